@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import glob
+import itertools
+import json
+import sys
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing.util import Finalize
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, Iterator, Optional, TextIO, Union
+
+from .run_log import FORMAT_DIR, open_run_log
+from .runner import DEFAULT_LOGS_DIR, DEFAULT_REGISTRY_PATH, unwrap_envelope
+from .runtime import Runtime
+
+JsonDict = Dict[str, Any]
+
+STDIN = "-"
+_GLOB_CHARS = set("*?[")
+
+
+@dataclass(frozen=True)
+class BatchItem:
+    """One envelope (or bundle) read from an input source, or the error that prevented reading it."""
+
+    source: str
+    raw: Optional[JsonDict] = None
+    error: Optional[str] = None
+
+
+def _iter_jsonl(lines: Iterable[Union[str, bytes]], label: str, start: int = 1) -> Iterator[BatchItem]:
+    """Lines from files arrive as bytes and are decoded one at a time, so a bad line fails alone."""
+    for lineno, line in enumerate(lines, start=start):
+        if isinstance(line, bytes):
+            try:
+                line = line.decode("utf-8")
+            except UnicodeDecodeError as e:
+                yield BatchItem(f"{label}:{lineno}", error=f"invalid UTF-8: {e}")
+                continue
+        if not line.strip():
+            continue
+        yield _parse_item(line, f"{label}:{lineno}")
+
+
+def _parse_item(text: str, source: str) -> BatchItem:
+    try:
+        raw = json.loads(text)
+    except json.JSONDecodeError as e:
+        return BatchItem(source, error=f"invalid JSON: {e}")
+    if not isinstance(raw, dict):
+        return BatchItem(source, error="JSON root must be object")
+    return BatchItem(source, raw=raw)
+
+
+def _iter_file(path: Path) -> Iterator[BatchItem]:
+    if path.suffix == ".jsonl":
+        try:
+            f = path.open("rb")
+        except OSError as e:
+            yield BatchItem(str(path), error=str(e))
+            return
+        with f:
+            try:
+                yield from _iter_jsonl(f, str(path))
+            except OSError as e:
+                yield BatchItem(str(path), error=str(e))
+        return
+    try:
+        text = path.read_bytes().decode("utf-8")
+    except OSError as e:
+        yield BatchItem(str(path), error=str(e))
+        return
+    except UnicodeDecodeError as e:
+        yield BatchItem(str(path), error=f"invalid UTF-8: {e}")
+        return
+    yield _parse_item(text, str(path))
+
+
+def _iter_stdin(stream: TextIO) -> Iterator[BatchItem]:
+    """
+    stdin is either a JSONL stream (one envelope per line, consumed as it arrives)
+    or a single, possibly pretty-printed, JSON document.
+    """
+    lines = iter(stream)
+    lineno = 0
+    for first in lines:
+        lineno += 1
+        if first.strip():
+            break
+    else:
+        return
+
+    try:
+        json.loads(first)
+    except json.JSONDecodeError:
+        # Not a one-line document: the whole stream is a single JSON document.
+        yield _parse_item(first + "".join(lines), "<stdin>")
+        return
+    yield from _iter_jsonl(itertools.chain([first], lines), "<stdin>", start=lineno)
+
+
+def iter_batch_items(inputs: Iterable[str], stdin: Optional[TextIO] = None) -> Iterator[BatchItem]:
+    """
+    Expand CLI inputs into envelopes, in a deterministic order.
+
+    Each input may be:
+      - "-" (stdin: JSONL stream or a single JSON document)
+      - a directory (all *.json / *.jsonl files, sorted by name)
+      - a glob pattern (matches sorted by path)
+      - a *.jsonl file (one envelope or bundle per line)
+      - a *.json file (one envelope or bundle)
+    """
+    for spec in inputs:
+        if spec == STDIN:
+            yield from _iter_stdin(stdin or sys.stdin)
+            continue
+
+        path = Path(spec)
+        if path.is_dir():
+            files = sorted(p for p in path.iterdir() if p.is_file() and p.suffix in (".json", ".jsonl"))
+        elif _GLOB_CHARS & set(spec):
+            files = [Path(p) for p in sorted(glob.glob(spec)) if Path(p).is_file()]
+            if not files:
+                yield BatchItem(spec, error="glob matched no files")
+        elif path.is_file():
+            files = [path]
+        else:
+            yield BatchItem(spec, error="no such file or directory")
+            files = []
+
+        for f in files:
+            yield from _iter_file(f)
+
+
+def _result_line(item: BatchItem, runtime: Runtime, registry_path: str, logs_dir: str) -> JsonDict:
+    out: JsonDict = {"source": item.source, "id": None}
+    if item.error is not None:
+        out.update({"ok": False, "error": {"type": "InputError", "message": item.error}})
+        return out
+    try:
+        env = unwrap_envelope(item.raw or {}, logs_dir=logs_dir)
+        out["id"] = env.get("id") if isinstance(env, dict) else None
+        response, run_record = runtime.run_envelope(env, registry_path=registry_path, logs_dir=logs_dir)
+    except Exception as e:
+        out.update({"ok": False, "error": {"type": type(e).__name__, "message": str(e)}})
+        return out
+    out.update({"ok": True, "response": response, "run_record": run_record})
+    return out
+
+
+# Per-process state for pool workers (set by _init_worker).
+_WORKER_RUNTIME: Optional[Runtime] = None
+_WORKER_ARGS: Dict[str, str] = {}
+
+
+def _open_runtime(registry_path: str, logs_dir: str, log_format: str, async_logs: bool) -> Runtime:
+    sink = open_run_log(logs_dir, fmt=log_format, background=async_logs)
+    return Runtime(registry_path, logs_dir, sink=sink)
+
+
+def _init_worker(registry_path: str, logs_dir: str, log_format: str, async_logs: bool) -> None:
+    global _WORKER_RUNTIME, _WORKER_ARGS
+    _WORKER_RUNTIME = _open_runtime(registry_path, logs_dir, log_format, async_logs)
+    _WORKER_ARGS = {"registry_path": registry_path, "logs_dir": logs_dir}
+    # pool workers leave via os._exit, which skips atexit; multiprocessing finalizers still run
+    Finalize(None, _WORKER_RUNTIME.close, exitpriority=10)
+
+
+def _run_in_worker(item: BatchItem) -> JsonDict:
+    assert _WORKER_RUNTIME is not None, "worker not initialized"
+    return _result_line(item, _WORKER_RUNTIME, **_WORKER_ARGS)
+
+
+def run_batch(
+    items: Iterable[BatchItem],
+    registry_path: str = DEFAULT_REGISTRY_PATH,
+    logs_dir: str = DEFAULT_LOGS_DIR,
+    workers: int = 1,
+    runtime: Optional[Runtime] = None,
+    log_format: str = FORMAT_DIR,
+    async_logs: bool = False,
+) -> Iterator[JsonDict]:
+    """
+    Run every item in one process (workers=1) or fan out over a process pool.
+
+    Results are yielded in input order regardless of completion order. With workers>1
+    at most `workers * 4` items are in flight, so arbitrarily long streams run in bounded memory.
+    Run logs are written with `log_format` (see `aos_runtime.run_log`), optionally on a background thread.
+    """
+    if workers <= 1:
+        rt = runtime or _open_runtime(registry_path, logs_dir, log_format, async_logs)
+        try:
+            for item in items:
+                yield _result_line(item, rt, registry_path, logs_dir)
+        finally:
+            if runtime is None:
+                rt.close()
+        return
+
+    window = workers * 4
+    pending: Deque[Future] = deque()
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(registry_path, logs_dir, log_format, async_logs),
+    ) as pool:
+        for item in items:
+            pending.append(pool.submit(_run_in_worker, item))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def write_jsonl(results: Iterable[JsonDict], out: TextIO) -> int:
+    """Stream results as JSONL; returns the number of failed items."""
+    failed = 0
+    for res in results:
+        if not res.get("ok"):
+            failed += 1
+        out.write(json.dumps(res, ensure_ascii=False, sort_keys=True) + "\n")
+        out.flush()
+    return failed
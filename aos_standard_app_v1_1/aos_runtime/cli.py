@@ -3,23 +3,51 @@ from __future__ import annotations
 import argparse
 import sys
 
+from .batch import iter_batch_items, run_batch, write_jsonl
 from .logging_utils import configure_logging
-from .runner import run_envelope_file
+from .run_log import FORMAT_DIR, LOG_FORMATS
 
 
 def main(argv: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser(prog="aos-stdapp", description="AoS Standard Application v1 - envelope runner")
-    parser.add_argument("envelope", help="Path to an AoS envelope JSON file")
+    parser.add_argument(
+        "envelope",
+        nargs="+",
+        help="Envelope JSON file(s), directories, glob patterns, *.jsonl streams, or '-' for stdin",
+    )
     parser.add_argument("--registry", default="registry/vports.registry.v1.jsonl", help="Path to vPorts registry JSONL")
     parser.add_argument("--logs-dir", default="run_logs", help="Directory to write run logs")
     parser.add_argument("--log-level", default="INFO", help="DEBUG/INFO/WARN/ERROR")
+    parser.add_argument("--workers", type=int, default=1, help="Process pool size (output order stays deterministic)")
+    parser.add_argument(
+        "--log-format",
+        choices=LOG_FORMATS,
+        default=FORMAT_DIR,
+        help="Run log layout: one directory per envelope (dir) or segmented append-only logs (jsonl/binary)",
+    )
+    parser.add_argument("--async-logs", action="store_true", help="Write run logs on a background thread")
+    parser.add_argument("--output", default="-", help="Where to stream JSONL results ('-' = stdout)")
 
     args = parser.parse_args(argv)
 
     configure_logging(args.log_level)
 
-    run_envelope_file(args.envelope, registry_path=args.registry, logs_dir=args.logs_dir)
-    return 0
+    items = iter_batch_items(args.envelope)
+    results = run_batch(
+        items,
+        registry_path=args.registry,
+        logs_dir=args.logs_dir,
+        workers=args.workers,
+        log_format=args.log_format,
+        async_logs=args.async_logs,
+    )
+
+    if args.output == "-":
+        failed = write_jsonl(results, sys.stdout)
+    else:
+        with open(args.output, "w", encoding="utf-8") as out:
+            failed = write_jsonl(results, out)
+    return 1 if failed else 0
 
 
 if __name__ == "__main__":
@@ -4,7 +4,15 @@ import hashlib
 import json
 from typing import Any, Dict
 
+_canonical_encoder = json.JSONEncoder(ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+
+
+def canonical_json(obj: Any) -> str:
+    """The canonical serialization every hash in the runtime is defined over."""
+    return _canonical_encoder.encode(obj)
+
 
 def sha256_json(obj: Dict[str, Any]) -> str:
-    data = json.dumps(obj, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    data = canonical_json(obj).encode("utf-8")
     return hashlib.sha256(data).hexdigest()
+
@@ -1,16 +1,25 @@
 from __future__ import annotations
 
+import hashlib
 import importlib
+import io
 import json
+import os
+import sys
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
 
 JsonDict = Dict[str, Any]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class VPortRecord:
+    """
+    One registry row. Slotted, and every field except `vport` is interned: roles, agent URNs, schema
+    paths and entrypoints repeat across many vPorts, so large registries share one copy of each.
+    """
+
     vport: str
     role: str
     agent_urn: str
@@ -19,32 +28,192 @@ class VPortRecord:
     entrypoint: str  # "module.submodule:function"
 
 
-def _parse_jsonl(path: Path) -> List[JsonDict]:
-    rows: List[JsonDict] = []
-    for line in path.read_text(encoding="utf-8").splitlines():
+def _record_from_row(r: JsonDict) -> VPortRecord:
+    return VPortRecord(
+        vport=r["vport"],
+        role=sys.intern(r["role"]),
+        agent_urn=sys.intern(r["agent_urn"]),
+        input_schema_path=sys.intern(r["input_schema_path"]),
+        output_schema_path=sys.intern(r["output_schema_path"]),
+        entrypoint=sys.intern(r["entrypoint"]),
+    )
+
+
+def _iter_jsonl(
+    f: BinaryIO, offset: int = 0, defer_partial: bool = False
+) -> Iterator[Tuple[JsonDict, int, int]]:
+    """
+    Stream rows from a JSONL file opened in binary mode, starting at byte `offset`.
+
+    Yields (row, line_start, line_end). Unparseable lines raise json.JSONDecodeError, except that with
+    `defer_partial` a final line without a newline that does not parse ends the stream instead: it may
+    still be being appended, and `RegistryIndex` decides later whether it is corrupt.
+    """
+    f.seek(offset)
+    pos = offset
+    for line in f:
+        start, pos = pos, pos + len(line)
         if not line.strip():
             continue
-        rows.append(json.loads(line))
-    return rows
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError:
+            if defer_partial and not line.endswith(b"\n"):
+                return
+            raise
+        yield row, start, pos
+
+
+def _parse_jsonl(path: Path) -> List[JsonDict]:
+    with path.open("rb") as f:
+        return [row for row, _, _ in _iter_jsonl(f)]
 
 
 def load_registry(registry_jsonl_path: str | Path) -> List[VPortRecord]:
     p = Path(registry_jsonl_path)
-    rows = _parse_jsonl(p)
-    out: List[VPortRecord] = []
-    for r in rows:
-        out.append(VPortRecord(
-            vport=r["vport"],
-            role=r["role"],
-            agent_urn=r["agent_urn"],
-            input_schema_path=r["input_schema_path"],
-            output_schema_path=r["output_schema_path"],
-            entrypoint=r["entrypoint"],
-        ))
-    return out
-
-
-def find_vport(registry: List[VPortRecord], vport: str) -> VPortRecord:
+    return [_record_from_row(r) for r in _parse_jsonl(p)]
+
+
+def vport_segments(vport: str) -> Tuple[str, ...]:
+    """'vport://host/py/labelgen' -> ('vport://host', 'py', 'labelgen'); ids without '/' are one segment."""
+    scheme, sep, rest = vport.partition("://")
+    parts = (rest if sep else vport).strip("/").split("/")
+    if sep:
+        parts[0] = f"{scheme}://{parts[0]}"
+    return tuple(parts)
+
+
+class RegistryIndex:
+    """
+    Indexed view of a vPort registry JSONL file.
+
+    Lookups by vport, role and agent_urn are dict lookups; `with_prefix` returns every vPort under a
+    `vport://host/...` segment prefix. As with `find_vport`, the first record for a vport wins.
+
+    `refresh()` is cheap to call before every lookup:
+      - unchanged mtime/size: nothing is read
+      - the file grew and the previously last line is still in place: only the appended lines are parsed
+      - anything else (rewrite, truncation, same-size edit): full reload, skipped if the sha256 is unchanged
+
+    An unparseable last line without a newline is left for the next refresh, since it may still be being
+    written. If the file has not changed by then, the line is corrupt and refresh raises
+    json.JSONDecodeError (as for any other malformed line) until the file is fixed.
+    """
+
+    def __init__(self, registry_jsonl_path: str | Path) -> None:
+        self.path = Path(registry_jsonl_path)
+        self.full_loads = 0
+        self.incremental_loads = 0
+        self._reset()
+        self.refresh()
+
+    def _reset(self) -> None:
+        self.records: List[VPortRecord] = []
+        self.by_vport: Dict[str, VPortRecord] = {}
+        self.by_role: Dict[str, List[VPortRecord]] = {}
+        self.by_agent_urn: Dict[str, List[VPortRecord]] = {}
+        self._by_prefix: Dict[Tuple[str, ...], List[VPortRecord]] = {}
+        self._stat: Optional[Tuple[int, int]] = None
+        self._sha256 = ""
+        self._offset = 0
+        self._tail: Tuple[int, bytes] = (0, b"")
+        # Set when a trailing partial line was deferred: the file's (mtime, size) at that point.
+        self._partial_at: Optional[Tuple[int, int]] = None
+
+    def _add(self, rec: VPortRecord) -> None:
+        self.records.append(rec)
+        if rec.vport in self.by_vport:
+            return
+        self.by_vport[rec.vport] = rec
+        self.by_role.setdefault(rec.role, []).append(rec)
+        self.by_agent_urn.setdefault(rec.agent_urn, []).append(rec)
+        segments = vport_segments(rec.vport)
+        for n in range(1, len(segments) + 1):
+            self._by_prefix.setdefault(segments[:n], []).append(rec)
+
+    def _load_from(self, f: BinaryIO, offset: int) -> bool:
+        """Parse rows from `offset`; True if a trailing partial line was left unparsed."""
+        for row, start, end in _iter_jsonl(f, offset, defer_partial=True):
+            self._add(_record_from_row(row))
+            self._offset = end
+            self._tail = (start, b"")
+        start = self._tail[0]
+        f.seek(start)
+        self._tail = (start, f.read(self._offset - start))
+        return bool(f.read().strip())
+
+    def _tail_intact(self, f: BinaryIO) -> bool:
+        start, data = self._tail
+        f.seek(start)
+        return f.read(len(data)) == data
+
+    def refresh(self) -> bool:
+        """Re-sync with the file; returns True if any record may have changed."""
+        st = os.stat(self.path)
+        stat_key = (st.st_mtime_ns, st.st_size)
+        if stat_key == self._stat:
+            if self._partial_at == stat_key:
+                # The deferred last line did not grow since the previous refresh: report it.
+                with self.path.open("rb") as f:
+                    for _ in _iter_jsonl(f, self._offset):
+                        pass
+            return False
+
+        with self.path.open("rb") as f:
+            if self._stat is not None and st.st_size > self._offset and self._tail_intact(f):
+                before = len(self.records)
+                partial = self._load_from(f, self._offset)
+                self._stat = stat_key
+                self._partial_at = stat_key if partial else None
+                self._sha256 = ""  # unknown until the next full load
+                if len(self.records) != before:
+                    self.incremental_loads += 1
+                    return True
+                return False
+
+            f.seek(0)
+            data = f.read()
+            digest = hashlib.sha256(data).hexdigest()
+            if self._stat is not None and digest == self._sha256:
+                # touched but unchanged
+                self._stat = stat_key
+                if self._partial_at is not None:
+                    self._partial_at = stat_key
+                return False
+
+            self._reset()
+            partial = self._load_from(io.BytesIO(data), 0)
+            self._stat = stat_key
+            self._partial_at = stat_key if partial else None
+            self._sha256 = digest
+            self.full_loads += 1
+            return True
+
+    def get(self, vport: str) -> VPortRecord:
+        try:
+            return self.by_vport[vport]
+        except KeyError:
+            raise KeyError(f"Unknown vPort: {vport}") from None
+
+    def for_role(self, role: str) -> List[VPortRecord]:
+        return list(self.by_role.get(role, ()))
+
+    def for_agent_urn(self, agent_urn: str) -> List[VPortRecord]:
+        return list(self.by_agent_urn.get(agent_urn, ()))
+
+    def with_prefix(self, prefix: str) -> List[VPortRecord]:
+        return list(self._by_prefix.get(vport_segments(prefix), ()))
+
+    def __iter__(self) -> Iterator[VPortRecord]:
+        return iter(self.records)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+
+def find_vport(registry: Iterable[VPortRecord], vport: str) -> VPortRecord:
+    if isinstance(registry, RegistryIndex):
+        return registry.get(vport)
     for rec in registry:
         if rec.vport == vport:
             return rec
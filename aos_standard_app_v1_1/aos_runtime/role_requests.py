@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import copy
+import threading
+from typing import Any, Callable, Dict, Mapping, Tuple, Union
+
+JsonDict = Dict[str, Any]
+
+# A field source is "<source>" or ("<source>", default).
+#
+#   "id"               envelope["id"]
+#   "envelope"         the envelope itself, shared by reference (never copied)
+#   "header"           envelope header only: project/target/transport/bundle_id/trace (size independent of payload)
+#   "trace"            envelope.get("trace", {})
+#   "inputs"           payload.inputs            (default applies when falsy)
+#   "constraints"      payload.constraints       (default applies when falsy)
+#   "inputs.<key>"     payload.inputs.get(key, default)
+#
+# Mutable defaults are copied per request, so builders never hand out shared default objects.
+FieldSource = Union[str, Tuple[str, Any]]
+RoleRequestSpec = Mapping[str, FieldSource]
+RequestBuilder = Callable[[JsonDict], JsonDict]
+
+_NO_DEFAULT = object()
+_HEADER_KEYS = ("project", "target", "transport", "bundle_id", "trace")
+
+# getter(envelope, inputs, constraints) -> value
+_Getter = Callable[[JsonDict, JsonDict, JsonDict], Any]
+
+
+def _default_factory(default: Any) -> Callable[[], Any]:
+    if isinstance(default, (dict, list)):
+        return lambda: copy.deepcopy(default)
+    return lambda: default
+
+
+def _compile_field(source: FieldSource) -> _Getter:
+    if isinstance(source, tuple):
+        name, default = source
+    else:
+        name, default = source, _NO_DEFAULT
+    make_default = _default_factory(default) if default is not _NO_DEFAULT else None
+
+    if name.startswith("inputs."):
+        key = name[len("inputs."):]
+        if make_default is None:
+            return lambda env, inputs, constraints: inputs.get(key)
+        return lambda env, inputs, constraints: inputs[key] if key in inputs else make_default()
+    if name == "id":
+        return lambda env, inputs, constraints: env["id"]
+    if name == "envelope":
+        return lambda env, inputs, constraints: env
+    if name == "header":
+        return lambda env, inputs, constraints: {
+            k: env.get(k, None if k == "bundle_id" else {}) for k in _HEADER_KEYS
+        }
+    if name == "trace":
+        return lambda env, inputs, constraints: env.get("trace", {})
+    if name in ("inputs", "constraints"):
+        pick: _Getter = (
+            (lambda env, inputs, constraints: inputs)
+            if name == "inputs"
+            else (lambda env, inputs, constraints: constraints)
+        )
+        if make_default is None:
+            return pick
+        return lambda env, inputs, constraints: pick(env, inputs, constraints) or make_default()
+    raise ValueError(f"Unknown request field source: {name!r}")
+
+
+def compile_request_spec(spec: RoleRequestSpec) -> RequestBuilder:
+    """Compile a role spec once into a builder: envelope -> request object."""
+    fields = tuple((key, _compile_field(source)) for key, source in spec.items())
+
+    def build(envelope: JsonDict) -> JsonDict:
+        payload = envelope["payload"]
+        inputs = payload["inputs"] or {}
+        constraints = payload["constraints"] or {}
+        return {key: get(envelope, inputs, constraints) for key, get in fields}
+
+    return build
+
+
+BUILTIN_ROLE_SPECS: Dict[str, RoleRequestSpec] = {
+    "Foreman": {
+        "task_id": "id",
+        "objective": ("inputs.objective", ""),
+        "intent": ("inputs.intent", "plan"),
+        "constraints": ("constraints", {"deterministic": True}),
+        "inputs": "inputs",
+        "context_snapshot": "envelope",
+        "requested_outputs": ("inputs.requested_outputs", []),
+        "routing_hints": ("inputs.routing_hints", {}),
+        "trace": "trace",
+    },
+    "Librarian": {
+        "task_id": "id",
+        "query": ("inputs.query", ""),
+        "intent": ("inputs.intent", "lookup"),
+        "context_snapshot": "envelope",
+        "sources": ("inputs.sources", []),
+        "filters": ("inputs.filters", {}),
+        "output_format": ("inputs.output_format", "bullets"),
+        "max_results": ("inputs.max_results", 10),
+        "trace": "trace",
+    },
+    "Sorcerer": {
+        "task_id": "id",
+        "objective": ("inputs.objective", ""),
+        "materials": ("inputs.materials", {}),
+        "intent": ("inputs.intent", "draft"),
+        "context_snapshot": "envelope",
+        "style_profile": ("inputs.style_profile", {}),
+        "constraints": "constraints",
+        "trace": "trace",
+    },
+    "Judge": {
+        "task_id": "id",
+        "subject": ("inputs.subject", ""),
+        "evaluation_type": ("inputs.evaluation_type", "quality_review"),
+        "payload": ("inputs.payload", {}),
+        "context_snapshot": "envelope",
+        "strictness": ("inputs.strictness", "high"),
+        "expected_schema": ("inputs.expected_schema", ""),
+        "notes": ("inputs.notes", ""),
+        "trace": "trace",
+    },
+    "Messenger": {
+        "task_id": "id",
+        "message": ("inputs.message", ""),
+        "targets": ("inputs.targets", []),
+        "channels": ("inputs.channels", ["console"]),
+        "context_snapshot": "envelope",
+        "formatting": ("inputs.formatting", {}),
+        "attachments": ("inputs.attachments", []),
+        "trace": "trace",
+    },
+}
+
+_builders: Dict[str, RequestBuilder] = {}
+_lock = threading.Lock()
+
+
+def register_role(role: str, spec: RoleRequestSpec, replace: bool = False) -> None:
+    """
+    Register (or with replace=True, override) the request mapping for a role.
+
+    Agent modules can call this at import time; entrypoints are imported before requests are built.
+    """
+    builder = compile_request_spec(spec)
+    with _lock:
+        if role in _builders and not replace:
+            raise ValueError(f"Role already registered: {role}")
+        _builders[role] = builder
+
+
+def registered_roles() -> Tuple[str, ...]:
+    return tuple(sorted(_builders))
+
+
+def build_request(envelope: JsonDict) -> JsonDict:
+    role = envelope["target"]["role"]
+    builder = _builders.get(role)
+    if builder is None:
+        raise ValueError(f"Unsupported role: {role}")
+    return builder(envelope)
+
+
+for _role, _spec in BUILTIN_ROLE_SPECS.items():
+    register_role(_role, _spec)
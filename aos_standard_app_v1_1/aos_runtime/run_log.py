@@ -0,0 +1,287 @@
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import os
+import queue
+import struct
+import threading
+import zlib
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, List, Optional, Protocol, Tuple
+
+from .io_utils import read_json, write_json
+
+JsonDict = Dict[str, Any]
+
+LOG = logging.getLogger(__name__)
+
+FORMAT_DIR = "dir"
+FORMAT_JSONL = "jsonl"
+FORMAT_BINARY = "binary"
+LOG_FORMATS = (FORMAT_DIR, FORMAT_JSONL, FORMAT_BINARY)
+
+SEGMENTS_DIR = "segments"
+_SEGMENT_SUFFIX = {FORMAT_JSONL: ".jsonl", FORMAT_BINARY: ".bin"}
+_LEN = struct.Struct(">I")
+
+
+class RunLogSink(Protocol):
+    def write(self, envelope: JsonDict, response: JsonDict, run_record: JsonDict) -> None:
+        ...
+
+    def flush(self) -> None:
+        ...
+
+    def close(self) -> None:
+        ...
+
+
+class DirectoryRunLog:
+    """The v1 layout: run_logs/<envelope id>/{envelope,response,run_record}.json"""
+
+    def __init__(self, logs_dir: str | Path) -> None:
+        self.logs_dir = Path(logs_dir)
+
+    def write(self, envelope: JsonDict, response: JsonDict, run_record: JsonDict) -> None:
+        out_dir = self.logs_dir / envelope["id"]
+        write_json(out_dir / "envelope.json", envelope)
+        write_json(out_dir / "response.json", response)
+        write_json(out_dir / "run_record.json", run_record)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+def _compact(obj: Any) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class SegmentedRunLog:
+    """
+    Append-only run log: one record per run in size-capped segment files plus an offset index.
+
+      <logs_dir>/segments/runs-<writer>-<NNNNNN>.jsonl|.bin   records
+      <logs_dir>/segments/index-<writer>.jsonl                {"id", "segment", "offset", "length"} per record
+
+    jsonl segments hold one compact JSON object per line; binary segments hold
+    4-byte big-endian length + zlib-compressed compact JSON. `writer` defaults to the pid so several
+    processes (e.g. `aos-stdapp --workers N`) can share a logs dir without coordinating.
+    """
+
+    def __init__(
+        self,
+        logs_dir: str | Path,
+        fmt: str = FORMAT_JSONL,
+        segment_max_bytes: int = 64 * 1024 * 1024,
+        writer_id: Optional[str] = None,
+    ) -> None:
+        if fmt not in _SEGMENT_SUFFIX:
+            raise ValueError(f"Unsupported segmented log format: {fmt}")
+        self.fmt = fmt
+        self.segment_max_bytes = segment_max_bytes
+        self.writer_id = writer_id or str(os.getpid())
+        self.dir = Path(logs_dir) / SEGMENTS_DIR
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._index: IO[str] = (self.dir / f"index-{self.writer_id}.jsonl").open("a", encoding="utf-8")
+        self._seq = self._last_segment_seq()
+        self._segment: Optional[IO[bytes]] = None
+        self._segment_name = ""
+
+    def _last_segment_seq(self) -> int:
+        prefix = f"runs-{self.writer_id}-"
+        seqs = [int(p.stem[len(prefix):]) for p in self.dir.glob(f"{prefix}*") if p.stem[len(prefix):].isdigit()]
+        return max(seqs, default=0)
+
+    def _open_segment(self) -> IO[bytes]:
+        if self._segment is not None and self._segment.tell() < self.segment_max_bytes:
+            return self._segment
+        if self._segment is not None:
+            self._segment.close()
+            self._seq += 1
+        elif self._seq == 0:
+            self._seq = 1
+        self._segment_name = f"runs-{self.writer_id}-{self._seq:06d}{_SEGMENT_SUFFIX[self.fmt]}"
+        self._segment = (self.dir / self._segment_name).open("ab")
+        return self._segment
+
+    def write(self, envelope: JsonDict, response: JsonDict, run_record: JsonDict) -> None:
+        body = _compact({"id": envelope["id"], "envelope": envelope, "response": response, "run_record": run_record})
+        if self.fmt == FORMAT_JSONL:
+            blob = body + b"\n"
+        else:
+            packed = zlib.compress(body)
+            blob = _LEN.pack(len(packed)) + packed
+        with self._lock:
+            seg = self._open_segment()
+            offset = seg.tell()
+            seg.write(blob)
+            entry = {"id": envelope["id"], "segment": self._segment_name, "offset": offset, "length": len(blob)}
+            self._index.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._segment is not None:
+                self._segment.flush()
+            self._index.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._segment is not None:
+                self._segment.close()
+                self._segment = None
+            self._index.close()
+
+
+_CLOSE = object()
+
+
+class BackgroundRunLog:
+    """
+    Moves run-log writes off the hot path.
+
+    Writes go through a bounded queue to one writer thread; `write` blocks when the queue is full
+    (backpressure instead of unbounded memory). `flush` waits until everything queued so far is written,
+    and pending records are flushed at interpreter exit. A failure in the writer thread is re-raised
+    from the next `write`/`flush`/`close`.
+    """
+
+    def __init__(self, sink: RunLogSink, max_queue: int = 1024) -> None:
+        self.sink = sink
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_queue)
+        self._error: Optional[BaseException] = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._worker, name="aos-run-log", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _worker(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is _CLOSE:
+                    return
+                self.sink.write(*item)
+                if self._queue.empty():
+                    self.sink.flush()
+            except BaseException as e:  # surfaced to the producer
+                LOG.exception("run log write failed")
+                self._error = e
+            finally:
+                self._queue.task_done()
+
+    def _raise_pending(self) -> None:
+        if self._error is not None:
+            err, self._error = self._error, None
+            raise RuntimeError("background run log write failed") from err
+
+    def write(self, envelope: JsonDict, response: JsonDict, run_record: JsonDict) -> None:
+        self._raise_pending()
+        if self._closed:
+            raise RuntimeError("run log is closed")
+        self._queue.put((envelope, response, run_record))
+
+    def flush(self) -> None:
+        self._queue.join()
+        self.sink.flush()
+        self._raise_pending()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_CLOSE)
+        self._thread.join()
+        self.sink.flush()
+        self.sink.close()
+        atexit.unregister(self.close)
+        self._raise_pending()
+
+
+def open_run_log(logs_dir: str | Path, fmt: str = FORMAT_DIR, background: bool = False, **kwargs: Any) -> RunLogSink:
+    sink: RunLogSink
+    if fmt == FORMAT_DIR:
+        sink = DirectoryRunLog(logs_dir)
+    elif fmt in _SEGMENT_SUFFIX:
+        sink = SegmentedRunLog(logs_dir, fmt=fmt, **kwargs)
+    else:
+        raise ValueError(f"Unsupported run log format: {fmt} (expected one of {LOG_FORMATS})")
+    return BackgroundRunLog(sink) if background else sink
+
+
+class RunLogReader:
+    """
+    Fetch a run's records by envelope id from any layout under `logs_dir`.
+
+    Segment indexes are loaded lazily and re-read when they grow; later entries win, matching the
+    overwrite semantics of the directory layout.
+    """
+
+    def __init__(self, logs_dir: str | Path) -> None:
+        self.logs_dir = Path(logs_dir)
+        self._index: Dict[str, Tuple[str, int, int]] = {}
+        self._index_pos: Dict[str, int] = {}
+
+    def _refresh_index(self) -> None:
+        seg_dir = self.logs_dir / SEGMENTS_DIR
+        if not seg_dir.is_dir():
+            return
+        for index_path in sorted(seg_dir.glob("index-*.jsonl")):
+            pos = self._index_pos.get(index_path.name, 0)
+            with index_path.open("r", encoding="utf-8") as f:
+                f.seek(pos)
+                while True:
+                    line = f.readline()
+                    if not line.endswith("\n"):
+                        break  # partially written entry; pick it up next time
+                    pos = f.tell()
+                    entry = json.loads(line)
+                    self._index[entry["id"]] = (entry["segment"], entry["offset"], entry["length"])
+            self._index_pos[index_path.name] = pos
+
+    def ids(self) -> List[str]:
+        self._refresh_index()
+        found = set(self._index)
+        if self.logs_dir.is_dir():
+            found.update(p.name for p in self.logs_dir.iterdir() if (p / "run_record.json").is_file())
+        return sorted(found)
+
+    def get(self, envelope_id: str) -> JsonDict:
+        """Returns {"envelope", "response", "run_record"}; raises KeyError if the run is unknown."""
+        if envelope_id not in self._index:
+            self._refresh_index()
+        loc = self._index.get(envelope_id)
+        if loc is not None:
+            return self._read_segment(envelope_id, *loc)
+
+        run_dir = self.logs_dir / envelope_id
+        if (run_dir / "run_record.json").is_file():
+            return {
+                "envelope": read_json(run_dir / "envelope.json"),
+                "response": read_json(run_dir / "response.json"),
+                "run_record": read_json(run_dir / "run_record.json"),
+            }
+        raise KeyError(f"Unknown run: {envelope_id}")
+
+    def _read_segment(self, envelope_id: str, segment: str, offset: int, length: int) -> JsonDict:
+        with (self.logs_dir / SEGMENTS_DIR / segment).open("rb") as f:
+            f.seek(offset)
+            blob = f.read(length)
+        if len(blob) != length:
+            # the index line reached disk before the segment bytes did
+            raise KeyError(f"Run not flushed yet: {envelope_id}")
+        if segment.endswith(_SEGMENT_SUFFIX[FORMAT_BINARY]):
+            (size,) = _LEN.unpack_from(blob)
+            body = zlib.decompress(blob[_LEN.size:_LEN.size + size])
+        else:
+            body = blob
+        rec = json.loads(body)
+        return {"envelope": rec["envelope"], "response": rec["response"], "run_record": rec["run_record"]}
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.ids())
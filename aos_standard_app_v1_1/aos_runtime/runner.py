@@ -7,15 +7,40 @@ from .base_agent import AgentSchemas, BaseAgent
 from .envelope import normalize_envelope, validate_envelope
 from .io_utils import read_json, write_json
 from .registry import find_vport, load_entrypoint, load_registry
+from .role_requests import build_request
+from .run_log import DirectoryRunLog
 
 JsonDict = Dict[str, Any]
 
 
+DEFAULT_REGISTRY_PATH = "registry/vports.registry.v1.jsonl"
+DEFAULT_LOGS_DIR = "run_logs"
+
+
+def build_agent_request(envelope: JsonDict) -> JsonDict:
+    """
+    Map a normalized envelope onto the request contract of its target role.
+
+    The mapping is table-driven: see `aos_runtime.role_requests` to add or override roles.
+    """
+    return build_request(envelope)
+
+
+def write_run_logs(envelope: JsonDict, response: JsonDict, run_record: JsonDict, logs_dir: str) -> None:
+    # persist logs deterministically
+    DirectoryRunLog(logs_dir).write(envelope, response, run_record)
+
+
 def run_envelope(
     envelope: JsonDict,
-    registry_path: str = "registry/vports.registry.v1.jsonl",
-    logs_dir: str = "run_logs",
+    registry_path: str = DEFAULT_REGISTRY_PATH,
+    logs_dir: str = DEFAULT_LOGS_DIR,
 ) -> Tuple[JsonDict, JsonDict]:
+    """
+    Cold-path runner: loads the registry and builds the agent on every call.
+
+    Use `aos_runtime.runtime.Runtime` when running many envelopes in one process.
+    """
     envelope = normalize_envelope(envelope)
     validate_envelope(envelope)
 
@@ -32,90 +57,15 @@ def run_envelope(
 
     agent_runtime: BaseAgent = build_fn(schemas)  # type: ignore
 
-    # Build a role-specific request object:
-    role = envelope["target"]["role"]
-    inputs = envelope["payload"]["inputs"] or {}
-    constraints = envelope["payload"]["constraints"] or {}
-
-    # Each wrapper expects its own schema contract, so we map accordingly:
-    if role == "Foreman":
-        request = {
-            "task_id": envelope["id"],
-            "objective": inputs.get("objective", ""),
-            "intent": inputs.get("intent", "plan"),
-            "constraints": constraints if constraints else {"deterministic": True},
-            "inputs": inputs,
-            "context_snapshot": envelope,
-            "requested_outputs": inputs.get("requested_outputs", []),
-            "routing_hints": inputs.get("routing_hints", {}),
-            "trace": envelope.get("trace", {}),
-        }
-    elif role == "Librarian":
-        request = {
-            "task_id": envelope["id"],
-            "query": inputs.get("query", ""),
-            "intent": inputs.get("intent", "lookup"),
-            "context_snapshot": envelope,
-            "sources": inputs.get("sources", []),
-            "filters": inputs.get("filters", {}),
-            "output_format": inputs.get("output_format", "bullets"),
-            "max_results": inputs.get("max_results", 10),
-            "trace": envelope.get("trace", {}),
-        }
-    elif role == "Sorcerer":
-        request = {
-            "task_id": envelope["id"],
-            "objective": inputs.get("objective", ""),
-            "materials": inputs.get("materials", {}),
-            "intent": inputs.get("intent", "draft"),
-            "context_snapshot": envelope,
-            "style_profile": inputs.get("style_profile", {}),
-            "constraints": constraints,
-            "trace": envelope.get("trace", {}),
-        }
-    elif role == "Judge":
-        request = {
-            "task_id": envelope["id"],
-            "subject": inputs.get("subject", ""),
-            "evaluation_type": inputs.get("evaluation_type", "quality_review"),
-            "payload": inputs.get("payload", {}),
-            "context_snapshot": envelope,
-            "strictness": inputs.get("strictness", "high"),
-            "expected_schema": inputs.get("expected_schema", ""),
-            "notes": inputs.get("notes", ""),
-            "trace": envelope.get("trace", {}),
-        }
-    elif role == "Messenger":
-        request = {
-            "task_id": envelope["id"],
-            "message": inputs.get("message", ""),
-            "targets": inputs.get("targets", []),
-            "channels": inputs.get("channels", ["console"]),
-            "context_snapshot": envelope,
-            "formatting": inputs.get("formatting", {}),
-            "attachments": inputs.get("attachments", []),
-            "trace": envelope.get("trace", {}),
-        }
-    else:
-        raise ValueError(f"Unsupported role: {role}")
-
+    request = build_agent_request(envelope)
     response, run_record = agent_runtime.handle(request)
 
-    # persist logs deterministically
-    out_dir = Path(logs_dir) / envelope["id"]
-    write_json(out_dir / "envelope.json", envelope)
-    write_json(out_dir / "response.json", response)
-    write_json(out_dir / "run_record.json", run_record)
+    write_run_logs(envelope, response, run_record, logs_dir)
 
     return response, run_record
 
 
-def run_envelope_file(
-    envelope_path: str,
-    registry_path: str = "registry/vports.registry.v1.jsonl",
-    logs_dir: str = "run_logs",
-) -> Tuple[JsonDict, JsonDict]:
-    raw = read_json(envelope_path)
+def unwrap_envelope(raw: JsonDict, logs_dir: str = DEFAULT_LOGS_DIR) -> JsonDict:
     # Accept either a plain envelope, or a bundle: {"envelope": {...}, "agent_profiles": {...}}
     if isinstance(raw, dict) and "envelope" in raw and isinstance(raw.get("envelope"), dict):
         bundle = raw
@@ -131,4 +81,17 @@ def run_envelope_file(
             pass
     else:
         env = raw
+    return env
+
+
+def load_envelope_file(envelope_path: str, logs_dir: str = DEFAULT_LOGS_DIR) -> JsonDict:
+    return unwrap_envelope(read_json(envelope_path), logs_dir=logs_dir)
+
+
+def run_envelope_file(
+    envelope_path: str,
+    registry_path: str = DEFAULT_REGISTRY_PATH,
+    logs_dir: str = DEFAULT_LOGS_DIR,
+) -> Tuple[JsonDict, JsonDict]:
+    env = load_envelope_file(envelope_path, logs_dir=logs_dir)
     return run_envelope(env, registry_path=registry_path, logs_dir=logs_dir)
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import os
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .base_agent import AgentSchemas, BaseAgent
+from .envelope import normalize_envelope, validate_envelope
+from .registry import RegistryIndex, VPortRecord, load_entrypoint
+from .run_log import DirectoryRunLog, RunLogSink
+from .runner import (
+    DEFAULT_LOGS_DIR,
+    DEFAULT_REGISTRY_PATH,
+    build_agent_request,
+    load_envelope_file,
+)
+
+JsonDict = Dict[str, Any]
+
+
+class Runtime:
+    """
+    Long-lived envelope runner.
+
+    Keeps the vPort registry, resolved entrypoints and built agents warm across calls:
+      - the registry is a `RegistryIndex`: untouched files are not read, appended lines are parsed
+        incrementally, and rewrites are re-parsed only if their sha256 differs
+      - agents are keyed by (registry, vport) and rebuilt only when their registry record changes
+      - `run_envelope` has the same signature and results as `aos_runtime.runner.run_envelope`
+
+    Run logs go to `sink` (see `aos_runtime.run_log`; default: the v1 per-directory layout under `logs_dir`).
+    An explicit `logs_dir` argument to `run_envelope` that differs from the runtime's writes that run in the
+    directory layout, as the cold runner does.
+    """
+
+    def __init__(
+        self,
+        registry_path: str = DEFAULT_REGISTRY_PATH,
+        logs_dir: str = DEFAULT_LOGS_DIR,
+        sink: Optional[RunLogSink] = None,
+    ) -> None:
+        self.registry_path = registry_path
+        self.logs_dir = logs_dir
+        self.sink: RunLogSink = sink or DirectoryRunLog(logs_dir)
+        self._lock = threading.RLock()
+        self._registries: Dict[str, RegistryIndex] = {}
+        self._entrypoints: Dict[str, Callable[..., Any]] = {}
+        self._agents: Dict[Tuple[str, str], Tuple[VPortRecord, BaseAgent]] = {}
+        self.agent_builds = 0
+
+    @property
+    def registry_loads(self) -> int:
+        return sum(index.full_loads + index.incremental_loads for index in self._registries.values())
+
+    def registry(self, registry_path: Optional[str] = None) -> RegistryIndex:
+        key = os.path.abspath(registry_path or self.registry_path)
+        with self._lock:
+            index = self._registries.get(key)
+            if index is None:
+                index = self._registries[key] = RegistryIndex(key)
+            elif index.refresh():
+                self._drop_stale_agents(key, index)
+            return index
+
+    def _drop_stale_agents(self, registry_key: str, index: RegistryIndex) -> None:
+        for agent_key in [k for k in self._agents if k[0] == registry_key]:
+            cached_rec, _ = self._agents[agent_key]
+            if index.by_vport.get(agent_key[1]) != cached_rec:
+                del self._agents[agent_key]
+
+    def _entrypoint(self, entrypoint: str) -> Callable[..., Any]:
+        fn = self._entrypoints.get(entrypoint)
+        if fn is None:
+            fn = load_entrypoint(entrypoint)
+            self._entrypoints[entrypoint] = fn
+        return fn
+
+    def agent_for(self, vport: str, registry_path: Optional[str] = None) -> BaseAgent:
+        registry = self.registry(registry_path)
+        key = (os.path.abspath(registry_path or self.registry_path), vport)
+        with self._lock:
+            cached = self._agents.get(key)
+            if cached is not None:
+                return cached[1]
+
+            rec = registry.get(vport)
+            build_fn = self._entrypoint(rec.entrypoint)
+            schemas = AgentSchemas(
+                input_schema_path=rec.input_schema_path,
+                output_schema_path=rec.output_schema_path,
+            )
+            agent_runtime: BaseAgent = build_fn(schemas)  # type: ignore
+            self.agent_builds += 1
+            self._agents[key] = (rec, agent_runtime)
+            return agent_runtime
+
+    def run_envelope(
+        self,
+        envelope: JsonDict,
+        registry_path: Optional[str] = None,
+        logs_dir: Optional[str] = None,
+    ) -> Tuple[JsonDict, JsonDict]:
+        envelope = normalize_envelope(envelope)
+        validate_envelope(envelope)
+
+        agent_runtime = self.agent_for(envelope["transport"]["vport"], registry_path)
+
+        request = build_agent_request(envelope)
+        response, run_record = agent_runtime.handle(request)
+
+        if logs_dir is None or logs_dir == self.logs_dir:
+            self.sink.write(envelope, response, run_record)
+        else:
+            DirectoryRunLog(logs_dir).write(envelope, response, run_record)
+
+        return response, run_record
+
+    def run_envelope_file(
+        self,
+        envelope_path: str,
+        registry_path: Optional[str] = None,
+        logs_dir: Optional[str] = None,
+    ) -> Tuple[JsonDict, JsonDict]:
+        env = load_envelope_file(envelope_path, logs_dir=logs_dir or self.logs_dir)
+        return self.run_envelope(env, registry_path=registry_path, logs_dir=logs_dir)
+
+    def flush(self) -> None:
+        self.sink.flush()
+
+    def close(self) -> None:
+        self.sink.close()
+
+    def __enter__(self) -> "Runtime":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
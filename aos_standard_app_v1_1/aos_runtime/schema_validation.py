@@ -1,40 +1,122 @@
 from __future__ import annotations
 
 import json
+import os
 from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Tuple
+from typing import Any, Callable, Dict, Iterable, List
 
 from jsonschema import Draft7Validator
 
+try:  # optional: pip install "aos-standard-app[fast]"
+    import fastjsonschema
+except ImportError:  # pragma: no cover - depends on environment
+    fastjsonschema = None  # type: ignore[assignment]
+
 JsonDict = Dict[str, Any]
 
+# "jsonschema" (default) or "compiled" (generated Python validators via fastjsonschema).
+ENGINE_ENV = "AOS_SCHEMA_ENGINE"
+ENGINE_JSONSCHEMA = "jsonschema"
+ENGINE_COMPILED = "compiled"
+
+MAX_REPORTED_ERRORS = 25
+
 
 class SchemaValidationError(ValueError):
     pass
 
 
+def canonical_schema_key(schema_path: str | Path) -> str:
+    """Absolute, symlink-resolved path, so `./schemas/x.json` and `schemas/x.json` share one cache entry."""
+    p = os.fspath(schema_path)
+    return _canonical(p, "" if os.path.isabs(p) else os.getcwd())
+
+
+@lru_cache(maxsize=1024)
+def _canonical(path: str, cwd: str) -> str:
+    return os.path.realpath(os.path.join(cwd, path))
+
+
+def schema_engine() -> str:
+    engine = (os.getenv(ENGINE_ENV) or ENGINE_JSONSCHEMA).strip().lower()
+    return ENGINE_COMPILED if engine == ENGINE_COMPILED else ENGINE_JSONSCHEMA
+
+
+def load_schema(schema_path: str | Path) -> JsonDict:
+    return _load_schema(canonical_schema_key(schema_path))
+
+
 @lru_cache(maxsize=256)
-def load_schema(schema_path: str) -> JsonDict:
-    p = Path(schema_path)
-    data = json.loads(p.read_text(encoding="utf-8"))
+def _load_schema(key: str) -> JsonDict:
+    data = json.loads(Path(key).read_text(encoding="utf-8"))
     if not isinstance(data, dict):
-        raise SchemaValidationError(f"Schema is not a JSON object: {schema_path}")
+        raise SchemaValidationError(f"Schema is not a JSON object: {key}")
     return data
 
 
+def get_validator(schema_path: str | Path) -> Draft7Validator:
+    return _get_validator(canonical_schema_key(schema_path))
+
+
 @lru_cache(maxsize=256)
-def get_validator(schema_path: str) -> Draft7Validator:
-    schema = load_schema(schema_path)
-    return Draft7Validator(schema)
+def _get_validator(key: str) -> Draft7Validator:
+    return Draft7Validator(_load_schema(key))
+
+
+@lru_cache(maxsize=512)
+def _get_checker(key: str, engine: str) -> Callable[[Any], bool]:
+    """
+    Boolean fast path for `key`.
+
+    The compiled engine uses a generated Python validator when fastjsonschema is installed
+    and can compile the schema; otherwise jsonschema's `is_valid` is used.
+    """
+    if engine == ENGINE_COMPILED and fastjsonschema is not None:
+        try:
+            # use_default=False: never fill defaults into (i.e. mutate) the caller's instance
+            compiled = fastjsonschema.compile(
+                _load_schema(key),
+                use_default=False,
+                use_formats=False,
+                detailed_exceptions=False,
+            )
+        except Exception:
+            compiled = None
+        if compiled is not None:
+            def check(instance: Any) -> bool:
+                try:
+                    compiled(instance)
+                except fastjsonschema.JsonSchemaException:
+                    return False
+                return True
 
+            return check
+    return _get_validator(key).is_valid
 
-def validate(instance: JsonDict, schema_path: str) -> None:
-    validator = get_validator(schema_path)
+
+def precompile(schema_paths: Iterable[str | Path]) -> None:
+    """Load and compile validators ahead of the first request (e.g. at process start)."""
+    engine = schema_engine()
+    for path in schema_paths:
+        _get_checker(canonical_schema_key(path), engine)
+
+
+def _error_report(validator: Draft7Validator, instance: Any) -> str:
     errors = sorted(validator.iter_errors(instance), key=lambda e: list(e.path))
-    if errors:
-        lines: List[str] = []
-        for e in errors[:25]:
-            path = ".".join(str(p) for p in e.path) if e.path else "(root)"
-            lines.append(f"{path}: {e.message}")
-        raise SchemaValidationError("Schema validation failed:\n- " + "\n- ".join(lines))
+    lines: List[str] = []
+    for e in errors[:MAX_REPORTED_ERRORS]:
+        path = ".".join(str(p) for p in e.path) if e.path else "(root)"
+        lines.append(f"{path}: {e.message}")
+    return "Schema validation failed:\n- " + "\n- ".join(lines)
+
+
+def validate(instance: JsonDict, schema_path: str | Path) -> None:
+    key = canonical_schema_key(schema_path)
+    if _get_checker(key, schema_engine())(instance):
+        return
+    # Slow path: build the full sorted report from jsonschema so messages do not depend on the engine.
+    validator = _get_validator(key)
+    if validator.is_valid(instance):
+        return
+    raise SchemaValidationError(_error_report(validator, instance))
@@ -0,0 +1,72 @@
+"""
+Cold vs warm per-envelope latency.
+
+Cold: aos_runtime.runner.run_envelope (registry parse + entrypoint import + agent build per call).
+Warm: aos_runtime.runtime.Runtime.run_envelope (registry/agents cached across calls).
+
+Run from the app root:
+  python benchmarks/bench_runtime.py --iterations 500
+  python benchmarks/bench_runtime.py --log-format jsonl --async-logs   # warm path with a segmented, background run log
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from aos_runtime.io_utils import read_json  # noqa: E402
+from aos_runtime.run_log import FORMAT_DIR, LOG_FORMATS, open_run_log  # noqa: E402
+from aos_runtime.runner import run_envelope  # noqa: E402
+from aos_runtime.runtime import Runtime  # noqa: E402
+
+
+def _measure(fn: Callable[[], object], iterations: int) -> List[float]:
+    samples: List[float] = []
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1e6)
+    return samples
+
+
+def _report(label: str, samples: List[float]) -> None:
+    samples = sorted(samples)
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    print(f"{label:<6} mean={statistics.mean(samples):9.1f}us  p50={statistics.median(samples):9.1f}us  p99={p99:9.1f}us")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--envelope", default="examples/envelopes/foreman_task.json")
+    parser.add_argument("--registry", default="registry/vports.registry.v1.jsonl")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--log-format", choices=LOG_FORMATS, default=FORMAT_DIR, help="Run log sink for the warm path")
+    parser.add_argument("--async-logs", action="store_true", help="Background run-log writer for the warm path")
+    args = parser.parse_args(argv)
+
+    env = read_json(args.envelope)
+    with tempfile.TemporaryDirectory() as logs_dir:
+        sink = open_run_log(logs_dir, fmt=args.log_format, background=args.async_logs)
+        runtime = Runtime(args.registry, logs_dir, sink=sink)
+        # warm imports and schema caches for both paths so we only compare per-envelope setup
+        run_envelope(env, registry_path=args.registry, logs_dir=logs_dir)
+        runtime.run_envelope(env)
+
+        cold = _measure(lambda: run_envelope(env, registry_path=args.registry, logs_dir=logs_dir), args.iterations)
+        warm = _measure(lambda: runtime.run_envelope(env), args.iterations)
+        runtime.close()
+
+    _report("cold", cold)
+    _report("warm", warm)
+    print(f"speedup (mean): {statistics.mean(cold) / statistics.mean(warm):.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,113 @@
+"""
+Micro-benchmark for aos_runtime.schema_validation over the role input/output schemas.
+
+Compares, per schema and for a valid instance produced by the real runner:
+  - legacy : Draft7Validator.iter_errors + sort (the previous implementation)
+  - jsonschema : validate() with the is_valid fast path
+  - compiled : validate() with AOS_SCHEMA_ENGINE=compiled (needs fastjsonschema)
+
+Run from the app root:
+  python benchmarks/bench_schema_validation.py --iterations 2000
+"""
+from __future__ import annotations
+
+import argparse
+import copy
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from aos_runtime import schema_validation as sv  # noqa: E402
+from aos_runtime.io_utils import read_json  # noqa: E402
+from aos_runtime.runtime import Runtime  # noqa: E402
+
+EXTRA_ROLE_INPUTS: Dict[str, Dict[str, Any]] = {
+    "Librarian": {"intent": "lookup", "query": "vPort registry format"},
+    "Judge": {"subject": "README draft", "evaluation_type": "quality_review"},
+    "Messenger": {"message": "Run finished", "targets": [{"target_id": "ops", "target_type": "email", "address": "ops@example.invalid"}]},
+}
+
+
+def _role_envelopes() -> List[Dict[str, Any]]:
+    envelopes = [read_json("examples/envelopes/foreman_task.json"), read_json("examples/envelopes/sorcerer_task.json")]
+    for role, inputs in EXTRA_ROLE_INPUTS.items():
+        env = copy.deepcopy(envelopes[0])
+        env["id"] = f"task_{role.lower()}_bench"
+        env["target"]["role"] = role
+        env["target"]["urn"] = f"urn:aos:agent:{role.lower()}.core.v1"
+        env["transport"]["vport"] = f"aos.vport.{role.lower()}.v1"
+        env["payload"] = {"inputs": inputs, "constraints": {}}
+        envelopes.append(env)
+    return envelopes
+
+
+def _capture_instances(runtime: Runtime) -> List[Tuple[str, Dict[str, Any]]]:
+    """Run the example envelopes and capture the validated request/response objects."""
+    captured: List[Tuple[str, Dict[str, Any]]] = []
+    original = sv.validate
+
+    def spy(instance: Dict[str, Any], schema_path: str) -> None:
+        original(instance, schema_path)
+        captured.append((schema_path, instance))
+
+    import aos_runtime.base_agent as base_agent_mod
+
+    base_agent_mod.validate = spy  # type: ignore[assignment]
+    try:
+        for env in _role_envelopes():
+            try:
+                runtime.run_envelope(env)
+            except sv.SchemaValidationError as e:
+                print(f"skipping {env['target']['role']}: {e}")
+    finally:
+        base_agent_mod.validate = original  # type: ignore[assignment]
+    return captured
+
+
+def _legacy(instance: Dict[str, Any], schema_path: str) -> None:
+    validator = sv.get_validator(schema_path)
+    errors = sorted(validator.iter_errors(instance), key=lambda e: list(e.path))
+    if errors:
+        raise sv.SchemaValidationError(str(errors[0]))
+
+
+def _time(fn: Callable[[], None], iterations: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - t0) / iterations * 1e6
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as logs_dir:
+        instances = _capture_instances(Runtime(logs_dir=logs_dir))
+
+    engines: List[Tuple[str, Callable[[Dict[str, Any], str], None]]] = [("legacy", _legacy), ("jsonschema", sv.validate)]
+    if sv.fastjsonschema is not None:
+        engines.append(("compiled", sv.validate))
+    else:
+        print("fastjsonschema not installed: skipping compiled engine")
+
+    print(f"{'schema':<48}" + "".join(f"{name:>14}" for name, _ in engines))
+    for schema_path, instance in instances:
+        row = f"{schema_path:<48}"
+        for name, fn in engines:
+            os.environ[sv.ENGINE_ENV] = sv.ENGINE_COMPILED if name == "compiled" else sv.ENGINE_JSONSCHEMA
+            fn(instance, schema_path)  # warm caches
+            row += f"{_time(lambda: fn(instance, schema_path), args.iterations):12.1f}us"
+        print(row)
+    os.environ.pop(sv.ENGINE_ENV, None)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
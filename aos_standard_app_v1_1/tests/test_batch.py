@@ -0,0 +1,102 @@
+import io
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from aos_runtime import cli
+from aos_runtime.batch import iter_batch_items, run_batch
+from aos_runtime.io_utils import read_json
+
+
+class TestBatchRunner(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.logs_dir = str(Path(self.tmp) / "run_logs")
+        self.foreman = read_json("examples/envelopes/foreman_task.json")
+        self.sorcerer = read_json("examples/envelopes/sorcerer_task.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_jsonl_stdin_with_bad_line_is_isolated(self):
+        stream = io.StringIO("\n".join([json.dumps(self.foreman), "not json", json.dumps({"envelope": self.sorcerer})]) + "\n")
+        results = list(run_batch(iter_batch_items(["-"], stdin=stream), logs_dir=self.logs_dir))
+        self.assertEqual([r["source"] for r in results], ["<stdin>:1", "<stdin>:2", "<stdin>:3"])
+        self.assertEqual([r["ok"] for r in results], [True, False, True])
+        self.assertEqual(results[2]["id"], "task_sorcerer_0001")
+
+    def test_pretty_printed_stdin_document(self):
+        stream = io.StringIO(json.dumps(self.foreman, indent=2))
+        results = list(run_batch(iter_batch_items(["-"], stdin=stream), logs_dir=self.logs_dir))
+        self.assertEqual(len(results), 1)
+        self.assertTrue(results[0]["ok"])
+
+    def test_directory_and_glob_inputs_are_sorted(self):
+        items = list(iter_batch_items(["examples/envelopes", "examples/envelopes/s*.json"]))
+        self.assertEqual(
+            [Path(i.source).name for i in items],
+            ["foreman_task.json", "sorcerer_task.json", "sorcerer_task.json"],
+        )
+
+    def test_process_pool_keeps_input_order(self):
+        envs = []
+        for n in range(12):
+            env = json.loads(json.dumps(self.foreman if n % 2 else self.sorcerer))
+            env["id"] = f"task_batch_{n:04d}"
+            envs.append(json.dumps(env))
+        stream = io.StringIO("\n".join(envs) + "\n")
+        results = list(run_batch(iter_batch_items(["-"], stdin=stream), logs_dir=self.logs_dir, workers=3))
+        self.assertEqual([r["id"] for r in results], [f"task_batch_{n:04d}" for n in range(12)])
+        self.assertTrue(all(r["ok"] for r in results))
+
+    def test_unreadable_jsonl_input_is_a_failure_record(self):
+        stream = Path(self.tmp) / "stream.jsonl"
+        stream.write_text(json.dumps(self.foreman) + "\n", encoding="utf-8")
+        out = Path(self.tmp) / "results.jsonl"
+        path_open = Path.open
+
+        def deny(path, *args, **kwargs):
+            if path == stream:
+                raise PermissionError(13, "Permission denied", str(path))
+            return path_open(path, *args, **kwargs)
+
+        with mock.patch.object(Path, "open", deny):
+            code = cli.main([str(stream), "examples/envelopes/sorcerer_task.json", "--logs-dir", self.logs_dir, "--output", str(out)])
+
+        results = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+        self.assertEqual(code, 1)
+        self.assertEqual([r["ok"] for r in results], [False, True])
+        self.assertEqual(results[0]["source"], str(stream))
+        self.assertEqual(results[0]["error"]["type"], "InputError")
+        self.assertIn("Permission denied", results[0]["error"]["message"])
+
+    def test_latin1_inputs_are_failure_records(self):
+        latin1 = Path(self.tmp) / "latin1.json"
+        latin1.write_bytes(json.dumps({"note": "caf\u00e9"}, ensure_ascii=False).encode("latin-1"))
+        stream = Path(self.tmp) / "mixed.jsonl"
+        stream.write_bytes(b"\n".join([
+            json.dumps(self.foreman).encode("utf-8"),
+            '{"note": "caf\u00e9"}'.encode("latin-1"),
+            json.dumps(self.sorcerer).encode("utf-8"),
+        ]) + b"\n")
+        out = Path(self.tmp) / "results.jsonl"
+
+        code = cli.main([str(latin1), str(stream), "--logs-dir", self.logs_dir, "--output", str(out)])
+
+        results = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+        self.assertEqual(code, 1)
+        self.assertEqual(
+            [r["source"] for r in results],
+            [str(latin1), f"{stream}:1", f"{stream}:2", f"{stream}:3"],
+        )
+        self.assertEqual([r["ok"] for r in results], [False, True, False, True])
+        for failed in (results[0], results[2]):
+            self.assertEqual(failed["error"]["type"], "InputError")
+            self.assertIn("invalid UTF-8", failed["error"]["message"])
+
+
+if __name__ == "__main__":
+    unittest.main()
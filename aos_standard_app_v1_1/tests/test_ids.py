@@ -0,0 +1,41 @@
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from aos_runtime.base_agent import AgentSchemas, BaseAgent
+from aos_runtime.ids import sha256_json
+
+
+class _EchoingImpl:
+    """Mutates a request subtree and returns it inside the response."""
+
+    role = "Echo"
+
+    def run(self, request):
+        materials = request["payload"]["materials"]
+        materials["seen"] = True
+        return {"status": "ok", "result": {"materials": materials}}
+
+
+class TestBaseAgentHashes(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        schema = Path(self.tmp) / "object.schema.json"
+        schema.write_text(json.dumps({"type": "object"}), encoding="utf-8")
+        self.agent = BaseAgent(_EchoingImpl(), AgentSchemas(str(schema), str(schema)))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_output_hash_sees_mutated_request_subtrees(self):
+        request = {"task_id": "t1", "payload": {"materials": {"k": "v"}}}
+        in_hash = sha256_json(request)
+        response, run_record = self.agent.handle(request)
+        self.assertEqual(run_record["input_sha256"], in_hash)
+        self.assertEqual(run_record["output_sha256"], sha256_json(response))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from aos_runtime.registry import RegistryIndex, find_vport, load_registry, vport_segments
+
+
+def _row(vport, role="Foreman", urn="urn:aos:agent:foreman.core.v1"):
+    return {
+        "vport": vport,
+        "role": role,
+        "agent_urn": urn,
+        "input_schema_path": "schemas/agents/foreman/input.v1.schema.json",
+        "output_schema_path": "schemas/agents/foreman/output.v1.schema.json",
+        "entrypoint": "agents.foreman.agent:build_runtime",
+    }
+
+
+class TestRegistryIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = Path(self.tmp) / "vports.registry.v1.jsonl"
+        self._write([
+            _row("vport://host/py/labelgen"),
+            _row("vport://host/py/thumbs", role="Sorcerer", urn="urn:aos:agent:sorcerer.core.v1"),
+            _row("vport://edge/bin/ffmpeg"),
+        ])
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _write(self, rows, mode="w"):
+        with self.path.open(mode, encoding="utf-8") as f:
+            for r in rows:
+                f.write(json.dumps(r) + "\n")
+        future = time.time() + 5 + len(self.path.read_bytes()) / 1e6
+        os.utime(self.path, (future, future))
+
+    def test_lookups_match_list_registry(self):
+        index = RegistryIndex(self.path)
+        self.assertEqual(list(index), load_registry(self.path))
+        self.assertEqual(find_vport(index, "vport://host/py/thumbs").role, "Sorcerer")
+        self.assertEqual([r.vport for r in index.for_role("Foreman")], ["vport://host/py/labelgen", "vport://edge/bin/ffmpeg"])
+        self.assertEqual(len(index.for_agent_urn("urn:aos:agent:sorcerer.core.v1")), 1)
+        self.assertEqual(len(index.with_prefix("vport://host")), 2)
+        self.assertEqual(len(index.with_prefix("vport://host/py/")), 2)
+        self.assertEqual(index.with_prefix("vport://host/bin"), [])
+        with self.assertRaises(KeyError):
+            index.get("vport://host/py/missing")
+
+    def test_records_are_compact(self):
+        first, second, _ = load_registry(self.path)
+        self.assertFalse(hasattr(first, "__dict__"))
+        self.assertIs(first.input_schema_path, second.input_schema_path)
+        self.assertIs(first.entrypoint, second.entrypoint)
+
+    def test_segments(self):
+        self.assertEqual(vport_segments("vport://host/py/labelgen"), ("vport://host", "py", "labelgen"))
+        self.assertEqual(vport_segments("aos.vport.foreman.v1"), ("aos.vport.foreman.v1",))
+
+    def test_append_parses_only_new_lines(self):
+        index = RegistryIndex(self.path)
+        self.assertFalse(index.refresh())
+        self._write([_row("vport://host/py/new")], mode="a")
+        self.assertTrue(index.refresh())
+        self.assertEqual((index.full_loads, index.incremental_loads), (1, 1))
+        self.assertEqual(index.get("vport://host/py/new").vport, "vport://host/py/new")
+        self.assertEqual(len(index.with_prefix("vport://host/py")), 3)
+
+    def test_partial_trailing_line_is_picked_up_later(self):
+        index = RegistryIndex(self.path)
+        line = json.dumps(_row("vport://host/py/late"))
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(line[:20])
+        os.utime(self.path, (time.time() + 20, time.time() + 20))
+        self.assertFalse(index.refresh())
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(line[20:] + "\n")
+        os.utime(self.path, (time.time() + 30, time.time() + 30))
+        self.assertTrue(index.refresh())
+        self.assertIn("vport://host/py/late", index.by_vport)
+        self.assertEqual(index.full_loads, 1)
+
+    def test_stalled_partial_line_is_reported_until_completed(self):
+        index = RegistryIndex(self.path)
+        line = json.dumps(_row("vport://host/py/stalled"))
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(line[:20])
+        os.utime(self.path, (time.time() + 20, time.time() + 20))
+        self.assertFalse(index.refresh())  # may still be being written
+        with self.assertRaises(json.JSONDecodeError):  # unchanged since: corrupt
+            index.refresh()
+        with self.assertRaises(json.JSONDecodeError):
+            load_registry(self.path)
+
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(line[20:] + "\n")
+        os.utime(self.path, (time.time() + 30, time.time() + 30))
+        self.assertTrue(index.refresh())
+        self.assertIn("vport://host/py/stalled", index.by_vport)
+        self.assertFalse(index.refresh())
+
+    def test_rewrite_triggers_full_reload(self):
+        index = RegistryIndex(self.path)
+        self._write([_row("vport://host/py/labelgen"), _row("vport://host/py/other-and-longer")])
+        self.assertTrue(index.refresh())
+        self.assertEqual(index.full_loads, 2)
+        self.assertNotIn("vport://edge/bin/ffmpeg", index.by_vport)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+
+from aos_runtime import role_requests
+from aos_runtime.io_utils import read_json
+from aos_runtime.runner import build_agent_request
+
+
+class TestRoleRequests(unittest.TestCase):
+    def test_foreman_mapping(self):
+        env = read_json("examples/envelopes/foreman_task.json")
+        req = build_agent_request(env)
+        inputs = env["payload"]["inputs"]
+        self.assertEqual(
+            req,
+            {
+                "task_id": "task_foreman_0001",
+                "objective": inputs["objective"],
+                "intent": "plan",
+                "constraints": env["payload"]["constraints"],
+                "inputs": inputs,
+                "context_snapshot": env,
+                "requested_outputs": inputs["requested_outputs"],
+                "routing_hints": {},
+                "trace": env["trace"],
+            },
+        )
+        # shared by reference, not copied
+        self.assertIs(req["context_snapshot"], env)
+        self.assertIs(req["inputs"], inputs)
+
+    def test_falsy_constraints_and_fresh_defaults(self):
+        env = read_json("examples/envelopes/foreman_task.json")
+        env["payload"]["constraints"] = {}
+        first = build_agent_request(env)
+        self.assertEqual(first["constraints"], {"deterministic": True})
+        first["constraints"]["max_steps"] = 1
+        first["routing_hints"]["x"] = 1
+        second = build_agent_request(env)
+        self.assertEqual(second["constraints"], {"deterministic": True})
+        self.assertEqual(second["routing_hints"], {})
+
+    def test_unknown_role(self):
+        env = read_json("examples/envelopes/foreman_task.json")
+        env["target"]["role"] = "Cartographer"
+        with self.assertRaises(ValueError):
+            build_agent_request(env)
+
+    def test_register_role_with_header_context(self):
+        role_requests.register_role(
+            "Cartographer",
+            {"task_id": "id", "region": ("inputs.region", "world"), "context_snapshot": "header", "trace": "trace"},
+        )
+        self.addCleanup(role_requests._builders.pop, "Cartographer")
+        env = read_json("examples/envelopes/foreman_task.json")
+        env["target"]["role"] = "Cartographer"
+        req = build_agent_request(env)
+        self.assertEqual(req["region"], "world")
+        self.assertEqual(sorted(req["context_snapshot"]), ["bundle_id", "project", "target", "trace", "transport"])
+        with self.assertRaises(ValueError):
+            role_requests.register_role("Cartographer", {"task_id": "id"})
+
+
+if __name__ == "__main__":
+    unittest.main()
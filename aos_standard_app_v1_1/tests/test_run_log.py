@@ -0,0 +1,62 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from aos_runtime.io_utils import read_json
+from aos_runtime.run_log import FORMAT_BINARY, FORMAT_DIR, FORMAT_JSONL, RunLogReader, open_run_log
+from aos_runtime.runtime import Runtime
+
+
+class TestRunLogSinks(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.envelopes = [
+            read_json("examples/envelopes/foreman_task.json"),
+            read_json("examples/envelopes/sorcerer_task.json"),
+        ]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _roundtrip(self, fmt, background, **kwargs):
+        logs_dir = str(Path(self.tmp) / f"{fmt}-{background}")
+        expected = {}
+        with Runtime(logs_dir=logs_dir, sink=open_run_log(logs_dir, fmt=fmt, background=background, **kwargs)) as rt:
+            for env in self.envelopes * 3:
+                response, record = rt.run_envelope(env)
+                expected[env["id"]] = (response, record)
+        reader = RunLogReader(logs_dir)
+        self.assertEqual(reader.ids(), sorted(expected))
+        for env_id, (response, record) in expected.items():
+            run = reader.get(env_id)
+            self.assertEqual(run["envelope"]["id"], env_id)
+            self.assertEqual(run["response"], response)
+            self.assertEqual(run["run_record"], record)
+        with self.assertRaises(KeyError):
+            reader.get("task_missing")
+        return logs_dir
+
+    def test_directory_layout(self):
+        logs_dir = self._roundtrip(FORMAT_DIR, background=False)
+        self.assertTrue((Path(logs_dir) / "task_foreman_0001" / "run_record.json").is_file())
+
+    def test_segmented_jsonl_rolls_segments(self):
+        logs_dir = self._roundtrip(FORMAT_JSONL, background=False, segment_max_bytes=1)
+        self.assertEqual(len(list((Path(logs_dir) / "segments").glob("runs-*.jsonl"))), 6)
+
+    def test_segmented_binary_background(self):
+        self._roundtrip(FORMAT_BINARY, background=True)
+
+    def test_background_flush_makes_runs_readable(self):
+        logs_dir = str(Path(self.tmp) / "live")
+        sink = open_run_log(logs_dir, fmt=FORMAT_JSONL, background=True)
+        rt = Runtime(logs_dir=logs_dir, sink=sink)
+        rt.run_envelope(self.envelopes[0])
+        rt.flush()
+        self.assertEqual(RunLogReader(logs_dir).get("task_foreman_0001")["envelope"]["id"], "task_foreman_0001")
+        rt.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
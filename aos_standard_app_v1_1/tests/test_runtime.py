@@ -0,0 +1,66 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from aos_runtime.io_utils import read_json
+from aos_runtime.runner import run_envelope
+from aos_runtime.runtime import Runtime
+
+
+class TestWarmRuntime(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.registry_path = str(Path(self.tmp) / "vports.registry.v1.jsonl")
+        shutil.copy("registry/vports.registry.v1.jsonl", self.registry_path)
+        self.logs_dir = str(Path(self.tmp) / "run_logs")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_matches_cold_runner(self):
+        env = read_json("examples/envelopes/foreman_task.json")
+        rt = Runtime(self.registry_path, self.logs_dir)
+        warm_resp, warm_rec = rt.run_envelope(env)
+        cold_resp, cold_rec = run_envelope(env, registry_path=self.registry_path, logs_dir=self.logs_dir)
+        self.assertEqual(warm_resp, cold_resp)
+        self.assertEqual(warm_rec["input_sha256"], cold_rec["input_sha256"])
+        self.assertEqual(warm_rec["output_sha256"], cold_rec["output_sha256"])
+
+    def test_registry_and_agents_are_reused(self):
+        rt = Runtime(self.registry_path, self.logs_dir)
+        for path in ("examples/envelopes/foreman_task.json", "examples/envelopes/sorcerer_task.json") * 3:
+            rt.run_envelope(read_json(path))
+        self.assertEqual(rt.registry_loads, 1)
+        self.assertEqual(rt.agent_builds, 2)
+
+    def test_touch_without_change_does_not_reload(self):
+        rt = Runtime(self.registry_path, self.logs_dir)
+        rt.run_envelope(read_json("examples/envelopes/foreman_task.json"))
+        future = time.time() + 5
+        os.utime(self.registry_path, (future, future))
+        rt.run_envelope(read_json("examples/envelopes/foreman_task.json"))
+        self.assertEqual(rt.registry_loads, 1)
+        self.assertEqual(rt.agent_builds, 1)
+
+    def test_changed_registry_rebuilds_only_changed_vports(self):
+        rt = Runtime(self.registry_path, self.logs_dir)
+        rt.run_envelope(read_json("examples/envelopes/foreman_task.json"))
+        rt.run_envelope(read_json("examples/envelopes/sorcerer_task.json"))
+
+        text = Path(self.registry_path).read_text(encoding="utf-8")
+        text = text.replace("urn:aos:agent:sorcerer.core.v1", "urn:aos:agent:sorcerer.core.v1b")
+        Path(self.registry_path).write_text(text, encoding="utf-8")
+        future = time.time() + 5
+        os.utime(self.registry_path, (future, future))
+
+        rt.run_envelope(read_json("examples/envelopes/foreman_task.json"))
+        rt.run_envelope(read_json("examples/envelopes/sorcerer_task.json"))
+        self.assertEqual(rt.registry_loads, 2)
+        self.assertEqual(rt.agent_builds, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import os
+import unittest
+from unittest import mock
+
+from aos_runtime import schema_validation as sv
+from aos_runtime.schema_validation import SchemaValidationError, canonical_schema_key, validate
+
+SCHEMA = "schemas/agents/sorcerer/input.v1.schema.json"
+
+
+def _request():
+    return {
+        "task_id": "t1",
+        "objective": "Draft a README",
+        "materials": {},
+        "intent": "draft",
+        "context_snapshot": {},
+        "style_profile": {},
+        "constraints": {},
+        "trace": {},
+    }
+
+
+class TestSchemaValidation(unittest.TestCase):
+    def test_equivalent_paths_share_one_validator(self):
+        self.assertEqual(canonical_schema_key("./" + SCHEMA), canonical_schema_key(SCHEMA))
+        self.assertEqual(canonical_schema_key(SCHEMA), canonical_schema_key(os.path.abspath(SCHEMA)))
+        self.assertIs(sv.get_validator("./" + SCHEMA), sv.get_validator(SCHEMA))
+
+    def test_valid_instance_does_not_build_error_report(self):
+        with mock.patch.object(sv, "_error_report", side_effect=AssertionError("slow path taken")):
+            validate(_request(), SCHEMA)
+
+    def test_invalid_instance_report_is_engine_independent(self):
+        bad = _request()
+        del bad["objective"]
+        bad["materials"] = "not-an-object"
+
+        messages = []
+        for engine in (sv.ENGINE_JSONSCHEMA, sv.ENGINE_COMPILED):
+            with mock.patch.dict(os.environ, {sv.ENGINE_ENV: engine}):
+                with self.assertRaises(SchemaValidationError) as ctx:
+                    validate(bad, SCHEMA)
+                messages.append(str(ctx.exception))
+        self.assertEqual(messages[0], messages[1])
+        self.assertIn("objective", messages[0])
+
+    @unittest.skipIf(sv.fastjsonschema is None, "fastjsonschema not installed")
+    def test_compiled_engine_does_not_mutate_instance(self):
+        req = _request()
+        before = dict(req)
+        with mock.patch.dict(os.environ, {sv.ENGINE_ENV: sv.ENGINE_COMPILED}):
+            validate(req, SCHEMA)
+        self.assertEqual(req, before)
+
+
+if __name__ == "__main__":
+    unittest.main()
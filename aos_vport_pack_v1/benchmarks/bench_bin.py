@@ -0,0 +1,88 @@
+"""
+Per-call latency of bin vPorts: a process per call vs a persistent worker pool.
+
+Both variants run the same Python echo handler:
+  spawn    bin_mode "spawn", payload via {payload_json} in argv (the old path)
+  worker   bin_mode "worker", payload over stdin to a pre-spawned pool (vport_bin_pool)
+
+Run from aos_vport_pack_v1/:
+  python benchmarks/bench_bin.py --iterations 200
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List
+
+PACK_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PACK_ROOT))
+
+from vport_router import VPortRouter  # noqa: E402
+
+HANDLER = """
+import json, sys
+sys.path.insert(0, {pack!r})
+
+def handle(payload):
+    return {{"echo": payload}}
+
+if len(sys.argv) > 1:
+    print(json.dumps(handle(json.loads(sys.argv[1]))))
+else:
+    from vport_bin_pool import serve_worker
+    serve_worker(handle)
+"""
+
+
+def _measure(fn: Callable[[], object], iterations: int) -> List[float]:
+    samples: List[float] = []
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1e6)
+    return samples
+
+
+def _report(label: str, samples: List[float]) -> None:
+    samples = sorted(samples)
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    print(f"  {label:<8} median {statistics.median(samples):10.1f} us   p99 {p99:10.1f} us")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--iterations", type=int, default=200)
+    ap.add_argument("--pool-size", type=int, default=2)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        script = Path(tmp) / "echo_handler.py"
+        script.write_text(HANDLER.format(pack=str(PACK_ROOT)))
+        registry = Path(tmp) / "vports.registry.v1.jsonl"
+        entries = [
+            {"vport": "vport://bench/bin/spawn", "call_type": "bin",
+             "target": {"bin_command": sys.executable, "bin_args_template": [str(script), "{payload_json}"]}},
+            {"vport": "vport://bench/bin/worker", "call_type": "bin",
+             "target": {"bin_command": sys.executable, "bin_args_template": [str(script)],
+                        "bin_mode": "worker", "bin_pool_size": args.pool_size}},
+        ]
+        registry.write_text("".join(json.dumps(e) + "\n" for e in entries))
+        payload = {"label": "bench", "items": list(range(16))}
+        print(f"{args.iterations} calls per mode")
+
+        with VPortRouter(registry_path=registry) as router:
+            for mode in ("spawn", "worker"):
+                envelope = {"vport": f"vport://bench/bin/{mode}", "payload": payload}
+                result = router.call_vport(envelope)  # starts the pool in worker mode
+                assert result["status"] == "success", result
+                _report(mode, _measure(lambda: router.call_vport(envelope), args.iterations))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
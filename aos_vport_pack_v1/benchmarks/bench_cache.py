@@ -0,0 +1,115 @@
+"""
+Result cache for cacheable vPorts: cost of a miss vs memory and disk hits, and single-flight.
+
+A python handler that sleeps --work-ms stands in for a pure vPort (label
+generation, thumbnails). Compared:
+  uncached   cacheable: false, every call runs the handler
+  memory     cacheable: true, repeat payload served from the memory LRU
+  disk       a fresh router on the same cache_dir (memory tier cold)
+  coalesced  --concurrency identical calls via call_many; handler runs counted
+
+Run from aos_vport_pack_v1/:
+  python benchmarks/bench_cache.py --iterations 500
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from vport_router import VPortRouter  # noqa: E402
+
+HANDLER = """
+import time
+
+CALLS = 0
+
+
+def run(payload):
+    global CALLS
+    CALLS += 1
+    time.sleep(payload["work_ms"] / 1000.0)
+    return {"label": payload["text"].upper(), "lines": [payload["text"]] * 8}
+"""
+
+
+def _measure(fn: Callable[[], object], iterations: int) -> List[float]:
+    samples: List[float] = []
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1e6)
+    return samples
+
+
+def _report(label: str, samples: List[float]) -> None:
+    samples = sorted(samples)
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    print(f"  {label:<10} median {statistics.median(samples):9.1f} us   p99 {p99:9.1f} us")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--iterations", type=int, default=500)
+    ap.add_argument("--uncached-iterations", type=int, default=50)
+    ap.add_argument("--work-ms", type=float, default=5.0)
+    ap.add_argument("--concurrency", type=int, default=100)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        Path(tmp, "bench_cache_handler.py").write_text(HANDLER)
+        sys.path.insert(0, tmp)
+        import bench_cache_handler
+
+        target = {"python_module": "bench_cache_handler", "python_handler": "run"}
+        registry = Path(tmp) / "vports.registry.v1.jsonl"
+        registry.write_text("\n".join([
+            json.dumps({"vport": "vport://bench/py/plain", "call_type": "python", "target": target}),
+            json.dumps({"vport": "vport://bench/py/cached", "call_type": "python", "target": target,
+                        "cacheable": True, "cache_ttl_s": 3600}),
+        ]) + "\n")
+        cache_dir = Path(tmp) / "cache"
+        payload = {"text": "bench", "work_ms": args.work_ms}
+        plain = {"vport": "vport://bench/py/plain", "payload": payload}
+        cached = {"vport": "vport://bench/py/cached", "payload": payload}
+        print(f"handler work {args.work_ms} ms per call")
+
+        with VPortRouter(registry_path=registry, cache_dir=cache_dir) as router:
+            _report("uncached", _measure(lambda: router.call_vport(plain), args.uncached_iterations))
+            router.call_vport(cached)
+            _report("memory", _measure(lambda: router.call_vport(cached), args.iterations))
+
+        # A router per call keeps the memory tier cold, so every lookup reads the file.
+        with VPortRouter(registry_path=registry, cache_dir=cache_dir) as router:
+            def disk_hit() -> None:
+                router.cache.clear()
+                router.call_vport(cached)
+
+            _report("disk", _measure(disk_hit, args.iterations))
+
+        with VPortRouter(registry_path=registry) as router:
+            fresh = {"vport": "vport://bench/py/cached", "payload": {**payload, "text": "fresh"}}
+            before = bench_cache_handler.CALLS
+
+            async def run_many() -> float:
+                t0 = time.perf_counter()
+                async for _, result in router.call_many([fresh] * args.concurrency, concurrency=args.concurrency):
+                    assert result["status"] == "success", result
+                return time.perf_counter() - t0
+
+            elapsed = asyncio.run(run_many())
+            print(f"  coalesced  {args.concurrency} identical concurrent calls in {elapsed * 1000:.1f} ms, "
+                  f"handler ran {bench_cache_handler.CALLS - before} time(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
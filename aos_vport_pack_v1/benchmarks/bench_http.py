@@ -0,0 +1,128 @@
+"""
+Per-call latency of http vPorts: one-shot requests vs the pooled transport.
+
+A local HTTP/1.1 keep-alive stub echoes the JSON body. Compared:
+  one-shot   requests.request per call (new connection every time; the old router path)
+  pooled     HttpTransport (shared Session, per-host keep-alive pool)
+  router     VPortRouter.call_vport over the pooled transport (adds envelope validation)
+  async      AsyncHttpTransport (httpx), --concurrency calls in flight
+
+Run from aos_vport_pack_v1/:
+  python benchmarks/bench_http.py --iterations 500
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, List
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from vport_http import AsyncHttpTransport, HttpTransport, httpx  # noqa: E402
+from vport_router import VPortRouter  # noqa: E402
+
+
+class _EchoHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without TCP_NODELAY a
+    # kept-alive connection stalls on delayed ACKs (~40 ms per call).
+    disable_nagle_algorithm = True
+
+    def do_POST(self) -> None:  # noqa: N802 - http.server naming
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        reply = json.dumps({"echo": json.loads(body or b"{}")}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(reply)))
+        self.end_headers()
+        self.wfile.write(reply)
+
+    def log_message(self, *args: object) -> None:
+        pass
+
+
+def _measure(fn: Callable[[], object], iterations: int) -> List[float]:
+    samples: List[float] = []
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1e6)
+    return samples
+
+
+def _report(label: str, samples: List[float]) -> None:
+    samples = sorted(samples)
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    print(f"  {label:<10} median {statistics.median(samples):9.1f} us   p99 {p99:9.1f} us")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--iterations", type=int, default=500)
+    ap.add_argument("--concurrency", type=int, default=8)
+    args = ap.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _EchoHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/echo"
+    target = {"http_method": "POST", "http_url_template": url}
+    payload = {"label": "bench", "items": list(range(16))}
+    body = json.dumps(payload)
+    print(f"{args.iterations} calls to {url}")
+
+    try:
+        _report("one-shot", _measure(
+            lambda: requests.request("POST", url, data=body, headers={"Content-Type": "application/json"}, timeout=5).json(),
+            args.iterations,
+        ))
+
+        transport = HttpTransport()
+        _report("pooled", _measure(lambda: transport.request(target, payload, 5000), args.iterations))
+        transport.close()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            registry = Path(tmp) / "vports.registry.v1.jsonl"
+            registry.write_text(json.dumps({"vport": "vport://bench/http/echo", "call_type": "http", "target": target}) + "\n")
+            with VPortRouter(registry_path=registry) as router:
+                envelope = {"vport": "vport://bench/http/echo", "payload": payload}
+                _report("router", _measure(lambda: router.call_vport(envelope), args.iterations))
+
+        if httpx is None:
+            print("  async      skipped (httpx not installed)")
+            return 0
+
+        async def run_async() -> float:
+            client = AsyncHttpTransport()
+            limit = asyncio.Semaphore(args.concurrency)
+
+            async def one() -> None:
+                async with limit:
+                    await client.request(target, payload, 5000)
+
+            await one()  # connect outside the timed section
+            t0 = time.perf_counter()
+            await asyncio.gather(*(one() for _ in range(args.iterations)))
+            elapsed = time.perf_counter() - t0
+            await client.aclose()
+            return elapsed
+
+        elapsed = asyncio.run(run_async())
+        print(f"  async      {elapsed / args.iterations * 1e6:9.1f} us/call amortised at concurrency {args.concurrency}")
+    finally:
+        server.shutdown()
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
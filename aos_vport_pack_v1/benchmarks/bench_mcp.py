@@ -0,0 +1,103 @@
+"""
+Per-call latency and concurrent throughput of mcp vPorts against the local stub server.
+
+Compared:
+  cold       new stdio session per call (spawn + initialize + tools/call)
+  pooled     McpSessionPool.call_tool on a persistent session
+  router     VPortRouter.call_vport over the pooled session (adds envelope validation)
+  many       VPortRouter.call_many, --concurrency `sleep` calls multiplexed per session
+
+Run from aos_vport_pack_v1/:
+  python benchmarks/bench_mcp.py --iterations 500
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from vport_mcp import McpSession, McpSessionPool  # noqa: E402
+from vport_router import VPortRouter  # noqa: E402
+
+STUB = Path(__file__).resolve().parents[1] / "stubs" / "mcp_stub_server.py"
+
+
+def _measure(fn: Callable[[], object], iterations: int) -> List[float]:
+    samples: List[float] = []
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1e6)
+    return samples
+
+
+def _report(label: str, samples: List[float]) -> None:
+    samples = sorted(samples)
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    print(f"  {label:<10} median {statistics.median(samples):9.1f} us   p99 {p99:9.1f} us")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--iterations", type=int, default=500)
+    ap.add_argument("--cold-iterations", type=int, default=20)
+    ap.add_argument("--concurrency", type=int, default=64)
+    ap.add_argument("--sessions", type=int, default=1)
+    ap.add_argument("--sleep-ms", type=float, default=20.0)
+    args = ap.parse_args()
+
+    server = {"command": [sys.executable, str(STUB)], "sessions": args.sessions}
+    payload = {"label": "bench", "items": list(range(16))}
+    print(f"stub server: {STUB.name}, {args.sessions} session(s)")
+
+    def cold() -> None:
+        session = McpSession("stub", server)
+        session.call_tool("echo", payload, 5.0)
+        session.close()
+
+    _report("cold", _measure(cold, args.cold_iterations))
+
+    pool = McpSessionPool("stub", server)
+    pool.call_tool("echo", payload, 5.0)  # connect outside the timed section
+    _report("pooled", _measure(lambda: pool.call_tool("echo", payload, 5.0), args.iterations))
+    pool.close()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        servers = Path(tmp) / "mcp.servers.v1.json"
+        servers.write_text(json.dumps({"servers": {"stub": server}}))
+        registry = Path(tmp) / "vports.registry.v1.jsonl"
+        registry.write_text("\n".join(
+            json.dumps({"vport": f"vport://bench/mcp/{tool}", "call_type": "mcp",
+                        "target": {"mcp_server_id": "stub", "mcp_tool_name": tool}})
+            for tool in ("echo", "sleep")
+        ) + "\n")
+        with VPortRouter(registry_path=registry, mcp_servers_path=servers) as router:
+            envelope = {"vport": "vport://bench/mcp/echo", "payload": payload}
+            router.call_vport(envelope)
+            _report("router", _measure(lambda: router.call_vport(envelope), args.iterations))
+
+            sleep = {"vport": "vport://bench/mcp/sleep", "payload": {"seconds": args.sleep_ms / 1000.0}}
+
+            async def run_many() -> float:
+                t0 = time.perf_counter()
+                async for _, result in router.call_many([sleep] * args.iterations, concurrency=args.concurrency):
+                    assert result["status"] == "success", result
+                return time.perf_counter() - t0
+
+            elapsed = asyncio.run(run_many())
+            serial = args.iterations * args.sleep_ms / 1000.0
+            print(f"  many       {args.iterations} x {args.sleep_ms:.0f} ms calls in {elapsed:.2f} s "
+                  f"at concurrency {args.concurrency} (serial: {serial:.1f} s)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,86 @@
+"""
+Validation overhead per VPortRouter.call_vport for each validation mode.
+
+A python vPort with a trivial inline handler is called repeatedly, so the
+figures are almost entirely envelope handling and validation:
+  handler only          the handler called directly (floor)
+  strict / jsonschema   full call + result validation with jsonschema (previous behaviour)
+  strict / compiled     full validation with fastjsonschema-compiled checks (if installed)
+  sampled / 1 in N      full call validation on one call in --sample-rate
+  trusted               structural checks only
+
+Run from aos_vport_pack_v1/:
+  python benchmarks/bench_validation.py --iterations 20000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+PACK_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PACK_ROOT))
+
+import vport_router  # noqa: E402
+from vport_router import VPortRouter  # noqa: E402
+
+
+def echo(payload: Dict[str, Any]) -> Dict[str, Any]:
+    return {"echo": payload}
+
+
+def _per_call_us(fn: Callable[[], object], iterations: int) -> float:
+    fn()
+    t0 = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - t0) / iterations * 1e6
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--iterations", type=int, default=20_000)
+    ap.add_argument("--sample-rate", type=int, default=100)
+    args = ap.parse_args()
+
+    sys.modules.setdefault("bench_validation", sys.modules[__name__])
+    envelope = {
+        "request_id": "bench-1",
+        "vport": "vport://bench/py/echo",
+        "payload": {"label": "bench", "items": list(range(16))},
+        "options": {"timeout_ms": 1000},
+    }
+    variants = [
+        ("strict / jsonschema", dict(validation="strict", compile_schemas=False)),
+        ("strict / compiled", dict(validation="strict", compile_schemas=True)),
+        (f"sampled / 1 in {args.sample_rate}", dict(validation="sampled", validation_sample_rate=args.sample_rate)),
+        ("trusted", dict(validation="trusted")),
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        registry = Path(tmp) / "vports.registry.v1.jsonl"
+        registry.write_text(json.dumps({
+            "vport": "vport://bench/py/echo",
+            "call_type": "python",
+            "target": {"python_module": "bench_validation", "python_handler": "echo"},
+        }) + "\n")
+
+        print(f"{args.iterations} calls per variant")
+        floor = _per_call_us(lambda: echo(envelope["payload"]), args.iterations)
+        print(f"  {'handler only':<22} {floor:8.2f} us/call")
+        for label, kwargs in variants:
+            if label == "strict / compiled" and vport_router.fastjsonschema is None:
+                print(f"  {label:<22} skipped (fastjsonschema not installed)")
+                continue
+            with VPortRouter(registry_path=registry, **kwargs) as router:
+                us = _per_call_us(lambda: router.call_vport(envelope), args.iterations)
+            print(f"  {label:<22} {us:8.2f} us/call")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,129 @@
+"""
+Minimal MCP server for tests and benchmarks of the mcp call_type.
+
+Speaks newline-delimited JSON-RPC 2.0 on stdin/stdout (default) or, with
+`--tcp HOST:PORT`, on every accepted TCP connection. Each tools/call runs on
+its own thread, so replies can come back out of order.
+
+Tools:
+  echo   {"...": ...}          -> structuredContent {"echo": arguments}
+  sleep  {"seconds": 0.1}      -> structuredContent {"slept": seconds}
+  fail   {"message": "..."}    -> isError result
+  text   {"text": "..."}       -> text content only
+  crash  {}                    -> the server process exits without replying
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from typing import Any, BinaryIO, Callable, Dict, Optional
+
+PROTOCOL_VERSION = "2025-06-18"
+
+TOOLS = [
+    {"name": "echo", "description": "Return the arguments.", "inputSchema": {"type": "object"}},
+    {"name": "sleep", "description": "Sleep, then return.", "inputSchema": {"type": "object"}},
+    {"name": "fail", "description": "Return an error result.", "inputSchema": {"type": "object"}},
+    {"name": "text", "description": "Return text content.", "inputSchema": {"type": "object"}},
+    {"name": "crash", "description": "Exit the server.", "inputSchema": {"type": "object"}},
+]
+
+
+def _call_tool(name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+    if name == "echo":
+        return {"content": [{"type": "text", "text": json.dumps(arguments)}], "structuredContent": {"echo": arguments}}
+    if name == "sleep":
+        seconds = float(arguments.get("seconds", 0.1))
+        time.sleep(seconds)
+        return {"content": [], "structuredContent": {"slept": seconds}}
+    if name == "fail":
+        return {"content": [{"type": "text", "text": arguments.get("message", "failed")}], "isError": True}
+    if name == "text":
+        return {"content": [{"type": "text", "text": arguments.get("text", "")}]}
+    if name == "crash":
+        os._exit(3)
+    raise KeyError(name)
+
+
+def serve(reader: BinaryIO, send: Callable[[Dict[str, Any]], None]) -> None:
+    """Answer requests from `reader` until EOF."""
+    for line in reader:
+        if not line.strip():
+            continue
+        message = json.loads(line)
+        method: Optional[str] = message.get("method")
+        if "id" not in message or method is None:
+            continue  # notifications (initialized, cancelled) and stray replies
+        request_id = message["id"]
+        params = message.get("params") or {}
+        if method == "initialize":
+            send({"jsonrpc": "2.0", "id": request_id, "result": {
+                "protocolVersion": PROTOCOL_VERSION,
+                "capabilities": {"tools": {}},
+                "serverInfo": {"name": "mcp-stub", "version": "1"},
+            }})
+        elif method == "ping":
+            send({"jsonrpc": "2.0", "id": request_id, "result": {}})
+        elif method == "tools/list":
+            send({"jsonrpc": "2.0", "id": request_id, "result": {"tools": TOOLS}})
+        elif method == "tools/call":
+            def run(request_id: Any = request_id, params: Dict[str, Any] = params) -> None:
+                try:
+                    result = _call_tool(params.get("name", ""), params.get("arguments") or {})
+                except KeyError:
+                    send({"jsonrpc": "2.0", "id": request_id,
+                          "error": {"code": -32602, "message": f"Unknown tool: {params.get('name')}"}})
+                    return
+                send({"jsonrpc": "2.0", "id": request_id, "result": result})
+
+            threading.Thread(target=run, daemon=True).start()
+        else:
+            send({"jsonrpc": "2.0", "id": request_id,
+                  "error": {"code": -32601, "message": f"Method not found: {method}"}})
+
+
+def _sender(stream: BinaryIO) -> Callable[[Dict[str, Any]], None]:
+    lock = threading.Lock()
+
+    def send(message: Dict[str, Any]) -> None:
+        data = (json.dumps(message) + "\n").encode("utf-8")
+        with lock:
+            try:
+                stream.write(data)
+                stream.flush()
+            except (OSError, ValueError):
+                pass  # client went away
+
+    return send
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--tcp", help="listen on HOST:PORT instead of stdio (port 0 picks one and prints it)")
+    args = ap.parse_args()
+
+    if not args.tcp:
+        serve(sys.stdin.buffer, _sender(sys.stdout.buffer))
+        return 0
+
+    host, _, port = args.tcp.rpartition(":")
+    server = socket.create_server((host or "127.0.0.1", int(port)))
+    print(f"tcp://{host or '127.0.0.1'}:{server.getsockname()[1]}", flush=True)
+    while True:
+        conn, _ = server.accept()
+        conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        def handle(conn: socket.socket = conn) -> None:
+            with conn:
+                serve(conn.makefile("rb"), _sender(conn.makefile("wb")))
+
+        threading.Thread(target=handle, daemon=True).start()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,38 @@
+import unittest
+
+from vport_bin_pool import BinWorkerError, BinWorkerPool
+from vport_python import worker_command, worker_env
+
+
+class TestBinWorkerPool(unittest.TestCase):
+    def setUp(self):
+        self.pool = BinWorkerPool(worker_command("vport_test_handlers", "echo"), size=1, env=worker_env())
+
+    def tearDown(self):
+        self.pool.close()
+
+    def test_call_round_trip(self):
+        self.assertEqual(self.pool.call({"a": 1}, 5000)["echo"], {"a": 1})
+
+    def test_unserialisable_payload_keeps_worker(self):
+        with self.assertRaises(BinWorkerError):
+            self.pool.call({"blob": b"\x00"}, 500)
+        self.assertEqual(self.pool.stats()["idle"], 1)
+        self.assertEqual(self.pool.call({"a": 2}, 500)["echo"], {"a": 2})
+        self.assertEqual(self.pool.stats()["replaced"], 0)
+
+    def test_handler_error_keeps_worker(self):
+        with self.assertRaises(BinWorkerError):
+            self.pool.call({"fail": "boom"}, 5000)
+        self.assertEqual(self.pool.call({"a": 3}, 5000)["echo"], {"a": 3})
+        self.assertEqual(self.pool.stats()["spawned"], 1)
+
+    def test_timeout_replaces_worker(self):
+        with self.assertRaises(BinWorkerError):
+            self.pool.call({"sleep": 5}, 200)
+        self.assertEqual(self.pool.call({"a": 4}, 5000)["echo"], {"a": 4})
+        self.assertEqual(self.pool.stats()["replaced"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,208 @@
+import asyncio
+import json
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+import vport_test_handlers
+from vport_cache import ResultCache, cache_key
+from vport_router import VPortRouter
+
+ECHO = {"python_module": "vport_test_handlers", "python_handler": "echo"}
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_key_is_canonical(self):
+        key = cache_key("vport://x/py/a", ECHO, {"b": 1, "a": [1, 2]})
+        self.assertEqual(key, cache_key("vport://x/py/a", dict(reversed(ECHO.items())), {"a": [1, 2], "b": 1}))
+        self.assertNotEqual(key, cache_key("vport://x/py/a", {**ECHO, "python_handler": "other"}, {"b": 1, "a": [1, 2]}))
+        with self.assertRaises(TypeError):
+            cache_key("vport://x/py/a", ECHO, {"blob": b"x"})
+
+    def test_memory_hit_returns_copies(self):
+        cache = ResultCache()
+        cache.put("k", {"a": [1]}, 60)
+        cache.get("k")["a"].append(2)
+        self.assertEqual(cache.get("k"), {"a": [1]})
+        self.assertIsNone(cache.get("other"))
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+
+    def test_memory_ttl_expiry(self):
+        cache = ResultCache()
+        cache.put("k", {"a": 1}, 0.05)
+        self.assertEqual(cache.get("k"), {"a": 1})
+        time.sleep(0.08)
+        self.assertIsNone(cache.get("k"))
+        self.assertEqual(cache.stats()["expirations"], 1)
+        self.assertEqual(cache.stats()["size"], 0)
+
+    def test_disk_tier_and_expiry(self):
+        ResultCache(directory=self.tmp).put("k1", {"a": 1}, 60)
+        ResultCache(directory=self.tmp).put("k2", {"b": 2}, 0.05)
+
+        cache = ResultCache(directory=self.tmp)
+        self.assertEqual(cache.get("k1"), {"a": 1})
+        self.assertEqual(cache.get("k1"), {"a": 1})
+        self.assertEqual(cache.disk_hits, 1)  # the second lookup is served from memory
+
+        time.sleep(0.08)
+        self.assertIsNone(cache.get("k2"))
+        self.assertEqual(cache.expirations, 1)
+        self.assertEqual(list(self.tmp.rglob("k2.json")), [])  # expired files are removed
+        self.assertEqual(list(self.tmp.rglob("*.tmp")), [])
+
+    def test_disk_write_failure_is_counted_not_raised(self):
+        blocker = self.tmp / "not-a-directory"
+        blocker.write_text("", encoding="utf-8")
+        cache = ResultCache(directory=blocker)
+        self.assertFalse(cache.put("k", {"a": 1}, 60))
+        self.assertEqual(cache.stats()["write_errors"], 1)
+        self.assertEqual(cache.get("k"), {"a": 1})  # the memory tier still has it
+
+    def test_memory_bound_and_unserialisable_outputs(self):
+        cache = ResultCache(max_bytes=200)
+        for i in range(10):
+            cache.put(f"k{i}", {"v": "x" * 40}, 60)
+        self.assertLessEqual(cache.stats()["bytes"], 200)
+        self.assertGreater(cache.evictions, 0)
+        self.assertFalse(cache.put("bad", {"blob": b"x"}, 60))
+        self.assertIsNone(cache.get("bad"))
+
+
+class TestRouterCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.registry = Path(self.tmp) / "vports.registry.v1.jsonl"
+        self.registry.write_text("\n".join(json.dumps(row) for row in [
+            {"vport": "vport://test/py/cached", "call_type": "python", "target": ECHO,
+             "cacheable": True, "cache_ttl_s": 60},
+            {"vport": "vport://test/py/short", "call_type": "python", "target": ECHO,
+             "cacheable": True, "cache_ttl_s": 0.1},
+            {"vport": "vport://test/py/plain", "call_type": "python", "target": ECHO},
+        ]) + "\n")
+        self.cache_dir = Path(self.tmp) / "cache"
+        self.router = VPortRouter(registry_path=self.registry, cache_dir=self.cache_dir, max_threads=16)
+        vport_test_handlers.CALLS.clear()
+
+    def tearDown(self):
+        self.router.close()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _call(self, vport, payload, timeout_ms=None):
+        envelope = {"vport": vport, "payload": payload}
+        if timeout_ms is not None:
+            envelope["options"] = {"timeout_ms": timeout_ms}
+        return self.router.call_vport(envelope)
+
+    def test_miss_then_hit(self):
+        first = self._call("vport://test/py/cached", {"x": 1})
+        second = self._call("vport://test/py/cached", {"x": 1})
+        self.assertEqual((first["meta"]["cache"], second["meta"]["cache"]), ("miss", "hit"))
+        self.assertEqual(first["output"], second["output"])
+        self.assertEqual(len(vport_test_handlers.CALLS), 1)
+        self.assertEqual(self._call("vport://test/py/cached", {"x": 2})["meta"]["cache"], "miss")
+        self.assertNotIn("cache", self._call("vport://test/py/plain", {"x": 1})["meta"])
+
+    def test_ttl_expiry_across_routers(self):
+        self._call("vport://test/py/short", {"x": 1})
+        with VPortRouter(registry_path=self.registry, cache_dir=self.cache_dir) as other:
+            envelope = {"vport": "vport://test/py/short", "payload": {"x": 1}}
+            self.assertEqual(other.call_vport(envelope)["meta"]["cache"], "hit")
+            self.assertEqual(other.cache.disk_hits, 1)
+            time.sleep(0.15)
+            self.assertEqual(other.call_vport(envelope)["meta"]["cache"], "miss")
+        self.assertEqual(len(vport_test_handlers.CALLS), 2)
+
+    def test_errors_are_not_cached(self):
+        for _ in range(2):
+            result = self._call("vport://test/py/cached", {"fail": "boom"})
+            self.assertEqual(result["status"], "error")
+        self.assertEqual(len(vport_test_handlers.CALLS), 2)
+        self.assertEqual(self.router.cache.stats()["size"], 0)
+        self.assertEqual(list(self.cache_dir.rglob("*.json")), [])
+
+    def test_unwritable_cache_dir_does_not_fail_calls(self):
+        self.router.close()
+        blocker = Path(self.tmp) / "blocked"
+        blocker.write_text("", encoding="utf-8")
+        self.router = VPortRouter(registry_path=self.registry, cache_dir=blocker, max_threads=16)
+        statuses = []
+
+        def call():
+            result = self._call("vport://test/py/cached", {"x": 7, "sleep": 0.2})
+            statuses.append((result["status"], result["meta"]["cache"]))
+
+        threads = [threading.Thread(target=call) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sorted(statuses), [("success", "coalesced")] * 2 + [("success", "miss")])
+        self.assertEqual(self.router.cache.stats()["write_errors"], 1)
+        self.assertEqual(self._call("vport://test/py/cached", {"x": 7, "sleep": 0.2})["meta"]["cache"], "hit")
+
+    def test_concurrent_identical_calls_are_coalesced(self):
+        statuses = []
+
+        def call():
+            statuses.append(self._call("vport://test/py/cached", {"x": 3, "sleep": 0.2})["meta"]["cache"])
+
+        threads = [threading.Thread(target=call) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sorted(statuses), ["coalesced"] * 7 + ["miss"])
+        self.assertEqual(len(vport_test_handlers.CALLS), 1)
+
+    def test_async_and_sync_callers_share_a_flight(self):
+        envelope = {"vport": "vport://test/py/cached", "payload": {"x": 4, "sleep": 0.2}}
+
+        async def run():
+            leader = asyncio.ensure_future(self.router.call_vport_async(envelope))
+            await asyncio.sleep(0.05)
+            sync = asyncio.get_running_loop().run_in_executor(None, self.router.call_vport, envelope)
+            followers = [self.router.call_vport_async(envelope) for _ in range(3)]
+            return await asyncio.gather(leader, sync, *followers)
+
+        results = asyncio.run(run())
+        self.assertEqual([r["meta"]["cache"] for r in results], ["miss"] + ["coalesced"] * 4)
+        self.assertEqual(len(vport_test_handlers.CALLS), 1)
+
+    def test_follower_times_out_on_its_own_budget(self):
+        leader = threading.Thread(target=self._call, args=("vport://test/py/cached", {"x": 5, "sleep": 0.5}))
+        leader.start()
+        time.sleep(0.05)
+        started = time.monotonic()
+        follower = self._call("vport://test/py/cached", {"x": 5, "sleep": 0.5}, timeout_ms=100)
+        self.assertLess(time.monotonic() - started, 0.4)
+        leader.join()
+        self.assertEqual(follower["status"], "error")
+        self.assertIn("waiting for an identical call in flight", follower["error"]["message"])
+        self.assertEqual(len(vport_test_handlers.CALLS), 1)
+
+    def test_followers_get_a_snapshot_of_the_leader_output(self):
+        published = []
+        finish = self.router._flights.finish
+
+        def recording_finish(key, future, output=None, error=None):
+            published.append(output)
+            finish(key, future, output, error)
+
+        self.router._flights.finish = recording_finish
+        result = self._call("vport://test/py/cached", {"x": 6})
+        result["output"]["echo"]["x"] = "mutated by the caller"
+        self.assertEqual(published[0]["echo"], {"x": 6})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+import json
+import shutil
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import unquote
+
+from vport_http import HttpTransport, build_request, decode_response
+from vport_router import VPortRouter
+
+
+class _EchoHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def _reply(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):  # noqa: N802 - http.server naming
+        self.server.peers.append(self.client_address)
+        self._reply(200, {"path": unquote(self.path)})
+
+    def do_POST(self):  # noqa: N802 - http.server naming
+        self.server.peers.append(self.client_address)
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+        if body.get("fail"):
+            self._reply(500, {"error": "boom"})
+        else:
+            self._reply(200, {"echo": body})
+
+    def log_message(self, *args):
+        pass
+
+
+class TestBuildRequest(unittest.TestCase):
+    def test_payload_is_percent_encoded_in_url(self):
+        target = {"http_method": "GET", "http_url_template": "http://h/q?data={payload_json}"}
+        method, url, headers, body = build_request(target, {"q": "a b&c/d"})
+        self.assertEqual(method, "GET")
+        self.assertEqual(url, "http://h/q?data=%7B%22q%22%3A%22a%20b%26c%2Fd%22%7D")
+        self.assertIsNone(body)
+        self.assertEqual(headers["Content-Type"], "application/json")
+
+    def test_body_only_for_post_put_patch(self):
+        for method in ("GET", "POST", "PUT", "PATCH", "DELETE"):
+            target = {"http_method": method, "http_url_template": "http://h/x"}
+            body = build_request(target, {"a": 1})[3]
+            if method in ("POST", "PUT", "PATCH"):
+                self.assertEqual(body, b'{"a":1}', method)
+            else:
+                self.assertIsNone(body, method)
+
+    def test_headers_template_is_kept(self):
+        target = {"http_method": "POST", "http_url_template": "http://h/x",
+                  "http_headers_template": {"Content-Type": "text/plain", "X-Key": "k"}}
+        headers = build_request(target, {})[2]
+        self.assertEqual(headers, {"Content-Type": "text/plain", "X-Key": "k"})
+
+
+class TestDecodeResponse(unittest.TestCase):
+    def test_object_body(self):
+        self.assertEqual(decode_response(200, b'{"a": 1}', '{"a": 1}'), (True, {"a": 1}))
+
+    def test_non_object_json_is_wrapped(self):
+        self.assertEqual(decode_response(200, b"[1, 2]", "[1, 2]"), (True, {"response": [1, 2]}))
+
+    def test_non_json_is_wrapped(self):
+        self.assertEqual(decode_response(502, b"Bad Gateway", "Bad Gateway"), (False, {"text": "Bad Gateway"}))
+
+    def test_empty_body(self):
+        self.assertEqual(decode_response(204, b"", ""), (True, {}))
+
+
+class TestHttpTransport(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _EchoHandler)
+        self.server.peers = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/echo"
+        self.transport = HttpTransport()
+
+    def tearDown(self):
+        self.transport.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_same_pool_settings_share_one_session(self):
+        a = {"http_method": "POST", "http_url_template": self.url}
+        b = {"http_method": "GET", "http_url_template": "http://other/", "http_pool_maxsize": 10}
+        c = {"http_method": "POST", "http_url_template": self.url, "http_pool_maxsize": 2}
+        self.assertIs(self.transport.session(a), self.transport.session(b))
+        self.assertIsNot(self.transport.session(a), self.transport.session(c))
+
+    def test_connection_is_reused(self):
+        target = {"http_method": "POST", "http_url_template": self.url}
+        for i in range(3):
+            self.assertEqual(self.transport.request(target, {"i": i}, 5000), (True, 200, {"echo": {"i": i}}))
+        self.assertEqual(len(set(self.server.peers)), 1)
+
+
+class TestRouterHttp(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _EchoHandler)
+        self.server.peers = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.tmp = tempfile.mkdtemp()
+        registry = Path(self.tmp) / "vports.registry.v1.jsonl"
+        registry.write_text(json.dumps({
+            "vport": "vport://test/http/echo",
+            "call_type": "http",
+            "target": {"http_method": "POST",
+                       "http_url_template": f"http://127.0.0.1:{self.server.server_address[1]}/echo"},
+        }) + "\n")
+        self.router = VPortRouter(registry_path=registry)
+
+    def tearDown(self):
+        self.router.close()
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_success_omits_request_id_and_error(self):
+        result = self.router.call_vport({"vport": "vport://test/http/echo", "payload": {"a": 1}})
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(result["output"], {"echo": {"a": 1}})
+        self.assertNotIn("request_id", result)
+        self.assertNotIn("error", result)
+
+    def test_request_id_is_echoed(self):
+        result = self.router.call_vport({"vport": "vport://test/http/echo", "payload": {}, "request_id": "r-1"})
+        self.assertEqual(result["request_id"], "r-1")
+        self.assertNotIn("error", result)
+
+    def test_http_error_status(self):
+        result = self.router.call_vport({"vport": "vport://test/http/echo", "payload": {"fail": True}})
+        self.assertEqual(result["status"], "error")
+        self.assertIn("HTTP 500", result["error"]["message"])
+        self.assertNotIn("request_id", result)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from vport_mcp import McpConnectionError, McpError, McpSessionPool, tool_output
+
+STUB = str(Path(__file__).resolve().parents[1] / "stubs" / "mcp_stub_server.py")
+
+
+class _Recorder:
+    """Wraps a session's send to record the JSON-RPC messages the client writes."""
+
+    def __init__(self, session):
+        self.messages = []
+        send = session._send
+
+        def recording_send(message):
+            self.messages.append(message)
+            send(message)
+
+        session._send = recording_send
+
+
+class TestMcpSessionPool(unittest.TestCase):
+    def setUp(self):
+        self.pool = McpSessionPool("stub", {"command": [sys.executable, STUB]})
+
+    def tearDown(self):
+        self.pool.close()
+
+    def test_multiplexes_out_of_order_replies(self):
+        results = {}
+
+        def call(name, seconds):
+            results[name] = self.pool.call_tool("sleep", {"seconds": seconds}, 5.0)
+            results[name + "_at"] = time.monotonic()
+
+        self.pool.call_tool("echo", {}, 5.0)  # connect first
+        slow = threading.Thread(target=call, args=("slow", 0.4))
+        slow.start()
+        time.sleep(0.05)
+        fast = threading.Thread(target=call, args=("fast", 0.05))
+        fast.start()
+        slow.join()
+        fast.join()
+
+        self.assertEqual(results["slow"]["structuredContent"], {"slept": 0.4})
+        self.assertEqual(results["fast"]["structuredContent"], {"slept": 0.05})
+        self.assertLess(results["fast_at"], results["slow_at"])
+        self.assertEqual(self.pool.stats()["sessions"], 1)
+
+    def test_crash_fails_without_retry_then_reconnects(self):
+        self.pool.call_tool("echo", {}, 5.0)
+        crashed = self.pool._session()
+        with self.assertRaises(McpConnectionError) as ctx:
+            self.pool.call_tool("crash", {}, 5.0)
+        self.assertFalse(ctx.exception.retryable)
+        self.assertIn("exit code 3", str(ctx.exception))
+        self.assertEqual(self.pool.stats()["connects"], 1)  # the crash was not retried
+
+        result = self.pool.call_tool("echo", {"after": "crash"}, 5.0)
+        self.assertEqual(result["structuredContent"], {"echo": {"after": "crash"}})
+        stats = self.pool.stats()
+        self.assertEqual((stats["connects"], stats["reconnects"]), (2, 1))
+        # The dead session was closed: its stdin is shut and the server process reaped.
+        self.assertTrue(crashed._conn.writer.closed)
+        self.assertEqual(crashed._conn.proc.returncode, 3)
+
+    def test_timeout_sends_cancellation(self):
+        self.pool.call_tool("echo", {}, 5.0)
+        session = self.pool._session()
+        recorder = _Recorder(session)
+        with self.assertRaises(McpError) as ctx:
+            self.pool.call_tool("sleep", {"seconds": 2}, 0.1)
+        self.assertIn("timed out", str(ctx.exception))
+
+        request, cancel = recorder.messages
+        self.assertEqual(request["method"], "tools/call")
+        self.assertEqual(cancel["method"], "notifications/cancelled")
+        self.assertEqual(cancel["params"]["requestId"], request["id"])
+        self.assertEqual(session.in_flight, 0)
+        # The late reply is dropped and the session stays usable.
+        self.assertEqual(self.pool.call_tool("echo", {"x": 1}, 5.0)["structuredContent"], {"echo": {"x": 1}})
+
+
+class TestToolOutput(unittest.TestCase):
+    def test_structured_content(self):
+        self.assertEqual(tool_output({"content": [], "structuredContent": {"a": 1}}), {"a": 1})
+
+    def test_text_only(self):
+        content = [{"type": "text", "text": "hi"}]
+        self.assertEqual(tool_output({"content": content}), {"content": content})
+
+    def test_is_error(self):
+        with self.assertRaises(McpError) as ctx:
+            tool_output({"content": [{"type": "text", "text": "boom"}], "isError": True})
+        self.assertEqual(str(ctx.exception), "boom")
+        with self.assertRaises(McpError):
+            tool_output({"isError": True})
+
+    def test_stub_error_and_text_results(self):
+        pool = McpSessionPool("stub", {"command": [sys.executable, STUB]})
+        try:
+            with self.assertRaises(McpError) as ctx:
+                tool_output(pool.call_tool("fail", {"message": "bad input"}, 5.0))
+            self.assertEqual(str(ctx.exception), "bad input")
+            self.assertEqual(
+                tool_output(pool.call_tool("text", {"text": "hi"}, 5.0)),
+                {"content": [{"type": "text", "text": "hi"}]},
+            )
+        finally:
+            pool.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+import vport_test_handlers
+from vport_router import VPortNotFoundError, VPortRouter
+
+TRACK = {"python_module": "vport_test_handlers", "python_handler": "track"}
+
+
+def _alive(pid):
+    try:
+        with open(f"/proc/{pid}/stat", encoding="utf-8") as f:
+            return f.read().rsplit(")", 1)[1].split()[0] != "Z"
+    except FileNotFoundError:
+        return False
+
+
+class TestCallMany(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        registry = Path(self.tmp) / "vports.registry.v1.jsonl"
+        registry.write_text("\n".join(json.dumps(row) for row in [
+            {"vport": "vport://test/py/track", "call_type": "python", "target": TRACK},
+            {"vport": "vport://test/py/limited", "call_type": "python", "target": TRACK, "max_concurrency": 2},
+            {"vport": "vport://test/bin/hang", "call_type": "bin", "target": {
+                "bin_command": "sh",
+                "bin_args_template": ["-c", f"sleep 30 & echo $! > {self.tmp}/child.pid; wait"],
+            }},
+        ]) + "\n")
+        self.router = VPortRouter(registry_path=registry, max_threads=16)
+        vport_test_handlers.ACTIVE.update(now=0, peak=0)
+
+    def tearDown(self):
+        self.router.close()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _run_many(self, envelopes, **kwargs):
+        async def collect():
+            return [item async for item in self.router.call_many(envelopes, **kwargs)]
+
+        return asyncio.run(collect())
+
+    def _envelopes(self, vport, count, sleep=0.05):
+        return [{"vport": vport, "payload": {"index": i, "sleep": sleep}} for i in range(count)]
+
+    def test_global_concurrency_limit(self):
+        results = self._run_many(self._envelopes("vport://test/py/track", 9), concurrency=3)
+        self.assertEqual(sorted(i for i, _ in results), list(range(9)))
+        self.assertTrue(all(r["status"] == "success" for _, r in results))
+        self.assertEqual(vport_test_handlers.ACTIVE["peak"], 3)
+
+    def test_per_vport_limit_from_registry(self):
+        self._run_many(self._envelopes("vport://test/py/limited", 6), concurrency=16)
+        self.assertEqual(vport_test_handlers.ACTIVE["peak"], 2)
+
+    def test_per_vport_limit_argument(self):
+        self._run_many(self._envelopes("vport://test/py/track", 6), concurrency=16, per_vport_limit=1)
+        self.assertEqual(vport_test_handlers.ACTIVE["peak"], 1)
+
+    def test_results_yielded_as_they_complete(self):
+        envelopes = [
+            {"vport": "vport://test/py/track", "payload": {"index": i, "sleep": sleep}}
+            for i, sleep in enumerate([0.4, 0.0, 0.2])
+        ]
+        results = self._run_many(envelopes)
+        self.assertEqual([i for i, _ in results], [1, 2, 0])
+        self.assertEqual([r["output"]["index"] for _, r in results], [1, 2, 0])
+
+    def test_return_exceptions(self):
+        envelopes = self._envelopes("vport://test/py/track", 2) + [{"vport": "vport://test/py/missing", "payload": {}}]
+        results = dict(self._run_many(envelopes, return_exceptions=True))
+        self.assertIsInstance(results[2], VPortNotFoundError)
+        self.assertEqual(results[0]["status"], "success")
+
+        with self.assertRaises(VPortNotFoundError):
+            self._run_many(envelopes)
+
+    @unittest.skipUnless(os.name == "posix" and Path("/proc").is_dir(), "needs process groups and /proc")
+    def test_bin_timeout_kills_process_group(self):
+        start = time.monotonic()
+        result = asyncio.run(self.router.call_vport_async(
+            {"vport": "vport://test/bin/hang", "payload": {}, "options": {"timeout_ms": 300}}
+        ))
+        self.assertLess(time.monotonic() - start, 2.0)
+        self.assertEqual(result["status"], "error")
+        self.assertIn("timed out after 300 ms", result["error"]["message"])
+
+        pid = int((Path(self.tmp) / "child.pid").read_text())
+        deadline = time.monotonic() + 2
+        while _alive(pid) and time.monotonic() < deadline:
+            time.sleep(0.02)
+        self.assertFalse(_alive(pid), "the backgrounded grandchild survived the timeout")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from vport_router import VPortRouter
+
+
+class TestPythonProcessMode(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        registry = Path(self.tmp) / "vports.registry.v1.jsonl"
+        registry.write_text(json.dumps({
+            "vport": "vport://test/py/echo",
+            "call_type": "python",
+            "target": {
+                "python_module": "vport_test_handlers",
+                "python_handler": "echo",
+                "python_mode": "process",
+                "python_pool_size": 1,
+            },
+        }) + "\n")
+        self.router = VPortRouter(registry_path=registry)
+
+    def tearDown(self):
+        self.router.close()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_unserialisable_payload_does_not_wedge_pool(self):
+        bad = self.router.call_vport({"vport": "vport://test/py/echo", "payload": {"blob": b"\x00"}})
+        self.assertEqual(bad["status"], "error")
+        self.assertIn("not JSON-serialisable", bad["error"]["message"])
+        for i in range(3):
+            result = self.router.call_vport({
+                "vport": "vport://test/py/echo", "payload": {"i": i}, "options": {"timeout_ms": 1000},
+            })
+            self.assertEqual(result["status"], "success", result)
+            self.assertEqual(result["output"]["echo"], {"i": i})
+        stats = self.router._worker_pools["vport://test/py/echo"].stats()
+        self.assertEqual((stats["workers"], stats["idle"]), (1, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
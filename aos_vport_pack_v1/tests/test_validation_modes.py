@@ -0,0 +1,171 @@
+import json
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+import vport_router
+from vport_router import VPortRouter, VPortRouterError
+
+ECHO = {"python_module": "vport_test_handlers", "python_handler": "echo"}
+
+REGISTRY_ROWS = [
+    {"vport": "vport://test/py/echo", "call_type": "python", "target": ECHO},
+    {"vport": "vport://test/py/cached", "call_type": "python", "target": ECHO, "cacheable": True, "cache_ttl_s": 60},
+    {"vport": "vport://test/bin/worker", "call_type": "bin", "max_concurrency": 2,
+     "target": {"bin_command": "cat", "bin_mode": "worker", "bin_pool_size": 1}},
+    {"vport": "vport://test/mcp/echo", "call_type": "mcp", "target": {"mcp_server_id": "s", "mcp_tool_name": "echo"}},
+]
+
+
+def _registry(tmp):
+    path = Path(tmp) / "vports.registry.v1.jsonl"
+    path.write_text("\n".join(json.dumps(row) for row in REGISTRY_ROWS) + "\n")
+    return path
+
+
+class TestValidationModes(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.registry = _registry(self.tmp)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _rejected(self, router, envelope, calls):
+        rejected = []
+        for index in range(calls):
+            try:
+                router.call_vport(envelope)
+            except VPortRouterError:
+                rejected.append(index)
+        return rejected
+
+    def test_strict_validates_every_call(self):
+        # task_type is outside the schema's enum; only full validation notices.
+        envelope = {"vport": "vport://test/py/echo", "payload": {}, "task_type": "bogus"}
+        with VPortRouter(registry_path=self.registry) as router:
+            self.assertEqual(self._rejected(router, envelope, 3), [0, 1, 2])
+
+    def test_sampled_validates_one_call_in_n(self):
+        envelope = {"vport": "vport://test/py/echo", "payload": {}, "task_type": "bogus"}
+        with VPortRouter(registry_path=self.registry, validation="sampled", validation_sample_rate=4) as router:
+            self.assertEqual(self._rejected(router, envelope, 12), [0, 4, 8])
+
+    def test_trusted_skips_schema_rules(self):
+        envelope = {"vport": "vport://test/py/echo", "payload": {}, "task_type": "bogus"}
+        with VPortRouter(registry_path=self.registry, validation="trusted") as router:
+            self.assertEqual(self._rejected(router, envelope, 3), [])
+
+    def test_structural_checks_still_apply(self):
+        for mode in ("sampled", "trusted"):
+            with VPortRouter(registry_path=self.registry, validation=mode, validation_sample_rate=1000) as router:
+                router.call_vport({"vport": "vport://test/py/echo", "payload": {}})  # consumes the sampled call
+                for bad in (
+                    {"vport": "vport://test/py/echo", "payload": []},
+                    {"vport": "vport://test/py/echo", "payload": {}, "request_id": 5},
+                    {"vport": "vport://test/py/echo", "payload": {}, "options": {"timeout_ms": 0}},
+                    {"payload": {}},
+                ):
+                    with self.assertRaises(VPortRouterError, msg=(mode, bad)):
+                        router.call_vport(bad)
+
+    def test_result_fast_path_rejects_bad_output_and_request_id(self):
+        for mode in ("sampled", "trusted"):
+            with VPortRouter(registry_path=self.registry, validation=mode) as router:
+                entry = router.get_entry("vport://test/py/echo")
+                with self.assertRaises(VPortRouterError):
+                    router._result_envelope(entry, None, time.monotonic(), ["not", "a", "dict"], None)
+                with self.assertRaises(VPortRouterError):
+                    router._result_envelope(entry, 5, time.monotonic(), {}, None)
+                ok = router._result_envelope(entry, "r-1", time.monotonic(), {"a": 1}, None)
+                self.assertEqual(ok["request_id"], "r-1")
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            VPortRouter(registry_path=self.registry, validation="lenient")
+
+
+@unittest.skipIf(vport_router.fastjsonschema is None, "fastjsonschema is not installed")
+class TestCompiledSchemasAgree(unittest.TestCase):
+    """The fastjsonschema checkers must give jsonschema's verdict on every bundled schema."""
+
+    CALLS = [
+        {"vport": "vport://test/py/echo", "payload": {}},
+        {"vport": "vport://test/py/echo", "payload": {"a": [1, {"b": None}]}, "request_id": "r",
+         "profile_id": "p", "task_type": "planner", "options": {"timeout_ms": 5, "dry_run": True}},
+        {"vport": "vport://test/py/echo", "payload": {}, "task_type": "bogus"},
+        {"vport": "vport://test/py/echo", "payload": {}, "options": {"timeout_ms": 0}},
+        {"vport": "vport://test/py/echo", "payload": {}, "options": {"timeout_ms": 1.5}},
+        {"vport": "vport://test/py/echo", "payload": {}, "options": {"retries": 2}},
+        {"vport": "vport://test/py/echo", "payload": {}, "extra": 1},
+        {"vport": "not-a-vport", "payload": {}},
+        {"vport": "vport://test/py/echo"},
+        {"vport": "vport://test/py/echo", "payload": "x"},
+        {"vport": 5, "payload": {}},
+        [],
+        "envelope",
+    ]
+    RESULTS = [
+        {"vport": "vport://test/py/echo", "status": "success", "output": {}, "meta": {"elapsed_ms": 1}},
+        {"vport": "vport://test/py/echo", "status": "error", "output": {},
+         "error": {"message": "m", "code": "EXECUTION_ERROR", "details": {}}, "request_id": "r"},
+        {"vport": "vport://test/py/echo", "status": "success", "output": [], "meta": {}},
+        {"vport": "vport://test/py/echo", "status": "maybe", "output": {}},
+        {"vport": "vport://test/py/echo", "status": "success", "output": {}, "request_id": None},
+        {"vport": "vport://test/py/echo", "status": "error", "output": {}, "error": None},
+        {"vport": "vport://test/py/echo", "output": {}},
+        {"status": "success", "output": {}},
+    ]
+    ENTRIES = REGISTRY_ROWS + [
+        {"vport": "vport://x/py/a", "call_type": "python", "target": ECHO, "cache_ttl_s": 0},
+        {"vport": "vport://x/py/a", "call_type": "python", "target": ECHO, "cacheable": "yes"},
+        {"vport": "vport://x/py/a", "call_type": "python", "target": {**ECHO, "python_mode": "fork"}},
+        {"vport": "vport://x/py/a", "call_type": "python", "target": {**ECHO, "unknown": 1}},
+        {"vport": "vport://x/py/a", "call_type": "rpc", "target": ECHO},
+        {"vport": "vport://x/py/a", "call_type": "python", "target": ECHO, "max_concurrency": 0},
+        {"vport": "vport://x/http/a", "call_type": "http",
+         "target": {"http_method": "TRACE", "http_url_template": "http://h/"}},
+        {"vport": "vport://x/py/a", "call_type": "python"},
+    ]
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.router = VPortRouter(registry_path=_registry(self.tmp))
+
+    def tearDown(self):
+        self.router.close()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _assert_agree(self, check, validator, instances):
+        self.assertIsNot(check, validator.is_valid)  # really compiled
+        verdicts = set()
+        for instance in instances:
+            expected = validator.is_valid(instance)
+            self.assertEqual(check(instance), expected, instance)
+            verdicts.add(expected)
+        self.assertEqual(verdicts, {True, False})
+
+    def test_call_schema(self):
+        self._assert_agree(self.router._check_call, self.router._validator_call, self.CALLS)
+
+    def test_result_schema(self):
+        self._assert_agree(self.router._check_result, self.router._validator_result, self.RESULTS)
+
+    def test_registry_entry_schema(self):
+        self._assert_agree(
+            self.router._check_registry_entry, self.router._validator_registry_entry, self.ENTRIES
+        )
+
+    def test_bundled_registry(self):
+        with VPortRouter() as router:
+            self.assertTrue(router.list_vports())
+            rows = [json.loads(line) for line in router.registry_path.read_text().splitlines() if line.strip()]
+            for row in rows:
+                self.assertTrue(router._check_registry_entry(row))
+                self.assertTrue(router._validator_registry_entry.is_valid(row))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,30 @@
+"""Python vPort handlers used by the tests (importable by process-mode workers via PYTHONPATH)."""
+import threading
+import time
+
+CALLS = []
+
+
+def echo(payload):
+    CALLS.append(payload)
+    time.sleep(payload.get("sleep", 0))
+    if payload.get("fail"):
+        raise RuntimeError(payload["fail"])
+    return {"echo": payload, "calls": len(CALLS)}
+
+
+ACTIVE = {"now": 0, "peak": 0}
+_active_lock = threading.Lock()
+
+
+def track(payload):
+    """Sleeps while recording how many calls run at once (ACTIVE["peak"])."""
+    with _active_lock:
+        ACTIVE["now"] += 1
+        ACTIVE["peak"] = max(ACTIVE["peak"], ACTIVE["now"])
+    try:
+        time.sleep(payload.get("sleep", 0.05))
+    finally:
+        with _active_lock:
+            ACTIVE["now"] -= 1
+    return {"index": payload.get("index")}
@@ -0,0 +1,327 @@
+from __future__ import annotations
+
+import collections
+import itertools
+import json
+import os
+import queue
+import signal
+import subprocess
+import sys
+import threading
+import time
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+DEFAULT_POOL_SIZE = 2
+DEFAULT_MAX_REQUESTS = 1000
+DEFAULT_HEALTH_CHECK_S = 30.0
+# Bound on how long a health-check ping may take.
+PING_TIMEOUT_S = 5.0
+
+
+class BinWorkerError(Exception):
+    """A worker failed, timed out or broke the protocol; the router wraps it in a VPortExecutionError."""
+
+
+class BinRequestError(BinWorkerError):
+    """The request could not be encoded, so nothing was sent and the worker is still usable."""
+
+
+def kill_process_group(proc: Any) -> None:
+    """Kill a child started with start_new_session=True together with anything it spawned.
+
+    Killing only the child would leave e.g. `sh -c` grandchildren holding the output pipes open.
+    """
+    if os.name == "posix":
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+            return
+        except ProcessLookupError:
+            return
+        except OSError:
+            pass
+    proc.kill()
+
+
+def serve_worker(handler: Callable[[Dict[str, Any]], Dict[str, Any]]) -> None:
+    """
+    Worker side of the protocol: answer requests on stdin until it is closed.
+
+    Each request is one JSON line, `{"id": n, "method": "call", "payload": {...}}` or
+    `{"id": n, "method": "ping"}`; each reply is one JSON line with the same id and either
+    `"output"` (an object) or `"error"` (a message). Anything else the handler prints must go
+    to stderr.
+    """
+    out = sys.stdout
+    sys.stdout = sys.stderr
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        request = json.loads(line)
+        reply: Dict[str, Any] = {"id": request.get("id")}
+        try:
+            if request.get("method") == "ping":
+                reply["output"] = {}
+            else:
+                result = handler(request.get("payload") or {})
+                if not isinstance(result, dict):
+                    raise TypeError(f"handler returned non-dict: {type(result)}")
+                reply["output"] = result
+        except Exception as e:  # noqa: BLE001 - reported to the caller, the worker keeps serving
+            reply["error"] = f"{type(e).__name__}: {e}"
+        out.write(json.dumps(reply) + "\n")
+        out.flush()
+
+
+class BinWorker:
+    """One long-lived worker process. Not thread-safe: the pool hands it to one caller at a time."""
+
+    def __init__(self, command: List[str], env: Optional[Dict[str, str]] = None) -> None:
+        self.command = command
+        self.proc = subprocess.Popen(
+            command,
+            env=env,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            bufsize=1,
+            start_new_session=os.name == "posix",
+        )
+        self.requests = 0
+        self.last_used = time.monotonic()
+        self._ids = itertools.count(1)
+        self._lines: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._stderr: Deque[str] = collections.deque(maxlen=20)
+        threading.Thread(target=self._read_stdout, daemon=True).start()
+        threading.Thread(target=self._read_stderr, daemon=True).start()
+
+    def _read_stdout(self) -> None:
+        for line in self.proc.stdout:
+            self._lines.put(line)
+        self.proc.stdout.close()
+        self._lines.put(None)  # EOF
+
+    def _read_stderr(self) -> None:
+        for line in self.proc.stderr:
+            self._stderr.append(line.rstrip("\n"))
+        self.proc.stderr.close()
+
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def stderr_tail(self) -> str:
+        return " | ".join(self._stderr)
+
+    def request(self, message: Dict[str, Any], timeout_s: float) -> Dict[str, Any]:
+        request_id = next(self._ids)
+        try:
+            line = json.dumps({"id": request_id, **message}) + "\n"
+        except (TypeError, ValueError) as e:
+            raise BinRequestError(f"payload is not JSON-serialisable: {e}") from e
+        try:
+            self.proc.stdin.write(line)
+            self.proc.stdin.flush()
+        except (BrokenPipeError, OSError, ValueError) as e:
+            raise BinWorkerError(f"worker stdin closed: {e}; stderr: {self.stderr_tail()}") from e
+
+        deadline = time.monotonic() + timeout_s
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise BinWorkerError(f"worker did not answer within {timeout_s:.3f}s")
+            try:
+                line = self._lines.get(timeout=remaining)
+            except queue.Empty:
+                continue
+            if line is None:
+                try:
+                    code: Optional[int] = self.proc.wait(timeout=1)
+                except subprocess.TimeoutExpired:
+                    code = None
+                raise BinWorkerError(f"worker exited (code {code}); stderr: {self.stderr_tail()}")
+            if not line.strip():
+                continue
+            try:
+                reply = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise BinWorkerError(f"worker wrote a non-JSON line: {line.strip()[:200]}") from e
+            if not isinstance(reply, dict) or reply.get("id") != request_id:
+                raise BinWorkerError(f"worker reply does not match request {request_id}: {line.strip()[:200]}")
+            self.requests += 1
+            self.last_used = time.monotonic()
+            return reply
+
+    def close(self, grace_s: float = 1.0) -> None:
+        """Close stdin so the worker can exit on its own, then kill it (and its children)."""
+        try:
+            self.proc.stdin.close()
+        except OSError:
+            pass
+        try:
+            self.proc.wait(timeout=grace_s)
+        except subprocess.TimeoutExpired:
+            pass
+        # On POSIX the group is killed even after a clean exit, in case the worker left children.
+        if self.proc.poll() is None or os.name == "posix":
+            kill_process_group(self.proc)
+            self.proc.wait()
+
+
+class BinWorkerPool:
+    """
+    Pre-spawned pool of `command` processes speaking newline-delimited JSON (see `serve_worker`).
+
+    - `size` workers are started up front; a call waits for an idle one.
+    - A worker is retired after `max_requests` calls and killed if it times out, exits or breaks
+      the protocol; either way a successor is started in the background.
+    - A worker idle for more than `health_check_s` is pinged before it is handed out.
+    """
+
+    def __init__(
+        self,
+        command: List[str],
+        size: int = DEFAULT_POOL_SIZE,
+        max_requests: int = DEFAULT_MAX_REQUESTS,
+        health_check_s: float = DEFAULT_HEALTH_CHECK_S,
+        env: Optional[Dict[str, str]] = None,
+    ) -> None:
+        self.command = list(command)
+        self.env = env
+        self.size = max(1, size)
+        self.max_requests = max(1, max_requests)
+        self.health_check_s = health_check_s
+        self._idle: "queue.LifoQueue[BinWorker]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._workers = 0
+        self._closed = False
+        self.spawned = 0
+        self.recycled = 0
+        self.replaced = 0
+        for _ in range(self.size):
+            self._reserve()
+            self._idle.put(self._spawn())
+
+    def _reserve(self) -> bool:
+        """Claim a worker slot for a new process; False if the pool is at `size`."""
+        with self._lock:
+            if self._workers >= self.size:
+                return False
+            self._workers += 1
+            return True
+
+    def _spawn(self) -> BinWorker:
+        """Start a worker in a slot claimed with _reserve."""
+        try:
+            worker = BinWorker(self.command, self.env)
+        except OSError as e:
+            with self._lock:
+                self._workers -= 1
+            raise BinWorkerError(f"failed to start worker {self.command[0]!r}: {e}") from e
+        with self._lock:
+            self.spawned += 1
+        return worker
+
+    def _discard(self, worker: BinWorker, counter: Optional[str] = None) -> None:
+        """Stop a worker; a recycled or replaced one gets a successor started in the background."""
+        worker.close(grace_s=0)
+        with self._lock:
+            self._workers -= 1
+            if counter is not None:
+                setattr(self, counter, getattr(self, counter) + 1)
+        if counter is not None and not self._closed:
+            threading.Thread(target=self._replenish, daemon=True).start()
+
+    def _replenish(self) -> None:
+        if self._closed or not self._reserve():
+            return
+        try:
+            worker = self._spawn()
+        except BinWorkerError:
+            return  # the next call retries and reports the error
+        self._checkin(worker)
+
+    def _checkout(self, timeout_s: float) -> BinWorker:
+        deadline = time.monotonic() + timeout_s
+        while True:
+            if self._closed:
+                raise BinWorkerError("worker pool is closed")
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                if self._reserve():
+                    return self._spawn()
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise BinWorkerError(f"no idle worker within {timeout_s:.3f}s")
+                try:
+                    # Short waits so a slot freed by a discarded worker is noticed.
+                    worker = self._idle.get(timeout=min(remaining, 0.05))
+                except queue.Empty:
+                    continue
+
+            if not worker.alive():
+                self._discard(worker, "replaced")
+                continue
+            if time.monotonic() - worker.last_used > self.health_check_s:
+                try:
+                    worker.request({"method": "ping"}, min(PING_TIMEOUT_S, max(deadline - time.monotonic(), 0.001)))
+                except BinWorkerError:
+                    self._discard(worker, "replaced")
+                    continue
+            return worker
+
+    def _checkin(self, worker: BinWorker) -> None:
+        if self._closed:
+            self._discard(worker)
+        elif worker.requests >= self.max_requests:
+            self._discard(worker, "recycled")
+        else:
+            self._idle.put(worker)
+
+    def call(self, payload: Dict[str, Any], timeout_ms: int) -> Dict[str, Any]:
+        """Run one call on an idle worker; the timeout covers waiting for the worker too."""
+        timeout_s = timeout_ms / 1000.0
+        deadline = time.monotonic() + timeout_s
+        worker = self._checkout(timeout_s)
+        try:
+            reply = worker.request({"method": "call", "payload": payload}, max(deadline - time.monotonic(), 0.001))
+        except BinRequestError:
+            self._checkin(worker)
+            raise
+        except BinWorkerError:
+            self._discard(worker, "replaced")
+            raise
+        except BaseException:
+            # Not a protocol failure: the worker goes back rather than leaking its slot. Should a
+            # reply still be in flight, the id check on its next request retires it.
+            self._checkin(worker)
+            raise
+        self._checkin(worker)
+
+        if "error" in reply:
+            raise BinWorkerError(str(reply["error"]))
+        output = reply.get("output")
+        if not isinstance(output, dict):
+            raise BinWorkerError(f"worker output is not an object: {type(output).__name__}")
+        return output
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "workers": self._workers,
+                "idle": self._idle.qsize(),
+                "spawned": self.spawned,
+                "recycled": self.recycled,
+                "replaced": self.replaced,
+            }
+
+    def close(self) -> None:
+        self._closed = True
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._discard(worker)
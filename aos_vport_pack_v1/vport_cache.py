@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_TTL_S = 300.0
+
+
+def canonical_json(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def cache_key(vport: str, target: Dict[str, Any], payload: Dict[str, Any]) -> str:
+    """
+    sha256 of the vPort, its target and the payload in canonical JSON. The target is part of the
+    key so that repointing a vPort (another handler, command or URL) does not serve old results.
+    Raises TypeError for payloads that are not JSON-serialisable.
+    """
+    document = canonical_json({"vport": vport, "target": target, "payload": payload})
+    return hashlib.sha256(document.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    Outputs of cacheable vPorts: a memory LRU in front of an optional disk tier.
+
+    Each entry carries a wall-clock expiry, so files written by an earlier process expire on
+    schedule too. The memory tier is bounded by the size of the serialised outputs (`max_bytes=0`
+    turns it off); the disk tier stores one JSON file per key under `directory`, written
+    atomically, and is promoted into memory on a hit. Outputs are copied in and out. Thread-safe.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, directory: Optional[Path] = None) -> None:
+        self.max_bytes = max(0, int(max_bytes))
+        self.directory = Path(directory) if directory is not None else None
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.write_errors = 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def _remember(self, key: str, expires_at: float, data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous[1])
+            self._entries[key] = (expires_at, data)
+            self._size += len(data)
+            while self._size > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+                self.evictions += 1
+
+    def get(self, key: str, count_miss: bool = True) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        expired = False
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return json.loads(entry[1])["output"]
+                del self._entries[key]
+                self._size -= len(entry[1])
+                self.expirations += 1
+                expired = True
+
+        if self.directory is not None:
+            path = self._path(key)
+            try:
+                data = path.read_bytes()
+                record = json.loads(data)
+            except (OSError, ValueError):
+                record = None
+            if isinstance(record, dict) and isinstance(record.get("output"), dict):
+                expires_at = record.get("expires_at")
+                if isinstance(expires_at, (int, float)) and expires_at > now:
+                    self._remember(key, float(expires_at), data)
+                    with self._lock:
+                        self.hits += 1
+                        self.disk_hits += 1
+                    return record["output"]
+                path.unlink(missing_ok=True)
+                if not expired:
+                    with self._lock:
+                        self.expirations += 1
+
+        if count_miss:
+            with self._lock:
+                self.misses += 1
+        return None
+
+    def put(self, key: str, output: Dict[str, Any], ttl_s: float) -> bool:
+        """
+        Store `output` for `ttl_s` seconds. Best-effort: False if it is not JSON-serialisable (nothing
+        stored) or the disk write failed (counted in `write_errors`; the memory tier still has it).
+        """
+        expires_at = time.time() + ttl_s
+        try:
+            data = canonical_json({"expires_at": expires_at, "output": output}).encode("utf-8")
+        except (TypeError, ValueError):
+            return False
+        self._remember(key, expires_at, data)
+        if self.directory is None:
+            return True
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        except OSError:
+            self._write_failed()
+            return False
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(data)
+            os.replace(tmp, path)
+        except OSError:
+            Path(tmp).unlink(missing_ok=True)
+            self._write_failed()
+            return False
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        return True
+
+    def _write_failed(self) -> None:
+        with self._lock:
+            self.write_errors += 1
+
+    def clear(self) -> None:
+        """Drops the memory tier and resets counters; files on disk are kept."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self.hits = self.disk_hits = self.misses = 0
+            self.evictions = self.expirations = self.write_errors = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "directory": str(self.directory) if self.directory is not None else None,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "write_errors": self.write_errors,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key: the first caller (the leader) runs the call and
+    publishes the outcome on a Future that the others wait on. Sync callers wait with
+    Future.result, asyncio callers on asyncio.wrap_future of the same Future.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.coalesced = 0
+
+    def join(self, key: str) -> Tuple[Future, bool]:
+        """(future, is_leader) for `key`; the leader must call finish()."""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future, False
+            future = self._calls[key] = Future()
+            return future, True
+
+    def finish(
+        self,
+        key: str,
+        future: Future,
+        output: Optional[Dict[str, Any]] = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        with self._lock:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(output)
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import json
+import threading
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import quote
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:  # optional: only needed for the async transport
+    import httpx
+except ImportError:  # pragma: no cover - depends on the environment
+    httpx = None
+
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+BODY_METHODS = ("POST", "PUT", "PATCH")
+
+
+class HttpCallError(Exception):
+    """Transport-level failure; the router wraps it in a VPortExecutionError."""
+
+
+def pool_settings(target: Dict[str, Any]) -> Tuple[int, int]:
+    """(pool_connections, pool_maxsize) for a registry target, falling back to the defaults."""
+    return (
+        int(target.get("http_pool_connections") or DEFAULT_POOL_CONNECTIONS),
+        int(target.get("http_pool_maxsize") or DEFAULT_POOL_MAXSIZE),
+    )
+
+
+def build_request(target: Dict[str, Any], payload: Dict[str, Any]) -> Tuple[str, str, Dict[str, str], Optional[bytes]]:
+    """(method, url, headers, body) for one call.
+
+    The payload is serialised once. `{payload_json}` in the URL template is
+    replaced with the percent-encoded JSON; the body is only sent for
+    POST/PUT/PATCH.
+    """
+    method = target["http_method"]
+    url_template = target["http_url_template"]
+    payload_json = json.dumps(payload, separators=(",", ":"))
+    if "{payload_json}" in url_template:
+        url = url_template.replace("{payload_json}", quote(payload_json, safe=""))
+    else:
+        url = url_template
+
+    headers = dict(target.get("http_headers_template") or {})
+    if "Content-Type" not in headers:
+        headers["Content-Type"] = "application/json"
+    body = payload_json.encode("utf-8") if method in BODY_METHODS else None
+    return method, url, headers, body
+
+
+def decode_response(status_code: int, content: bytes, text: str) -> Tuple[bool, Dict[str, Any]]:
+    """(ok, body) with non-object JSON wrapped as {"response": ...} and non-JSON as {"text": ...}."""
+    try:
+        body = json.loads(content) if content else {}
+    except ValueError:
+        body = {"text": text}
+    if not isinstance(body, dict):
+        body = {"response": body}
+    return status_code < 400, body
+
+
+class HttpTransport:
+    """Keep-alive HTTP transport with connection pools shared across calls.
+
+    Registry entries with the same pool settings share one `requests.Session`;
+    its adapter keeps up to `pool_connections` per-host pools of up to
+    `pool_maxsize` idle connections each, so repeated calls to a host reuse an
+    open TCP/TLS connection. Responses are read in full before returning so the
+    connection goes straight back to its pool for the next request.
+    """
+
+    def __init__(self) -> None:
+        self._sessions: Dict[Tuple[int, int], requests.Session] = {}
+        self._lock = threading.Lock()
+
+    def session(self, target: Dict[str, Any]) -> requests.Session:
+        key = pool_settings(target)
+        session = self._sessions.get(key)
+        if session is None:
+            with self._lock:
+                session = self._sessions.get(key)
+                if session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=key[0], pool_maxsize=key[1])
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    self._sessions[key] = session
+        return session
+
+    def request(self, target: Dict[str, Any], payload: Dict[str, Any], timeout_ms: int) -> Tuple[bool, int, Dict[str, Any]]:
+        method, url, headers, body = build_request(target, payload)
+        try:
+            resp = self.session(target).request(
+                method=method,
+                url=url,
+                headers=headers,
+                data=body,
+                timeout=timeout_ms / 1000.0,
+            )
+            content = resp.content
+        except requests.RequestException as e:
+            raise HttpCallError(str(e)) from e
+        ok, decoded = decode_response(resp.status_code, content, resp.text if content else "")
+        return ok, resp.status_code, decoded
+
+    def close(self) -> None:
+        with self._lock:
+            sessions, self._sessions = list(self._sessions.values()), {}
+        for session in sessions:
+            session.close()
+
+
+class AsyncHttpTransport:
+    """httpx-based async counterpart of HttpTransport (requires `httpx`).
+
+    One `httpx.AsyncClient` per pool setting; `pool_maxsize` bounds the
+    keep-alive connections and `pool_connections * pool_maxsize` the total.
+    Clients belong to the event loop that created them.
+    """
+
+    def __init__(self) -> None:
+        if httpx is None:
+            raise RuntimeError("AsyncHttpTransport requires the 'httpx' package")
+        self._clients: Dict[Tuple[int, int], Any] = {}
+
+    def client(self, target: Dict[str, Any]) -> Any:
+        key = pool_settings(target)
+        client = self._clients.get(key)
+        if client is None:
+            limits = httpx.Limits(max_connections=key[0] * key[1], max_keepalive_connections=key[1])
+            client = self._clients[key] = httpx.AsyncClient(limits=limits)
+        return client
+
+    async def request(self, target: Dict[str, Any], payload: Dict[str, Any], timeout_ms: int) -> Tuple[bool, int, Dict[str, Any]]:
+        method, url, headers, body = build_request(target, payload)
+        try:
+            resp = await self.client(target).request(
+                method,
+                url,
+                headers=headers,
+                content=body,
+                timeout=timeout_ms / 1000.0,
+            )
+        except httpx.HTTPError as e:
+            raise HttpCallError(str(e) or type(e).__name__) from e
+        ok, decoded = decode_response(resp.status_code, resp.content, resp.text if resp.content else "")
+        return ok, resp.status_code, decoded
+
+    async def aclose(self) -> None:
+        clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            await client.aclose()
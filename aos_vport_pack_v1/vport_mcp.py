@@ -0,0 +1,416 @@
+from __future__ import annotations
+
+import asyncio
+import collections
+import itertools
+import json
+import os
+import socket
+import subprocess
+import threading
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from pathlib import Path
+from typing import Any, BinaryIO, Deque, Dict, List, Optional, Tuple
+
+from vport_bin_pool import kill_process_group
+
+MCP_PROTOCOL_VERSION = "2025-06-18"
+CLIENT_INFO = {"name": "aos-vport-router", "version": "1"}
+DEFAULT_SESSIONS = 1
+DEFAULT_CONNECT_TIMEOUT_S = 10.0
+
+
+class McpError(Exception):
+    """An MCP call failed; the router wraps it in a VPortExecutionError."""
+
+
+class McpConnectionError(McpError):
+    """
+    The session is unusable. `retryable` is True when the request was never written, so sending it
+    again on a fresh session cannot run the tool twice.
+    """
+
+    def __init__(self, message: str, retryable: bool = False) -> None:
+        super().__init__(message)
+        self.retryable = retryable
+
+
+def load_mcp_servers(path: Path) -> Dict[str, Dict[str, Any]]:
+    """
+    Read an MCP server map: `{"servers": {"<mcp_server_id>": {...}}}` where each server is either
+
+        {"command": ["python", "server.py"], "env": {...}, "cwd": "...", "sessions": 1}   (stdio)
+        {"url": "tcp://127.0.0.1:7300", "sessions": 2}                                   (socket)
+        {"url": "unix:///run/tools.sock"}                                                 (socket)
+
+    Socket servers speak the same newline-delimited JSON-RPC as stdio servers.
+    """
+    with path.open("r", encoding="utf-8") as f:
+        data = json.load(f)
+    servers = data.get("servers") if isinstance(data, dict) else None
+    if not isinstance(servers, dict):
+        raise RuntimeError(f"MCP server map must have a 'servers' object: {path}")
+    for server_id, config in servers.items():
+        command = config.get("command") if isinstance(config, dict) else None
+        url = config.get("url") if isinstance(config, dict) else None
+        if not (isinstance(command, list) and command and all(isinstance(c, str) for c in command)) and not (
+            isinstance(url, str) and url.startswith(("tcp://", "unix://"))
+        ):
+            raise RuntimeError(
+                f"MCP server '{server_id}' needs a 'command' list or a tcp:// / unix:// 'url': {path}"
+            )
+    return servers
+
+
+class _Connection:
+    """A bidirectional byte stream carrying one JSON-RPC message per line."""
+
+    reader: BinaryIO
+    writer: BinaryIO
+
+    def close(self) -> None:
+        raise NotImplementedError
+
+    def describe(self) -> str:
+        return ""
+
+
+class _StdioConnection(_Connection):
+    def __init__(self, config: Dict[str, Any]) -> None:
+        env = None
+        if config.get("env"):
+            env = {**os.environ, **{str(k): str(v) for k, v in config["env"].items()}}
+        self.proc = subprocess.Popen(
+            config["command"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=env,
+            cwd=config.get("cwd"),
+            start_new_session=os.name == "posix",
+        )
+        self.reader = self.proc.stdout
+        self.writer = self.proc.stdin
+        self._stderr: Deque[str] = collections.deque(maxlen=20)
+        threading.Thread(target=self._drain_stderr, daemon=True).start()
+
+    def _drain_stderr(self) -> None:
+        for line in self.proc.stderr:
+            self._stderr.append(line.decode("utf-8", errors="replace").rstrip("\n"))
+        self.proc.stderr.close()
+
+    def describe(self) -> str:
+        try:
+            code: Optional[int] = self.proc.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            code = None
+        tail = " | ".join(self._stderr)
+        return f" (server exit code {code}; stderr: {tail})" if code is not None else ""
+
+    def close(self) -> None:
+        try:
+            self.writer.close()
+        except OSError:
+            pass
+        try:
+            self.proc.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            pass
+        kill_process_group(self.proc)
+        self.proc.wait()
+
+
+class _SocketConnection(_Connection):
+    def __init__(self, url: str, timeout_s: float) -> None:
+        if url.startswith("unix://"):
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            address: Any = url[len("unix://"):]
+        else:
+            host, _, port = url[len("tcp://"):].rstrip("/").rpartition(":")
+            self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            address = (host, int(port))
+        self.sock.settimeout(timeout_s)
+        self.sock.connect(address)
+        self.sock.settimeout(None)
+        self.reader = self.sock.makefile("rb")
+        self.writer = self.sock.makefile("wb")
+
+    def close(self) -> None:
+        # Shut down first: it wakes the reader thread, which holds the reader's lock.
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        for stream in (self.writer, self.reader):
+            try:
+                stream.close()
+            except OSError:
+                pass
+        self.sock.close()
+
+
+class McpSession:
+    """
+    One initialised MCP connection shared by any number of threads.
+
+    Requests get increasing ids and wait on a Future; a reader thread resolves them as responses
+    arrive, in any order, so concurrent calls are multiplexed over the one connection. Server pings
+    are answered; other server requests are refused. When the connection drops, every pending call
+    fails with McpConnectionError and the session reports `alive == False`.
+    """
+
+    def __init__(self, server_id: str, config: Dict[str, Any], connect_timeout_s: float = DEFAULT_CONNECT_TIMEOUT_S) -> None:
+        self.server_id = server_id
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, Future] = {}
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._closed = False
+        self.server_info: Dict[str, Any] = {}
+        try:
+            if "command" in config:
+                self._conn: _Connection = _StdioConnection(config)
+            else:
+                self._conn = _SocketConnection(config["url"], connect_timeout_s)
+        except OSError as e:
+            raise McpConnectionError(f"cannot connect to MCP server '{server_id}': {e}", retryable=True) from e
+        threading.Thread(target=self._read_loop, name=f"mcp-{server_id}", daemon=True).start()
+
+        try:
+            result = self.request(
+                "initialize",
+                {"protocolVersion": MCP_PROTOCOL_VERSION, "capabilities": {}, "clientInfo": CLIENT_INFO},
+                connect_timeout_s,
+            )
+            self._send({"jsonrpc": "2.0", "method": "notifications/initialized"})
+        except McpError as e:
+            self.close()
+            raise McpConnectionError(f"MCP server '{server_id}' failed to initialise: {e}", retryable=True) from e
+        self.server_info = result.get("serverInfo") or {}
+
+    @property
+    def alive(self) -> bool:
+        return not self._closed
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._pending)
+
+    def _send(self, message: Dict[str, Any]) -> None:
+        data = (json.dumps(message, separators=(",", ":")) + "\n").encode("utf-8")
+        try:
+            with self._write_lock:
+                self._conn.writer.write(data)
+                self._conn.writer.flush()
+        except (OSError, ValueError) as e:
+            self._fail_all(f"write failed: {e}")
+            raise McpConnectionError(f"MCP server '{self.server_id}' connection lost: {e}", retryable=True) from e
+
+    def _read_loop(self) -> None:
+        reason = "connection closed"
+        try:
+            for line in self._conn.reader:
+                if not line.strip():
+                    continue
+                try:
+                    message = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # not JSON-RPC (e.g. a stray log line); ignore it
+                if isinstance(message, dict):
+                    self._dispatch(message)
+        except (OSError, ValueError) as e:
+            reason = f"read failed: {e}"
+        try:
+            self._conn.reader.close()
+        except OSError:
+            pass
+        self._fail_all(reason + self._conn.describe())
+        # The server is gone: close our end too (and reap a stdio child), not just the reader.
+        self._conn.close()
+
+    def _dispatch(self, message: Dict[str, Any]) -> None:
+        if "method" in message:
+            if "id" in message:  # server -> client request
+                if message["method"] == "ping":
+                    reply: Dict[str, Any] = {"jsonrpc": "2.0", "id": message["id"], "result": {}}
+                else:
+                    reply = {
+                        "jsonrpc": "2.0",
+                        "id": message["id"],
+                        "error": {"code": -32601, "message": f"Method not found: {message['method']}"},
+                    }
+                try:
+                    self._send(reply)
+                except McpConnectionError:
+                    pass
+            return  # notifications (progress, logging, list_changed) are not used
+        with self._lock:
+            future = self._pending.pop(message.get("id"), None)
+        if future is None:
+            return  # late reply to a call that already timed out
+        if "error" in message:
+            error = message["error"] if isinstance(message["error"], dict) else {}
+            future.set_exception(McpError(f"{error.get('message', 'error')} (code {error.get('code')})"))
+        else:
+            future.set_result(message.get("result") or {})
+
+    def _fail_all(self, reason: str) -> None:
+        with self._lock:
+            if self._closed and not self._pending:
+                return
+            self._closed = True
+            pending, self._pending = list(self._pending.values()), {}
+        for future in pending:
+            if not future.done():
+                future.set_exception(McpConnectionError(f"MCP server '{self.server_id}' {reason}"))
+
+    def start(self, method: str, params: Dict[str, Any]) -> Tuple[int, Future]:
+        """Send a request and return its id and the Future its reply resolves."""
+        request_id = next(self._ids)
+        future: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise McpConnectionError(f"MCP session to '{self.server_id}' is closed", retryable=True)
+            self._pending[request_id] = future
+        self._send({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params})
+        return request_id, future
+
+    def cancel(self, request_id: int, reason: str) -> None:
+        """Stop waiting for a request and tell the server; a late reply is dropped."""
+        with self._lock:
+            self._pending.pop(request_id, None)
+        try:
+            self._send({
+                "jsonrpc": "2.0",
+                "method": "notifications/cancelled",
+                "params": {"requestId": request_id, "reason": reason},
+            })
+        except McpConnectionError:
+            pass
+
+    def request(self, method: str, params: Dict[str, Any], timeout_s: float) -> Dict[str, Any]:
+        request_id, future = self.start(method, params)
+        try:
+            return future.result(timeout=timeout_s)
+        except FutureTimeoutError:
+            self.cancel(request_id, "timeout")
+            raise McpError(f"'{method}' on MCP server '{self.server_id}' timed out after {timeout_s:.3f}s") from None
+
+    def call_tool(self, name: str, arguments: Dict[str, Any], timeout_s: float) -> Dict[str, Any]:
+        return self.request("tools/call", {"name": name, "arguments": arguments}, timeout_s)
+
+    async def call_tool_async(self, name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Awaitable call_tool; the caller bounds it (e.g. asyncio.wait_for) and a cancel is sent on."""
+        request_id, future = self.start("tools/call", {"name": name, "arguments": arguments})
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            self.cancel(request_id, "cancelled")
+            raise
+
+    def close(self) -> None:
+        self._fail_all("session closed")
+        self._conn.close()
+
+
+class McpSessionPool:
+    """
+    Up to `size` sessions to one MCP server; each call goes to the session with the fewest calls in
+    flight. Dead sessions are dropped and reconnected on the next call, and a call that could not be
+    sent is retried once on a new session.
+    """
+
+    def __init__(self, server_id: str, config: Dict[str, Any], size: Optional[int] = None) -> None:
+        self.server_id = server_id
+        self.config = config
+        self.size = max(1, int(size or config.get("sessions") or DEFAULT_SESSIONS))
+        self._sessions: List[McpSession] = []
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.reconnects = 0
+
+    def _session(self, blocking: bool = True) -> Optional[McpSession]:
+        """
+        The least busy live session, connecting a new one while there are fewer than `size`.
+        With `blocking=False`, None instead of waiting for the lock or for a connect.
+        """
+        if not self._lock.acquire(blocking):
+            return None
+        try:
+            dead = [s for s in self._sessions if not s.alive]
+            if dead:
+                self._sessions = [s for s in self._sessions if s.alive]
+                self.reconnects += len(dead)
+                for session in dead:
+                    session.close()
+            idle = [s for s in self._sessions if s.in_flight == 0]
+            if idle:
+                return idle[0]
+            if len(self._sessions) >= self.size:
+                return min(self._sessions, key=lambda s: s.in_flight)
+            if not blocking:
+                return None
+            # Connect under the lock so concurrent first calls do not each open a session.
+            session = McpSession(
+                self.server_id, self.config, self.config.get("connect_timeout_s", DEFAULT_CONNECT_TIMEOUT_S)
+            )
+            self._sessions.append(session)
+            self.connects += 1
+            return session
+        finally:
+            self._lock.release()
+
+    def call_tool(self, name: str, arguments: Dict[str, Any], timeout_s: float) -> Dict[str, Any]:
+        for attempt in (1, 2):
+            session = self._session()
+            try:
+                return session.call_tool(name, arguments, timeout_s)
+            except McpConnectionError as e:
+                if not e.retryable or attempt == 2:
+                    raise
+        raise AssertionError("unreachable")
+
+    async def call_tool_async(self, name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """call_tool for asyncio callers; connecting (rare) happens on the default executor."""
+        for attempt in (1, 2):
+            session = self._session(blocking=False)
+            if session is None:
+                session = await asyncio.get_running_loop().run_in_executor(None, self._session)
+            try:
+                return await session.call_tool_async(name, arguments)
+            except McpConnectionError as e:
+                if not e.retryable or attempt == 2:
+                    raise
+        raise AssertionError("unreachable")
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "in_flight": sum(s.in_flight for s in self._sessions),
+                "connects": self.connects,
+                "reconnects": self.reconnects,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            sessions, self._sessions = self._sessions, []
+        for session in sessions:
+            session.close()
+
+
+def tool_output(result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    vPort output for a `tools/call` result: `structuredContent` when the tool returns it, else
+    `{"content": [...]}`. A result flagged `isError` raises McpError with its text content.
+    """
+    content = result.get("content") if isinstance(result.get("content"), list) else []
+    if result.get("isError"):
+        text = " ".join(str(c.get("text", "")) for c in content if isinstance(c, dict)).strip()
+        raise McpError(text or "tool reported an error")
+    structured = result.get("structuredContent")
+    if isinstance(structured, dict):
+        return structured
+    return {"content": content}
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import functools
+import os
+import sys
+from importlib import import_module
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+PythonHandler = Callable[[Dict[str, Any]], Any]
+
+PYTHON_MODES = ("inline", "thread", "process")
+
+
+class HandlerResolutionError(Exception):
+    """The module cannot be imported or does not expose a callable handler."""
+
+
+@functools.lru_cache(maxsize=None)
+def resolve_handler(module_path: str, handler_name: str) -> PythonHandler:
+    """Import `module_path` and look up `handler_name` once per process; failures are not cached."""
+    try:
+        module = import_module(module_path)
+    except ImportError as e:
+        raise HandlerResolutionError(f"Failed to import module '{module_path}': {e}") from e
+
+    handler = getattr(module, handler_name, None)
+    if handler is None or not callable(handler):
+        raise HandlerResolutionError(
+            f"Handler '{handler_name}' not found or not callable in module '{module_path}'"
+        )
+    return handler
+
+
+def worker_command(module_path: str, handler_name: str) -> List[str]:
+    """Command line of a process-mode worker serving one handler (see vport_bin_pool.serve_worker)."""
+    return [sys.executable, str(Path(__file__).resolve()), module_path, handler_name]
+
+
+def worker_env() -> Dict[str, str]:
+    """Environment for process-mode workers: the parent's sys.path, so handler modules import the same."""
+    env = dict(os.environ)
+    paths = [p for p in sys.path if p] + [p for p in env.get("PYTHONPATH", "").split(os.pathsep) if p]
+    env["PYTHONPATH"] = os.pathsep.join(dict.fromkeys(paths))
+    return env
+
+
+def _main(argv: List[str]) -> int:
+    from vport_bin_pool import serve_worker
+
+    module_path, handler_name = argv
+    # Resolved before the first request, so the worker is warm when the pool hands it out.
+    serve_worker(resolve_handler(module_path, handler_name))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(_main(sys.argv[1:]))
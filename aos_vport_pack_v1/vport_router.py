@@ -1,15 +1,53 @@
 from __future__ import annotations
 
+import asyncio
+import copy
+import itertools
 import json
+import os
 import subprocess
+import threading
 import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from dataclasses import dataclass
-from importlib import import_module
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple
 
-import requests
 from jsonschema import Draft7Validator
+from referencing import Registry, Resource
+from referencing.jsonschema import DRAFT7
+
+try:  # optional: compiled schema checks
+    import fastjsonschema
+except ImportError:  # pragma: no cover - depends on the environment
+    fastjsonschema = None
+
+from vport_bin_pool import (
+    DEFAULT_HEALTH_CHECK_S,
+    DEFAULT_MAX_REQUESTS,
+    DEFAULT_POOL_SIZE,
+    BinWorkerError,
+    BinWorkerPool,
+    kill_process_group,
+)
+from vport_cache import (
+    DEFAULT_MAX_BYTES as DEFAULT_CACHE_MAX_BYTES,
+    DEFAULT_TTL_S as DEFAULT_CACHE_TTL_S,
+    ResultCache,
+    SingleFlight,
+    cache_key,
+)
+from vport_http import AsyncHttpTransport, HttpCallError, HttpTransport, httpx
+from vport_mcp import McpError, McpSessionPool, load_mcp_servers, tool_output
+from vport_python import (
+    HandlerResolutionError,
+    PythonHandler,
+    resolve_handler,
+    worker_command,
+    worker_env,
+)
 
 
 @dataclass
@@ -24,6 +62,12 @@ class RegistryEntry:
     raw: Dict[str, Any] = None
 
 
+VALIDATION_STRICT = "strict"
+VALIDATION_SAMPLED = "sampled"
+VALIDATION_TRUSTED = "trusted"
+VALIDATION_MODES = (VALIDATION_STRICT, VALIDATION_SAMPLED, VALIDATION_TRUSTED)
+
+
 class VPortRouterError(Exception):
     pass
 
@@ -40,13 +84,104 @@ class VPortExecutionError(VPortRouterError):
     pass
 
 
+def _error_report(validator: Draft7Validator, instance: Any) -> str:
+    errors = sorted(validator.iter_errors(instance), key=lambda e: e.path)
+    return "; ".join(
+        [f"{'/'.join(str(p) for p in err.path)}: {err.message}"
+         for err in errors]
+    )
+
+
+def _compile_checker(
+    validator: Draft7Validator,
+    schemas_by_id: Dict[str, Dict[str, Any]],
+    compile_schemas: bool,
+) -> Callable[[Any], bool]:
+    """
+    Boolean check for `validator`'s schema: a fastjsonschema-generated function when requested and
+    installed (cross-schema $refs resolve by $id), else jsonschema's is_valid.
+    """
+    if compile_schemas and fastjsonschema is not None:
+        try:
+            compiled = fastjsonschema.compile(
+                validator.schema,
+                handlers={"": schemas_by_id.__getitem__},
+                # never fill defaults into (i.e. mutate) the caller's envelope
+                use_default=False,
+                use_formats=False,
+                detailed_exceptions=False,
+            )
+        except Exception:
+            compiled = None
+        if compiled is not None:
+            def check(instance: Any) -> bool:
+                try:
+                    compiled(instance)
+                except fastjsonschema.JsonSchemaException:
+                    return False
+                return True
+
+            return check
+    return validator.is_valid
+
+
+def _call_structure_error(call_envelope: Any) -> Optional[str]:
+    """What the router itself relies on in a call envelope; the schema's remaining rules are skipped."""
+    if not isinstance(call_envelope, dict):
+        return "envelope must be an object"
+    if not isinstance(call_envelope.get("vport"), str):
+        return "vport: must be a string"
+    if not isinstance(call_envelope.get("payload"), dict):
+        return "payload: must be an object"
+    options = call_envelope.get("options")
+    if options is not None:
+        if not isinstance(options, dict):
+            return "options: must be an object"
+        timeout_ms = options.get("timeout_ms")
+        if timeout_ms is not None and (
+            not isinstance(timeout_ms, int) or isinstance(timeout_ms, bool) or timeout_ms < 1
+        ):
+            return "options/timeout_ms: must be a positive integer"
+    request_id = call_envelope.get("request_id")
+    if request_id is not None and not isinstance(request_id, str):
+        return "request_id: must be a string"
+    return None
+
+
 class VPortRouter:
     def __init__(
         self,
         base_dir: Optional[Path] = None,
         registry_path: Optional[Path] = None,
         schema_dir: Optional[Path] = None,
+        max_threads: Optional[int] = None,
+        mcp_servers_path: Optional[Path] = None,
+        cache_max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+        cache_dir: Optional[Path] = None,
+        validation: str = VALIDATION_STRICT,
+        validation_sample_rate: int = 100,
+        compile_schemas: bool = True,
     ) -> None:
+        """
+        `validation` sets how much of each call is checked against the vPort schemas:
+
+        - "strict" (default): every call envelope and every result envelope.
+        - "sampled": the call envelope of one call in `validation_sample_rate`; the rest get a
+          structural check (vport, payload, options types).
+        - "trusted": structural checks only, for internal callers that build envelopes themselves.
+
+        Result envelopes are built by the router, so outside strict mode only the parts taken from
+        the target and the caller (output, request_id) are checked. With `compile_schemas`, the
+        schemas are compiled with fastjsonschema when it is installed; error reports always come
+        from jsonschema.
+
+        Registry entries with `cacheable: true` have successful outputs cached for `cache_ttl_s`
+        seconds (default 300) under a hash of vport, target and payload: in memory up to
+        `cache_max_bytes`, and as files under `cache_dir` when given. Identical calls that arrive
+        while one is running wait for its outcome instead of running again.
+        """
+        if validation not in VALIDATION_MODES:
+            raise ValueError(f"validation must be one of {VALIDATION_MODES}, got {validation!r}")
         self.base_dir = base_dir or Path(__file__).parent
         self.config_dir = self.base_dir / "config"
         self.schemas_dir = schema_dir or (self.base_dir / "schemas" / "vport")
@@ -54,6 +189,9 @@ class VPortRouter:
         self.registry_path = registry_path or (
             self.config_dir / "vports.registry.v1.jsonl"
         )
+        self.mcp_servers_path = mcp_servers_path or (
+            self.config_dir / "mcp.servers.v1.json"
+        )
 
         self._schema_registry_entry = self._load_schema(
             "vport.registry_entry.schema.v1.json"
@@ -61,15 +199,81 @@ class VPortRouter:
         self._schema_call = self._load_schema("vport.call.schema.v1.json")
         self._schema_result = self._load_schema("vport.result.schema.v1.json")
 
+        # Cross-schema "$ref"s (e.g. aos.vport.id.schema.v1) resolve by $id
+        # against every schema in the directory.
+        schema_store, schemas_by_id = self._load_schema_store()
         self._validator_registry_entry = Draft7Validator(
-            self._schema_registry_entry
+            self._schema_registry_entry, registry=schema_store
+        )
+        self._validator_call = Draft7Validator(
+            self._schema_call, registry=schema_store
+        )
+        self._validator_result = Draft7Validator(
+            self._schema_result, registry=schema_store
+        )
+        # Boolean checks compiled up front; the validators above only build error reports.
+        self._check_registry_entry = _compile_checker(
+            self._validator_registry_entry, schemas_by_id, compile_schemas
+        )
+        self._check_call = _compile_checker(
+            self._validator_call, schemas_by_id, compile_schemas
+        )
+        self._check_result = _compile_checker(
+            self._validator_result, schemas_by_id, compile_schemas
         )
-        self._validator_call = Draft7Validator(self._schema_call)
-        self._validator_result = Draft7Validator(self._schema_result)
+        self.validation = validation
+        self.validation_sample_rate = max(1, validation_sample_rate)
+        self._call_counter = itertools.count()
+
+        self._http = HttpTransport()
+        # httpx clients are bound to the event loop that created them.
+        self._async_http: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncHttpTransport]" = (
+            weakref.WeakKeyDictionary()
+        )
+        # Thread pool for python handlers called from call_vport_async.
+        self.max_threads = max_threads
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        # Worker process pools per vPort (bin_mode "worker", python_mode "process"),
+        # started on first call.
+        self._worker_pools: Dict[str, BinWorkerPool] = {}
+        self._worker_pools_lock = threading.Lock()
+        # MCP session pools per mcp_server_id; the server map is read on first use.
+        self._mcp_servers: Optional[Dict[str, Dict[str, Any]]] = None
+        self._mcp_pools: Dict[str, McpSessionPool] = {}
+        self.cache = ResultCache(max_bytes=cache_max_bytes, directory=cache_dir)
+        self._flights = SingleFlight()
 
         self._registry: Dict[str, RegistryEntry] = {}
         self._load_registry()
 
+    def close(self) -> None:
+        """Release pooled connections, worker processes, MCP sessions and the handler thread pool."""
+        self._http.close()
+        with self._worker_pools_lock:
+            pools, self._worker_pools = list(self._worker_pools.values()), {}
+            mcp_pools, self._mcp_pools = list(self._mcp_pools.values()), {}
+        for pool in pools:
+            pool.close()
+        for mcp_pool in mcp_pools:
+            mcp_pool.close()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def aclose(self) -> None:
+        """close(), plus the async HTTP clients of the running event loop."""
+        transport = self._async_http.pop(asyncio.get_running_loop(), None)
+        if transport is not None:
+            await transport.aclose()
+        self.close()
+
+    def __enter__(self) -> "VPortRouter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
     def _load_schema(self, filename: str) -> Dict[str, Any]:
         path = self.schemas_dir / filename
         if not path.exists():
@@ -77,6 +281,19 @@ class VPortRouter:
         with path.open("r", encoding="utf-8") as f:
             return json.load(f)
 
+    def _load_schema_store(self) -> Tuple[Registry, Dict[str, Dict[str, Any]]]:
+        schemas_by_id: Dict[str, Dict[str, Any]] = {}
+        for path in sorted(self.schemas_dir.glob("*.json")):
+            with path.open("r", encoding="utf-8") as f:
+                schema = json.load(f)
+            if "$id" in schema:
+                schemas_by_id[schema["$id"]] = schema
+        store = Registry().with_resources(
+            (schema_id, Resource.from_contents(schema, default_specification=DRAFT7))
+            for schema_id, schema in schemas_by_id.items()
+        )
+        return store, schemas_by_id
+
     def _load_registry(self) -> None:
         if not self.registry_path.exists():
             raise RuntimeError(f"Registry file not found: {self.registry_path}")
@@ -95,15 +312,8 @@ class VPortRouter:
                         f"Invalid JSON on line {lineno} of {self.registry_path}: {e}"
                     ) from e
 
-                errors = sorted(
-                    self._validator_registry_entry.iter_errors(data),
-                    key=lambda e: e.path,
-                )
-                if errors:
-                    msg = "; ".join(
-                        [f"{'/'.join(str(p) for p in err.path)}: {err.message}"
-                         for err in errors]
-                    )
+                if not self._check_registry_entry(data):
+                    msg = _error_report(self._validator_registry_entry, data)
                     raise RuntimeError(
                         f"Registry entry on line {lineno} is invalid: {msg}"
                     )
@@ -137,17 +347,17 @@ class VPortRouter:
 
         return entry
 
-    def call_vport(self, call_envelope: Dict[str, Any]) -> Dict[str, Any]:
-        errors = sorted(
-            self._validator_call.iter_errors(call_envelope),
-            key=lambda e: e.path,
-        )
-        if errors:
-            msg = "; ".join(
-                [f"{'/'.join(str(p) for p in err.path)}: {err.message}"
-                 for err in errors]
-            )
-            raise VPortRouterError(f"Invalid vPort call envelope: {msg}")
+    def _prepare_call(
+        self, call_envelope: Dict[str, Any]
+    ) -> Tuple[RegistryEntry, Dict[str, Any], Optional[str], int]:
+        if self._validate_call_fully():
+            if not self._check_call(call_envelope):
+                msg = _error_report(self._validator_call, call_envelope)
+                raise VPortRouterError(f"Invalid vPort call envelope: {msg}")
+        else:
+            msg = _call_structure_error(call_envelope)
+            if msg:
+                raise VPortRouterError(f"Invalid vPort call envelope: {msg}")
 
         vport = call_envelope["vport"]
         payload = call_envelope.get("payload", {})
@@ -156,100 +366,377 @@ class VPortRouter:
         timeout_ms = options.get("timeout_ms")
 
         entry = self.get_entry(vport)
-        effective_timeout_ms = timeout_ms or entry.default_timeout_ms
+        return entry, payload, request_id, timeout_ms or entry.default_timeout_ms
 
-        start_time = time.monotonic()
-        try:
-            if entry.call_type == "python":
-                output = self._execute_python(entry, payload, effective_timeout_ms)
-            elif entry.call_type == "bin":
-                output = self._execute_bin(entry, payload, effective_timeout_ms)
-            elif entry.call_type == "http":
-                output = self._execute_http(entry, payload, effective_timeout_ms)
-            elif entry.call_type == "mcp":
-                raise VPortExecutionError(
-                    f"MCP call_type not implemented for vPort: {vport}"
-                )
-            else:
-                raise VPortExecutionError(
-                    f"Unsupported call_type '{entry.call_type}' for vPort: {vport}"
-                )
+    def _validate_call_fully(self) -> bool:
+        if self.validation == VALIDATION_STRICT:
+            return True
+        if self.validation == VALIDATION_SAMPLED:
+            return next(self._call_counter) % self.validation_sample_rate == 0
+        return False
 
-            status = "success"
-            error_obj = None
-        except VPortExecutionError as e:
-            status = "error"
-            output = {}
-            error_obj = {
+    @staticmethod
+    def _error_object(e: Exception) -> Dict[str, Any]:
+        if isinstance(e, VPortExecutionError):
+            return {
                 "message": str(e),
                 "code": "EXECUTION_ERROR",
                 "details": {}
             }
-        except Exception as e:
-            status = "error"
-            output = {}
-            error_obj = {
-                "message": f"Unexpected error: {e}",
-                "code": "UNEXPECTED_ERROR",
-                "details": {}
-            }
+        return {
+            "message": f"Unexpected error: {e}",
+            "code": "UNEXPECTED_ERROR",
+            "details": {}
+        }
 
+    def _result_envelope(
+        self,
+        entry: RegistryEntry,
+        request_id: Optional[str],
+        start_time: float,
+        output: Dict[str, Any],
+        error_obj: Optional[Dict[str, Any]],
+        cache_status: Optional[str] = None,
+    ) -> Dict[str, Any]:
         elapsed_ms = int((time.monotonic() - start_time) * 1000)
-        result_envelope: Dict[str, Any] = {
-            "request_id": request_id,
-            "vport": vport,
-            "status": status,
+        # The result schema types request_id and error, so they are left out rather than null.
+        result_envelope: Dict[str, Any] = {}
+        if request_id is not None:
+            result_envelope["request_id"] = request_id
+        result_envelope.update({
+            "vport": entry.vport,
+            "status": "error" if error_obj is not None else "success",
             "output": output,
-            "error": error_obj,
-            "meta": {
-                "elapsed_ms": elapsed_ms,
-                "call_type": entry.call_type
-            }
+        })
+        if error_obj is not None:
+            result_envelope["error"] = error_obj
+        result_envelope["meta"] = {
+            "elapsed_ms": elapsed_ms,
+            "call_type": entry.call_type
         }
+        if cache_status is not None:
+            result_envelope["meta"]["cache"] = cache_status
 
-        errors = sorted(
-            self._validator_result.iter_errors(result_envelope),
-            key=lambda e: e.path,
-        )
-        if errors:
-            msg = "; ".join(
-                [f"{'/'.join(str(p) for p in err.path)}: {err.message}"
-                 for err in errors]
-            )
+        if self.validation == VALIDATION_STRICT:
+            valid = self._check_result(result_envelope)
+        else:
+            # Everything else in the envelope is built here and matches the schema by construction.
+            valid = isinstance(output, dict) and (request_id is None or isinstance(request_id, str))
+        if not valid:
+            msg = _error_report(self._validator_result, result_envelope)
             raise VPortRouterError(
                 f"vPort result envelope failed schema validation: {msg}"
             )
 
         return result_envelope
 
-    def _execute_python(
+    def call_vport(self, call_envelope: Dict[str, Any]) -> Dict[str, Any]:
+        entry, payload, request_id, timeout_ms = self._prepare_call(call_envelope)
+
+        start_time = time.monotonic()
+        cache_status = None
+        try:
+            key = self._cache_key(entry, payload)
+            if key is not None:
+                output, cache_status = self._call_cached(entry, payload, timeout_ms, key)
+            else:
+                output = self._execute(entry, payload, timeout_ms)
+            error_obj = None
+        except Exception as e:
+            output = {}
+            error_obj = self._error_object(e)
+
+        return self._result_envelope(
+            entry, request_id, start_time, output, error_obj, cache_status
+        )
+
+    def _execute(
         self,
         entry: RegistryEntry,
         payload: Dict[str, Any],
         timeout_ms: int,
     ) -> Dict[str, Any]:
-        module_path = entry.target.get("python_module")
-        handler_name = entry.target.get("python_handler")
+        if entry.call_type == "python":
+            return self._execute_python(entry, payload, timeout_ms)
+        if entry.call_type == "bin":
+            return self._execute_bin(entry, payload, timeout_ms)
+        if entry.call_type == "http":
+            return self._execute_http(entry, payload, timeout_ms)
+        if entry.call_type == "mcp":
+            return self._execute_mcp(entry, payload, timeout_ms)
+        raise VPortExecutionError(
+            f"Unsupported call_type '{entry.call_type}' for vPort: {entry.vport}"
+        )
 
-        if not module_path or not handler_name:
-            raise VPortExecutionError(
-                f"Missing python_module or python_handler for vPort: {entry.vport}"
-            )
+    def _cache_key(self, entry: RegistryEntry, payload: Dict[str, Any]) -> Optional[str]:
+        """Cache key for calls to a `cacheable` entry; None when the call is not cached."""
+        if not (entry.raw or {}).get("cacheable"):
+            return None
+        try:
+            return cache_key(entry.vport, entry.target, payload)
+        except (TypeError, ValueError):
+            return None  # payload is not JSON (possible when validation is relaxed)
+
+    def _store_result(self, entry: RegistryEntry, key: str, output: Dict[str, Any]) -> None:
+        ttl_s = (entry.raw or {}).get("cache_ttl_s", DEFAULT_CACHE_TTL_S)
+        self.cache.put(key, output, ttl_s)
+
+    def _call_cached(
+        self,
+        entry: RegistryEntry,
+        payload: Dict[str, Any],
+        timeout_ms: int,
+        key: str,
+    ) -> Tuple[Dict[str, Any], str]:
+        """(output, "hit" | "miss" | "coalesced") for a cacheable call; only successes are stored."""
+        output = self.cache.get(key)
+        if output is not None:
+            return output, "hit"
+        future, leader = self._flights.join(key)
+        if not leader:
+            try:
+                return copy.deepcopy(future.result(timeout=timeout_ms / 1000.0)), "coalesced"
+            except FutureTimeoutError:
+                raise VPortExecutionError(
+                    f"vPort {entry.vport} timed out after {timeout_ms} ms "
+                    f"waiting for an identical call in flight"
+                ) from None
 
         try:
-            module = import_module(module_path)
-        except ImportError as e:
-            raise VPortExecutionError(
-                f"Failed to import module '{module_path}' for vPort {entry.vport}: {e}"
-            ) from e
+            # A leader that finished between the lookup and join() has stored its output.
+            output = self.cache.get(key, count_miss=False)
+            cache_status = "hit"
+            if output is None:
+                output = self._execute(entry, payload, timeout_ms)
+                cache_status = "miss"
+                self._store_result(entry, key, output)
+        except BaseException as e:
+            self._flights.finish(key, future, error=e)
+            raise
+        # Followers get a snapshot: the caller may mutate `output` before they wake up.
+        self._flights.finish(key, future, copy.deepcopy(output))
+        return output, cache_status
+
+    async def call_vport_async(self, call_envelope: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        asyncio counterpart of call_vport.
+
+        bin vPorts run via asyncio subprocesses, http vPorts on the httpx transport
+        (the pooled requests transport in a thread if httpx is missing) and python
+        handlers on the router's thread pool. The effective timeout bounds the whole
+        call; a timed-out subprocess is killed, a python handler thread cannot be and
+        finishes in the background. mcp calls await their reply on a shared session;
+        a timed-out call is cancelled on the server.
+        """
+        entry, payload, request_id, timeout_ms = self._prepare_call(call_envelope)
+
+        start_time = time.monotonic()
+        cache_status = None
+        try:
+            key = self._cache_key(entry, payload)
+            if key is not None:
+                output, cache_status = await self._call_cached_async(
+                    entry, payload, timeout_ms, key
+                )
+            else:
+                output = await self._execute_with_timeout(entry, payload, timeout_ms)
+            error_obj = None
+        except Exception as e:
+            output = {}
+            error_obj = self._error_object(e)
 
-        handler = getattr(module, handler_name, None)
-        if handler is None or not callable(handler):
+        return self._result_envelope(
+            entry, request_id, start_time, output, error_obj, cache_status
+        )
+
+    async def _execute_with_timeout(
+        self,
+        entry: RegistryEntry,
+        payload: Dict[str, Any],
+        timeout_ms: int,
+    ) -> Dict[str, Any]:
+        try:
+            return await asyncio.wait_for(
+                self._execute_async(entry, payload, timeout_ms),
+                timeout_ms / 1000.0,
+            )
+        except asyncio.TimeoutError:
             raise VPortExecutionError(
-                f"Handler '{handler_name}' not found or not callable in module '{module_path}'"
+                f"vPort {entry.vport} timed out after {timeout_ms} ms"
+            ) from None
+
+    async def _call_cached_async(
+        self,
+        entry: RegistryEntry,
+        payload: Dict[str, Any],
+        timeout_ms: int,
+        key: str,
+    ) -> Tuple[Dict[str, Any], str]:
+        """asyncio counterpart of _call_cached; sync and async callers share in-flight calls."""
+        output = self.cache.get(key)
+        if output is not None:
+            return output, "hit"
+        future, leader = self._flights.join(key)
+        if not leader:
+            try:
+                # shield: a follower giving up must not cancel the shared future.
+                shared = await asyncio.wait_for(
+                    asyncio.shield(asyncio.wrap_future(future)), timeout_ms / 1000.0
+                )
+            except asyncio.TimeoutError:
+                raise VPortExecutionError(
+                    f"vPort {entry.vport} timed out after {timeout_ms} ms "
+                    f"waiting for an identical call in flight"
+                ) from None
+            return copy.deepcopy(shared), "coalesced"
+
+        try:
+            output = self.cache.get(key, count_miss=False)
+            cache_status = "hit"
+            if output is None:
+                output = await self._execute_with_timeout(entry, payload, timeout_ms)
+                cache_status = "miss"
+                self._store_result(entry, key, output)
+        except asyncio.CancelledError:
+            self._flights.finish(key, future, error=VPortExecutionError(
+                f"Identical in-flight call to vPort {entry.vport} was cancelled"
+            ))
+            raise
+        except BaseException as e:
+            self._flights.finish(key, future, error=e)
+            raise
+        # Followers get a snapshot: the caller may mutate `output` before they wake up.
+        self._flights.finish(key, future, copy.deepcopy(output))
+        return output, cache_status
+
+    async def call_many(
+        self,
+        call_envelopes: Iterable[Dict[str, Any]],
+        concurrency: int = 16,
+        per_vport_limit: Optional[int] = None,
+        return_exceptions: bool = False,
+    ) -> AsyncIterator[Tuple[int, Any]]:
+        """
+        Run many calls concurrently, yielding (index, result envelope) as each completes.
+
+        At most `concurrency` calls are in flight overall and at most `max_concurrency`
+        (registry entry) or `per_vport_limit` per vPort. Envelopes that raise
+        VPortRouterError (invalid, unknown or disabled vPort) stop the fan-out, or are
+        yielded as (index, exception) with `return_exceptions=True`.
+        """
+        overall = asyncio.Semaphore(max(1, concurrency))
+        per_vport: Dict[str, asyncio.Semaphore] = {}
+
+        def vport_limit(vport: Any) -> Optional[asyncio.Semaphore]:
+            entry = self._registry.get(vport) if isinstance(vport, str) else None
+            limit = (entry.raw or {}).get("max_concurrency") if entry else None
+            limit = limit or per_vport_limit
+            if not limit:
+                return None
+            if vport not in per_vport:
+                per_vport[vport] = asyncio.Semaphore(limit)
+            return per_vport[vport]
+
+        async def run(index: int, envelope: Dict[str, Any]) -> Tuple[int, Any]:
+            limit = vport_limit(envelope.get("vport"))
+            try:
+                async with overall:
+                    if limit is None:
+                        return index, await self.call_vport_async(envelope)
+                    async with limit:
+                        return index, await self.call_vport_async(envelope)
+            except VPortRouterError as e:
+                if not return_exceptions:
+                    raise
+                return index, e
+
+        tasks = [
+            asyncio.ensure_future(run(index, envelope))
+            for index, envelope in enumerate(call_envelopes)
+        ]
+        try:
+            for done in asyncio.as_completed(tasks):
+                yield await done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _execute_async(
+        self,
+        entry: RegistryEntry,
+        payload: Dict[str, Any],
+        timeout_ms: int,
+    ) -> Dict[str, Any]:
+        if entry.call_type == "python":
+            # Inline and thread mode both call the handler on the thread pool here (waiting
+            # for a second pool thread could deadlock); call_vport_async enforces the timeout.
+            loop = asyncio.get_running_loop()
+            if entry.target.get("python_mode") == "process":
+                return await loop.run_in_executor(
+                    self._thread_pool(), self._execute_python, entry, payload, timeout_ms
+                )
+            return await loop.run_in_executor(
+                self._thread_pool(), self._call_python_handler, entry, payload
             )
+        if entry.call_type == "bin":
+            return await self._execute_bin_async(entry, payload, timeout_ms)
+        if entry.call_type == "http":
+            return await self._execute_http_async(entry, payload, timeout_ms)
+        if entry.call_type == "mcp":
+            return await self._execute_mcp_async(entry, payload)
+        raise VPortExecutionError(
+            f"Unsupported call_type '{entry.call_type}' for vPort: {entry.vport}"
+        )
+
+    def _thread_pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_threads,
+                        thread_name_prefix="vport-router",
+                    )
+        return self._executor
+
+    def _execute_python(
+        self,
+        entry: RegistryEntry,
+        payload: Dict[str, Any],
+        timeout_ms: int,
+    ) -> Dict[str, Any]:
+        """
+        Run a python handler in the entry's `python_mode`.
+
+        - inline (default): called on the caller's thread; the timeout cannot be enforced.
+        - thread: called on the router's thread pool and abandoned after the timeout.
+        - process: sent to a pool of warm worker processes that have the handler imported; a
+          worker that overruns the timeout is killed and replaced.
+        """
+        mode = entry.target.get("python_mode", "inline")
+        if mode == "process":
+            pool = self._worker_pool(entry, self._new_python_pool)
+            try:
+                return pool.call(payload, timeout_ms)
+            except BinWorkerError as e:
+                raise VPortExecutionError(
+                    f"Python worker failed for vPort {entry.vport}: {e}"
+                ) from e
+
+        if mode == "thread":
+            future = self._thread_pool().submit(self._call_python_handler, entry, payload)
+            try:
+                return future.result(timeout=timeout_ms / 1000.0)
+            except FutureTimeoutError as e:
+                raise VPortExecutionError(
+                    f"Python handler for vPort {entry.vport} timed out after {timeout_ms} ms"
+                ) from e
+
+        return self._call_python_handler(entry, payload)
 
-        result = handler(payload)
+    def _call_python_handler(
+        self, entry: RegistryEntry, payload: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        result = self._python_handler(entry)(payload)
         if not isinstance(result, dict):
             raise VPortExecutionError(
                 f"Python handler for vPort {entry.vport} returned non-dict: {type(result)}"
@@ -257,54 +744,194 @@ class VPortRouter:
 
         return result
 
+    @staticmethod
+    def _python_target(entry: RegistryEntry) -> Tuple[str, str]:
+        module_path = entry.target.get("python_module")
+        handler_name = entry.target.get("python_handler")
+
+        if not module_path or not handler_name:
+            raise VPortExecutionError(
+                f"Missing python_module or python_handler for vPort: {entry.vport}"
+            )
+        return module_path, handler_name
+
+    def _python_handler(self, entry: RegistryEntry) -> PythonHandler:
+        try:
+            return resolve_handler(*self._python_target(entry))
+        except HandlerResolutionError as e:
+            raise VPortExecutionError(f"{e} (vPort {entry.vport})") from e
+
+    def _new_python_pool(self, entry: RegistryEntry) -> BinWorkerPool:
+        target = entry.target
+        return BinWorkerPool(
+            worker_command(*self._python_target(entry)),
+            size=target.get("python_pool_size", DEFAULT_POOL_SIZE),
+            max_requests=target.get("python_max_requests", DEFAULT_MAX_REQUESTS),
+            env=worker_env(),
+        )
+
     def _execute_bin(
         self,
         entry: RegistryEntry,
         payload: Dict[str, Any],
         timeout_ms: int,
     ) -> Dict[str, Any]:
-        bin_command = entry.target.get("bin_command")
-        args_template = entry.target.get("bin_args_template", [])
-
-        if not bin_command:
+        if not entry.target.get("bin_command"):
             raise VPortExecutionError(
                 f"Missing bin_command for vPort: {entry.vport}"
             )
 
-        payload_json = json.dumps(payload)
-        args: List[str] = []
-        for item in args_template:
-            if "{payload_json}" in item:
-                args.append(item.replace("{payload_json}", payload_json))
-            else:
-                args.append(item)
+        if entry.target.get("bin_mode") == "worker":
+            try:
+                return self._worker_pool(entry, self._new_bin_pool).call(payload, timeout_ms)
+            except BinWorkerError as e:
+                raise VPortExecutionError(
+                    f"Binary worker failed for vPort {entry.vport}: {e}"
+                ) from e
 
-        cmd = [bin_command] + args
+        cmd = self._bin_command(entry, payload)
+        stdin_payload = self._bin_stdin(entry, payload)
 
         try:
-            completed = subprocess.run(
+            proc = subprocess.Popen(
                 cmd,
-                input=None,
-                capture_output=True,
+                stdin=subprocess.PIPE if stdin_payload is not None else None,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
                 text=True,
-                timeout=timeout_ms / 1000.0,
+                start_new_session=os.name == "posix",
             )
+        except OSError as e:
+            raise VPortExecutionError(
+                f"Failed to execute binary for vPort {entry.vport}: {e}"
+            ) from e
+
+        try:
+            stdout, stderr = proc.communicate(stdin_payload, timeout=timeout_ms / 1000.0)
         except subprocess.TimeoutExpired as e:
+            kill_process_group(proc)
+            proc.communicate()
             raise VPortExecutionError(
                 f"Binary command timed out for vPort {entry.vport}: {e}"
             ) from e
+
+        return self._bin_output(entry, proc.returncode, stdout, stderr)
+
+    def _worker_pool(
+        self,
+        entry: RegistryEntry,
+        factory: Callable[[RegistryEntry], BinWorkerPool],
+    ) -> BinWorkerPool:
+        pool = self._worker_pools.get(entry.vport)
+        if pool is not None:
+            return pool
+        with self._worker_pools_lock:
+            pool = self._worker_pools.get(entry.vport)
+            if pool is None:
+                try:
+                    pool = factory(entry)
+                except BinWorkerError as e:
+                    raise VPortExecutionError(
+                        f"Failed to start workers for vPort {entry.vport}: {e}"
+                    ) from e
+                self._worker_pools[entry.vport] = pool
+        return pool
+
+    @staticmethod
+    def _new_bin_pool(entry: RegistryEntry) -> BinWorkerPool:
+        target = entry.target
+        args = target.get("bin_args_template", [])
+        if any("{payload_json}" in arg for arg in args):
+            raise VPortExecutionError(
+                f"bin_mode 'worker' takes payloads on stdin; remove {{payload_json}} "
+                f"from bin_args_template for vPort {entry.vport}"
+            )
+        return BinWorkerPool(
+            [target["bin_command"]] + list(args),
+            size=target.get("bin_pool_size", DEFAULT_POOL_SIZE),
+            max_requests=target.get("bin_max_requests", DEFAULT_MAX_REQUESTS),
+            health_check_s=target.get("bin_health_check_s", DEFAULT_HEALTH_CHECK_S),
+        )
+
+    @staticmethod
+    def _bin_stdin(entry: RegistryEntry, payload: Dict[str, Any]) -> Optional[str]:
+        if entry.target.get("bin_payload_stdin"):
+            return json.dumps(payload)
+        return None
+
+    async def _execute_bin_async(
+        self,
+        entry: RegistryEntry,
+        payload: Dict[str, Any],
+        timeout_ms: int,
+    ) -> Dict[str, Any]:
+        if not entry.target.get("bin_command"):
+            raise VPortExecutionError(
+                f"Missing bin_command for vPort: {entry.vport}"
+            )
+        if entry.target.get("bin_mode") == "worker":
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._thread_pool(), self._execute_bin, entry, payload, timeout_ms
+            )
+
+        cmd = self._bin_command(entry, payload)
+        stdin_payload = self._bin_stdin(entry, payload)
+
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdin=asyncio.subprocess.PIPE if stdin_payload is not None else None,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                start_new_session=os.name == "posix",
+            )
         except OSError as e:
             raise VPortExecutionError(
                 f"Failed to execute binary for vPort {entry.vport}: {e}"
             ) from e
 
-        if completed.returncode != 0:
+        try:
+            stdout, stderr = await proc.communicate(
+                stdin_payload.encode("utf-8") if stdin_payload is not None else None
+            )
+        except BaseException:
+            # Cancelled, e.g. by call_vport_async's timeout: do not leave the child behind.
+            if proc.returncode is None:
+                kill_process_group(proc)
+                await proc.wait()
+            raise
+
+        return self._bin_output(
+            entry,
+            proc.returncode,
+            stdout.decode("utf-8", errors="replace"),
+            stderr.decode("utf-8", errors="replace"),
+        )
+
+    @staticmethod
+    def _bin_command(entry: RegistryEntry, payload: Dict[str, Any]) -> List[str]:
+        payload_json = json.dumps(payload)
+        args: List[str] = []
+        for item in entry.target.get("bin_args_template", []):
+            if "{payload_json}" in item:
+                args.append(item.replace("{payload_json}", payload_json))
+            else:
+                args.append(item)
+
+        return [entry.target["bin_command"]] + args
+
+    @staticmethod
+    def _bin_output(
+        entry: RegistryEntry, returncode: int, stdout: str, stderr: str
+    ) -> Dict[str, Any]:
+        if returncode != 0:
             raise VPortExecutionError(
-                f"Binary returned non-zero exit code {completed.returncode} "
-                f"for vPort {entry.vport}: {completed.stderr.strip()}"
+                f"Binary returned non-zero exit code {returncode} "
+                f"for vPort {entry.vport}: {stderr.strip()}"
             )
 
-        stdout = completed.stdout.strip()
+        stdout = stdout.strip()
         try:
             parsed = json.loads(stdout) if stdout else {}
         except json.JSONDecodeError:
@@ -320,44 +947,123 @@ class VPortRouter:
     ) -> Dict[str, Any]:
         method = entry.target.get("http_method")
         url_template = entry.target.get("http_url_template")
-        headers_template = entry.target.get("http_headers_template", {})
 
         if not method or not url_template:
             raise VPortExecutionError(
                 f"Missing http_method or http_url_template for vPort: {entry.vport}"
             )
 
-        payload_json = json.dumps(payload)
-        url = url_template.replace("{payload_json}", payload_json)
+        try:
+            ok, status_code, body = self._http.request(
+                entry.target, payload, timeout_ms
+            )
+        except HttpCallError as e:
+            raise VPortExecutionError(
+                f"HTTP request failed for vPort {entry.vport}: {e}"
+            ) from e
+
+        if not ok:
+            raise VPortExecutionError(
+                f"HTTP {status_code} for vPort {entry.vport}: {body}"
+            )
 
-        headers = dict(headers_template or {})
-        if "Content-Type" not in headers:
-            headers["Content-Type"] = "application/json"
+        return body
 
+    async def _execute_http_async(
+        self,
+        entry: RegistryEntry,
+        payload: Dict[str, Any],
+        timeout_ms: int,
+    ) -> Dict[str, Any]:
+        if httpx is None:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._thread_pool(), self._execute_http, entry, payload, timeout_ms
+            )
+
+        if not entry.target.get("http_method") or not entry.target.get("http_url_template"):
+            raise VPortExecutionError(
+                f"Missing http_method or http_url_template for vPort: {entry.vport}"
+            )
+
+        loop = asyncio.get_running_loop()
+        transport = self._async_http.get(loop)
+        if transport is None:
+            transport = self._async_http[loop] = AsyncHttpTransport()
         try:
-            resp = requests.request(
-                method=method,
-                url=url,
-                headers=headers,
-                data=payload_json if method in ("POST", "PUT", "PATCH") else None,
-                timeout=timeout_ms / 1000.0,
+            ok, status_code, body = await transport.request(
+                entry.target, payload, timeout_ms
             )
-        except requests.RequestException as e:
+        except HttpCallError as e:
             raise VPortExecutionError(
                 f"HTTP request failed for vPort {entry.vport}: {e}"
             ) from e
 
-        try:
-            body = resp.json()
-        except ValueError:
-            body = {"text": resp.text}
+        if not ok:
+            raise VPortExecutionError(
+                f"HTTP {status_code} for vPort {entry.vport}: {body}"
+            )
+
+        return body
 
-        if not resp.ok:
+    def _mcp_pool(self, entry: RegistryEntry) -> McpSessionPool:
+        server_id = entry.target.get("mcp_server_id")
+        if not server_id or not entry.target.get("mcp_tool_name"):
             raise VPortExecutionError(
-                f"HTTP {resp.status_code} for vPort {entry.vport}: {body}"
+                f"Missing mcp_server_id or mcp_tool_name for vPort: {entry.vport}"
             )
+        pool = self._mcp_pools.get(server_id)
+        if pool is not None:
+            return pool
+        with self._worker_pools_lock:
+            pool = self._mcp_pools.get(server_id)
+            if pool is None:
+                if self._mcp_servers is None:
+                    if not self.mcp_servers_path.exists():
+                        raise VPortExecutionError(
+                            f"MCP server map not found: {self.mcp_servers_path}"
+                        )
+                    self._mcp_servers = load_mcp_servers(self.mcp_servers_path)
+                config = self._mcp_servers.get(server_id)
+                if config is None:
+                    raise VPortExecutionError(
+                        f"Unknown mcp_server_id '{server_id}' for vPort {entry.vport}"
+                    )
+                pool = self._mcp_pools[server_id] = McpSessionPool(server_id, config)
+        return pool
 
-        if not isinstance(body, dict):
-            body = {"response": body}
+    def _execute_mcp(
+        self,
+        entry: RegistryEntry,
+        payload: Dict[str, Any],
+        timeout_ms: int,
+    ) -> Dict[str, Any]:
+        """
+        Call `mcp_tool_name` with the payload as its arguments over a pooled session to
+        `mcp_server_id` (see vport_mcp). The output is the tool's structuredContent, or
+        {"content": [...]} for tools that only return content blocks.
+        """
+        pool = self._mcp_pool(entry)
+        try:
+            result = pool.call_tool(
+                entry.target["mcp_tool_name"], payload, timeout_ms / 1000.0
+            )
+            return tool_output(result)
+        except McpError as e:
+            raise VPortExecutionError(
+                f"MCP call failed for vPort {entry.vport}: {e}"
+            ) from e
 
-        return body
+    async def _execute_mcp_async(
+        self,
+        entry: RegistryEntry,
+        payload: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        pool = self._mcp_pool(entry)
+        try:
+            result = await pool.call_tool_async(entry.target["mcp_tool_name"], payload)
+            return tool_output(result)
+        except McpError as e:
+            raise VPortExecutionError(
+                f"MCP call failed for vPort {entry.vport}: {e}"
+            ) from e
@@ -0,0 +1,116 @@
+"""
+Sequential vs parallel task execution in LocalTaskEngine.
+
+Synthetic DAGs whose handler sleeps for --task-ms (standing in for I/O-bound tools):
+  wide:    N independent tasks feeding one join task
+  deep:    a single chain of N tasks (no parallelism available)
+  diamond: layers of --width tasks, each depending on every task of the previous layer
+
+Run from foreman_v2_stack/:
+  python benchmarks/bench_dag.py --tasks 32 --task-ms 20 --workers 1 8
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.engines.local_inproc import LocalTaskEngine  # noqa: E402
+from src.registries.tool_lookup import ToolRegistry  # noqa: E402
+
+PLANNER_RECORD = {
+    "id": "urn:aos:tool:planner",
+    "type": "aos.tool_record",
+    "created_at": "2026-02-15T19:00:00Z",
+    "name": "planner",
+    "kind": "python_module",
+    "entrypoint": "planner.run",
+    "capabilities": ["planning"],
+    "interfaces": {"mcp": None, "vport": None, "http": None},
+    "versioning": {"semver": "0.1.0", "api_version": "v1"},
+    "status": "active",
+}
+
+
+def _task(i: int, depends_on: List[str]) -> Dict[str, Any]:
+    return {"task_id": f"t{i}", "task_type": "planning", "description": f"task {i}", "depends_on": depends_on}
+
+
+def wide(n: int, width: int) -> List[Dict[str, Any]]:
+    leaves = [_task(i, []) for i in range(n - 1)]
+    return leaves + [_task(n - 1, [t["task_id"] for t in leaves])]
+
+
+def deep(n: int, width: int) -> List[Dict[str, Any]]:
+    return [_task(i, [f"t{i - 1}"] if i else []) for i in range(n)]
+
+
+def diamond(n: int, width: int) -> List[Dict[str, Any]]:
+    tasks: List[Dict[str, Any]] = []
+    previous: List[str] = []
+    for start in range(0, n, width):
+        layer = [_task(i, previous) for i in range(start, min(n, start + width))]
+        tasks.extend(layer)
+        previous = [t["task_id"] for t in layer]
+    return tasks
+
+
+SHAPES: Dict[str, Callable[[int, int], List[Dict[str, Any]]]] = {"wide": wide, "deep": deep, "diamond": diamond}
+
+
+def _engine(registry_path: Path, workers: int, task_ms: float) -> LocalTaskEngine:
+    engine = LocalTaskEngine(registry=ToolRegistry(registry_path=registry_path), max_workers=workers)
+    build = engine.handlers["urn:aos:tool:planner"]
+
+    def handler(task: Dict[str, Any]) -> Dict[str, Any]:
+        time.sleep(task_ms / 1000)
+        return build(task)
+
+    engine.handlers["urn:aos:tool:planner"] = handler
+    return engine
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--tasks", type=int, default=32)
+    ap.add_argument("--width", type=int, default=8, help="layer width for the diamond shape")
+    ap.add_argument("--task-ms", type=float, default=20.0)
+    ap.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        registry_path = Path(tmp) / "tools_catalog.jsonl"
+        registry_path.write_text(json.dumps(PLANNER_RECORD) + "\n", encoding="utf-8")
+
+        print(f"{args.tasks} tasks, {args.task_ms:.0f} ms each")
+        for name, shape in SHAPES.items():
+            envelope = {
+                "envelope_version": LocalTaskEngine.EXPECTED_ENVELOPE_VERSION,
+                "request_id": f"urn:aos:req:bench.{name}",
+                "embedded_master_meta": {"tasks": {"tasks": shape(args.tasks, args.width)}},
+            }
+            baseline = None
+            for workers in args.workers:
+                engine = _engine(registry_path, workers, args.task_ms)
+                samples = []
+                for _ in range(args.repeat):
+                    t0 = time.perf_counter()
+                    engine._run_tasks(envelope)
+                    samples.append((time.perf_counter() - t0) * 1000)
+                engine.dag_executor.shutdown()
+                median = statistics.median(samples)
+                baseline = baseline or median
+                print(f"  {name:<8} workers={workers:<3} {median:9.1f} ms  x{baseline / median:.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
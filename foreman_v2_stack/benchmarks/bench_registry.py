@@ -0,0 +1,123 @@
+"""
+ToolRegistry load, lookup and tail-reload cost for a large synthetic catalog.
+
+Records get 3 capabilities drawn from --tokens task types, random semvers and a
+10% deprecated rate. Lookups compare the inverted index with a linear scan
+over `records` (what a per-lookup filter without an index costs).
+
+Run from foreman_v2_stack/:
+  python benchmarks/bench_registry.py --records 100000 --append 1000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.registries.tool_lookup import ToolRegistry  # noqa: E402
+
+
+def _record(rng: random.Random, index: int, tokens: List[str]) -> Dict[str, Any]:
+    return {
+        "id": f"urn:aos:tool:bench{index}",
+        "type": "aos.tool_record",
+        "created_at": "2026-02-15T19:00:00Z",
+        "name": f"bench{index}",
+        "kind": "python_module",
+        "entrypoint": f"bench.tool{index}",
+        "capabilities": [f"task_type:{token}" for token in rng.sample(tokens, 3)],
+        "interfaces": {"mcp": None, "vport": None, "http": None},
+        "versioning": {"semver": f"{rng.randint(0, 3)}.{rng.randint(0, 20)}.{rng.randint(0, 9)}", "api_version": "v1"},
+        "status": "deprecated" if rng.random() < 0.1 else "active",
+    }
+
+
+def _write(path: Path, rows: List[Dict[str, Any]]) -> None:
+    with open(path, "a", encoding="utf-8") as handle:
+        handle.writelines(json.dumps(row) + "\n" for row in rows)
+
+
+def _per_op_us(fn: Callable[[str], Any], keys: List[str], repeat: int = 3) -> float:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for key in keys:
+            fn(key)
+        samples.append((time.perf_counter() - t0) / len(keys) * 1e6)
+    return statistics.median(samples)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--records", type=int, default=100_000)
+    ap.add_argument("--tokens", type=int, default=500)
+    ap.add_argument("--append", type=int, default=1000, help="records appended per tail reload")
+    ap.add_argument("--lookups", type=int, default=20_000)
+    args = ap.parse_args()
+
+    rng = random.Random(7)
+    tokens = [f"type{i}" for i in range(args.tokens)]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "tools_catalog.jsonl"
+        _write(path, [_record(rng, i, tokens) for i in range(args.records)])
+        print(f"{args.records} records, {args.tokens} task types, {path.stat().st_size / 1e6:.1f} MB")
+
+        t0 = time.perf_counter()
+        registry = ToolRegistry(registry_path=path)
+        print(f"  full load                {(time.perf_counter() - t0) * 1000:9.1f} ms")
+
+        keys = [rng.choice(tokens) for _ in range(args.lookups)]
+        print(f"  resolve_tool             {_per_op_us(registry.resolve_tool, keys):9.2f} us/op")
+        print(f"  find(status=active)      {_per_op_us(lambda k: registry.find(k, status='active'), keys):9.2f} us/op")
+        print(f"  find(min_version=2.0)    {_per_op_us(lambda k: registry.find(k, min_version='2.0'), keys):9.2f} us/op")
+
+        records = registry.records
+
+        def scan(key: str) -> List[Any]:
+            capability = f"task_type:{key}"
+            return [r for r in records if capability in r.capabilities and r.status == "active"]
+
+        print(f"  linear scan (baseline)   {_per_op_us(scan, keys[:50], repeat=1):9.2f} us/op")
+
+        next_id = args.records
+        samples = []
+        for _ in range(5):
+            _write(path, [_record(rng, next_id + i, tokens) for i in range(args.append)])
+            next_id += args.append
+            t0 = time.perf_counter()
+            registry.refresh()
+            samples.append((time.perf_counter() - t0) * 1000)
+        print(f"  tail reload (+{args.append})     {statistics.median(samples):9.1f} ms")
+
+        # Lookup latency while a writer keeps appending and reloading.
+        stop = threading.Event()
+
+        def reloader() -> None:
+            nonlocal next_id
+            while not stop.is_set():
+                _write(path, [_record(rng, next_id + i, tokens) for i in range(args.append)])
+                next_id += args.append
+                registry.refresh()
+
+        thread = threading.Thread(target=reloader)
+        thread.start()
+        try:
+            during = _per_op_us(registry.resolve_tool, keys)
+        finally:
+            stop.set()
+            thread.join()
+        print(f"  resolve_tool (reloading) {during:9.2f} us/op  ({len(registry.records)} records)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
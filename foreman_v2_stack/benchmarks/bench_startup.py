@@ -0,0 +1,99 @@
+"""
+Foreman API cold-start cost, each scenario measured in a fresh interpreter.
+
+  import            `import src.api.server` (no validator is built at import time)
+  v5_1 sources      import + first v5_1 validator prepared from the source schemas
+  v5_1 bundle       import + first v5_1 validator loaded from a prepared bundle file
+  all sources       import + v5_1, v5 and v4 validators (what import used to build eagerly)
+  bundle load       SchemaBundle.load alone
+
+From foreman_v2_stack/:
+  python benchmarks/bench_startup.py --runs 7
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List
+
+FOREMAN_ROOT = Path(__file__).resolve().parents[1]
+
+_PROBE = r"""
+import json, sys, time
+sys.path.insert(0, {root!r})
+t0 = time.perf_counter()
+import src.api.server as server
+t_import = time.perf_counter()
+for version in {versions!r}:
+    validator = server.get_envelope_validator(version)
+    next(validator.outer.iter_errors({{}}), None)
+t_ready = time.perf_counter()
+from src.api.schema_bundle import SchemaBundle
+t_load = t_ready
+if {bundle!r}:
+    t1 = time.perf_counter()
+    SchemaBundle.load(__import__("pathlib").Path({bundle!r}))
+    t_load = time.perf_counter() - t1
+print(json.dumps({{"import_ms": (t_import - t0) * 1000, "ready_ms": (t_ready - t0) * 1000,
+                  "validators_ms": (t_ready - t_import) * 1000, "bundle_load_ms": t_load * 1000}}))
+"""
+
+ALL_VERSIONS = ["aos.master.envelope.v5_1", "aos.master.envelope.v5", "aos.master.envelope.v4"]
+
+
+def _probe(versions: List[str], bundle: str = "") -> Dict[str, float]:
+    env = dict(os.environ)
+    env.pop("AOS_FOREMAN_SCHEMA_BUNDLE", None)
+    if bundle:
+        env["AOS_FOREMAN_SCHEMA_BUNDLE"] = bundle
+    code = _PROBE.format(root=str(FOREMAN_ROOT), versions=versions, bundle=bundle)
+    out = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", code],
+        cwd=FOREMAN_ROOT,
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=5)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bundle = str(Path(tmp) / "schema_bundle.json")
+        subprocess.run(
+            [sys.executable, "-m", "src.api.schema_bundle", "--out", bundle],
+            cwd=FOREMAN_ROOT,
+            check=True,
+            capture_output=True,
+        )
+        scenarios = {
+            "import": ([], ""),
+            "v5_1 sources": (ALL_VERSIONS[:1], ""),
+            "v5_1 bundle": (ALL_VERSIONS[:1], bundle),
+            "all sources": (ALL_VERSIONS, ""),
+        }
+        print(f"median of {args.runs} fresh interpreters")
+        for name, (versions, bundle_path) in scenarios.items():
+            runs = [_probe(versions, bundle_path) for _ in range(args.runs)]
+            ready = statistics.median(r["ready_ms"] for r in runs)
+            validators = statistics.median(r["validators_ms"] for r in runs)
+            print(f"  {name:<14} ready={ready:8.1f} ms  validators={validators:7.2f} ms")
+            if bundle_path:
+                load = statistics.median(r["bundle_load_ms"] for r in runs)
+                print(f"  {'bundle load':<14} {load:8.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,127 @@
+"""
+Throughput of QueueTaskEngine against N foreman-worker processes.
+
+Each job is a one-task envelope whose handler sleeps for --task-ms (standing in
+for tool I/O or CPU work) plus the real LocalTaskEngine envelope handling. All
+--jobs are submitted at once; the report is completed jobs per second.
+
+  mp:     MultiprocessingBroker (queues shared with forked workers)
+  socket: SocketBroker against an in-process BrokerServer on an ephemeral port
+
+Run from foreman_v2_stack/:
+  python benchmarks/bench_workers.py --jobs 400 --task-ms 5 --processes 1 2 4 8
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import functools
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.brokers.memory import MultiprocessingBroker  # noqa: E402
+from src.brokers.socket_broker import BrokerServer, SocketBroker  # noqa: E402
+from src.engines.local_inproc import LocalTaskEngine  # noqa: E402
+from src.engines.queue_engine import QueueTaskEngine  # noqa: E402
+from src.registries.tool_lookup import ToolRegistry  # noqa: E402
+from src.worker import start_worker_processes  # noqa: E402
+
+PLANNER_RECORD = {
+    "id": "urn:aos:tool:planner",
+    "type": "aos.tool_record",
+    "created_at": "2026-02-15T19:00:00Z",
+    "name": "planner",
+    "kind": "python_module",
+    "entrypoint": "planner.run",
+    "capabilities": ["planning"],
+    "interfaces": {"mcp": None, "vport": None, "http": None},
+    "versioning": {"semver": "0.1.0", "api_version": "v1"},
+    "status": "active",
+}
+
+
+def sleepy_engine(registry_path: str, task_ms: float) -> LocalTaskEngine:
+    """Worker-side engine factory (top-level so it pickles into worker processes)."""
+    sys.stdout = open(os.devnull, "w")  # LocalTaskEngine logs every envelope
+    engine = LocalTaskEngine(registry=ToolRegistry(registry_path=Path(registry_path)), max_workers=1)
+    build = engine.handlers["urn:aos:tool:planner"]
+
+    def handler(task: Dict[str, Any]) -> Dict[str, Any]:
+        time.sleep(task_ms / 1000)
+        return build(task)
+
+    engine.handlers["urn:aos:tool:planner"] = handler
+    return engine
+
+
+def _envelope(i: int) -> Dict[str, Any]:
+    return {
+        "envelope_version": LocalTaskEngine.EXPECTED_ENVELOPE_VERSION,
+        "request_id": f"urn:aos:req:bench.{i}",
+        "embedded_master_meta": {
+            "tasks": {"tasks": [{"task_id": "t0", "task_type": "planning", "description": "bench", "depends_on": []}]}
+        },
+    }
+
+
+async def _drive(engine: QueueTaskEngine, jobs: int) -> None:
+    await asyncio.gather(*(engine.submit_task_async(_envelope(i)) for i in range(jobs)))
+
+
+def _measure(broker_kind: str, processes: int, jobs: int, factory: Any) -> float:
+    server = None
+    if broker_kind == "socket":
+        server = BrokerServer(port=0).start()
+        worker_broker, api_broker = SocketBroker(server.url), SocketBroker(server.url)
+    else:
+        worker_broker = api_broker = MultiprocessingBroker()
+
+    workers, stop = start_worker_processes(worker_broker, processes, factory)
+    engine = QueueTaskEngine(api_broker, timeout_s=300, poll_interval_s=0.1)
+    try:
+        asyncio.run(_drive(engine, processes))  # warm-up: every worker has built its engine
+        t0 = time.perf_counter()
+        asyncio.run(_drive(engine, jobs))
+        elapsed = time.perf_counter() - t0
+    finally:
+        stop.set()
+        for worker in workers:
+            worker.join()
+        engine.close()
+        if server is not None:
+            server.close()
+    return jobs / elapsed
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--jobs", type=int, default=400)
+    ap.add_argument("--task-ms", type=float, default=5.0)
+    ap.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4, 8])
+    ap.add_argument("--brokers", nargs="+", choices=["mp", "socket"], default=["mp", "socket"])
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        registry_path = Path(tmp) / "tools_catalog.jsonl"
+        registry_path.write_text(json.dumps(PLANNER_RECORD) + "\n", encoding="utf-8")
+        factory = functools.partial(sleepy_engine, str(registry_path), args.task_ms)
+
+        print(f"{args.jobs} jobs, {args.task_ms:.0f} ms each")
+        for broker_kind in args.brokers:
+            baseline = None
+            for processes in args.processes:
+                rate = _measure(broker_kind, processes, args.jobs, factory)
+                baseline = baseline or rate
+                print(f"  {broker_kind:<6} processes={processes:<3} {rate:9.1f} jobs/s  x{rate / baseline:.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,134 @@
+"""
+Concurrent-client load test for POST /chat.
+
+Each of --clients clients sends --requests envelopes back to back. A --slow-ratio
+share of them hit a planner that blocks for --slow-ms (standing in for a slow
+tool); the rest are fast. With execution offloaded from the event loop the fast
+requests' p99 stays near their own cost instead of queueing behind slow ones.
+Requests refused by admission control (429/503) are counted separately.
+
+Runs in-process over ASGI by default; pass --url to load a running server instead
+(the slow planner is only installed in-process).
+
+From foreman_v2_stack/:
+  python benchmarks/load_chat.py --clients 32 --requests 20 --slow-ratio 0.1 --slow-ms 200
+  AOS_FOREMAN_WORKERS=8 AOS_FOREMAN_MAX_QUEUE=64 python benchmarks/load_chat.py --clients 64
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+FOREMAN_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(FOREMAN_ROOT))
+sys.path.insert(0, str(FOREMAN_ROOT / "tests"))
+
+import src.api.server as server  # noqa: E402
+from src.engines.local_inproc import LocalTaskEngine  # noqa: E402
+from src.registries.tool_lookup import ToolRegistry  # noqa: E402
+from test_mvp_flow import _build_base_payload, _build_registry_file  # noqa: E402
+
+
+def _payload(request_id: str, slow: bool) -> Dict[str, Any]:
+    payload = _build_base_payload(task_type="planning")
+    payload["request_id"] = request_id
+    payload["embedded_master_meta"]["agents"]["agents"][0]["allowed_task_types"] = ["planning"]
+    payload["embedded_master_meta"]["tasks"]["tasks"][0]["description"] = "slow" if slow else "fast"
+    return payload
+
+
+def _install_engine(tmp: Path, slow_ms: float) -> None:
+    engine = LocalTaskEngine(registry=ToolRegistry(registry_path=_build_registry_file(tmp)))
+    build = engine.handlers["urn:aos:tool:planner"]
+
+    def planner(task: Dict[str, Any]) -> Dict[str, Any]:
+        if task.get("description") == "slow":
+            time.sleep(slow_ms / 1000)
+        return build(task)
+
+    engine.handlers["urn:aos:tool:planner"] = planner
+    server.ENGINE = engine
+
+
+def _percentile(samples: List[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))] if ordered else float("nan")
+
+
+async def _client(
+    client: httpx.AsyncClient, index: int, requests: int, slow_ratio: float, rng: random.Random
+) -> List[Tuple[bool, int, float]]:
+    out = []
+    for n in range(requests):
+        slow = rng.random() < slow_ratio
+        payload = _payload(f"urn:aos:req:load.{index}.{n}", slow)
+        t0 = time.perf_counter()
+        response = await client.post("/chat", json=payload)
+        out.append((slow, response.status_code, (time.perf_counter() - t0) * 1000))
+    return out
+
+
+async def _run(args: argparse.Namespace, url: Optional[str]) -> List[Tuple[bool, int, float]]:
+    transport = None if url else httpx.ASGITransport(app=server.app)
+    limits = httpx.Limits(max_connections=args.clients)
+    async with httpx.AsyncClient(
+        transport=transport, base_url=url or "http://foreman", limits=limits, timeout=60
+    ) as client:
+        rng = random.Random(args.seed)
+        batches = await asyncio.gather(
+            *(_client(client, i, args.requests, args.slow_ratio, rng) for i in range(args.clients))
+        )
+    return [sample for batch in batches for sample in batch]
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--clients", type=int, default=32)
+    ap.add_argument("--requests", type=int, default=20, help="requests per client")
+    ap.add_argument("--slow-ratio", type=float, default=0.1)
+    ap.add_argument("--slow-ms", type=float, default=200.0)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--url", default=None, help="load a running server instead of the in-process app")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if not args.url:
+            _install_engine(Path(tmp), args.slow_ms)
+        started = time.perf_counter()
+        # LocalTaskEngine logs every accepted envelope to stdout.
+        with contextlib.redirect_stdout(io.StringIO()):
+            samples = asyncio.run(_run(args, args.url))
+        elapsed = time.perf_counter() - started
+        server.CHAT_EXECUTOR.shutdown()
+
+    statuses = Counter(status for _, status, _ in samples)
+    print(
+        f"{len(samples)} requests from {args.clients} clients in {elapsed:.2f}s "
+        f"({len(samples) / elapsed:.0f} req/s); executor workers={server.CHAT_EXECUTOR.max_workers} "
+        f"queue={server.CHAT_EXECUTOR.max_queue}"
+    )
+    print("  status codes: " + json.dumps(dict(sorted(statuses.items()))))
+    for label, want_slow in (("fast", False), ("slow", True)):
+        ok = [ms for slow, status, ms in samples if slow is want_slow and status == 200]
+        if ok:
+            print(
+                f"  {label:<5} n={len(ok):<5} p50={_percentile(ok, 0.50):8.1f} ms  "
+                f"p95={_percentile(ok, 0.95):8.1f} ms  p99={_percentile(ok, 0.99):8.1f} ms"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
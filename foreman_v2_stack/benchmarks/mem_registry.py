@@ -0,0 +1,130 @@
+"""
+Memory footprint of a large tool catalog held as records or columns.
+
+Compares, for the same synthetic catalog (see bench_registry.py):
+  legacy    the previous ToolRecord layout: a regular frozen dataclass with a
+            list and two dicts per record and no interning
+  records   ToolRecord (slots, interned strings, shared tuples and mappings)
+  columns   ToolColumns built from ToolRecords
+  registry  a loaded ToolRegistry (records plus the capability index)
+
+Each variant runs in a fresh interpreter so interned strings and shared values
+are not carried over; the figure is what tracemalloc still holds after the
+parsed JSON rows are dropped.
+
+Run from foreman_v2_stack/:
+  python benchmarks/mem_registry.py --records 100000
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import random
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from bench_registry import _record  # noqa: E402
+from src.registries.tool_columns import ToolColumns  # noqa: E402
+from src.registries.tool_lookup import ToolRecord, ToolRegistry  # noqa: E402
+
+VARIANTS = ("legacy", "records", "columns", "registry")
+
+
+@dataclass(frozen=True)
+class LegacyToolRecord:
+    id: str
+    type: str
+    created_at: str
+    name: str
+    kind: str
+    entrypoint: str
+    capabilities: List[str]
+    interfaces: Dict[str, Any]
+    versioning: Dict[str, str]
+    status: str
+
+    @staticmethod
+    def from_dict(raw: Dict[str, Any]) -> "LegacyToolRecord":
+        return LegacyToolRecord(
+            id=str(raw["id"]),
+            type=str(raw["type"]),
+            created_at=str(raw["created_at"]),
+            name=str(raw["name"]),
+            kind=str(raw["kind"]),
+            entrypoint=str(raw["entrypoint"]),
+            capabilities=[str(item) for item in raw["capabilities"]],
+            interfaces=raw["interfaces"],
+            versioning={str(k): str(v) for k, v in raw["versioning"].items()},
+            status=str(raw["status"]),
+        )
+
+
+def _measure(variant: str, path: Path) -> int:
+    lines = path.read_bytes().splitlines()
+    gc.collect()
+    tracemalloc.start()
+    if variant == "registry":
+        held: Any = ToolRegistry(registry_path=path)
+    else:
+        rows = [json.loads(line) for line in lines]
+        if variant == "legacy":
+            held = [LegacyToolRecord.from_dict(row) for row in rows]
+        elif variant == "records":
+            held = [ToolRecord.from_dict(row) for row in rows]
+        else:
+            held = ToolColumns.from_records(ToolRecord.from_dict(row) for row in rows)
+        del rows
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del held
+    return current
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--records", type=int, default=100_000)
+    ap.add_argument("--tokens", type=int, default=500)
+    ap.add_argument("--variant", choices=VARIANTS, help=argparse.SUPPRESS)
+    ap.add_argument("--path", type=Path, help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.variant:
+        print(_measure(args.variant, args.path))
+        return 0
+
+    rng = random.Random(7)
+    tokens = [f"type{i}" for i in range(args.tokens)]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "tools_catalog.jsonl"
+        with open(path, "w", encoding="utf-8") as handle:
+            handle.writelines(json.dumps(_record(rng, i, tokens)) + "\n" for i in range(args.records))
+        print(f"{args.records} records, {args.tokens} task types, {path.stat().st_size / 1e6:.1f} MB of JSONL")
+
+        baseline = None
+        for variant in VARIANTS:
+            out = subprocess.run(
+                [sys.executable, __file__, "--variant", variant, "--path", str(path)],
+                check=True,
+                capture_output=True,
+                text=True,
+            )
+            size = int(out.stdout.strip())
+            baseline = baseline or size
+            print(
+                f"  {variant:<9} {size / 1e6:8.1f} MB  {size / args.records:7.0f} B/record"
+                f"  {size / baseline:6.0%} of legacy"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,4 @@
+@echo off
+if not defined AOS_FOREMAN_BROKER_URL set AOS_FOREMAN_BROKER_URL=tcp://127.0.0.1:7455
+if not defined FOREMAN_WORKERS set FOREMAN_WORKERS=4
+python -m src.worker --broker %AOS_FOREMAN_BROKER_URL% --processes %FOREMAN_WORKERS%
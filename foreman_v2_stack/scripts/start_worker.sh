@@ -0,0 +1,4 @@
+#!/usr/bin/env bash
+set -e
+export AOS_FOREMAN_BROKER_URL=${AOS_FOREMAN_BROKER_URL:-tcp://127.0.0.1:7455}
+exec python -m src.worker --broker "${AOS_FOREMAN_BROKER_URL}" --processes ${FOREMAN_WORKERS:-4}
@@ -0,0 +1,238 @@
+"""Envelope/master meta schemas prepared for validation, loadable from sources or a bundle file.
+
+Preparing a version means loading its envelope schema and only the master meta
+schemas it allows, pruning `embedded_master_meta.oneOf` to those, and splitting
+the envelope into an outer schema plus the list of master schema ids. A bundle
+file stores the prepared result as one JSON document, so a process can start
+from it without reading, copying or pruning the source schemas.
+
+Write a bundle (from foreman_v2_stack/):
+
+    python -m src.api.schema_bundle --out build/schema_bundle.json
+
+and point the API at it with `AOS_FOREMAN_SCHEMA_BUNDLE=build/schema_bundle.json`.
+Versions missing from the bundle are prepared from the source schemas on first use,
+and a bundle whose recorded source hashes no longer match the schema files is
+discarded in favour of the sources.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+from copy import deepcopy
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+BUNDLE_FORMAT = "foreman.schema_bundle.v1"
+
+MASTER_SCHEMA_FILES = {
+    "v5_1": "aos.master.meta.v5_1.schema.json",
+    "v5": "aos.master.meta.v5.schema.json",
+    "v4": "aos.master.meta.v4.schema.json",
+}
+
+# envelope_version -> (envelope schema file, master meta versions it may embed)
+ENVELOPE_SCHEMA_FILES: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    "aos.master.envelope.v5_1": ("aos.master.envelope.v5_1.schema.json", ("v5_1",)),
+    "aos.master.envelope.v5": ("aos.master.envelope.v5.schema.json", ("v5", "v4")),
+    "aos.master.envelope.v4": ("aos.master.envelope.v4.schema.json", ("v4",)),
+}
+
+
+def _load_json(path: Path) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _prune_unresolvable_master_refs(
+    envelope_schema: Dict[str, Any],
+    available_master_ids: set[str],
+    allowed_master_ids: set[str],
+) -> Dict[str, Any]:
+    schema_copy = deepcopy(envelope_schema)
+    embedded_master_meta = (
+        schema_copy.get("properties", {})
+        .get("embedded_master_meta", {})
+    )
+    one_of = embedded_master_meta.get("oneOf")
+    if isinstance(one_of, list):
+        filtered = [
+            entry
+            for entry in one_of
+            if isinstance(entry, dict)
+            and isinstance(entry.get("$ref"), str)
+            and entry["$ref"] in available_master_ids
+            and entry["$ref"] in allowed_master_ids
+        ]
+        if filtered:
+            embedded_master_meta["oneOf"] = filtered
+    return schema_copy
+
+
+def _split_embedded_master_meta(
+    envelope_schema: Dict[str, Any],
+) -> Tuple[Dict[str, Any], List[str]]:
+    outer_schema = deepcopy(envelope_schema)
+    embedded = outer_schema.get("properties", {}).get("embedded_master_meta", {})
+    refs = [
+        entry["$ref"]
+        for entry in embedded.get("oneOf", [])
+        if isinstance(entry, dict) and isinstance(entry.get("$ref"), str)
+    ]
+    if "properties" in outer_schema:
+        outer_schema["properties"]["embedded_master_meta"] = {"type": "object"}
+    return outer_schema, refs
+
+
+@dataclass(frozen=True)
+class PreparedEnvelope:
+    outer_schema: Dict[str, Any]
+    master_ids: Tuple[str, ...]
+
+
+class SchemaBundle:
+    """Prepared schemas keyed by envelope_version; prepares missing versions from `schema_root`."""
+
+    def __init__(
+        self,
+        schema_root: Optional[Path] = None,
+        envelopes: Optional[Dict[str, PreparedEnvelope]] = None,
+        masters: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> None:
+        self.schema_root = schema_root
+        self.envelopes: Dict[str, PreparedEnvelope] = dict(envelopes or {})
+        self.masters: Dict[str, Dict[str, Any]] = dict(masters or {})
+        self.sources: Dict[str, str] = {}
+        self.stale_sources: List[str] = []
+
+    def _read_source(self, relative: str) -> Dict[str, Any]:
+        if self.schema_root is None:
+            raise KeyError(f"schema not in bundle and no schema_root to load it from: {relative}")
+        path = self.schema_root / relative
+        data = path.read_bytes()
+        self.sources[relative] = hashlib.sha256(data).hexdigest()
+        return json.loads(data)
+
+    def envelope(self, envelope_version: str) -> PreparedEnvelope:
+        prepared = self.envelopes.get(envelope_version)
+        if prepared is not None:
+            return prepared
+        if envelope_version not in ENVELOPE_SCHEMA_FILES:
+            raise KeyError(f"unknown envelope_version: {envelope_version}")
+
+        envelope_file, master_versions = ENVELOPE_SCHEMA_FILES[envelope_version]
+        allowed_ids = set()
+        for master_version in master_versions:
+            schema = self._read_source(f"master/{MASTER_SCHEMA_FILES[master_version]}")
+            self.masters.setdefault(schema["$id"], schema)
+            allowed_ids.add(schema["$id"])
+
+        normalized = _prune_unresolvable_master_refs(
+            self._read_source(f"envelope/{envelope_file}"),
+            allowed_ids,
+            allowed_ids,
+        )
+        outer_schema, refs = _split_embedded_master_meta(normalized)
+        prepared = PreparedEnvelope(
+            outer_schema=outer_schema,
+            master_ids=tuple(ref for ref in refs if ref in allowed_ids),
+        )
+        self.envelopes[envelope_version] = prepared
+        return prepared
+
+    def masters_for(self, envelope_version: str) -> Dict[str, Dict[str, Any]]:
+        return {schema_id: self.masters[schema_id] for schema_id in self.envelope(envelope_version).master_ids}
+
+    def prepare(self, envelope_versions: Iterable[str]) -> "SchemaBundle":
+        for envelope_version in envelope_versions:
+            self.envelope(envelope_version)
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "format": BUNDLE_FORMAT,
+            "sources_sha256": dict(sorted(self.sources.items())),
+            "masters": self.masters,
+            "envelopes": {
+                version: {"outer_schema": prepared.outer_schema, "master_ids": list(prepared.master_ids)}
+                for version, prepared in self.envelopes.items()
+            },
+        }
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path: Path, schema_root: Optional[Path] = None) -> "SchemaBundle":
+        """Load a bundle file. With a `schema_root`, each recorded source is hashed again; if any
+        changed or is missing, the bundle is stale and an empty bundle preparing every version from
+        `schema_root` is returned instead (its `stale_sources` lists what differed)."""
+        raw = _load_json(path)
+        if raw.get("format") != BUNDLE_FORMAT:
+            raise ValueError(f"unsupported schema bundle format: {raw.get('format')!r} (expected {BUNDLE_FORMAT})")
+        sources = dict(raw.get("sources_sha256", {}))
+        if schema_root is not None:
+            stale = _stale_sources(schema_root, sources)
+            if stale:
+                bundle = cls(schema_root=schema_root)
+                bundle.stale_sources = stale
+                return bundle
+        bundle = cls(
+            schema_root=schema_root,
+            envelopes={
+                version: PreparedEnvelope(
+                    outer_schema=entry["outer_schema"],
+                    master_ids=tuple(entry["master_ids"]),
+                )
+                for version, entry in raw["envelopes"].items()
+            },
+            masters=raw["masters"],
+        )
+        bundle.sources = sources
+        return bundle
+
+
+def _stale_sources(schema_root: Path, sources: Dict[str, str]) -> List[str]:
+    stale = []
+    for relative, digest in sorted(sources.items()):
+        try:
+            current = hashlib.sha256((schema_root / relative).read_bytes()).hexdigest()
+        except OSError:
+            current = None
+        if current != digest:
+            stale.append(relative)
+    return stale
+
+
+def default_schema_root() -> Path:
+    start = Path(__file__).resolve()
+    for candidate in (start, *start.parents):
+        if (candidate / ".git").exists() or (candidate / "aos_v4_meta_envelope_scene_bundle").exists():
+            return candidate / "aos_v4_meta_envelope_scene_bundle" / "aos_v4_meta_envelope_scene_bundle" / "schemas"
+    raise RuntimeError("Unable to locate repository root from schema_bundle.py path")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Write a prepared envelope schema bundle.")
+    ap.add_argument("--out", required=True, type=Path)
+    ap.add_argument("--schema-root", type=Path, default=None)
+    ap.add_argument(
+        "--versions",
+        nargs="+",
+        default=sorted(ENVELOPE_SCHEMA_FILES),
+        choices=sorted(ENVELOPE_SCHEMA_FILES),
+    )
+    args = ap.parse_args()
+
+    bundle = SchemaBundle(schema_root=args.schema_root or default_schema_root()).prepare(args.versions)
+    bundle.save(args.out)
+    print(f"wrote {args.out} ({', '.join(sorted(bundle.envelopes))})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
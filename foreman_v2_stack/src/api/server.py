@@ -1,16 +1,33 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import os
-from copy import deepcopy
+import threading
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict
-
-from fastapi import FastAPI, HTTPException, WebSocket
-from jsonschema import Draft202012Validator, RefResolver
-
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from fastapi import FastAPI, HTTPException, Request, WebSocket
+from fastapi.responses import StreamingResponse
+from jsonschema import Draft202012Validator
+from referencing import Registry, Resource
+from referencing.jsonschema import DRAFT202012
+
+from src.api.schema_bundle import SchemaBundle, default_schema_root
+from src.api.validation_cache import ValidationCache
+from src.api.ws_stream import WsSession
+from src.engines.artifact_cache import ArtifactCache
+from src.engines.bounded import BoundedExecutor, EngineQueueTimeout, EngineSaturated
+from src.brokers.socket_broker import SocketBroker
 from src.engines.local_inproc import LocalTaskEngine
-from src.interfaces.engine import BaseTaskEngine
+from src.engines.queue_engine import QueueTaskEngine
+from src.interfaces.engine import (
+    AsyncTaskEngine,
+    BaseTaskEngine,
+    StreamingTaskEngine,
+    TaskEventCallback,
+)
 
 app = FastAPI(title="Foreman v2 Agent API")
 
@@ -23,18 +40,6 @@ LEGACY_ENVELOPE_VERSIONS = {
 ENGINE: BaseTaskEngine | None = None
 
 
-def _find_repo_root(start: Path) -> Path:
-    for candidate in (start, *start.parents):
-        if (candidate / ".git").exists() or (
-            candidate / "aos_v4_meta_envelope_scene_bundle"
-        ).exists():
-            return candidate
-    raise RuntimeError("Unable to locate repository root from server.py path")
-def _load_json(path: Path) -> Dict[str, Any]:
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
-
-
 def _is_truthy(value: str | None) -> bool:
     return (value or "").strip().lower() in {"1", "true", "yes", "on"}
 
@@ -43,91 +48,93 @@ def _legacy_schemas_enabled() -> bool:
     return _is_truthy(os.getenv("AOS_ALLOW_LEGACY_SCHEMAS"))
 
 
+def _env_number(name: str, default: float) -> float:
+    raw = os.getenv(name)
+    try:
+        return float(raw) if raw else default
+    except ValueError:
+        return default
+
+
 def _packet_mode_enabled() -> bool:
     # If true, /chat returns an MCP packet instead of executing the local engine.
     return _is_truthy(os.getenv("AOS_FOREMAN_PACKET_MODE"))
 
 
-def _prune_unresolvable_master_refs(
-    envelope_schema: Dict[str, Any],
-    available_master_ids: set[str],
-    allowed_master_ids: set[str],
-) -> Dict[str, Any]:
-    schema_copy = deepcopy(envelope_schema)
-    embedded_master_meta = (
-        schema_copy.get("properties", {})
-        .get("embedded_master_meta", {})
+@dataclass(frozen=True)
+class EnvelopeValidator:
+    """Validators for one envelope_version.
+
+    `outer` checks the envelope with `embedded_master_meta` relaxed to an object;
+    `meta` holds one validator per allowed master meta schema, in the envelope
+    schema's `oneOf` order. Splitting them lets the (large) master meta outcome be
+    cached independently of per-request fields such as request_id.
+    """
+
+    envelope_version: str
+    outer: Draft202012Validator
+    meta: Tuple[Tuple[str, Draft202012Validator], ...]
+
+
+def _schema_bundle() -> SchemaBundle:
+    global SCHEMA_BUNDLE
+    if SCHEMA_BUNDLE is None:
+        schema_root = default_schema_root()
+        bundle_path = os.getenv("AOS_FOREMAN_SCHEMA_BUNDLE")
+        if bundle_path and Path(bundle_path).is_file():
+            SCHEMA_BUNDLE = SchemaBundle.load(Path(bundle_path), schema_root=schema_root)
+        else:
+            SCHEMA_BUNDLE = SchemaBundle(schema_root=schema_root)
+    return SCHEMA_BUNDLE
+
+
+def _build_envelope_validator(envelope_version: str) -> EnvelopeValidator:
+    bundle = _schema_bundle()
+    prepared = bundle.envelope(envelope_version)
+    masters = bundle.masters_for(envelope_version)
+    # A referencing.Registry is immutable, so validators can be shared by worker
+    # threads; RefResolver keeps a mutable scope stack and cannot.
+    registry = Registry().with_resources(
+        (schema_id, Resource.from_contents(schema, default_specification=DRAFT202012))
+        for schema_id, schema in masters.items()
     )
-    one_of = embedded_master_meta.get("oneOf")
-    if isinstance(one_of, list):
-        filtered = [
-            entry
-            for entry in one_of
-            if isinstance(entry, dict)
-            and isinstance(entry.get("$ref"), str)
-            and entry["$ref"] in available_master_ids
-            and entry["$ref"] in allowed_master_ids
-        ]
-        if filtered:
-            embedded_master_meta["oneOf"] = filtered
-    return schema_copy
-
-
-def _build_envelope_validators() -> Dict[str, Draft202012Validator]:
-    repo_root = _find_repo_root(Path(__file__).resolve())
-    schema_root = (
-        repo_root
-        / "aos_v4_meta_envelope_scene_bundle"
-        / "aos_v4_meta_envelope_scene_bundle"
-        / "schemas"
+    return EnvelopeValidator(
+        envelope_version=envelope_version,
+        outer=Draft202012Validator(prepared.outer_schema, registry=registry),
+        meta=tuple(
+            (schema_id, Draft202012Validator(schema, registry=registry))
+            for schema_id, schema in masters.items()
+        ),
     )
 
-    master_schemas = {
-        "v5_1": _load_json(schema_root / "master" / "aos.master.meta.v5_1.schema.json"),
-        "v5": _load_json(schema_root / "master" / "aos.master.meta.v5.schema.json"),
-        "v4": _load_json(schema_root / "master" / "aos.master.meta.v4.schema.json"),
-    }
-    master_ids = {name: schema["$id"] for name, schema in master_schemas.items()}
-    master_store = {schema["$id"]: schema for schema in master_schemas.values()}
-    available_master_ids = set(master_store.keys())
 
-    envelope_schemas = {
-        "aos.master.envelope.v5_1": _load_json(
-            schema_root / "envelope" / "aos.master.envelope.v5_1.schema.json"
-        ),
-        "aos.master.envelope.v5": _load_json(
-            schema_root / "envelope" / "aos.master.envelope.v5.schema.json"
-        ),
-        "aos.master.envelope.v4": _load_json(
-            schema_root / "envelope" / "aos.master.envelope.v4.schema.json"
-        ),
-    }
+def get_envelope_validator(envelope_version: str) -> EnvelopeValidator:
+    """Validator for an envelope_version, built on first use (legacy ones only if requested)."""
+    validator = ENVELOPE_VALIDATORS.get(envelope_version)
+    if validator is None:
+        with _VALIDATORS_LOCK:
+            validator = ENVELOPE_VALIDATORS.get(envelope_version)
+            if validator is None:
+                validator = _build_envelope_validator(envelope_version)
+                ENVELOPE_VALIDATORS[envelope_version] = validator
+    return validator
 
-    allowed_master_map = {
-        "aos.master.envelope.v5_1": {master_ids["v5_1"]},
-        "aos.master.envelope.v5": {master_ids["v5"], master_ids["v4"]},
-        "aos.master.envelope.v4": {master_ids["v4"]},
-    }
 
-    validators: Dict[str, Draft202012Validator] = {}
-    for envelope_version, envelope_schema in envelope_schemas.items():
-        normalized_envelope = _prune_unresolvable_master_refs(
-            envelope_schema,
-            available_master_ids,
-            allowed_master_map.get(envelope_version, available_master_ids),
-        )
-        resolver = RefResolver.from_schema(
-            normalized_envelope,
-            store=master_store,
-        )
-        validators[envelope_version] = Draft202012Validator(
-            normalized_envelope,
-            resolver=resolver,
-        )
-    return validators
+SCHEMA_BUNDLE: SchemaBundle | None = None
+ENVELOPE_VALIDATORS: Dict[str, EnvelopeValidator] = {}
+_VALIDATORS_LOCK = threading.Lock()
 
+# Validation and synchronous engines run here, never on the event loop.
+CHAT_EXECUTOR = BoundedExecutor(
+    max_workers=int(_env_number("AOS_FOREMAN_WORKERS", 4)),
+    max_queue=int(_env_number("AOS_FOREMAN_MAX_QUEUE", 32)),
+    queue_timeout_s=_env_number("AOS_FOREMAN_QUEUE_TIMEOUT_S", 10.0) or None,
+)
 
-ENVELOPE_VALIDATORS = _build_envelope_validators()
+# Outcomes of embedded_master_meta validation, keyed by envelope_version + canonical hash.
+VALIDATION_CACHE = ValidationCache(
+    max_entries=int(_env_number("AOS_FOREMAN_VALIDATION_CACHE_SIZE", 1024)),
+)
 
 
 def _raise_validation_error(
@@ -150,7 +157,7 @@ def _raise_validation_error(
     )
 
 
-def _enforce_version_gate(payload: Dict[str, Any]) -> Draft202012Validator:
+def _enforce_version_gate(payload: Dict[str, Any]) -> EnvelopeValidator:
     envelope_version = payload.get("envelope_version")
     if not isinstance(envelope_version, str):
         _raise_validation_error(
@@ -161,7 +168,7 @@ def _enforce_version_gate(payload: Dict[str, Any]) -> Draft202012Validator:
         )
 
     if envelope_version == DEFAULT_ENVELOPE_VERSION:
-        return ENVELOPE_VALIDATORS[DEFAULT_ENVELOPE_VERSION]
+        return get_envelope_validator(DEFAULT_ENVELOPE_VERSION)
 
     if envelope_version in LEGACY_ENVELOPE_VERSIONS:
         if not _legacy_schemas_enabled():
@@ -174,7 +181,7 @@ def _enforce_version_gate(payload: Dict[str, Any]) -> Draft202012Validator:
                 path=["envelope_version"],
                 validator="version_gate",
             )
-        return ENVELOPE_VALIDATORS[envelope_version]
+        return get_envelope_validator(envelope_version)
 
     _raise_validation_error(
         error="unsupported_envelope_version",
@@ -214,12 +221,47 @@ def _enforce_conditional_envelope_requirements(payload: Dict[str, Any]) -> None:
             )
 
 
+def _embedded_meta_error(
+    validator: EnvelopeValidator, embedded_meta: Any
+) -> Optional[Dict[str, Any]]:
+    """First error for embedded_master_meta under the envelope's `oneOf`, or None."""
+    base_schema_path: List[str | int] = ["properties", "embedded_master_meta", "oneOf"]
+    if len(validator.meta) == 1:
+        # oneOf over a single schema is that schema: report its first error directly.
+        error = next(validator.meta[0][1].iter_errors(embedded_meta), None)
+        if error is None:
+            return None
+        return {
+            "error": "invalid_envelope_payload",
+            "message": error.message,
+            "path": ["embedded_master_meta", *error.path],
+            "schema_path": [str(part) for part in (*base_schema_path, 0, *error.schema_path)],
+            "validator": error.validator,
+        }
+
+    matches = [ref for ref, meta_validator in validator.meta if meta_validator.is_valid(embedded_meta)]
+    if len(matches) == 1:
+        return None
+    reason = (
+        "is not valid under any of the given schemas"
+        if not matches
+        else f"is valid under more than one of the given schemas: {matches}"
+    )
+    return {
+        "error": "invalid_envelope_payload",
+        "message": f"embedded_master_meta {reason}",
+        "path": ["embedded_master_meta"],
+        "schema_path": [str(part) for part in base_schema_path],
+        "validator": "oneOf",
+    }
+
+
 def validate_envelope_payload(payload: Dict[str, Any]) -> None:
     validator = _enforce_version_gate(payload)
 
-    errors = sorted(validator.iter_errors(payload), key=lambda err: list(err.path))
-    if errors:
-        first_error = errors[0]
+    # Only the first error is reported, so stop at the first one found.
+    first_error = next(validator.outer.iter_errors(payload), None)
+    if first_error is not None:
         _raise_validation_error(
             error="invalid_envelope_payload",
             message=first_error.message,
@@ -228,6 +270,15 @@ def validate_envelope_payload(payload: Dict[str, Any]) -> None:
             validator=first_error.validator,
         )
 
+    embedded_meta = payload["embedded_master_meta"]
+    cache_key = VALIDATION_CACHE.key(validator.envelope_version, embedded_meta)
+    found, meta_error = VALIDATION_CACHE.get(cache_key)
+    if not found:
+        meta_error = _embedded_meta_error(validator, embedded_meta)
+        VALIDATION_CACHE.put(cache_key, meta_error)
+    if meta_error is not None:
+        _raise_validation_error(**meta_error)
+
     _enforce_conditional_envelope_requirements(payload)
 
 
@@ -241,10 +292,71 @@ def to_mcp(payload: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
+def _build_engine() -> BaseTaskEngine:
+    """`AOS_FOREMAN_ENGINE=queue` hands envelopes to foreman-worker processes via
+    the broker at `AOS_FOREMAN_BROKER_URL`; the default runs them in-process."""
+    kind = os.getenv("AOS_FOREMAN_ENGINE", "local").strip().lower()
+    if kind == "queue":
+        broker_url = os.getenv("AOS_FOREMAN_BROKER_URL", "tcp://127.0.0.1:7455")
+        return QueueTaskEngine(
+            SocketBroker(broker_url),
+            timeout_s=_env_number("AOS_FOREMAN_QUEUE_RESULT_TIMEOUT_S", 60.0),
+        )
+    if kind != "local":
+        raise RuntimeError(f"unknown AOS_FOREMAN_ENGINE: {kind!r} (expected 'local' or 'queue')")
+    engine = LocalTaskEngine(artifact_cache=ArtifactCache.from_env())
+    reload_s = _env_number("AOS_FOREMAN_REGISTRY_RELOAD_S", 0.0)
+    if reload_s > 0:
+        engine.registry.watch(reload_s)
+    return engine
+
+
 @app.on_event("startup")
 async def on_startup() -> None:
     global ENGINE
-    ENGINE = LocalTaskEngine()
+    ENGINE = _build_engine()
+
+
+@app.on_event("shutdown")
+async def on_shutdown() -> None:
+    close = getattr(ENGINE, "close", None) or getattr(ENGINE, "shutdown", None)
+    if callable(close):
+        close()
+    CHAT_EXECUTOR.shutdown()
+
+
+async def _admitted(work: Awaitable[Any]) -> Any:
+    """Await engine work, mapping admission-control rejections to 429/503 with Retry-After."""
+    try:
+        return await work
+    except EngineSaturated as exc:
+        raise HTTPException(
+            status_code=429,
+            detail={"error": "engine_saturated", "message": str(exc)},
+            headers={"Retry-After": "1"},
+        ) from exc
+    except EngineQueueTimeout as exc:
+        raise HTTPException(
+            status_code=503,
+            detail={"error": "engine_overloaded", "message": str(exc)},
+            headers={"Retry-After": "1"},
+        ) from exc
+
+
+async def _offload(fn: Callable[..., Any], *args: Any) -> Any:
+    return await _admitted(CHAT_EXECUTOR.run(fn, *args))
+
+
+async def _submit(
+    engine: BaseTaskEngine,
+    envelope: Dict[str, Any],
+    on_event: Optional[TaskEventCallback] = None,
+) -> Dict[str, Any]:
+    if on_event is not None and isinstance(engine, StreamingTaskEngine):
+        return await _offload(engine.submit_task_streaming, envelope, on_event)
+    if isinstance(engine, AsyncTaskEngine):
+        return await _admitted(engine.submit_task_async(envelope))
+    return await _offload(engine.submit_task, envelope)
 
 
 def _require_engine() -> BaseTaskEngine:
@@ -259,16 +371,13 @@ def _require_engine() -> BaseTaskEngine:
     return ENGINE
 
 
-@app.post("/chat")
-async def chat(request_data: Dict[str, Any]) -> Dict[str, Any]:
-    validate_envelope_payload(request_data)
-
-    if _packet_mode_enabled():
-        return {"status": "ok", "mode": "packet", "packet": to_mcp(request_data)}
-
+async def _execute_envelope(
+    request_data: Dict[str, Any],
+    on_event: Optional[TaskEventCallback] = None,
+) -> Dict[str, Any]:
     engine = _require_engine()
     try:
-        result_envelope = engine.submit_task(request_data)
+        result_envelope = await _submit(engine, request_data, on_event)
     except ValueError as exc:
         raise HTTPException(
             status_code=400,
@@ -277,6 +386,20 @@ async def chat(request_data: Dict[str, Any]) -> Dict[str, Any]:
                 "message": str(exc),
             },
         ) from exc
+    except ConnectionError as exc:
+        raise HTTPException(
+            status_code=503,
+            detail={"error": "engine_unavailable", "message": str(exc)},
+            headers={"Retry-After": "1"},
+        ) from exc
+    except TimeoutError as exc:
+        raise HTTPException(
+            status_code=504,
+            detail={
+                "error": "engine_timeout",
+                "message": str(exc),
+            },
+        ) from exc
 
     if not isinstance(result_envelope, dict):
         raise HTTPException(
@@ -290,7 +413,140 @@ async def chat(request_data: Dict[str, Any]) -> Dict[str, Any]:
     return result_envelope
 
 
+@app.post("/chat")
+async def chat(request_data: Dict[str, Any]) -> Dict[str, Any]:
+    await _offload(validate_envelope_payload, request_data)
+
+    if _packet_mode_enabled():
+        return {"status": "ok", "mode": "packet", "packet": to_mcp(request_data)}
+
+    return await _execute_envelope(request_data)
+
+
+class _BatchParseError:
+    def __init__(self, message: str) -> None:
+        self.message = message
+
+
+def _parse_batch_body(body: bytes, content_type: str) -> List[Any]:
+    """Items of a JSON array or NDJSON body; unparseable NDJSON lines become `_BatchParseError`s."""
+    try:
+        text = body.decode("utf-8").strip()
+    except UnicodeDecodeError as exc:
+        _raise_validation_error(error="invalid_batch_body", message=str(exc))
+    if not text:
+        _raise_validation_error(error="empty_batch", message="Batch body contains no envelopes.")
+    if text.startswith("[") and "ndjson" not in content_type and "jsonl" not in content_type:
+        try:
+            items = json.loads(text)
+        except json.JSONDecodeError as exc:
+            _raise_validation_error(error="invalid_batch_body", message=str(exc))
+        return items
+
+    items = []
+    for line_no, line in enumerate(text.splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            items.append(json.loads(line))
+        except json.JSONDecodeError as exc:
+            items.append(_BatchParseError(f"line {line_no}: {exc}"))
+    return items
+
+
+def _validate_batch(items: List[Any]) -> List[Optional[Tuple[int, Dict[str, Any]]]]:
+    """Validate every item in one executor hop; returns (status_code, detail) per failing item."""
+    outcomes: List[Optional[Tuple[int, Dict[str, Any]]]] = []
+    for item in items:
+        if isinstance(item, _BatchParseError):
+            outcomes.append((400, {"error": "invalid_json", "message": item.message}))
+            continue
+        if not isinstance(item, dict):
+            outcomes.append((400, {"error": "invalid_envelope_payload", "message": "Envelope must be a JSON object."}))
+            continue
+        try:
+            validate_envelope_payload(item)
+        except HTTPException as exc:
+            outcomes.append((exc.status_code, exc.detail))
+        else:
+            outcomes.append(None)
+    return outcomes
+
+
+def _batch_line(index: int, item: Any, status_code: int, **body: Any) -> bytes:
+    request_id = item.get("request_id") if isinstance(item, dict) else None
+    line = {"index": index, "request_id": request_id, "status_code": status_code, **body}
+    return (json.dumps(line, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+@app.post("/chat/batch")
+async def chat_batch(request: Request) -> StreamingResponse:
+    items = _parse_batch_body(await request.body(), request.headers.get("content-type", ""))
+    max_items = int(_env_number("AOS_FOREMAN_BATCH_MAX_ITEMS", 1000))
+    if len(items) > max_items:
+        raise HTTPException(
+            status_code=413,
+            detail={"error": "batch_too_large", "message": f"{len(items)} envelopes exceeds the limit of {max_items}."},
+        )
+
+    outcomes = await _offload(_validate_batch, items)
+    packet_mode = _packet_mode_enabled()
+    concurrency = asyncio.Semaphore(max(1, int(_env_number("AOS_FOREMAN_BATCH_CONCURRENCY", CHAT_EXECUTOR.max_workers))))
+
+    async def run_item(index: int) -> bytes:
+        item = items[index]
+        if packet_mode:
+            return _batch_line(index, item, 200, envelope={"status": "ok", "mode": "packet", "packet": to_mcp(item)})
+        try:
+            async with concurrency:
+                result_envelope = await _execute_envelope(item)
+        except HTTPException as exc:
+            return _batch_line(index, item, exc.status_code, error=exc.detail)
+        except Exception as exc:  # isolate per-item failures
+            return _batch_line(index, item, 500, error={"error": "engine_error", "message": str(exc)})
+        return _batch_line(index, item, 200, envelope=result_envelope)
+
+    async def stream() -> AsyncIterator[bytes]:
+        pending = []
+        for index, outcome in enumerate(outcomes):
+            if outcome is None:
+                pending.append(asyncio.ensure_future(run_item(index)))
+            else:
+                yield _batch_line(index, items[index], outcome[0], error=outcome[1])
+        try:
+            # Completion order: a slow envelope does not hold back finished ones.
+            for next_done in asyncio.as_completed(pending):
+                yield await next_done
+        finally:
+            for task in pending:
+                task.cancel()
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+@app.get("/metrics")
+async def metrics() -> Dict[str, Any]:
+    artifact_cache = getattr(ENGINE, "artifact_cache", None)
+    return {
+        "validation_cache": VALIDATION_CACHE.stats(),
+        "artifact_cache": artifact_cache.stats() if artifact_cache is not None else None,
+        "executor": {
+            **CHAT_EXECUTOR.stats,
+            "in_flight": CHAT_EXECUTOR.in_flight,
+            "capacity": CHAT_EXECUTOR.capacity,
+        },
+    }
+
+
 @app.websocket("/ws")
 async def ws_endpoint(ws: WebSocket) -> None:
     await ws.accept()
     await ws.send_json({"status": "connected"})
+    session = WsSession(
+        ws,
+        validate=lambda envelope: _offload(validate_envelope_payload, envelope),
+        execute=_execute_envelope,
+        max_in_flight=int(_env_number("AOS_FOREMAN_WS_MAX_IN_FLIGHT", 4)),
+        send_queue_size=int(_env_number("AOS_FOREMAN_WS_SEND_QUEUE", 64)),
+    )
+    await session.serve()
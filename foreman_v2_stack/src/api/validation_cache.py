@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from copy import deepcopy
+from typing import Any, Dict, Optional, Tuple
+
+from src.utils.hashing import canonical_sha256
+
+CacheKey = Tuple[str, str]
+
+
+class ValidationCache:
+    """Bounded LRU of validation outcomes keyed by (envelope_version, canonical hash).
+
+    An outcome is `None` for a valid document or the error detail dict that the
+    API returns for it. Both are cached, so resent invalid documents are rejected
+    without re-validation too. `max_entries=0` disables caching. Thread-safe.
+    """
+
+    def __init__(self, max_entries: int = 1024) -> None:
+        self.max_entries = max(0, int(max_entries))
+        self._entries: "OrderedDict[CacheKey, Optional[Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(envelope_version: str, document: Any) -> CacheKey:
+        return envelope_version, canonical_sha256(document)
+
+    def get(self, key: CacheKey) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """Returns (found, outcome); error details are copied so callers may mutate them."""
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                outcome = self._entries[key]
+                return True, deepcopy(outcome) if outcome is not None else None
+            self.misses += 1
+            return False, None
+
+    def put(self, key: CacheKey, outcome: Optional[Dict[str, Any]]) -> None:
+        if self.max_entries == 0:
+            return
+        with self._lock:
+            self._entries[key] = deepcopy(outcome) if outcome is not None else None
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+from fastapi import HTTPException, WebSocket, WebSocketDisconnect
+
+from src.interfaces.engine import TaskEventCallback
+
+Event = Dict[str, Any]
+Validate = Callable[[Dict[str, Any]], Awaitable[None]]
+Execute = Callable[[Dict[str, Any], TaskEventCallback], Awaitable[Dict[str, Any]]]
+
+_ws_ids = itertools.count(1)
+
+# Events a client can miss without losing results; dropped first under backpressure.
+PROGRESS_EVENTS = frozenset({"task_started", "task_skipped"})
+
+
+class WsSession:
+    """One `/ws` connection: many envelopes in flight, events streamed as they happen.
+
+    Client messages are `{"type": "submit", "envelope": {...}}` (a bare envelope
+    is accepted too) and `{"type": "ping"}`. Every event sent back carries the
+    `request_id` it belongs to, so several envelopes can share the connection:
+
+        accepted -> task_skipped* / task_started / task_completed / task_unsupported ... -> result | error
+
+    Flow control: at most `max_in_flight` envelopes run per connection (more are
+    refused with `too_many_in_flight`), at most `send_queue_size` task events
+    per envelope wait to be sent, and the connection's send queue holds at most
+    `max_in_flight * send_queue_size` events of any kind. `on_event` runs on
+    shared engine threads, so it never blocks: when an envelope's buffer (or the
+    connection's queue) is full its progress events (`task_started`,
+    `task_skipped`) are dropped, and an event that must not be lost aborts that
+    envelope with `slow_consumer`. Everything else (accepted, result, error,
+    pong) waits for room, which also stops reading from a client that does not
+    read. A slow reader only ever affects its own envelopes.
+
+    Only text frames are understood; a binary frame gets an `unsupported_frame`
+    error and the connection stays open.
+    """
+
+    def __init__(
+        self,
+        ws: WebSocket,
+        validate: Validate,
+        execute: Execute,
+        max_in_flight: int = 4,
+        send_queue_size: int = 64,
+    ) -> None:
+        self.ws = ws
+        self.validate = validate
+        self.execute = execute
+        self.max_in_flight = max(1, int(max_in_flight))
+        self.send_queue_size = max(1, int(send_queue_size))
+        # (event, request_id it is counted against or None)
+        self._queue: "asyncio.Queue[Tuple[Event, Optional[str]]]" = asyncio.Queue(
+            maxsize=self.max_in_flight * self.send_queue_size
+        )
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        # Envelopes cancelled by _abort_slow; their _run reports slow_consumer.
+        self._aborted: Set[asyncio.Task] = set()
+        # Task events queued but not yet sent, per request_id; only touched on the event loop.
+        self._buffered: Dict[str, int] = {}
+        self.dropped = 0
+        self._closed = threading.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def send(self, event: Event) -> None:
+        await self._queue.put((event, None))
+
+    async def _send_error(
+        self, request_id: Optional[str], error: str, message: str, status_code: int = 400
+    ) -> None:
+        await self.send(
+            {
+                "type": "error",
+                "request_id": request_id,
+                "status_code": status_code,
+                "detail": {"error": error, "message": message},
+            }
+        )
+
+    def _emit_threadsafe(self, request_id: str, run: Optional[asyncio.Task], event: Event) -> None:
+        """Called from engine threads; hands the event to the event loop without waiting."""
+        if self._closed.is_set() or self._loop is None:
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._enqueue_event, request_id, run, event)
+        except RuntimeError:  # loop already closed
+            pass
+
+    def _enqueue_event(self, request_id: str, run: Optional[asyncio.Task], event: Event) -> None:
+        if self._in_flight.get(request_id) is not run:
+            return  # the envelope finished or was aborted
+        buffered = self._buffered.get(request_id, 0)
+        if buffered >= self.send_queue_size or self._queue.full():
+            if event.get("type") in PROGRESS_EVENTS:
+                self.dropped += 1
+            else:
+                self._abort_slow(request_id)
+            return
+        self._buffered[request_id] = buffered + 1
+        self._queue.put_nowait(({**event, "request_id": request_id}, request_id))
+
+    def _abort_slow(self, request_id: str) -> None:
+        task = self._in_flight.pop(request_id, None)
+        if task is not None:
+            self._aborted.add(task)
+            task.cancel()
+
+    async def _send_loop(self) -> None:
+        while True:
+            event, counted = await self._queue.get()
+            await self.ws.send_json(event)
+            if counted is not None:
+                remaining = self._buffered.get(counted, 1) - 1
+                if remaining > 0 or counted in self._in_flight:
+                    self._buffered[counted] = remaining
+                else:
+                    self._buffered.pop(counted, None)
+
+    async def serve(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        sender = asyncio.create_task(self._send_loop())
+        try:
+            while True:
+                frame = await self.ws.receive()
+                if frame["type"] == "websocket.disconnect":
+                    raise WebSocketDisconnect(frame.get("code", 1000))
+                raw = frame.get("text")
+                if raw is None:
+                    await self._send_error(None, "unsupported_frame", "only text frames are accepted")
+                    continue
+                try:
+                    message = json.loads(raw)
+                except json.JSONDecodeError as exc:
+                    await self._send_error(None, "invalid_json", str(exc))
+                    continue
+                await self._handle(message)
+        except WebSocketDisconnect:
+            pass
+        finally:
+            self._closed.set()
+            for task in [*self._in_flight.values(), *self._aborted]:
+                task.cancel()
+            sender.cancel()
+
+    async def _handle(self, message: Any) -> None:
+        if not isinstance(message, dict):
+            await self._send_error(None, "invalid_message", "expected an object")
+            return
+        if message.get("type") == "ping":
+            await self.send({"type": "pong", "request_id": None})
+            return
+
+        envelope = message.get("envelope", message) if message.get("type", "submit") == "submit" else None
+        if not isinstance(envelope, dict):
+            await self._send_error(None, "invalid_message", "expected a submit message")
+            return
+
+        request_id = envelope.get("request_id")
+        if not isinstance(request_id, str) or not request_id:
+            request_id = f"urn:aos:req:ws.{next(_ws_ids)}"
+        if request_id in self._in_flight:
+            await self._send_error(request_id, "duplicate_request_id", "request_id is already in flight on this connection")
+            return
+        if len(self._in_flight) >= self.max_in_flight:
+            await self._send_error(
+                request_id,
+                "too_many_in_flight",
+                f"at most {self.max_in_flight} envelopes may run per connection",
+            )
+            return
+
+        self._in_flight[request_id] = asyncio.create_task(self._run(request_id, envelope))
+
+    async def _run(self, request_id: str, envelope: Dict[str, Any]) -> None:
+        try:
+            await self.send({"type": "accepted", "request_id": request_id})
+            await self.validate(envelope)
+            run = asyncio.current_task()
+            result = await self.execute(envelope, lambda event: self._emit_threadsafe(request_id, run, event))
+            await self.send({"type": "result", "request_id": request_id, "envelope": result})
+        except HTTPException as exc:
+            await self.send(
+                {"type": "error", "request_id": request_id, "status_code": exc.status_code, "detail": exc.detail}
+            )
+        except asyncio.CancelledError:
+            if asyncio.current_task() not in self._aborted:
+                raise
+            await self._send_error(
+                request_id,
+                "slow_consumer",
+                f"more than {self.send_queue_size} task events waiting to be read; envelope aborted",
+                status_code=429,
+            )
+        except Exception as exc:  # one failing envelope must not take down the connection
+            await self._send_error(request_id, "engine_error", str(exc), status_code=500)
+        finally:
+            self._aborted.discard(asyncio.current_task())
+            if self._in_flight.get(request_id) is asyncio.current_task():
+                del self._in_flight[request_id]
+            if not self._buffered.get(request_id):
+                self._buffered.pop(request_id, None)
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+
+Job = Dict[str, Any]
+JobResult = Dict[str, Any]
+
+
+class Broker(ABC):
+    """Transport between QueueTaskEngine (API side) and foreman workers.
+
+    Jobs are `{"job_id", "reply_to", "envelope"}`; every worker competes for the
+    shared task queue. Results are `{"job_id", "ok", "envelope" | "error_type",
+    "message"}` and are routed back to the queue named by the job's `reply_to`,
+    so several API processes can share one broker.
+
+    `consume_*` block for at most `timeout` seconds and return None when nothing
+    arrived, so callers can poll for shutdown.
+    """
+
+    @abstractmethod
+    def publish_task(self, job: Job) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def consume_task(self, timeout: float) -> Optional[Job]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def publish_result(self, reply_to: str, result: JobResult) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def consume_result(self, reply_to: str, timeout: float) -> Optional[JobResult]:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release connections; the default broker holds none."""
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import multiprocessing
+import queue
+import threading
+from typing import Any, Dict, Optional
+
+from src.brokers.base import Broker, Job, JobResult
+
+
+class InMemoryBroker(Broker):
+    """Thread-safe broker for workers running as threads in the API process (and tests)."""
+
+    def __init__(self) -> None:
+        self._tasks: "queue.Queue[Job]" = queue.Queue()
+        self._results: Dict[str, "queue.Queue[JobResult]"] = {}
+        self._lock = threading.Lock()
+
+    def _result_queue(self, reply_to: str) -> "queue.Queue[JobResult]":
+        with self._lock:
+            result_queue = self._results.get(reply_to)
+            if result_queue is None:
+                result_queue = self._results[reply_to] = queue.Queue()
+            return result_queue
+
+    def publish_task(self, job: Job) -> None:
+        self._tasks.put(job)
+
+    def consume_task(self, timeout: float) -> Optional[Job]:
+        try:
+            return self._tasks.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def publish_result(self, reply_to: str, result: JobResult) -> None:
+        self._result_queue(reply_to).put(result)
+
+    def consume_result(self, reply_to: str, timeout: float) -> Optional[JobResult]:
+        try:
+            return self._result_queue(reply_to).get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def pending_tasks(self) -> int:
+        return self._tasks.qsize()
+
+
+class MultiprocessingBroker(Broker):
+    """Broker over multiprocessing queues, for worker processes on one box.
+
+    Create it before starting workers and pass it to them as a Process argument.
+    There is a single result queue, so it serves one consuming engine; `reply_to`
+    is carried through but not used for routing (use the socket broker to share
+    workers between several API processes).
+    """
+
+    def __init__(self, context: Optional[Any] = None) -> None:
+        ctx = context or multiprocessing.get_context()
+        self._tasks = ctx.Queue()
+        self._results = ctx.Queue()
+
+    def publish_task(self, job: Job) -> None:
+        self._tasks.put(job)
+
+    def consume_task(self, timeout: float) -> Optional[Job]:
+        try:
+            return self._tasks.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def publish_result(self, reply_to: str, result: JobResult) -> None:
+        self._results.put(result)
+
+    def consume_result(self, reply_to: str, timeout: float) -> Optional[JobResult]:
+        try:
+            return self._results.get(timeout=timeout)
+        except queue.Empty:
+            return None
@@ -0,0 +1,283 @@
+"""Single-box TCP broker: one BrokerServer, any number of API processes and workers.
+
+Frames are a 4-byte big-endian length followed by compact UTF-8 JSON. Each
+request gets exactly one response on the same connection:
+
+    {"op": "publish_task", "job": {...}}                      -> {"ok": true}
+    {"op": "consume_task", "timeout": 1.0}                    -> {"ok": true, "job": {...} | null}
+    {"op": "publish_result", "reply_to": "...", "result": {}} -> {"ok": true}
+    {"op": "consume_result", "reply_to": "...", "timeout": 1} -> {"ok": true, "result": {...} | null}
+
+Run a server (from foreman_v2_stack/):
+
+    python -m src.brokers.socket_broker --host 127.0.0.1 --port 7455
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import select
+import socket
+import socketserver
+import struct
+import threading
+from typing import Any, Dict, Optional, Set, Tuple
+from urllib.parse import urlparse
+
+from src.brokers.base import Broker, Job, JobResult
+from src.brokers.memory import InMemoryBroker
+
+DEFAULT_PORT = 7455
+MAX_WAIT_S = 30.0
+
+_LEN = struct.Struct(">I")
+
+
+def _send_frame(sock: socket.socket, message: Dict[str, Any]) -> None:
+    body = json.dumps(message, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    sock.sendall(_LEN.pack(len(body)) + body)
+
+
+def _recv_exact(sock: socket.socket, size: int) -> Optional[bytes]:
+    chunks = []
+    while size:
+        chunk = sock.recv(size)
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def _recv_frame(sock: socket.socket) -> Optional[Dict[str, Any]]:
+    header = _recv_exact(sock, _LEN.size)
+    if header is None:
+        return None
+    (size,) = _LEN.unpack(header)
+    body = _recv_exact(sock, size)
+    if body is None:
+        return None
+    return json.loads(body)
+
+
+def _peer_closed(sock: socket.socket) -> bool:
+    """True if the other end has hung up (readable, and a peek reads EOF or fails)."""
+    readable, _, _ = select.select([sock], [], [], 0)
+    if not readable:
+        return False
+    try:
+        return sock.recv(1, socket.MSG_PEEK) == b""
+    except OSError:
+        return True
+
+
+def parse_broker_url(url: str) -> Tuple[str, int]:
+    """`tcp://host:port` (port defaults to 7455) -> (host, port)."""
+    parsed = urlparse(url if "://" in url else f"tcp://{url}")
+    if parsed.scheme != "tcp":
+        raise ValueError(f"unsupported broker url scheme: {url}")
+    return parsed.hostname or "127.0.0.1", parsed.port or DEFAULT_PORT
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    server: "_Server"
+
+    def handle(self) -> None:
+        sock: socket.socket = self.request
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with self.server.clients_lock:
+            self.server.clients.add(sock)
+        try:
+            self._serve(sock)
+        except OSError:
+            pass  # client went away, or the server is closing
+        finally:
+            with self.server.clients_lock:
+                self.server.clients.discard(sock)
+
+    def _serve(self, sock: socket.socket) -> None:
+        backend = self.server.backend
+        while True:
+            request = _recv_frame(sock)
+            if request is None:
+                return
+            op = request.get("op")
+            timeout = min(float(request.get("timeout", 0) or 0), MAX_WAIT_S)
+            if op == "publish_task":
+                backend.publish_task(request["job"])
+                response: Dict[str, Any] = {"ok": True}
+            elif op == "consume_task":
+                job = backend.consume_task(timeout)
+                if job is not None:
+                    self._send_job(sock, job)
+                    continue
+                response = {"ok": True, "job": None}
+            elif op == "publish_result":
+                backend.publish_result(request["reply_to"], request["result"])
+                response = {"ok": True}
+            elif op == "consume_result":
+                response = {"ok": True, "result": backend.consume_result(request["reply_to"], timeout)}
+            else:
+                response = {"ok": False, "error": f"unknown op: {op!r}"}
+            _send_frame(sock, response)
+
+    def _send_job(self, sock: socket.socket, job: Dict[str, Any]) -> None:
+        # The worker may have gone away while this request waited for a job: put the job back
+        # rather than lose it. (A send that "succeeds" to a closed peer would lose it too.)
+        try:
+            if _peer_closed(sock):
+                raise ConnectionResetError("worker disconnected before the job was sent")
+            _send_frame(sock, {"ok": True, "job": job})
+        except OSError:
+            self.server.backend.publish_task(job)
+            raise
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int]) -> None:
+        super().__init__(address, _Handler)
+        self.backend = InMemoryBroker()
+        self.clients: Set[socket.socket] = set()
+        self.clients_lock = threading.Lock()
+
+
+class BrokerServer:
+    """Serves an InMemoryBroker over TCP; `port=0` picks a free port (see `url`)."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT) -> None:
+        self._server = _Server((host, port))
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"tcp://{host}:{port}"
+
+    def start(self) -> "BrokerServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="foreman-broker", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+    def close(self) -> None:
+        """Stop listening and drop client connections, as a stopped broker process would."""
+        self._server.shutdown()
+        self._server.server_close()
+        with self._server.clients_lock:
+            clients = list(self._server.clients)
+        for sock in clients:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        if self._thread is not None:
+            self._thread.join()
+
+
+class SocketBroker(Broker):
+    """Client for BrokerServer. Each thread gets its own connection, so a blocking
+    `consume_result` in a collector thread does not hold up publishers.
+
+    A failed connection is dropped and surfaces as ConnectionError; the next call
+    from that thread connects again.
+    """
+
+    def __init__(self, url: str, connect_timeout: float = 5.0) -> None:
+        self.url = url
+        self.address = parse_broker_url(url)
+        self.connect_timeout = connect_timeout
+        self._local = threading.local()
+        self._sockets: list[socket.socket] = []
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Picklable for worker processes; connections are per process and per thread.
+        return {"url": self.url, "connect_timeout": self.connect_timeout}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(state["url"], state["connect_timeout"])  # type: ignore[misc]
+
+    def _socket(self) -> socket.socket:
+        sock = getattr(self._local, "sock", None)
+        if sock is None:
+            try:
+                sock = socket.create_connection(self.address, timeout=self.connect_timeout)
+            except OSError as exc:
+                raise ConnectionError(f"cannot connect to broker at {self.url}: {exc}") from exc
+            sock.settimeout(None)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._local.sock = sock
+            with self._lock:
+                self._sockets.append(sock)
+        return sock
+
+    def _drop_socket(self, sock: socket.socket) -> None:
+        self._local.sock = None
+        with self._lock:
+            if sock in self._sockets:
+                self._sockets.remove(sock)
+        try:
+            sock.close()
+        except OSError:
+            pass
+
+    def _call(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        sock = self._socket()
+        try:
+            _send_frame(sock, request)
+            response = _recv_frame(sock)
+        except OSError as exc:
+            self._drop_socket(sock)
+            raise ConnectionError(f"connection to broker at {self.url} failed: {exc}") from exc
+        if response is None:
+            self._drop_socket(sock)
+            raise ConnectionError(f"broker at {self.url} closed the connection")
+        if not response.get("ok"):
+            raise RuntimeError(f"broker error: {response.get('error')}")
+        return response
+
+    def publish_task(self, job: Job) -> None:
+        self._call({"op": "publish_task", "job": job})
+
+    def consume_task(self, timeout: float) -> Optional[Job]:
+        return self._call({"op": "consume_task", "timeout": timeout})["job"]
+
+    def publish_result(self, reply_to: str, result: JobResult) -> None:
+        self._call({"op": "publish_result", "reply_to": reply_to, "result": result})
+
+    def consume_result(self, reply_to: str, timeout: float) -> Optional[JobResult]:
+        return self._call({"op": "consume_result", "reply_to": reply_to, "timeout": timeout})["result"]
+
+    def close(self) -> None:
+        with self._lock:
+            sockets, self._sockets = self._sockets, []
+        for sock in sockets:
+            try:
+                sock.close()
+            except OSError:
+                pass
+        self._local = threading.local()
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(prog="foreman-broker", description="Run the single-box foreman task broker.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = ap.parse_args()
+
+    server = BrokerServer(args.host, args.port)
+    print(f"[foreman-broker] listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
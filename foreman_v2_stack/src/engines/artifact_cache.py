@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from src.utils.hashing import canonical_json, canonical_sha256
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def declares_side_effects(task: Dict[str, Any], handler: Any) -> bool:
+    """A task's non-empty `side_effects_declared` list or a handler's `side_effects = True`.
+
+    The field mirrors the scene node declaration; the v5.1 task schema does not
+    allow it, so for API traffic the declaration comes from the handler.
+    """
+    return bool(task.get("side_effects_declared")) or getattr(handler, "side_effects", False) is True
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """Run-level cache settings taken from `embedded_master_meta`.
+
+    - `replay` (`execution.replay_mode`): recorded artifacts are served for every
+      task, and tasks with declared side effects are never re-run.
+    - `deterministic` (`governance.deterministic_required`): artifacts of
+      handlers marked `deterministic = False` are served from the cache too, so
+      a repeated task yields the artifact first recorded for it.
+    """
+
+    replay: bool = False
+    deterministic: bool = False
+
+    @staticmethod
+    def from_envelope(envelope: Dict[str, Any]) -> "CachePolicy":
+        meta = envelope.get("embedded_master_meta")
+        meta = meta if isinstance(meta, dict) else {}
+        execution = meta.get("execution") if isinstance(meta.get("execution"), dict) else {}
+        governance = meta.get("governance") if isinstance(meta.get("governance"), dict) else {}
+        return CachePolicy(
+            replay=execution.get("replay_mode") is True,
+            deterministic=governance.get("deterministic_required") is True,
+        )
+
+
+class ArtifactCache:
+    """Content-addressed task artifacts: a memory LRU in front of an optional disk tier.
+
+    Keys hash the task together with the tool id and version, so a task is only
+    served an artifact produced by the same tool release. The memory tier is
+    bounded by the size of the serialised artifacts (`max_bytes=0` turns it
+    off); the disk tier stores one JSON file per key under `directory` and is
+    promoted into memory on a hit. Artifacts are copied in and out. Thread-safe.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, directory: Optional[Path] = None) -> None:
+        self.max_bytes = max(0, int(max_bytes))
+        self.directory = Path(directory) if directory is not None else None
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def from_env() -> Optional["ArtifactCache"]:
+        """`AOS_FOREMAN_ARTIFACT_CACHE_BYTES` (default 64 MiB) and `AOS_FOREMAN_ARTIFACT_CACHE_DIR`; None if both are off."""
+        raw = os.getenv("AOS_FOREMAN_ARTIFACT_CACHE_BYTES")
+        try:
+            max_bytes = int(raw) if raw else DEFAULT_MAX_BYTES
+        except ValueError:
+            max_bytes = DEFAULT_MAX_BYTES
+        directory = os.getenv("AOS_FOREMAN_ARTIFACT_CACHE_DIR") or None
+        if max_bytes <= 0 and directory is None:
+            return None
+        return ArtifactCache(max_bytes=max_bytes, directory=Path(directory) if directory else None)
+
+    @staticmethod
+    def key(task: Dict[str, Any], tool_id: str, tool_version: str) -> str:
+        return canonical_sha256({"task": task, "tool_id": tool_id, "tool_version": tool_version})
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def _remember(self, key: str, data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = data
+            self._size += len(data)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+                self.evictions += 1
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return json.loads(data)
+
+        if self.directory is not None:
+            try:
+                data = self._path(key).read_bytes()
+                artifact = json.loads(data)
+            except (OSError, ValueError):
+                artifact = None
+            if isinstance(artifact, dict):
+                self._remember(key, data)
+                with self._lock:
+                    self.hits += 1
+                    self.disk_hits += 1
+                return artifact
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, artifact: Dict[str, Any]) -> None:
+        data = canonical_json(artifact).encode("utf-8")
+        self._remember(key, data)
+        if self.directory is None:
+            return
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    def clear(self) -> None:
+        """Drops the memory tier and resets counters; files on disk are kept."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self.hits = self.disk_hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "directory": str(self.directory) if self.directory is not None else None,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
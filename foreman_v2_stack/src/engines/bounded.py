@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from src.interfaces.engine import AsyncTaskEngine, BaseTaskEngine
+
+T = TypeVar("T")
+
+
+class EngineSaturated(RuntimeError):
+    """Every worker is busy and the wait queue is full; the request was not admitted."""
+
+
+class EngineQueueTimeout(RuntimeError):
+    """The request was admitted but waited longer than `queue_timeout_s` for a worker."""
+
+
+class BoundedExecutor:
+    """Thread pool with admission control, for running blocking work off the event loop.
+
+    At most `max_workers` calls run at once and at most `max_queue` more wait for
+    a worker; beyond that `run` raises `EngineSaturated` immediately instead of
+    queueing without bound. A call that waited longer than `queue_timeout_s` is
+    dropped before it starts and raises `EngineQueueTimeout`. The pool is created
+    on first use and recreated after `shutdown`, so one instance can serve several
+    application lifespans.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        max_queue: int = 32,
+        queue_timeout_s: Optional[float] = None,
+    ) -> None:
+        self.max_workers = max(1, int(max_workers))
+        self.max_queue = max(0, int(max_queue))
+        self.queue_timeout_s = queue_timeout_s
+        self._slots = threading.BoundedSemaphore(self.capacity)
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.stats: Dict[str, int] = {"admitted": 0, "rejected": 0, "timed_out": 0}
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.max_queue
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="foreman-api",
+                )
+            return self._pool
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+    def _release(self, _: Optional[Future] = None) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self._slots.release()
+
+    def _call(self, enqueued_at: float, fn: Callable[..., T], args: tuple) -> T:
+        if self.queue_timeout_s is not None:
+            waited = time.monotonic() - enqueued_at
+            if waited > self.queue_timeout_s:
+                with self._lock:
+                    self.stats["timed_out"] += 1
+                raise EngineQueueTimeout(
+                    f"waited {waited:.2f}s for a worker (limit {self.queue_timeout_s:.2f}s)"
+                )
+        return fn(*args)
+
+    def submit(self, fn: Callable[..., T], *args: Any) -> "Future[T]":
+        """Admit `fn(*args)` or raise `EngineSaturated`; never blocks the caller."""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.stats["rejected"] += 1
+            raise EngineSaturated(
+                f"{self.max_workers} workers busy and {self.max_queue} requests queued"
+            )
+        with self._lock:
+            self._in_flight += 1
+            self.stats["admitted"] += 1
+        try:
+            future = self._get_pool().submit(self._call, time.monotonic(), fn, args)
+        except BaseException:
+            self._release()
+            raise
+        # Runs on completion and on cancellation, so a slot is never leaked.
+        future.add_done_callback(self._release)
+        return future
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+
+class OffloadedTaskEngine(AsyncTaskEngine):
+    """Adapts a synchronous engine to `AsyncTaskEngine` by running it on a BoundedExecutor."""
+
+    def __init__(self, engine: BaseTaskEngine, executor: Optional[BoundedExecutor] = None) -> None:
+        self.engine = engine
+        self.executor = executor or BoundedExecutor()
+
+    def submit_task(self, envelope: Dict[str, Any]) -> Dict[str, Any]:
+        return self.engine.submit_task(envelope)
+
+    async def submit_task_async(self, envelope: Dict[str, Any]) -> Dict[str, Any]:
+        return await self.executor.run(self.engine.submit_task, envelope)
@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import heapq
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Set, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class DagPlan:
+    """Dependency graph over `embedded_master_meta.tasks.tasks`.
+
+    Nodes are task ids (or `#<index>` for tasks without one) in input order.
+    `problems` holds an `unsupported_tasks`-style entry for every task that
+    cannot be scheduled; all other nodes appear in `order`.
+    """
+
+    nodes: List[str]
+    tasks: Dict[str, Dict[str, Any]]
+    deps: Dict[str, List[str]]
+    dependents: Dict[str, List[str]]
+    order: List[str]
+    problems: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+
+@dataclass
+class NodeRun:
+    result: Any
+    start_ms: float
+    duration_ms: float
+
+
+def _problem(task: Dict[str, Any], reason: str, **extra: Any) -> Dict[str, Any]:
+    entry = {
+        "task_id": task.get("task_id"),
+        "task_type": str(task.get("task_type", "")).strip(),
+        "reason": reason,
+    }
+    entry.update(extra)
+    return entry
+
+
+def plan_dag(tasks: List[Any]) -> DagPlan:
+    """Topologically order tasks by `depends_on`.
+
+    Ties are broken by input position so the order is deterministic. Tasks
+    with duplicate ids or unknown dependencies, tasks on a dependency cycle and
+    everything downstream of those are reported in `problems` instead of being
+    scheduled.
+    """
+    nodes: List[str] = []
+    by_id: Dict[str, Dict[str, Any]] = {}
+    position: Dict[str, int] = {}
+    problems: Dict[str, Dict[str, Any]] = {}
+
+    for index, task in enumerate(tasks):
+        if not isinstance(task, dict):
+            continue
+        task_id = task.get("task_id")
+        node = task_id if isinstance(task_id, str) and task_id else f"#{index}"
+        if node in by_id:
+            node = f"#{index}"
+            problems[node] = _problem(task, "duplicate_task_id")
+        nodes.append(node)
+        by_id[node] = task
+        position[node] = index
+
+    deps: Dict[str, List[str]] = {}
+    dependents: Dict[str, List[str]] = {node: [] for node in nodes}
+    for node in nodes:
+        raw = by_id[node].get("depends_on") or []
+        node_deps = [d for d in raw if isinstance(d, str)] if isinstance(raw, list) else []
+        missing = sorted({d for d in node_deps if d not in by_id or d.startswith("#")})
+        if missing and node not in problems:
+            problems[node] = _problem(by_id[node], "missing_dependency", missing=missing)
+        deps[node] = [d for d in dict.fromkeys(node_deps) if d in by_id and not d.startswith("#")]
+        for dep in deps[node]:
+            dependents[dep].append(node)
+
+    # Kahn's algorithm; problem nodes never complete, so their dependents stay blocked.
+    indegree = {node: len(deps[node]) for node in nodes}
+    ready = [(position[n], n) for n in nodes if indegree[n] == 0 and n not in problems]
+    heapq.heapify(ready)
+    order: List[str] = []
+    while ready:
+        _, node = heapq.heappop(ready)
+        order.append(node)
+        for child in dependents[node]:
+            indegree[child] -= 1
+            if indegree[child] == 0 and child not in problems:
+                heapq.heappush(ready, (position[child], child))
+
+    scheduled = set(order)
+    remaining = [n for n in nodes if n not in problems and n not in scheduled]
+    if remaining:
+        remaining_set = set(remaining)
+        on_cycle = {n for n in remaining if _reaches(n, n, deps, remaining_set)}
+        for node in remaining:
+            if node in on_cycle:
+                problems[node] = _problem(by_id[node], "dependency_cycle")
+        for node in remaining:
+            if node not in on_cycle:
+                blocked_by = sorted(d for d in deps[node] if d in problems or d in remaining_set)
+                problems[node] = _problem(by_id[node], "blocked_by_dependency", blocked_by=blocked_by)
+
+    return DagPlan(nodes=nodes, tasks=by_id, deps=deps, dependents=dependents, order=order, problems=problems)
+
+
+def plan_levels(plan: DagPlan) -> Dict[str, int]:
+    """Depth of every scheduled node: 0 without dependencies, else 1 + deepest dependency."""
+    levels: Dict[str, int] = {}
+    for node in plan.order:
+        levels[node] = 1 + max((levels[dep] for dep in plan.deps[node]), default=-1)
+    return levels
+
+
+def coalesce_plan(plan: DagPlan, groups: List[List[str]]) -> tuple[DagPlan, Dict[str, List[str]]]:
+    """Merge each group of scheduled nodes into one unit node.
+
+    Groups must not contain a node and one of its (transitive) dependencies;
+    nodes of one `plan_levels` level always qualify. A unit is named after its
+    first member and depends on everything its members depend on. Returns the
+    unit plan and unit -> members (ungrouped nodes are units of one).
+    """
+    unit_of = {node: node for node in plan.order}
+    for group in groups:
+        for member in group:
+            unit_of[member] = group[0]
+
+    members: Dict[str, List[str]] = {}
+    for node in plan.order:
+        members.setdefault(unit_of[node], []).append(node)
+
+    deps: Dict[str, List[str]] = {unit: [] for unit in members}
+    dependents: Dict[str, List[str]] = {unit: [] for unit in members}
+    for unit, nodes in members.items():
+        unit_deps = dict.fromkeys(unit_of[d] for n in nodes for d in plan.deps[n] if d in unit_of)
+        unit_deps.pop(unit, None)
+        deps[unit] = list(unit_deps)
+        for dep in deps[unit]:
+            dependents[dep].append(unit)
+
+    # Level-major order keeps it topological once members are pulled together.
+    levels = plan_levels(plan)
+    position = {node: index for index, node in enumerate(plan.order)}
+    units = sorted(members, key=lambda unit: (max(levels[n] for n in members[unit]), position[unit]))
+    unit_plan = DagPlan(
+        nodes=units,
+        tasks={unit: plan.tasks[unit] for unit in units},
+        deps=deps,
+        dependents=dependents,
+        order=units,
+    )
+    return unit_plan, members
+
+
+def _reaches(start: str, target: str, deps: Dict[str, List[str]], within: Set[str]) -> bool:
+    stack = [d for d in deps[start] if d in within]
+    seen: Set[str] = set()
+    while stack:
+        node = stack.pop()
+        if node == target:
+            return True
+        if node in seen:
+            continue
+        seen.add(node)
+        stack.extend(d for d in deps[node] if d in within)
+    return False
+
+
+class DagExecutor:
+    """Runs the schedulable nodes of a DagPlan, starting each as soon as its dependencies finish.
+
+    `run` uses a lazily created, reused thread pool (`max_workers=1` runs
+    inline in topological order). The first exception raised by `fn` cancels
+    anything not yet started and is re-raised.
+    """
+
+    def __init__(self, max_workers: int = 4) -> None:
+        self.max_workers = max(1, int(max_workers))
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="foreman-dag",
+                )
+            return self._pool
+
+    def shutdown(self) -> None:
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True)
+                self._pool = None
+
+    @staticmethod
+    def _timed(fn: Callable[[str], T], node: str, t0: float) -> NodeRun:
+        start = time.perf_counter()
+        result = fn(node)
+        end = time.perf_counter()
+        return NodeRun(result=result, start_ms=(start - t0) * 1000, duration_ms=(end - start) * 1000)
+
+    @staticmethod
+    def _initial(plan: DagPlan) -> tuple[Dict[str, int], List[str]]:
+        scheduled = set(plan.order)
+        pending = {n: sum(1 for d in plan.deps[n] if d in scheduled) for n in plan.order}
+        return pending, [n for n in plan.order if pending[n] == 0]
+
+    @staticmethod
+    def _release(plan: DagPlan, node: str, pending: Dict[str, int]) -> List[str]:
+        released = []
+        for child in plan.dependents[node]:
+            if child in pending:
+                pending[child] -= 1
+                if pending[child] == 0:
+                    released.append(child)
+        return released
+
+    def run(self, plan: DagPlan, fn: Callable[[str], T]) -> Dict[str, NodeRun]:
+        t0 = time.perf_counter()
+        runs: Dict[str, NodeRun] = {}
+        if self.max_workers == 1 or len(plan.order) <= 1:
+            for node in plan.order:
+                runs[node] = self._timed(fn, node, t0)
+            return runs
+
+        pool = self._get_pool()
+        pending, ready = self._initial(plan)
+        in_flight: Dict[Future, str] = {}
+        try:
+            while ready or in_flight:
+                for node in ready:
+                    in_flight[pool.submit(self._timed, fn, node, t0)] = node
+                ready = []
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node = in_flight.pop(future)
+                    runs[node] = future.result()
+                    ready.extend(self._release(plan, node, pending))
+        except BaseException:
+            for future in in_flight:
+                future.cancel()
+            raise
+        return runs
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import functools
+from dataclasses import dataclass
+from importlib import metadata
+from typing import Any, Callable, Dict, Iterator, List, Mapping, MutableMapping, Optional, Tuple
+
+from src.registries.tool_lookup import ToolRecord, ToolRegistry
+
+HANDLER_ENTRY_POINT_GROUP = "foreman.handlers"
+
+TaskHandler = Callable[[Dict[str, Any]], Dict[str, Any]]
+BatchHandler = Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]]
+
+
+def batch_api(handler: Optional[TaskHandler]) -> Optional[BatchHandler]:
+    """The handler's `handle_batch(tasks) -> artifacts` method, if it declares one."""
+    batch = getattr(handler, "handle_batch", None)
+    return batch if callable(batch) else None
+
+
+@functools.lru_cache(maxsize=None)
+def discover_handler_plugins(group: str = HANDLER_ENTRY_POINT_GROUP) -> Tuple[Tuple[str, Any], ...]:
+    """Load every entry point in `group` once per process.
+
+    Returns `(name, plugin)` pairs; a plugin that fails to import is returned
+    as the exception so each registry can report it. Call `cache_clear()` after
+    installing plugins into a running process.
+    """
+    loaded: List[Tuple[str, Any]] = []
+    for entry_point in sorted(metadata.entry_points(group=group), key=lambda ep: ep.name):
+        try:
+            loaded.append((entry_point.name, entry_point.load()))
+        except Exception as exc:  # noqa: BLE001 - a broken plugin must not take the engine down
+            loaded.append((entry_point.name, exc))
+    return tuple(loaded)
+
+
+class HandlerRegistry(MutableMapping[str, TaskHandler]):
+    """Tool id -> task handler.
+
+    A handler is called with one task and returns one artifact. Handlers that
+    also have a `handle_batch(tasks)` method receive every batchable task of
+    their tool in one call instead (see LocalTaskEngine).
+
+    Plugins are advertised under the `foreman.handlers` entry point group and
+    resolve either to a `{tool_id: handler}` mapping or to a function that takes
+    the HandlerRegistry and registers into it:
+
+        [project.entry-points."foreman.handlers"]
+        my_tools = "my_pkg.foreman:HANDLERS"
+
+    `version` changes on every update so compiled dispatch tables can tell
+    they are stale.
+    """
+
+    def __init__(self, handlers: Optional[Mapping[str, TaskHandler]] = None) -> None:
+        self._handlers: Dict[str, TaskHandler] = dict(handlers or {})
+        self.load_errors: List[str] = []
+        self.version = 0
+
+    def __getitem__(self, tool_id: str) -> TaskHandler:
+        return self._handlers[tool_id]
+
+    def __setitem__(self, tool_id: str, handler: TaskHandler) -> None:
+        if not callable(handler):
+            raise TypeError(f"handler for {tool_id} is not callable")
+        self._handlers[tool_id] = handler
+        self.version += 1
+
+    def __delitem__(self, tool_id: str) -> None:
+        del self._handlers[tool_id]
+        self.version += 1
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._handlers)
+
+    def __len__(self) -> int:
+        return len(self._handlers)
+
+    def register(self, tool_id: str, handler: TaskHandler) -> None:
+        self[tool_id] = handler
+
+    def load_plugins(self, group: str = HANDLER_ENTRY_POINT_GROUP) -> None:
+        for name, plugin in discover_handler_plugins(group):
+            try:
+                if isinstance(plugin, BaseException):
+                    raise plugin
+                if isinstance(plugin, Mapping):
+                    for tool_id, handler in plugin.items():
+                        self[str(tool_id)] = handler
+                elif callable(plugin):
+                    plugin(self)
+                else:
+                    raise TypeError("expected a {tool_id: handler} mapping or a register(registry) function")
+            except Exception as exc:  # noqa: BLE001
+                self.load_errors.append(f"handler_plugin_error name={name} error={exc}")
+
+
+@dataclass(frozen=True)
+class Dispatch:
+    tool: ToolRecord
+    handler: Optional[TaskHandler]
+    batch: Optional[BatchHandler]
+
+
+class DispatchTable:
+    """Precompiled task_type -> (tool, handler) lookup.
+
+    Built once from the registry's task type index and the handler registry so
+    dispatching a task is a single dict lookup; task types are only
+    normalised (strip/lower) when the exact spelling misses. `version` pairs
+    the handler registry version with the tool registry generation.
+    """
+
+    def __init__(self, registry: ToolRegistry, handlers: HandlerRegistry) -> None:
+        self.version = (handlers.version, registry.generation)
+        self._entries: Dict[str, Dispatch] = {}
+        for task_type, record in registry.task_type_index.items():
+            handler = handlers.get(record.id)
+            self._entries[task_type] = Dispatch(tool=record, handler=handler, batch=batch_api(handler))
+
+    def lookup(self, task_type: str) -> Optional[Dispatch]:
+        entry = self._entries.get(task_type)
+        if entry is None:
+            entry = self._entries.get(task_type.strip().lower())
+        return entry
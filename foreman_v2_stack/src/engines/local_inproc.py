@@ -1,12 +1,15 @@
 from __future__ import annotations
 from datetime import datetime, timezone
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-from src.interfaces.engine import BaseTaskEngine
-from src.registries.tool_lookup import ToolRecord, ToolRegistry
+from src.engines.artifact_cache import ArtifactCache, CachePolicy, declares_side_effects
+from src.engines.dag import DagExecutor, DagPlan, NodeRun, coalesce_plan, plan_dag, plan_levels
+from src.engines.handlers import Dispatch, DispatchTable, HandlerRegistry
+from src.interfaces.engine import StreamingTaskEngine, TaskEventCallback
+from src.registries.tool_lookup import ToolRegistry
 
 
-class LocalTaskEngine(BaseTaskEngine):
+class LocalTaskEngine(StreamingTaskEngine):
     """MVP in-process task engine.
 
     This class is the local execution boundary and can later be swapped with
@@ -15,13 +18,37 @@ class LocalTaskEngine(BaseTaskEngine):
 
     EXPECTED_ENVELOPE_VERSION = "aos.master.envelope.v5_1"
 
-    def __init__(self, registry: Optional[ToolRegistry] = None) -> None:
+    def __init__(
+        self,
+        registry: Optional[ToolRegistry] = None,
+        max_workers: int = 4,
+        load_plugins: bool = True,
+        artifact_cache: Optional[ArtifactCache] = None,
+    ) -> None:
         self.registry = registry or ToolRegistry()
-        self.handlers: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
-            "urn:aos:tool:planner": self._build_planning_artifact,
-            "urn:aos:tool:generator": self._build_generation_artifact,
-            "urn:aos:tool:writer": self._build_generation_artifact,
-        }
+        # Content-addressed handler results; None always runs the handler.
+        self.artifact_cache = artifact_cache
+        # Independent tasks (per depends_on) run concurrently on this pool.
+        self.dag_executor = DagExecutor(max_workers=max_workers)
+        self.handlers = HandlerRegistry(
+            {
+                "urn:aos:tool:planner": self._build_planning_artifact,
+                "urn:aos:tool:generator": self._build_generation_artifact,
+                "urn:aos:tool:writer": self._build_generation_artifact,
+            }
+        )
+        if load_plugins:
+            # Installed `foreman.handlers` plugins may add tools or replace the built-ins.
+            self.handlers.load_plugins()
+        self._dispatch_table: Optional[DispatchTable] = None
+
+    @property
+    def dispatch_table(self) -> DispatchTable:
+        """Compiled on first use and again whenever `handlers` or the tool registry changes."""
+        table = self._dispatch_table
+        if table is None or table.version != (self.handlers.version, self.registry.generation):
+            table = self._dispatch_table = DispatchTable(self.registry, self.handlers)
+        return table
 
     def _iso_now(self) -> str:
         return (
@@ -67,7 +94,174 @@ class LocalTaskEngine(BaseTaskEngine):
             "produced_by_task_id": task_id,
         }
 
-    def _run_tasks(self, envelope: Dict[str, Any]) -> Dict[str, Any]:
+    def _dispatch(
+        self, task: Dict[str, Any]
+    ) -> Tuple[Optional[Dispatch], Optional[Dict[str, Any]]]:
+        """Resolve a task's tool and handler; returns (dispatch, None) or (None, unsupported_tasks entry)."""
+        task_type = str(task.get("task_type", "")).strip()
+        dispatch = self.dispatch_table.lookup(task_type)
+        if dispatch is None:
+            return None, {
+                "task_id": task.get("task_id"),
+                "task_type": task_type,
+                "reason": "tool_not_found",
+            }
+        if dispatch.handler is None:
+            return None, {
+                "task_id": task.get("task_id"),
+                "task_type": task_type,
+                "tool_id": dispatch.tool.id,
+                "reason": "handler_not_found",
+            }
+        return dispatch, None
+
+    def _cached(
+        self, task: Dict[str, Any], dispatch: Dispatch, policy: CachePolicy
+    ) -> Tuple[Optional[str], Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """Consult the artifact cache; returns (key, cached artifact, unsupported_tasks entry).
+
+        Tasks with declared side effects always run (their artifact is still
+        recorded) except under replay, where only a recorded artifact is used.
+        Handlers marked `deterministic = False` are served from the cache only
+        under replay or `deterministic_required`. A None key bypasses the cache.
+        """
+        if self.artifact_cache is None:
+            return None, None, None
+        version = dispatch.tool.versioning.get("semver", "")
+        handler_version = getattr(dispatch.handler, "version", None)
+        if handler_version is not None:
+            version = f"{version}+{handler_version}"
+        key = ArtifactCache.key(task, dispatch.tool.id, version)
+
+        side_effects = declares_side_effects(task, dispatch.handler)
+        if side_effects:
+            readable = policy.replay
+        elif getattr(dispatch.handler, "deterministic", True) is False:
+            readable = policy.replay or policy.deterministic
+        else:
+            readable = True
+        if readable:
+            artifact = self.artifact_cache.get(key)
+            if artifact is not None:
+                return key, artifact, None
+        if side_effects and policy.replay:
+            return key, None, {
+                "task_id": task.get("task_id"),
+                "task_type": str(task.get("task_type", "")).strip(),
+                "tool_id": dispatch.tool.id,
+                "reason": "replay_artifact_missing",
+            }
+        return key, None, None
+
+    def _execute_task(
+        self, task: Dict[str, Any], policy: CachePolicy = CachePolicy()
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """Run one task; returns (artifact, None) or (None, unsupported_tasks entry)."""
+        dispatch, problem = self._dispatch(task)
+        if dispatch is None:
+            return None, problem
+        key, artifact, problem = self._cached(task, dispatch, policy)
+        if artifact is not None or problem is not None:
+            return artifact, problem
+
+        artifact = dispatch.handler(task)
+        artifact["tool_id"] = dispatch.tool.id
+        if key is not None:
+            self.artifact_cache.put(key, artifact)
+        return artifact, None
+
+    def _execute_batch(
+        self, tasks: List[Dict[str, Any]], dispatch: Dispatch, policy: CachePolicy = CachePolicy()
+    ) -> List[Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]]:
+        """Run same-tool tasks not served by the cache through one `handle_batch` call."""
+        outcomes: List[Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]] = [(None, None)] * len(tasks)
+        pending: List[Tuple[int, Optional[str]]] = []
+        for index, task in enumerate(tasks):
+            key, artifact, problem = self._cached(task, dispatch, policy)
+            if artifact is not None or problem is not None:
+                outcomes[index] = (artifact, problem)
+            else:
+                pending.append((index, key))
+        if not pending:
+            return outcomes
+
+        artifacts = dispatch.batch([tasks[index] for index, _ in pending])
+        if len(artifacts) != len(pending):
+            raise RuntimeError(
+                f"{dispatch.tool.id} handle_batch returned {len(artifacts)} artifacts for {len(pending)} tasks"
+            )
+        for (index, key), artifact in zip(pending, artifacts):
+            artifact["tool_id"] = dispatch.tool.id
+            if key is not None:
+                self.artifact_cache.put(key, artifact)
+            outcomes[index] = (artifact, None)
+        return outcomes
+
+    def _batch_groups(self, plan: DagPlan) -> List[List[str]]:
+        """Nodes of one DAG level whose tool handler has a batch API, grouped per tool."""
+        levels = plan_levels(plan)
+        groups: Dict[Tuple[int, str], List[str]] = {}
+        for node in plan.order:
+            dispatch, _ = self._dispatch(plan.tasks[node])
+            if dispatch is not None and dispatch.batch is not None:
+                groups.setdefault((levels[node], dispatch.tool.id), []).append(node)
+        return [nodes for nodes in groups.values() if len(nodes) > 1]
+
+    def _run_unit(
+        self,
+        plan: DagPlan,
+        nodes: List[str],
+        on_event: Optional[TaskEventCallback],
+        policy: CachePolicy,
+    ) -> Dict[str, Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]]:
+        if len(nodes) == 1:
+            task = plan.tasks[nodes[0]]
+            if on_event is None:
+                return {nodes[0]: self._execute_task(task, policy)}
+            return {nodes[0]: self._execute_task_streaming(task, on_event, policy)}
+
+        tasks = [plan.tasks[node] for node in nodes]
+        dispatch, _ = self._dispatch(tasks[0])
+        if on_event is not None:
+            for task in tasks:
+                on_event(
+                    {
+                        "type": "task_started",
+                        "task_id": task.get("task_id"),
+                        "task_type": str(task.get("task_type", "")).strip(),
+                    }
+                )
+        outcomes = self._execute_batch(tasks, dispatch, policy)
+        if on_event is not None:
+            for task, (artifact, problem) in zip(tasks, outcomes):
+                if problem is not None:
+                    on_event({"type": "task_unsupported", **problem})
+                else:
+                    on_event({"type": "task_completed", "task_id": task.get("task_id"), "artifact": artifact})
+        return dict(zip(nodes, outcomes))
+
+    def _execute_task_streaming(
+        self, task: Dict[str, Any], on_event: TaskEventCallback, policy: CachePolicy = CachePolicy()
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        on_event(
+            {
+                "type": "task_started",
+                "task_id": task.get("task_id"),
+                "task_type": str(task.get("task_type", "")).strip(),
+            }
+        )
+        artifact, problem = self._execute_task(task, policy)
+        if problem is not None:
+            on_event({"type": "task_unsupported", **problem})
+        else:
+            on_event({"type": "task_completed", "task_id": task.get("task_id"), "artifact": artifact})
+        return artifact, problem
+
+    def _run_tasks(
+        self,
+        envelope: Dict[str, Any],
+        on_event: Optional[TaskEventCallback] = None,
+    ) -> Dict[str, Any]:
         embedded_meta = envelope.get("embedded_master_meta")
         if not isinstance(embedded_meta, dict):
             raise ValueError("embedded_master_meta must be an object")
@@ -80,50 +274,70 @@ class LocalTaskEngine(BaseTaskEngine):
         if not isinstance(tasks, list):
             raise ValueError("embedded_master_meta.tasks.tasks must be a list")
 
-        artifacts: List[Dict[str, Any]] = []
-        unsupported: List[Dict[str, Any]] = []
+        plan = plan_dag(tasks)
+        policy = CachePolicy.from_envelope(envelope)
+        if on_event is not None:
+            for node in plan.nodes:
+                if node in plan.problems:
+                    on_event({"type": "task_skipped", **plan.problems[node]})
 
-        for task in tasks:
-            if not isinstance(task, dict):
-                continue
+        # Same-level tasks for a batch-capable handler run as one unit; a batch's
+        # timing is reported for each of its tasks.
+        unit_plan, members = coalesce_plan(plan, self._batch_groups(plan))
+        unit_runs = self.dag_executor.run(
+            unit_plan, lambda unit: self._run_unit(plan, members[unit], on_event, policy)
+        )
+        runs: Dict[str, NodeRun] = {}
+        for unit, unit_run in unit_runs.items():
+            for node, outcome in unit_run.result.items():
+                runs[node] = NodeRun(result=outcome, start_ms=unit_run.start_ms, duration_ms=unit_run.duration_ms)
 
-            task_type = str(task.get("task_type", "")).strip()
-            tool_record: Optional[ToolRecord] = self.registry.resolve_tool(task_type)
-            if tool_record is None:
-                unsupported.append(
-                    {
-                        "task_id": task.get("task_id"),
-                        "task_type": task_type,
-                        "reason": "tool_not_found",
-                    }
-                )
-                continue
+        artifacts: List[Dict[str, Any]] = []
+        unsupported: List[Dict[str, Any]] = []
+        task_timings: List[Dict[str, Any]] = []
 
-            handler = self.handlers.get(tool_record.id)
-            if handler is None:
-                unsupported.append(
-                    {
-                        "task_id": task.get("task_id"),
-                        "task_type": task_type,
-                        "tool_id": tool_record.id,
-                        "reason": "handler_not_found",
-                    }
+        # Report in input order so results do not depend on completion order.
+        for node in plan.nodes:
+            task = plan.tasks[node]
+            run = runs.get(node)
+            if run is None:
+                unsupported.append(plan.problems[node])
+                task_timings.append(
+                    {"task_id": task.get("task_id"), "status": "skipped", "start_ms": None, "duration_ms": 0.0}
                 )
                 continue
 
-            artifact = handler(task)
-            artifact["tool_id"] = tool_record.id
-            artifacts.append(artifact)
+            artifact, problem = run.result
+            if problem is not None:
+                unsupported.append(problem)
+            else:
+                artifacts.append(artifact)
+            task_timings.append(
+                {
+                    "task_id": task.get("task_id"),
+                    "status": "unsupported" if problem is not None else "completed",
+                    "start_ms": round(run.start_ms, 3),
+                    "duration_ms": round(run.duration_ms, 3),
+                }
+            )
 
         status = "completed" if not unsupported else "completed_with_warnings"
         return {
             "status": status,
             "artifacts": artifacts,
             "unsupported_tasks": unsupported,
-            "registry_errors": self.registry.load_errors,
+            "registry_errors": self.registry.load_errors + self.handlers.load_errors,
+            "task_timings": task_timings,
         }
 
     def submit_task(self, envelope: Dict[str, Any]) -> Dict[str, Any]:
+        return self.submit_task_streaming(envelope, None)
+
+    def submit_task_streaming(
+        self,
+        envelope: Dict[str, Any],
+        on_event: Optional[TaskEventCallback],
+    ) -> Dict[str, Any]:
         envelope_version = envelope.get("envelope_version")
         if envelope_version != self.EXPECTED_ENVELOPE_VERSION:
             raise ValueError(
@@ -137,7 +351,7 @@ class LocalTaskEngine(BaseTaskEngine):
             f"kind={envelope.get('envelope_kind', 'n/a')}"
         )
 
-        result = self._run_tasks(envelope)
+        result = self._run_tasks(envelope, on_event)
 
         result_envelope: Dict[str, Any] = {
             "envelope_version": self.EXPECTED_ENVELOPE_VERSION,
@@ -155,3 +369,6 @@ class LocalTaskEngine(BaseTaskEngine):
             result_envelope["temporal"] = envelope["temporal"]
 
         return result_envelope
+
+    def shutdown(self) -> None:
+        self.dag_executor.shutdown()
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import os
+import threading
+import uuid
+from concurrent.futures import Future
+from typing import Any, Dict, Optional
+
+from src.brokers.base import Broker, JobResult
+from src.interfaces.engine import AsyncTaskEngine
+
+
+class QueueTaskEngine(AsyncTaskEngine):
+    """Remote execution: publishes envelopes to a Broker and awaits worker results.
+
+    Workers (`python -m src.worker`) run the actual engine. One collector thread
+    per engine drains this engine's `reply_to` queue and resolves the matching
+    pending submission, so any number of submissions can be in flight. A worker
+    `ValueError` is re-raised as `ValueError` (the API maps it to 400); other
+    worker failures raise `RuntimeError`. Submissions with no result after
+    `timeout_s` raise `TimeoutError`.
+    """
+
+    def __init__(
+        self,
+        broker: Broker,
+        reply_to: Optional[str] = None,
+        timeout_s: Optional[float] = 60.0,
+        poll_interval_s: float = 0.5,
+    ) -> None:
+        self.broker = broker
+        self.reply_to = reply_to or f"foreman.results.{os.getpid()}.{uuid.uuid4().hex[:8]}"
+        self.timeout_s = timeout_s
+        self.poll_interval_s = poll_interval_s
+        self._ids = itertools.count(1)
+        self._pending: Dict[str, "Future[Dict[str, Any]]"] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._collector: Optional[threading.Thread] = None
+
+    def _ensure_collector(self) -> None:
+        with self._lock:
+            if self._collector is None or not self._collector.is_alive():
+                self._stop.clear()
+                self._collector = threading.Thread(
+                    target=self._collect, name="foreman-queue-results", daemon=True
+                )
+                self._collector.start()
+
+    def _collect(self) -> None:
+        while not self._stop.is_set():
+            try:
+                result = self.broker.consume_result(self.reply_to, self.poll_interval_s)
+            except (ConnectionError, OSError) as exc:
+                self._fail_pending(exc)
+                return
+            if result is not None:
+                self._resolve(result)
+
+    def _resolve(self, result: JobResult) -> None:
+        with self._lock:
+            future = self._pending.pop(str(result.get("job_id")), None)
+        if future is None or future.done():
+            return  # timed out or unknown job
+        if result.get("ok"):
+            future.set_result(result["envelope"])
+        elif result.get("error_type") == "ValueError":
+            future.set_exception(ValueError(result.get("message", "")))
+        else:
+            future.set_exception(
+                RuntimeError(f"worker failed: {result.get('error_type')}: {result.get('message', '')}")
+            )
+
+    def _fail_pending(self, exc: BaseException) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(RuntimeError(f"broker connection lost: {exc}"))
+
+    def _publish(self, envelope: Dict[str, Any]) -> "tuple[str, Future[Dict[str, Any]]]":
+        self._ensure_collector()
+        job_id = f"{self.reply_to}.{next(self._ids)}"
+        future: "Future[Dict[str, Any]]" = Future()
+        with self._lock:
+            self._pending[job_id] = future
+        try:
+            self.broker.publish_task({"job_id": job_id, "reply_to": self.reply_to, "envelope": envelope})
+        except BaseException:
+            with self._lock:
+                self._pending.pop(job_id, None)
+            raise
+        return job_id, future
+
+    def _forget(self, job_id: str) -> None:
+        with self._lock:
+            self._pending.pop(job_id, None)
+
+    def submit_task(self, envelope: Dict[str, Any]) -> Dict[str, Any]:
+        job_id, future = self._publish(envelope)
+        try:
+            return future.result(timeout=self.timeout_s)
+        except TimeoutError:
+            self._forget(job_id)
+            raise TimeoutError(f"no worker result for {job_id} within {self.timeout_s}s") from None
+
+    async def submit_task_async(self, envelope: Dict[str, Any]) -> Dict[str, Any]:
+        # publish_task may do socket I/O; keep it off the event loop as well.
+        job_id, future = await asyncio.to_thread(self._publish, envelope)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.timeout_s)
+        except asyncio.TimeoutError:
+            self._forget(job_id)
+            raise TimeoutError(f"no worker result for {job_id} within {self.timeout_s}s") from None
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._pending)
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._collector is not None:
+            self._collector.join(timeout=self.poll_interval_s * 4)
+        self.broker.close()
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Optional
+
+# Receives progress events ({"type": "task_started", ...}) while a task envelope runs.
+TaskEventCallback = Callable[[Dict[str, Any]], None]
 
 
 class BaseTaskEngine(ABC):
@@ -19,3 +22,39 @@ class BaseTaskEngine(ABC):
             AoS result envelope payload.
         """
         raise NotImplementedError
+
+
+class AsyncTaskEngine(BaseTaskEngine):
+    """Async variant of the engine contract.
+
+    The API awaits `submit_task_async` instead of calling `submit_task`, so
+    implementations must not block the event loop (offload to a pool, or await
+    a remote worker). `submit_task` stays available for synchronous callers.
+    """
+
+    @abstractmethod
+    async def submit_task_async(self, envelope: Dict[str, Any]) -> Dict[str, Any]:
+        """Submit an AoS envelope for execution without blocking the event loop.
+
+        Returns:
+            AoS result envelope payload.
+        """
+        raise NotImplementedError
+
+
+class StreamingTaskEngine(BaseTaskEngine):
+    """Engine that reports per-task progress while it executes an envelope.
+
+    `on_event` may be called from worker threads and may block (the caller uses
+    that for flow control); it receives dicts with a `type` of `task_started`,
+    `task_completed` (with the `artifact`), `task_unsupported` or `task_skipped`.
+    """
+
+    @abstractmethod
+    def submit_task_streaming(
+        self,
+        envelope: Dict[str, Any],
+        on_event: Optional[TaskEventCallback],
+    ) -> Dict[str, Any]:
+        """Like `submit_task`, calling `on_event` as tasks start and finish."""
+        raise NotImplementedError
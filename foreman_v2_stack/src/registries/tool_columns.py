@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+from array import array
+from typing import Any, Dict, Generic, Hashable, Iterable, Iterator, List, Tuple, TypeVar, Union, overload
+
+from src.registries.tool_lookup import ToolRecord, shared_tuple
+
+T = TypeVar("T", bound=Hashable)
+
+
+class _Vocabulary(Generic[T]):
+    """Distinct values of a column; rows store the value's code.
+
+    With `by_identity`, values are told apart by object identity instead of
+    equality: used for the mappings, which ToolRecord already shares.
+    """
+
+    def __init__(self, by_identity: bool = False) -> None:
+        self.values: List[Any] = []
+        self._codes: Dict[Any, int] = {}
+        self._by_identity = by_identity
+
+    def code(self, value: Any) -> int:
+        key = id(value) if self._by_identity else value
+        code = self._codes.get(key)
+        if code is None:
+            code = self._codes[key] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class ToolColumns:
+    """Column-oriented copy of a tool catalog.
+
+    Unique strings (`id`, `name`, `entrypoint`) are kept in plain lists; every
+    other field is an `array` of codes into a per-column vocabulary, so a row
+    costs four bytes per repeated field instead of a record object holding a
+    pointer per field. Capabilities are flattened into one array of capability
+    codes with per-row offsets. Rows are materialised as ToolRecord on access.
+
+    Meant for holding or shipping a whole catalog (snapshots, worker start-up,
+    reporting); ToolRegistry keeps record objects for its ranked index.
+    """
+
+    def __init__(self) -> None:
+        self.ids: List[str] = []
+        self.names: List[str] = []
+        self.entrypoints: List[str] = []
+        self._vocabularies: Dict[str, _Vocabulary[Any]] = {
+            "type": _Vocabulary(),
+            "created_at": _Vocabulary(),
+            "kind": _Vocabulary(),
+            "status": _Vocabulary(),
+            "interfaces": _Vocabulary(by_identity=True),
+            "versioning": _Vocabulary(by_identity=True),
+        }
+        self._codes: Dict[str, array] = {name: array("I") for name in self._vocabularies}
+        self._capabilities: _Vocabulary[str] = _Vocabulary()
+        self._capability_codes = array("I")
+        self._capability_offsets = array("I", [0])
+
+    @staticmethod
+    def from_records(records: Iterable[ToolRecord]) -> "ToolColumns":
+        columns = ToolColumns()
+        for record in records:
+            columns.append(record)
+        return columns
+
+    def append(self, record: ToolRecord) -> None:
+        self.ids.append(record.id)
+        self.names.append(record.name)
+        self.entrypoints.append(record.entrypoint)
+        for name, vocabulary in self._vocabularies.items():
+            self._codes[name].append(vocabulary.code(getattr(record, name)))
+        self._capability_codes.extend(self._capabilities.code(capability) for capability in record.capabilities)
+        self._capability_offsets.append(len(self._capability_codes))
+
+    def _value(self, name: str, index: int) -> Any:
+        return self._vocabularies[name].values[self._codes[name][index]]
+
+    def capabilities(self, index: int) -> Tuple[str, ...]:
+        values = self._capabilities.values
+        start, end = self._capability_offsets[index], self._capability_offsets[index + 1]
+        return shared_tuple(values[code] for code in self._capability_codes[start:end])
+
+    def _row(self, index: int) -> ToolRecord:
+        return ToolRecord(
+            id=self.ids[index],
+            type=self._value("type", index),
+            created_at=self._value("created_at", index),
+            name=self.names[index],
+            kind=self._value("kind", index),
+            entrypoint=self.entrypoints[index],
+            capabilities=self.capabilities(index),
+            interfaces=self._value("interfaces", index),
+            versioning=self._value("versioning", index),
+            status=self._value("status", index),
+        )
+
+    @overload
+    def __getitem__(self, index: int) -> ToolRecord: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[ToolRecord]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[ToolRecord, List[ToolRecord]]:
+        if isinstance(index, slice):
+            return [self._row(i) for i in range(*index.indices(len(self.ids)))]
+        if index < 0:
+            index += len(self.ids)
+        if not 0 <= index < len(self.ids):
+            raise IndexError("ToolColumns index out of range")
+        return self._row(index)
+
+    def __iter__(self) -> Iterator[ToolRecord]:
+        return (self._row(i) for i in range(len(self.ids)))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def column(self, name: str) -> List[Any]:
+        """One field for every row, decoded (`ids`, `names` and `entrypoints` are plain lists)."""
+        if name == "capabilities":
+            return [self.capabilities(index) for index in range(len(self.ids))]
+        values = self._vocabularies[name].values
+        return [values[code] for code in self._codes[name]]
@@ -1,14 +1,69 @@
 from __future__ import annotations
 
+import bisect
+import functools
 import json
-from dataclasses import dataclass
+import os
+import sys
+import threading
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple, Union
 
 
-@dataclass(frozen=True)
+# Canonical instances of repeated immutable values, shared by every record that
+# carries an equal value. Once a table is full, new values are no longer shared,
+# so catalogs with mostly distinct values cannot grow it without bound.
+_SHARED_LIMIT = 1 << 16
+_SHARED_TUPLES: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+_SHARED_MAPPINGS: Dict[Tuple[Tuple[str, type, Any], ...], Mapping[str, Any]] = {}
+# Value types a shared mapping may hold. The intern key carries each value's type,
+# since equality alone would merge True with 1 and 1.0 with 1.
+_SHAREABLE_SCALARS = (str, int, float, bool, type(None))
+
+
+def shared_tuple(items: Iterable[str]) -> Tuple[str, ...]:
+    """Interned strings in a tuple shared with every other caller passing equal items.
+
+    Only strings are accepted (sys.intern raises TypeError otherwise), so equal
+    tuples never differ in element type.
+    """
+    value = tuple(sys.intern(item) for item in items)
+    shared = _SHARED_TUPLES.get(value)
+    if shared is None:
+        if len(_SHARED_TUPLES) >= _SHARED_LIMIT:
+            return value
+        shared = _SHARED_TUPLES.setdefault(value, value)
+    return shared
+
+
+def shared_mapping(raw: Mapping[str, Any]) -> Mapping[str, Any]:
+    """Read-only view of `raw`; views of flat mappings with equal, same-typed items are shared.
+
+    Keys and string values are interned. A mapping with non-scalar values (nested
+    objects or lists) gets a private copy.
+    """
+    items = tuple((sys.intern(str(k)), sys.intern(v) if isinstance(v, str) else v) for k, v in raw.items())
+    if not all(type(v) in _SHAREABLE_SCALARS for _, v in items):
+        return MappingProxyType(dict(items))
+    key = tuple((k, type(v), v) for k, v in items)
+    shared = _SHARED_MAPPINGS.get(key)
+    if shared is None:
+        if len(_SHARED_MAPPINGS) >= _SHARED_LIMIT:
+            return MappingProxyType(dict(items))
+        shared = _SHARED_MAPPINGS.setdefault(key, MappingProxyType(dict(items)))
+    return shared
+
+
+@dataclass(frozen=True, slots=True)
 class ToolRecord:
-    """Typed view over a tool record from registry/tools_catalog.jsonl."""
+    """Typed view over a tool record from registry/tools_catalog.jsonl.
+
+    Records are slotted and share their repeated parts: enum-like strings are
+    interned, `capabilities` is a shared tuple and `interfaces`/`versioning` are
+    shared read-only mappings, so a large catalog costs little more than its ids.
+    """
 
     id: str
     type: str
@@ -16,9 +71,9 @@ class ToolRecord:
     name: str
     kind: str
     entrypoint: str
-    capabilities: List[str]
-    interfaces: Dict[str, Any]
-    versioning: Dict[str, str]
+    capabilities: Tuple[str, ...]
+    interfaces: Mapping[str, Any]
+    versioning: Mapping[str, str]
     status: str
 
     @staticmethod
@@ -52,20 +107,175 @@ class ToolRecord:
 
         return ToolRecord(
             id=str(raw["id"]),
-            type=str(raw["type"]),
-            created_at=str(raw["created_at"]),
+            type=sys.intern(str(raw["type"])),
+            created_at=sys.intern(str(raw["created_at"])),
             name=str(raw["name"]),
-            kind=str(raw["kind"]),
+            kind=sys.intern(str(raw["kind"])),
             entrypoint=str(raw["entrypoint"]),
-            capabilities=[str(item) for item in capabilities],
-            interfaces=interfaces,
-            versioning={str(k): str(v) for k, v in versioning.items()},
-            status=str(raw["status"]),
+            capabilities=shared_tuple(capabilities),
+            interfaces=shared_mapping(interfaces),
+            versioning=shared_mapping({k: str(v) for k, v in versioning.items()}),
+            status=sys.intern(str(raw["status"])),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "type": self.type,
+            "created_at": self.created_at,
+            "name": self.name,
+            "kind": self.kind,
+            "entrypoint": self.entrypoint,
+            "capabilities": list(self.capabilities),
+            "interfaces": dict(self.interfaces),
+            "versioning": dict(self.versioning),
+            "status": self.status,
+        }
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # mappingproxy does not pickle; worker processes rebuild (and re-share) from the dict form.
+        return (ToolRecord.from_dict, (self.to_dict(),))
+
+
+# Leading bytes remembered to detect a catalog rewritten in place.
+_HEAD_BYTES = 256
+
+
+def _semver_key(version: str) -> Tuple[int, ...]:
+    """Numeric (major, minor, patch); missing or non-numeric parts count as 0."""
+    parts: List[int] = []
+    for part in version.split("-", 1)[0].split("+", 1)[0].split(".")[:3]:
+        if not part.isdigit():
+            break
+        parts.append(int(part))
+    return tuple(parts + [0] * (3 - len(parts)))
+
+
+def capability_tokens(record: ToolRecord) -> Tuple[str, ...]:
+    """Normalised lookup tokens; `task_type:x` and `task:x` also index as `x`."""
+    tokens: Dict[str, None] = {}
+    for capability in record.capabilities:
+        key = capability.strip().lower()
+        if key:
+            tokens[key] = None
+        prefix, sep, rest = capability.partition(":")
+        if sep and prefix in ("task_type", "task"):
+            key = rest.strip().lower()
+            if key:
+                tokens[key] = None
+    return shared_tuple(tokens)
+
+
+RankKey = Tuple[bool, Tuple[int, ...], int]
+
+
+@functools.lru_cache(maxsize=4096)
+def _negated_semver(version: str) -> Tuple[int, ...]:
+    return tuple(-n for n in _semver_key(version))
+
+
+def _rank(record: ToolRecord, position: int) -> RankKey:
+    # Sorted ascending: active first, then newest semver, then catalog order.
+    return (record.status != "active", _negated_semver(record.versioning.get("semver", "")), position)
+
+
+@dataclass(frozen=True)
+class _Index:
+    """Immutable registry snapshot; reloads build a new one and swap it in.
+
+    `rank` and `tokens` are computed once per record so updates never re-parse
+    versions or capabilities of unchanged records.
+    """
+
+    records: Tuple[ToolRecord, ...] = ()
+    by_id: Dict[str, ToolRecord] = field(default_factory=dict)
+    rank: Dict[str, RankKey] = field(default_factory=dict)
+    tokens: Dict[str, Tuple[str, ...]] = field(default_factory=dict)
+    by_token: Dict[str, Tuple[ToolRecord, ...]] = field(default_factory=dict)
+    by_token_status: Dict[Tuple[str, str], Tuple[ToolRecord, ...]] = field(default_factory=dict)
+
+    def with_records(self, records: List[ToolRecord]) -> "_Index":
+        """Copy-on-write update; a record replaces any earlier record with the same id."""
+        # Only the final record per id is indexed.
+        changed: Dict[str, ToolRecord] = {}
+        for record in records:
+            changed[record.id] = record
+
+        by_id = dict(self.by_id)
+        rank = dict(self.rank)
+        tokens = dict(self.tokens)
+        replaced = [tool_id for tool_id in changed if tool_id in self.by_id]
+        touched: Dict[str, None] = {}
+        for tool_id in replaced:
+            touched.update(dict.fromkeys(self.tokens[tool_id]))
+
+        added: Dict[str, List[ToolRecord]] = {}
+        next_position = len(self.by_id)
+        for tool_id, record in changed.items():
+            if tool_id in self.rank:
+                position = self.rank[tool_id][2]
+            else:
+                position, next_position = next_position, next_position + 1
+            by_id[tool_id] = record
+            rank[tool_id] = _rank(record, position)
+            tokens[tool_id] = capability_tokens(record)
+            for token in tokens[tool_id]:
+                added.setdefault(token, []).append(record)
+                touched[token] = None
+
+        def key(record: ToolRecord) -> RankKey:
+            return rank[record.id]
+
+        by_token = dict(self.by_token)
+        by_token_status = dict(self.by_token_status)
+        for token in touched:
+            current = by_token.get(token, ())
+            merged = [r for r in current if r.id not in changed] if replaced else list(current)
+            new = added.get(token, [])
+            if len(new) * 8 < len(merged):
+                for record in new:
+                    bisect.insort(merged, record, key=key)
+            else:
+                merged.extend(new)
+                merged.sort(key=key)
+
+            for status in {r.status for r in current}:
+                by_token_status.pop((token, status), None)
+            if not merged:
+                by_token.pop(token, None)
+                continue
+            by_token[token] = tuple(merged)
+            per_status: Dict[str, List[ToolRecord]] = {}
+            for record in merged:
+                per_status.setdefault(record.status, []).append(record)
+            for status, matches in per_status.items():
+                by_token_status[(token, status)] = tuple(matches)
+
+        if replaced:
+            ordered = tuple(sorted(by_id.values(), key=lambda r: rank[r.id][2]))
+        else:
+            ordered = self.records + tuple(changed.values())
+        return _Index(
+            records=ordered,
+            by_id=by_id,
+            rank=rank,
+            tokens=tokens,
+            by_token=by_token,
+            by_token_status=by_token_status,
         )
 
 
 class ToolRegistry:
-    """Tool catalog adapter for capability lookup by task type."""
+    """Tool catalog adapter for capability lookup by task type.
+
+    Every capability token maps to all records that declare it (an inverted
+    index), ranked active first, then by descending semver, then catalog order;
+    `resolve_tool` returns the top match and `find` the filtered list. The
+    catalog is append-only JSONL, so a later line for an existing id replaces
+    that record. `refresh()` reads only the lines appended since the last load
+    (a truncated or replaced file is reloaded in full) and swaps in a new index
+    snapshot; lookups read the current snapshot without locking.
+    """
 
     @staticmethod
     def _find_repo_root(start: Path) -> Path:
@@ -82,64 +292,183 @@ class ToolRegistry:
             repo_root = self._find_repo_root(Path(__file__).resolve())
             registry_path = repo_root / "registry" / "tools_catalog.jsonl"
 
-        self.registry_path = registry_path
-        self.records: List[ToolRecord] = []
-        self.task_type_index: Dict[str, ToolRecord] = {}
+        self.registry_path = Path(registry_path)
         self.load_errors: List[str] = []
+        # Bumped on every snapshot swap so dependants (dispatch tables) can tell they are stale.
+        self.generation = 0
+        self._index = _Index()
+        self._offset = 0
+        self._inode: Optional[int] = None
+        self._head = b""
+        self._line_number = 0
+        self._reload_lock = threading.Lock()
+        self._watcher: Optional[threading.Thread] = None
+        self._stop_watching = threading.Event()
 
         self._load_registry()
 
-    def _index_task_types(self, record: ToolRecord) -> None:
-        for capability in record.capabilities:
-            tokens: List[str] = [capability]
-            if capability.startswith("task_type:"):
-                tokens.append(capability.split(":", 1)[1])
-            if capability.startswith("task:"):
-                tokens.append(capability.split(":", 1)[1])
+    @property
+    def records(self) -> List[ToolRecord]:
+        return list(self._index.records)
 
-            for token in tokens:
-                key = token.strip().lower()
-                if key and key not in self.task_type_index:
-                    self.task_type_index[key] = record
+    @property
+    def task_type_index(self) -> Dict[str, ToolRecord]:
+        """Best-ranked record per token."""
+        return {token: matches[0] for token, matches in self._index.by_token.items()}
 
-    def _load_registry(self) -> None:
-        if not self.registry_path.exists():
-            self.load_errors.append(f"registry_not_found:{self.registry_path}")
-            return
+    def _parse_lines(self, data: bytes) -> Tuple[List[ToolRecord], int]:
+        """Records in `data` and the number of bytes consumed.
+
+        A last line without a newline that is not valid JSON yet is left
+        unconsumed: the writer may still be appending it.
+        """
+        records: List[ToolRecord] = []
+        consumed = 0
+        lines = data.split(b"\n")
+        for index, chunk in enumerate(lines):
+            last = index == len(lines) - 1
+            line = chunk.decode("utf-8", errors="replace").strip()
+            if last:
+                if not line:
+                    break
+                try:
+                    json.loads(line)
+                except json.JSONDecodeError:
+                    break
+            consumed += len(chunk) + (0 if last else 1)
+            self._line_number += 1
+            if not line:
+                continue
+            try:
+                raw = json.loads(line)
+            except json.JSONDecodeError as exc:
+                self.load_errors.append(f"invalid_json line={self._line_number} error={exc.msg}")
+                continue
 
+            # Skip metadata rows and non-tool records.
+            if not isinstance(raw, dict) or raw.get("type") != "aos.tool_record":
+                continue
+
+            try:
+                record = ToolRecord.from_dict(raw)
+            except ValueError as exc:
+                self.load_errors.append(f"invalid_tool_record line={self._line_number} error={exc}")
+                continue
+            records.append(record)
+        return records, consumed
+
+    def _read_from(self, offset: int) -> Optional[Tuple[List[ToolRecord], int, int]]:
         try:
-            with open(self.registry_path, "r", encoding="utf-8") as handle:
-                for line_number, line in enumerate(handle, start=1):
-                    line = line.strip()
-                    if not line:
-                        continue
-                    try:
-                        raw = json.loads(line)
-                    except json.JSONDecodeError as exc:
-                        self.load_errors.append(
-                            f"invalid_json line={line_number} error={exc.msg}"
-                        )
-                        continue
-
-                    # Skip metadata rows and non-tool records.
-                    if raw.get("type") != "aos.tool_record":
-                        continue
-
-                    try:
-                        record = ToolRecord.from_dict(raw)
-                    except ValueError as exc:
-                        self.load_errors.append(
-                            f"invalid_tool_record line={line_number} error={exc}"
-                        )
-                        continue
-
-                    self.records.append(record)
-                    self._index_task_types(record)
+            with open(self.registry_path, "rb") as handle:
+                inode = os.fstat(handle.fileno()).st_ino
+                if offset == 0:
+                    data = handle.read()
+                    self._head = data[:_HEAD_BYTES]
+                else:
+                    if handle.read(len(self._head)) != self._head:
+                        return None  # rewritten in place; caller reloads in full
+                    handle.seek(offset)
+                    data = handle.read()
+        except FileNotFoundError:
+            self.load_errors.append(f"registry_not_found:{self.registry_path}")
+            return None
         except OSError as exc:
             self.load_errors.append(f"registry_read_error:{exc}")
+            return None
+        records, consumed = self._parse_lines(data)
+        return records, offset + consumed, inode
+
+    def _load_registry(self) -> None:
+        with self._reload_lock:
+            self._full_reload()
+
+    def _full_reload(self) -> None:
+        self.load_errors = []
+        self._line_number = 0
+        loaded = self._read_from(0)
+        if loaded is None:
+            self._index, self._offset, self._inode = _Index(), 0, None
+        else:
+            records, self._offset, self._inode = loaded
+            self._index = _Index().with_records(records)
+        self.generation += 1
+
+    def refresh(self) -> int:
+        """Apply lines appended since the last load; returns the number of records read."""
+        with self._reload_lock:
+            try:
+                stat = os.stat(self.registry_path)
+            except OSError:
+                return 0
+            if stat.st_ino != self._inode or stat.st_size < self._offset:
+                self._full_reload()
+                return len(self._index.records)
+            if stat.st_size == self._offset:
+                return 0
+            loaded = self._read_from(self._offset)
+            if loaded is None:
+                self._full_reload()
+                return len(self._index.records)
+            records, self._offset, _ = loaded
+            if records:
+                self._index = self._index.with_records(records)
+                self.generation += 1
+            return len(records)
+
+    def watch(self, interval_s: float = 1.0) -> None:
+        """Poll the catalog for appended lines on a daemon thread until `stop_watching()`."""
+        if self._watcher is not None and self._watcher.is_alive():
+            return
+        self._stop_watching.clear()
+
+        def _poll() -> None:
+            while not self._stop_watching.wait(interval_s):
+                self.refresh()
+
+        self._watcher = threading.Thread(target=_poll, name="foreman-registry-watch", daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self) -> None:
+        self._stop_watching.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+    def get(self, tool_id: str) -> Optional[ToolRecord]:
+        return self._index.by_id.get(tool_id)
+
+    def find(
+        self,
+        capability: str,
+        status: Union[None, str, Iterable[str]] = None,
+        min_version: Optional[str] = None,
+        api_version: Optional[str] = None,
+    ) -> List[ToolRecord]:
+        """All records with a capability token, best first, optionally filtered.
+
+        `status` is one status or a collection of them; `min_version` compares
+        `versioning.semver` numerically; `api_version` must match exactly.
+        """
+        index = self._index
+        token = capability.strip().lower()
+        if isinstance(status, str):
+            matches = index.by_token_status.get((token, status), ())
+        else:
+            matches = index.by_token.get(token, ())
+            if status is not None:
+                allowed = set(status)
+                matches = tuple(r for r in matches if r.status in allowed)
+        if min_version is not None:
+            # rank keys hold the negated semver.
+            ceiling = _negated_semver(min_version)
+            matches = tuple(r for r in matches if index.rank[r.id][1] <= ceiling)
+        if api_version is not None:
+            matches = tuple(r for r in matches if r.versioning.get("api_version") == api_version)
+        return list(matches)
 
     def resolve_tool(self, task_type: str) -> Optional[ToolRecord]:
         lookup = task_type.strip().lower()
         if not lookup:
             return None
-        return self.task_type_index.get(lookup)
+        matches = self._index.by_token.get(lookup)
+        return matches[0] if matches else None
@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Any
+
+
+def canonical_json(value: Any) -> str:
+    """Sorted-key, whitespace-free JSON; equal documents serialise equally."""
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def canonical_sha256(value: Any) -> str:
+    """sha256 over `canonical_json`; equal documents hash equally."""
+    return hashlib.sha256(canonical_json(value).encode("utf-8")).hexdigest()
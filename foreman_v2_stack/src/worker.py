@@ -0,0 +1,162 @@
+"""foreman-worker: executes envelopes published by QueueTaskEngine.
+
+Usage (from foreman_v2_stack/, with a broker running):
+
+    python -m src.brokers.socket_broker --port 7455 &
+    python -m src.worker --broker tcp://127.0.0.1:7455 --processes 4
+    AOS_FOREMAN_ENGINE=queue AOS_FOREMAN_BROKER_URL=tcp://127.0.0.1:7455 \\
+        uvicorn src.api.server:app --port 8000
+"""
+from __future__ import annotations
+
+import argparse
+import functools
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+from src.brokers.base import Broker
+from src.interfaces.engine import BaseTaskEngine
+
+EngineFactory = Callable[[], BaseTaskEngine]
+
+POLL_INTERVAL_S = 0.5
+# Reconnect backoff after the broker becomes unreachable: doubles per failure up to the cap.
+RECONNECT_BACKOFF_S = 0.1
+MAX_RECONNECT_BACKOFF_S = 5.0
+
+
+def local_engine(registry_path: Optional[str] = None, max_workers: int = 4) -> BaseTaskEngine:
+    """Default engine factory; top-level so it can be handed to worker processes."""
+    from src.engines.artifact_cache import ArtifactCache
+    from src.engines.local_inproc import LocalTaskEngine
+    from src.registries.tool_lookup import ToolRegistry
+
+    registry = ToolRegistry(registry_path=Path(registry_path)) if registry_path else None
+    return LocalTaskEngine(registry=registry, max_workers=max_workers, artifact_cache=ArtifactCache.from_env())
+
+
+def _stopped(stop_event: Optional[threading.Event], wait_s: float) -> bool:
+    """Wait `wait_s`, returning early (True) if `stop_event` is set."""
+    if stop_event is None:
+        time.sleep(wait_s)
+        return False
+    return bool(stop_event.wait(wait_s))
+
+
+def run_worker(
+    broker: Broker,
+    engine_factory: EngineFactory = local_engine,
+    stop_event: Optional[threading.Event] = None,
+    max_jobs: Optional[int] = None,
+) -> int:
+    """Consume jobs until `stop_event` is set or `max_jobs` ran; returns jobs processed.
+
+    Engine failures are reported back as error results rather than killing the
+    worker. While the broker is unreachable (ConnectionError, e.g. during a
+    restart) the worker backs off and reconnects; a finished result is
+    published once the broker is back. `stop_event` may be a threading or
+    multiprocessing Event. The broker stays open: thread workers may share one.
+    """
+    engine = engine_factory()
+    processed = 0
+    backoff = RECONNECT_BACKOFF_S
+    try:
+        while (stop_event is None or not stop_event.is_set()) and (max_jobs is None or processed < max_jobs):
+            try:
+                job = broker.consume_task(POLL_INTERVAL_S)
+            except ConnectionError:
+                if _stopped(stop_event, backoff):
+                    break
+                backoff = min(backoff * 2, MAX_RECONNECT_BACKOFF_S)
+                continue
+            backoff = RECONNECT_BACKOFF_S
+            if job is None:
+                continue
+            try:
+                result = {"job_id": job["job_id"], "ok": True, "envelope": engine.submit_task(job["envelope"])}
+            except Exception as exc:  # noqa: BLE001 - every failure goes back to the submitter
+                result = {"job_id": job["job_id"], "ok": False, "error_type": type(exc).__name__, "message": str(exc)}
+            while True:
+                try:
+                    broker.publish_result(job["reply_to"], result)
+                    break
+                except ConnectionError:
+                    if _stopped(stop_event, backoff):
+                        return processed
+                    backoff = min(backoff * 2, MAX_RECONNECT_BACKOFF_S)
+            backoff = RECONNECT_BACKOFF_S
+            processed += 1
+    finally:
+        shutdown = getattr(engine, "shutdown", None)
+        if callable(shutdown):
+            shutdown()
+    return processed
+
+
+def start_worker_processes(
+    broker: Broker,
+    processes: int,
+    engine_factory: EngineFactory = local_engine,
+    context: Optional[multiprocessing.context.BaseContext] = None,
+):
+    """Start `processes` worker processes; returns (processes, stop_event).
+
+    `broker` and `engine_factory` must be picklable (MultiprocessingBroker,
+    SocketBroker, and top-level functions or `functools.partial` of them are).
+    """
+    ctx = context or multiprocessing.get_context()
+    stop_event = ctx.Event()
+    workers = [
+        ctx.Process(
+            target=run_worker,
+            args=(broker, engine_factory, stop_event),
+            name=f"foreman-worker-{index}",
+            daemon=True,
+        )
+        for index in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+    return workers, stop_event
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(prog="foreman-worker", description="Run foreman task workers against a broker.")
+    ap.add_argument(
+        "--broker",
+        default=os.getenv("AOS_FOREMAN_BROKER_URL", "tcp://127.0.0.1:7455"),
+        help="Broker URL (default: $AOS_FOREMAN_BROKER_URL or tcp://127.0.0.1:7455).",
+    )
+    ap.add_argument("--processes", type=int, default=os.cpu_count() or 1, help="Worker processes to run.")
+    ap.add_argument("--registry", default=None, help="Path to tools_catalog.jsonl (default: repo registry).")
+    ap.add_argument("--dag-workers", type=int, default=4, help="Threads per worker for independent DAG tasks.")
+    args = ap.parse_args()
+
+    from src.brokers.socket_broker import SocketBroker
+
+    broker = SocketBroker(args.broker)
+    factory = functools.partial(local_engine, args.registry, args.dag_workers)
+    workers, stop_event = start_worker_processes(broker, max(1, args.processes), factory)
+    print(f"[foreman-worker] {len(workers)} process(es) consuming from {args.broker}")
+
+    def _stop(*_: object) -> None:
+        stop_event.set()
+
+    signal.signal(signal.SIGTERM, _stop)
+    try:
+        for worker in workers:
+            worker.join()
+    except KeyboardInterrupt:
+        stop_event.set()
+        for worker in workers:
+            worker.join()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
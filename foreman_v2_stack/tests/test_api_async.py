@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+if importlib.util.find_spec("httpx") is None:
+    pytest.skip("httpx is required for the ASGI test client", allow_module_level=True)
+
+import httpx
+
+# Ensure `src` package imports resolve when running pytest from repo root.
+FOREMAN_ROOT = Path(__file__).resolve().parents[1]
+if str(FOREMAN_ROOT) not in sys.path:
+    sys.path.insert(0, str(FOREMAN_ROOT))
+
+import src.api.server as server
+from src.engines.bounded import BoundedExecutor, EngineSaturated, OffloadedTaskEngine
+from src.interfaces.engine import BaseTaskEngine
+from test_mvp_flow import _build_base_payload
+
+
+class SleepyEngine(BaseTaskEngine):
+    """Blocks for `delay_s` on requests whose request_id ends in `.slow`."""
+
+    def __init__(self, delay_s: float) -> None:
+        self.delay_s = delay_s
+        self.threads: List[str] = []
+
+    def submit_task(self, envelope: Dict[str, Any]) -> Dict[str, Any]:
+        self.threads.append(threading.current_thread().name)
+        if envelope["request_id"].endswith(".slow"):
+            time.sleep(self.delay_s)
+        return {"envelope_kind": "task_result", "request_id": envelope["request_id"], "result": {}}
+
+
+def _payload(request_id: str) -> Dict[str, Any]:
+    payload = _build_base_payload(task_type="planning")
+    payload["request_id"] = request_id
+    payload["embedded_master_meta"]["agents"]["agents"][0]["allowed_task_types"] = ["planning"]
+    return payload
+
+
+async def _post_all(payloads: List[Dict[str, Any]], stagger_s: float = 0.02) -> List[httpx.Response]:
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://foreman") as client:
+
+        async def post(index: int, payload: Dict[str, Any]) -> httpx.Response:
+            await asyncio.sleep(index * stagger_s)
+            return await client.post("/chat", json=payload)
+
+        return await asyncio.gather(*(post(i, p) for i, p in enumerate(payloads)))
+
+
+@pytest.fixture
+def executor(monkeypatch: pytest.MonkeyPatch):
+    def install(**kwargs: Any) -> BoundedExecutor:
+        bounded = BoundedExecutor(**kwargs)
+        monkeypatch.setattr(server, "CHAT_EXECUTOR", bounded)
+        return bounded
+
+    yield install
+    server.CHAT_EXECUTOR.shutdown()
+
+
+def test_slow_envelope_does_not_stall_other_requests(executor) -> None:
+    executor(max_workers=4, max_queue=4)
+    engine = SleepyEngine(delay_s=0.5)
+    server.ENGINE = engine
+
+    async def scenario() -> float:
+        slow = asyncio.ensure_future(_post_all([_payload("urn:aos:req:a.slow")], stagger_s=0))
+        await asyncio.sleep(0.05)
+        started = time.perf_counter()
+        (fast,) = await _post_all([_payload("urn:aos:req:b.fast")])
+        fast_latency = time.perf_counter() - started
+        (slow_response,) = await slow
+        assert fast.status_code == 200, fast.text
+        assert slow_response.status_code == 200, slow_response.text
+        return fast_latency
+
+    assert asyncio.run(scenario()) < 0.4
+    assert all(name.startswith("foreman-api") for name in engine.threads)
+
+
+def test_saturated_executor_returns_429(executor) -> None:
+    executor(max_workers=1, max_queue=0)
+    server.ENGINE = SleepyEngine(delay_s=0.3)
+
+    first, second = asyncio.run(_post_all([_payload("urn:aos:req:a.slow"), _payload("urn:aos:req:b.fast")]))
+
+    assert first.status_code == 200, first.text
+    assert second.status_code == 429, second.text
+    assert second.headers.get("retry-after") == "1"
+    assert second.json()["detail"]["error"] == "engine_saturated"
+
+
+def test_queue_timeout_returns_503(executor) -> None:
+    executor(max_workers=1, max_queue=1, queue_timeout_s=0.05)
+    server.ENGINE = SleepyEngine(delay_s=0.3)
+
+    first, second = asyncio.run(_post_all([_payload("urn:aos:req:a.slow"), _payload("urn:aos:req:b.fast")]))
+
+    assert first.status_code == 200, first.text
+    assert second.status_code == 503, second.text
+    assert second.json()["detail"]["error"] == "engine_overloaded"
+
+
+def test_async_engine_contract_is_awaited(executor) -> None:
+    executor(max_workers=2, max_queue=2)
+    engine = OffloadedTaskEngine(SleepyEngine(delay_s=0), BoundedExecutor(max_workers=1, max_queue=0))
+    server.ENGINE = engine
+    try:
+        (response,) = asyncio.run(_post_all([_payload("urn:aos:req:c.fast")]))
+    finally:
+        engine.executor.shutdown()
+
+    assert response.status_code == 200, response.text
+    assert response.json()["request_id"] == "urn:aos:req:c.fast"
+    assert engine.executor.stats["admitted"] == 1
+
+
+def test_async_engine_saturation_maps_to_429_and_503(executor) -> None:
+    executor(max_workers=2, max_queue=2)
+    saturated = OffloadedTaskEngine(SleepyEngine(delay_s=0.3), BoundedExecutor(max_workers=1, max_queue=0))
+    queued = OffloadedTaskEngine(
+        SleepyEngine(delay_s=0.3), BoundedExecutor(max_workers=1, max_queue=1, queue_timeout_s=0.05)
+    )
+    try:
+        server.ENGINE = saturated
+        first, second = asyncio.run(_post_all([_payload("urn:aos:req:a.slow"), _payload("urn:aos:req:b.fast")]))
+        assert first.status_code == 200, first.text
+        assert second.status_code == 429, second.text
+        assert second.headers.get("retry-after") == "1"
+        assert second.json()["detail"]["error"] == "engine_saturated"
+
+        server.ENGINE = queued
+        first, second = asyncio.run(_post_all([_payload("urn:aos:req:c.slow"), _payload("urn:aos:req:d.fast")]))
+        assert first.status_code == 200, first.text
+        assert second.status_code == 503, second.text
+        assert second.headers.get("retry-after") == "1"
+        assert second.json()["detail"]["error"] == "engine_overloaded"
+    finally:
+        saturated.executor.shutdown()
+        queued.executor.shutdown()
+
+
+class DownBrokerEngine(BaseTaskEngine):
+    def submit_task(self, envelope: Dict[str, Any]) -> Dict[str, Any]:
+        raise ConnectionError("cannot connect to broker at tcp://127.0.0.1:7455")
+
+
+def test_broker_connection_error_returns_503(executor) -> None:
+    executor(max_workers=1, max_queue=1)
+    server.ENGINE = DownBrokerEngine()
+
+    (response,) = asyncio.run(_post_all([_payload("urn:aos:req:e.fast")]))
+
+    assert response.status_code == 503, response.text
+    assert response.headers.get("retry-after") == "1"
+    assert response.json()["detail"]["error"] == "engine_unavailable"
+
+
+def test_bounded_executor_releases_slots() -> None:
+    bounded = BoundedExecutor(max_workers=1, max_queue=0)
+    gate = threading.Event()
+    try:
+        future = bounded.submit(gate.wait)
+        with pytest.raises(EngineSaturated):
+            bounded.submit(lambda: None)
+        gate.set()
+        future.result(timeout=1)
+        assert bounded.submit(lambda: 7).result(timeout=1) == 7
+    finally:
+        bounded.shutdown()
+
+    assert bounded.in_flight == 0
+    assert bounded.stats == {"admitted": 2, "rejected": 1, "timed_out": 0}
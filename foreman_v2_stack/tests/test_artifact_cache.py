@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+# Ensure `src` package imports resolve when running pytest from repo root.
+FOREMAN_ROOT = Path(__file__).resolve().parents[1]
+if str(FOREMAN_ROOT) not in sys.path:
+    sys.path.insert(0, str(FOREMAN_ROOT))
+
+from src.engines.artifact_cache import ArtifactCache
+from src.engines.local_inproc import LocalTaskEngine
+from src.registries.tool_lookup import ToolRegistry
+from test_dag import _build_registry_file, _envelope, _task
+from test_handlers import BatchPlanner
+
+
+class CountingPlanner:
+    def __init__(self, **attributes: Any) -> None:
+        self.calls: List[str] = []
+        self.__dict__.update(attributes)
+
+    def __call__(self, task: Dict[str, Any]) -> Dict[str, Any]:
+        self.calls.append(task["task_id"])
+        return {"artifact_id": f"urn:aos:artifact:{task['task_id']}.{len(self.calls)}"}
+
+
+def _engine(tmp_path: Path, planner: Any, cache: Optional[ArtifactCache] = None) -> LocalTaskEngine:
+    engine = LocalTaskEngine(
+        registry=ToolRegistry(registry_path=_build_registry_file(tmp_path)),
+        load_plugins=False,
+        artifact_cache=cache if cache is not None else ArtifactCache(),
+    )
+    engine.handlers["urn:aos:tool:planner"] = planner
+    return engine
+
+
+def _run(engine: LocalTaskEngine, tasks: List[Dict[str, Any]], replay: bool = False, deterministic: bool = False):
+    envelope = _envelope(tasks)
+    envelope["embedded_master_meta"]["execution"] = {"mode": "dry_run" if replay else "execute", "replay_mode": replay}
+    envelope["embedded_master_meta"]["governance"] = {"deterministic_required": deterministic}
+    return engine.submit_task(envelope)["result"]
+
+
+def test_memory_tier_is_bounded_by_bytes() -> None:
+    cache = ArtifactCache(max_bytes=100)
+    cache.put("a", {"content": "x" * 30})
+    cache.put("b", {"content": "y" * 30})
+    assert cache.get("a") is not None  # "a" is now most recently used
+    cache.put("c", {"content": "z" * 30})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"content": "x" * 30}
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["bytes"] <= 100
+    assert (stats["hits"], stats["misses"]) == (2, 1)
+
+
+def test_disk_tier_survives_restart(tmp_path: Path) -> None:
+    ArtifactCache(directory=tmp_path / "artifacts").put("k" * 64, {"artifact_id": "one"})
+
+    restarted = ArtifactCache(directory=tmp_path / "artifacts")
+    assert restarted.get("k" * 64) == {"artifact_id": "one"}
+    assert restarted.get("k" * 64) == {"artifact_id": "one"}
+    assert (restarted.stats()["disk_hits"], restarted.stats()["hits"]) == (1, 2)
+
+
+def test_identical_tasks_are_served_from_cache(tmp_path: Path) -> None:
+    planner = CountingPlanner()
+    engine = _engine(tmp_path, planner)
+
+    first = _run(engine, [_task("a", []), _task("b", [])])
+    second = _run(engine, [_task("a", []), _task("b", [])])
+    changed = _run(engine, [{**_task("a", []), "description": "edited"}])
+
+    assert planner.calls == ["a", "b", "a"]
+    assert second["artifacts"] == first["artifacts"]
+    assert second["artifacts"][0]["tool_id"] == "urn:aos:tool:planner"
+    assert changed["artifacts"][0]["artifact_id"].endswith(".3")
+
+
+def test_handler_version_is_part_of_the_key(tmp_path: Path) -> None:
+    cache = ArtifactCache()
+    _run(_engine(tmp_path, CountingPlanner(version="1"), cache), [_task("a", [])])
+    upgraded = CountingPlanner(version="2")
+    _run(_engine(tmp_path, upgraded, cache), [_task("a", [])])
+    assert upgraded.calls == ["a"]
+
+
+def test_side_effect_tasks_run_every_time_but_replay_from_recording(tmp_path: Path) -> None:
+    planner = CountingPlanner()
+    engine = _engine(tmp_path, planner)
+    effectful = {**_task("a", []), "side_effects_declared": ["sends_email"]}
+
+    _run(engine, [effectful])
+    _run(engine, [effectful])
+    replayed = _run(engine, [effectful], replay=True)
+    missing = _run(engine, [{**effectful, "task_id": "never_recorded"}], replay=True)
+
+    assert planner.calls == ["a", "a"]
+    assert replayed["artifacts"][0]["artifact_id"].endswith(".2")
+    assert missing["unsupported_tasks"][0]["reason"] == "replay_artifact_missing"
+
+
+def test_nondeterministic_handlers_are_pinned_only_when_required(tmp_path: Path) -> None:
+    planner = CountingPlanner(deterministic=False)
+    engine = _engine(tmp_path, planner)
+
+    _run(engine, [_task("a", [])])
+    _run(engine, [_task("a", [])])
+    pinned = _run(engine, [_task("a", [])], deterministic=True)
+
+    assert planner.calls == ["a", "a"]
+    assert pinned["artifacts"][0]["artifact_id"].endswith(".2")
+
+
+def test_batches_only_carry_cache_misses(tmp_path: Path) -> None:
+    planner = BatchPlanner()
+    engine = _engine(tmp_path, planner)
+
+    _run(engine, [_task("a", []), _task("b", [])])
+    result = _run(engine, [_task("a", []), _task("b", []), _task("c", [])])
+
+    assert planner.calls == [["a", "b"], ["c"]]
+    assert [a["produced_by_task_id"] for a in result["artifacts"]] == ["a", "b", "c"]
+
+
+@pytest.mark.parametrize("raw, expected", [(None, 64 * 1024 * 1024), ("1024", 1024)])
+def test_from_env(monkeypatch: pytest.MonkeyPatch, raw: Optional[str], expected: int) -> None:
+    monkeypatch.delenv("AOS_FOREMAN_ARTIFACT_CACHE_DIR", raising=False)
+    if raw is None:
+        monkeypatch.delenv("AOS_FOREMAN_ARTIFACT_CACHE_BYTES", raising=False)
+    else:
+        monkeypatch.setenv("AOS_FOREMAN_ARTIFACT_CACHE_BYTES", raw)
+    assert ArtifactCache.from_env().max_bytes == expected
+
+    monkeypatch.setenv("AOS_FOREMAN_ARTIFACT_CACHE_BYTES", "0")
+    assert ArtifactCache.from_env() is None
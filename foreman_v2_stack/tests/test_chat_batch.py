@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+if importlib.util.find_spec("httpx") is None:
+    pytest.skip("httpx is required for FastAPI TestClient", allow_module_level=True)
+
+from fastapi.testclient import TestClient
+
+# Ensure `src` package imports resolve when running pytest from repo root.
+FOREMAN_ROOT = Path(__file__).resolve().parents[1]
+if str(FOREMAN_ROOT) not in sys.path:
+    sys.path.insert(0, str(FOREMAN_ROOT))
+
+import src.api.server as server
+from src.api.validation_cache import ValidationCache
+from src.engines.local_inproc import LocalTaskEngine
+from src.registries.tool_lookup import ToolRegistry
+from test_mvp_flow import _build_base_payload, _build_registry_file
+
+
+def _payload(request_id: str) -> Dict[str, Any]:
+    payload = _build_base_payload(task_type="planning")
+    payload["request_id"] = request_id
+    payload["embedded_master_meta"]["agents"]["agents"][0]["allowed_task_types"] = ["planning"]
+    return payload
+
+
+def _lines(body: str) -> Dict[int, Dict[str, Any]]:
+    parsed: List[Dict[str, Any]] = [json.loads(line) for line in body.splitlines() if line]
+    return {line["index"]: line for line in parsed}
+
+
+@pytest.fixture
+def client(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(server, "VALIDATION_CACHE", ValidationCache(max_entries=16))
+    with TestClient(server.app) as test_client:
+        server.ENGINE = LocalTaskEngine(registry=ToolRegistry(registry_path=_build_registry_file(tmp_path)))
+        yield test_client
+
+
+def test_array_body_isolates_item_errors(client: TestClient) -> None:
+    bad = _payload("urn:aos:req:batch.bad")
+    bad["unexpected_key"] = True
+    items = [_payload("urn:aos:req:batch.0"), bad, _payload("urn:aos:req:batch.2"), "not an envelope"]
+
+    response = client.post("/chat/batch", json=items)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = _lines(response.text)
+    assert sorted(lines) == [0, 1, 2, 3]
+    assert lines[0]["status_code"] == 200
+    assert lines[0]["envelope"]["envelope_kind"] == "task_result"
+    assert lines[0]["request_id"] == "urn:aos:req:batch.0"
+    assert lines[1]["status_code"] == 400
+    assert lines[1]["error"]["validator"] == "additionalProperties"
+    assert lines[2]["envelope"]["request_id"] == "urn:aos:req:batch.2"
+    assert lines[3]["error"]["error"] == "invalid_envelope_payload"
+    # Both valid items share one embedded_master_meta: validated once, then served from cache.
+    assert server.VALIDATION_CACHE.stats()["misses"] == 1
+    assert server.VALIDATION_CACHE.stats()["hits"] == 1
+
+
+def test_ndjson_body_reports_unparseable_lines(client: TestClient) -> None:
+    body = "\n".join(
+        [json.dumps(_payload("urn:aos:req:batch.a")), "{broken", "", json.dumps(_payload("urn:aos:req:batch.b"))]
+    )
+
+    response = client.post("/chat/batch", content=body, headers={"content-type": "application/x-ndjson"})
+
+    lines = _lines(response.text)
+    assert sorted(lines) == [0, 1, 2]
+    assert lines[1]["error"]["error"] == "invalid_json"
+    assert lines[1]["error"]["message"].startswith("line 2:")
+    assert [lines[i]["status_code"] for i in (0, 2)] == [200, 200]
+
+
+def test_engine_errors_are_per_item(client: TestClient) -> None:
+    wrong_version = _payload("urn:aos:req:batch.v")
+    server.ENGINE.EXPECTED_ENVELOPE_VERSION = "aos.master.envelope.v9"
+    try:
+        response = client.post("/chat/batch", json=[wrong_version])
+    finally:
+        del server.ENGINE.EXPECTED_ENVELOPE_VERSION
+
+    (line,) = _lines(response.text).values()
+    assert line["status_code"] == 400
+    assert line["error"]["error"] == "engine_submission_error"
+
+
+def test_batch_level_errors(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    assert client.post("/chat/batch", content=b"   ").status_code == 400
+    assert client.post("/chat/batch", content=b"[{}, ").status_code == 400
+
+    monkeypatch.setenv("AOS_FOREMAN_BATCH_MAX_ITEMS", "1")
+    response = client.post("/chat/batch", json=[_payload("a"), _payload("b")])
+    assert response.status_code == 413
+    assert response.json()["detail"]["error"] == "batch_too_large"
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+# Ensure `src` package imports resolve when running pytest from repo root.
+FOREMAN_ROOT = Path(__file__).resolve().parents[1]
+if str(FOREMAN_ROOT) not in sys.path:
+    sys.path.insert(0, str(FOREMAN_ROOT))
+
+from src.engines.dag import DagExecutor, plan_dag
+from src.engines.local_inproc import LocalTaskEngine
+from src.registries.tool_lookup import ToolRegistry
+
+
+def _task(task_id: str, depends_on: List[str], task_type: str = "planning") -> Dict[str, Any]:
+    return {
+        "task_id": task_id,
+        "task_type": task_type,
+        "description": f"task {task_id}",
+        "depends_on": depends_on,
+    }
+
+
+def _envelope(tasks: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        "envelope_version": "aos.master.envelope.v5_1",
+        "envelope_kind": "task_request",
+        "request_id": "urn:aos:req:test.dag",
+        "embedded_master_meta": {"tasks": {"tasks": tasks}},
+    }
+
+
+def _build_registry_file(tmp_path: Path) -> Path:
+    path = tmp_path / "tools_catalog.jsonl"
+    lines = [
+        json.dumps({"id": "tools_catalog.meta.v1", "type": "aos.tool_catalog_meta"}),
+        json.dumps(
+            {
+                "id": "urn:aos:tool:planner",
+                "type": "aos.tool_record",
+                "created_at": "2026-02-15T19:00:00Z",
+                "name": "planner",
+                "kind": "python_module",
+                "entrypoint": "planner.run",
+                "capabilities": ["planning", "task_type:planning"],
+                "interfaces": {"mcp": None, "vport": None, "http": None},
+                "versioning": {"semver": "0.1.0", "api_version": "v1"},
+                "status": "active",
+            }
+        ),
+    ]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+
+def _engine(tmp_path: Path, max_workers: int, delay_s: float, log: List[str]) -> LocalTaskEngine:
+    engine = LocalTaskEngine(
+        registry=ToolRegistry(registry_path=_build_registry_file(tmp_path)),
+        max_workers=max_workers,
+    )
+    lock = threading.Lock()
+    build = engine.handlers["urn:aos:tool:planner"]
+
+    def slow_planner(task: Dict[str, Any]) -> Dict[str, Any]:
+        time.sleep(delay_s)
+        with lock:
+            log.append(task["task_id"])
+        return build(task)
+
+    engine.handlers["urn:aos:tool:planner"] = slow_planner
+    return engine
+
+
+def test_plan_orders_by_dependencies_with_input_tiebreak() -> None:
+    plan = plan_dag([_task("c", ["a", "b"]), _task("b", []), _task("a", [])])
+
+    assert plan.order == ["b", "a", "c"]
+    assert plan.problems == {}
+
+
+def test_plan_reports_missing_cycles_and_blocked_tasks() -> None:
+    plan = plan_dag(
+        [
+            _task("a", ["ghost"]),
+            _task("b", ["c"]),
+            _task("c", ["b"]),
+            _task("d", ["c"]),
+            _task("e", []),
+            _task("e", []),
+        ]
+    )
+
+    assert plan.order == ["e"]
+    reasons = {node: problem["reason"] for node, problem in plan.problems.items()}
+    assert reasons == {
+        "a": "missing_dependency",
+        "b": "dependency_cycle",
+        "c": "dependency_cycle",
+        "d": "blocked_by_dependency",
+        "#5": "duplicate_task_id",
+    }
+    assert plan.problems["a"]["missing"] == ["ghost"]
+    assert plan.problems["d"]["blocked_by"] == ["c"]
+
+
+def test_independent_tasks_run_concurrently_and_respect_dependencies(tmp_path: Path) -> None:
+    log: List[str] = []
+    engine = _engine(tmp_path, max_workers=4, delay_s=0.1, log=log)
+    tasks = [_task("a", []), _task("b", []), _task("c", []), _task("d", ["a", "b", "c"])]
+
+    started = time.perf_counter()
+    result = engine.submit_task(_envelope(tasks))["result"]
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.35, f"expected a, b, c to overlap; took {elapsed:.3f}s"
+    assert log[-1] == "d"
+    assert result["status"] == "completed"
+    # Artifacts and timings stay in input order regardless of completion order.
+    assert [a["produced_by_task_id"] for a in result["artifacts"]] == ["a", "b", "c", "d"]
+    timings = {t["task_id"]: t for t in result["task_timings"]}
+    assert [t["task_id"] for t in result["task_timings"]] == ["a", "b", "c", "d"]
+    for dep in ("a", "b", "c"):
+        # timings are rounded to microseconds
+        assert timings["d"]["start_ms"] >= timings[dep]["start_ms"] + timings[dep]["duration_ms"] - 0.002
+
+
+def test_sequential_mode_matches_parallel_output(tmp_path: Path) -> None:
+    tasks = [_task("a", []), _task("b", ["a"]), _task("c", ["x"]), _task("d", [], task_type="validation")]
+    results = []
+    for workers in (1, 4):
+        engine = _engine(tmp_path, max_workers=workers, delay_s=0, log=[])
+        results.append(engine.submit_task(_envelope(tasks))["result"])
+
+    for result in results:
+        assert result["status"] == "completed_with_warnings"
+        assert [a["produced_by_task_id"] for a in result["artifacts"]] == ["a", "b"]
+        assert [(u["task_id"], u["reason"]) for u in result["unsupported_tasks"]] == [
+            ("c", "missing_dependency"),
+            ("d", "tool_not_found"),
+        ]
+        assert [t["status"] for t in result["task_timings"]] == ["completed", "completed", "skipped", "unsupported"]
+    assert results[0]["artifacts"] == results[1]["artifacts"]
+
+
+def test_handler_error_propagates(tmp_path: Path) -> None:
+    engine = _engine(tmp_path, max_workers=4, delay_s=0, log=[])
+
+    def broken(task: Dict[str, Any]) -> Dict[str, Any]:
+        raise RuntimeError("boom")
+
+    engine.handlers["urn:aos:tool:planner"] = broken
+    with pytest.raises(RuntimeError, match="boom"):
+        engine.submit_task(_envelope([_task("a", []), _task("b", [])]))
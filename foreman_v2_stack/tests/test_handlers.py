@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import sys
+import textwrap
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+import pytest
+
+# Ensure `src` package imports resolve when running pytest from repo root.
+FOREMAN_ROOT = Path(__file__).resolve().parents[1]
+if str(FOREMAN_ROOT) not in sys.path:
+    sys.path.insert(0, str(FOREMAN_ROOT))
+
+from src.engines.dag import coalesce_plan, plan_dag
+from src.engines.handlers import HandlerRegistry, discover_handler_plugins
+from src.engines.local_inproc import LocalTaskEngine
+from src.registries.tool_lookup import ToolRegistry
+from test_dag import _build_registry_file, _envelope, _task
+
+
+class BatchPlanner:
+    def __init__(self) -> None:
+        self.calls: List[List[str]] = []
+
+    def _artifact(self, task: Dict[str, Any]) -> Dict[str, Any]:
+        return {"artifact_id": f"urn:aos:artifact:{task['task_id']}.batch", "produced_by_task_id": task["task_id"]}
+
+    def __call__(self, task: Dict[str, Any]) -> Dict[str, Any]:
+        self.calls.append([task["task_id"]])
+        return self._artifact(task)
+
+    def handle_batch(self, tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        self.calls.append([task["task_id"] for task in tasks])
+        return [self._artifact(task) for task in tasks]
+
+
+def _engine(tmp_path: Path, **kwargs: Any) -> LocalTaskEngine:
+    return LocalTaskEngine(registry=ToolRegistry(registry_path=_build_registry_file(tmp_path)), **kwargs)
+
+
+def test_dispatch_table_is_recompiled_when_handlers_change(tmp_path: Path) -> None:
+    engine = _engine(tmp_path, load_plugins=False)
+    table = engine.dispatch_table
+    assert table.lookup("planning").tool.id == "urn:aos:tool:planner"
+    assert table.lookup("  Planning ").tool.id == "urn:aos:tool:planner"
+    assert table.lookup("retrieval") is None
+    assert engine.dispatch_table is table
+
+    del engine.handlers["urn:aos:tool:planner"]
+    assert engine.dispatch_table is not table
+    result = engine.submit_task(_envelope([_task("a", [])]))["result"]
+    assert result["unsupported_tasks"][0]["reason"] == "handler_not_found"
+
+
+def test_batch_handler_gets_one_call_per_dag_level(tmp_path: Path) -> None:
+    engine = _engine(tmp_path, max_workers=4, load_plugins=False)
+    planner = BatchPlanner()
+    engine.handlers["urn:aos:tool:planner"] = planner
+    tasks = [_task("a", []), _task("b", []), _task("c", ["a"]), _task("d", ["a", "b"]), _task("e", [])]
+
+    result = engine.submit_task(_envelope(tasks))["result"]
+
+    assert sorted(map(sorted, planner.calls)) == [["a", "b", "e"], ["c", "d"]]
+    assert [a["produced_by_task_id"] for a in result["artifacts"]] == ["a", "b", "c", "d", "e"]
+    assert {a["tool_id"] for a in result["artifacts"]} == {"urn:aos:tool:planner"}
+    timings = {t["task_id"]: t for t in result["task_timings"]}
+    assert timings["a"]["start_ms"] == timings["e"]["start_ms"]
+    assert timings["c"]["start_ms"] >= timings["a"]["start_ms"] + timings["a"]["duration_ms"] - 0.002
+
+
+def test_batch_streams_per_task_events(tmp_path: Path) -> None:
+    engine = _engine(tmp_path, max_workers=1, load_plugins=False)
+    engine.handlers["urn:aos:tool:planner"] = BatchPlanner()
+    events: List[Dict[str, Any]] = []
+
+    engine.submit_task_streaming(_envelope([_task("a", []), _task("b", [])]), events.append)
+
+    assert [(e["type"], e["task_id"]) for e in events] == [
+        ("task_started", "a"),
+        ("task_started", "b"),
+        ("task_completed", "a"),
+        ("task_completed", "b"),
+    ]
+
+
+def test_batch_result_count_must_match(tmp_path: Path) -> None:
+    engine = _engine(tmp_path, load_plugins=False)
+    planner = BatchPlanner()
+    planner.handle_batch = lambda tasks: []  # type: ignore[method-assign]
+    engine.handlers["urn:aos:tool:planner"] = planner
+
+    with pytest.raises(RuntimeError, match="returned 0 artifacts for 2 tasks"):
+        engine.submit_task(_envelope([_task("a", []), _task("b", [])]))
+
+
+def test_coalesced_plan_stays_topological() -> None:
+    # "c" comes after "b" in input order but "b"'s unit mate "e" depends on it.
+    plan = plan_dag([_task("a", []), _task("b", ["a"]), _task("c", []), _task("e", ["c"])])
+    unit_plan, members = coalesce_plan(plan, [["b", "e"]])
+
+    assert members == {"a": ["a"], "b": ["b", "e"], "c": ["c"]}
+    assert unit_plan.deps["b"] == ["a", "c"]
+    assert unit_plan.order.index("b") > unit_plan.order.index("c")
+
+
+@pytest.fixture
+def plugin_dist(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[Path]:
+    site = tmp_path / "site"
+    dist_info = site / "foreman_test_plugins-0.1.dist-info"
+    dist_info.mkdir(parents=True)
+    (dist_info / "METADATA").write_text("Metadata-Version: 2.1\nName: foreman-test-plugins\nVersion: 0.1\n")
+    (dist_info / "entry_points.txt").write_text(
+        textwrap.dedent(
+            """
+            [foreman.handlers]
+            mapping = foreman_test_plugin:HANDLERS
+            register = foreman_test_plugin:register
+            broken = foreman_test_plugin_missing:HANDLERS
+            """
+        )
+    )
+    (site / "foreman_test_plugin.py").write_text(
+        textwrap.dedent(
+            """
+            def plan(task):
+                return {"artifact_id": "plugin", "produced_by_task_id": task["task_id"]}
+
+            HANDLERS = {"urn:aos:tool:planner": plan}
+
+            def register(registry):
+                registry.register("urn:aos:tool:retriever", plan)
+            """
+        )
+    )
+    monkeypatch.syspath_prepend(str(site))
+    discover_handler_plugins.cache_clear()
+    yield site
+    discover_handler_plugins.cache_clear()
+
+
+def test_entry_point_plugins_are_loaded(plugin_dist: Path, tmp_path: Path) -> None:
+    registry = HandlerRegistry()
+    registry.load_plugins()
+
+    assert set(registry) == {"urn:aos:tool:planner", "urn:aos:tool:retriever"}
+    assert len(registry.load_errors) == 1
+    assert registry.load_errors[0].startswith("handler_plugin_error name=broken")
+
+    engine = _engine(tmp_path)
+    result = engine.submit_task(_envelope([_task("a", [])]))["result"]
+    assert result["artifacts"][0]["artifact_id"] == "plugin"
+    assert any(e.startswith("handler_plugin_error") for e in result["registry_errors"])
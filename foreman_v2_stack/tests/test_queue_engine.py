@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import json
+import socket
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import pytest
+
+# Ensure `src` package imports resolve when running pytest from repo root.
+FOREMAN_ROOT = Path(__file__).resolve().parents[1]
+if str(FOREMAN_ROOT) not in sys.path:
+    sys.path.insert(0, str(FOREMAN_ROOT))
+
+from src.brokers.base import Broker
+from src.brokers.memory import InMemoryBroker, MultiprocessingBroker
+from src.brokers.socket_broker import BrokerServer, SocketBroker
+from src.engines.queue_engine import QueueTaskEngine
+from src.worker import local_engine, run_worker, start_worker_processes
+from test_mvp_flow import _build_base_payload, _build_registry_file
+
+
+def _payload(request_id: str) -> Dict[str, Any]:
+    payload = _build_base_payload(task_type="planning")
+    payload["request_id"] = request_id
+    return payload
+
+
+def _start_thread_workers(broker: Broker, factory, count: int) -> Tuple[threading.Event, List[threading.Thread]]:
+    stop = threading.Event()
+    threads = [
+        threading.Thread(target=run_worker, args=(broker, factory, stop), daemon=True) for _ in range(count)
+    ]
+    for thread in threads:
+        thread.start()
+    return stop, threads
+
+
+@pytest.fixture
+def factory(tmp_path: Path):
+    return functools.partial(local_engine, str(_build_registry_file(tmp_path)))
+
+
+def test_threaded_workers_serve_sync_and_async_submissions(factory) -> None:
+    broker = InMemoryBroker()
+    stop, threads = _start_thread_workers(broker, factory, 2)
+    engine = QueueTaskEngine(broker, timeout_s=10)
+    try:
+        result = engine.submit_task(_payload("urn:aos:req:queue.sync"))
+        assert result["envelope_kind"] == "task_result"
+        assert result["request_id"] == "urn:aos:req:queue.sync"
+
+        async def _many() -> List[Dict[str, Any]]:
+            return await asyncio.gather(
+                *(engine.submit_task_async(_payload(f"urn:aos:req:queue.{i}")) for i in range(8))
+            )
+
+        results = asyncio.run(_many())
+        assert [r["request_id"] for r in results] == [f"urn:aos:req:queue.{i}" for i in range(8)]
+        assert engine.in_flight == 0
+    finally:
+        stop.set()
+        engine.close()
+        for thread in threads:
+            thread.join(timeout=5)
+
+
+def test_worker_value_error_is_reraised(factory) -> None:
+    broker = InMemoryBroker()
+    stop, threads = _start_thread_workers(broker, factory, 1)
+    engine = QueueTaskEngine(broker, timeout_s=10)
+    payload = _payload("urn:aos:req:queue.bad")
+    payload["envelope_version"] = "aos.master.envelope.v9"
+    try:
+        with pytest.raises(ValueError, match="unsupported_envelope_version"):
+            engine.submit_task(payload)
+    finally:
+        stop.set()
+        engine.close()
+        for thread in threads:
+            thread.join(timeout=5)
+
+
+def test_submission_times_out_without_workers() -> None:
+    engine = QueueTaskEngine(InMemoryBroker(), timeout_s=0.05, poll_interval_s=0.05)
+    try:
+        with pytest.raises(TimeoutError):
+            engine.submit_task(_payload("urn:aos:req:queue.lonely"))
+        assert engine.in_flight == 0
+    finally:
+        engine.close()
+
+
+def test_socket_broker_routes_results_per_reply_to(factory) -> None:
+    server = BrokerServer(port=0).start()
+    stop, threads = _start_thread_workers(SocketBroker(server.url), factory, 2)
+    first = QueueTaskEngine(SocketBroker(server.url), timeout_s=10)
+    second = QueueTaskEngine(SocketBroker(server.url), timeout_s=10)
+    try:
+        assert first.submit_task(_payload("urn:aos:req:sock.a"))["request_id"] == "urn:aos:req:sock.a"
+        assert second.submit_task(_payload("urn:aos:req:sock.b"))["request_id"] == "urn:aos:req:sock.b"
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join(timeout=5)
+        first.close()
+        second.close()
+        server.close()
+
+
+def test_socket_broker_reconnects_after_failed_connection() -> None:
+    server = BrokerServer(port=0).start()
+    port = int(server.url.rsplit(":", 1)[1])
+    client = SocketBroker(server.url, connect_timeout=1)
+    client.publish_task({"job_id": "a"})
+    server.close()
+    with pytest.raises(ConnectionError):
+        client.consume_task(0.1)
+    with pytest.raises(ConnectionError):  # still down: refused on connect
+        client.consume_task(0.1)
+    server = BrokerServer(port=port).start()
+    try:
+        client.publish_task({"job_id": "b"})
+        assert client.consume_task(1)["job_id"] == "b"
+    finally:
+        client.close()
+        server.close()
+
+
+def test_job_for_a_disconnected_consumer_is_requeued() -> None:
+    server = BrokerServer(port=0).start()
+    client = SocketBroker(server.url)
+    host, port = server.url[len("tcp://"):].rsplit(":", 1)
+    try:
+        gone = socket.create_connection((host, int(port)))
+        body = json.dumps({"op": "consume_task", "timeout": 2}).encode("utf-8")
+        gone.sendall(struct.pack(">I", len(body)) + body)
+        time.sleep(0.1)  # the server is now waiting for a job on gone's behalf
+        gone.close()
+        client.publish_task({"job_id": "kept"})
+        assert client.consume_task(2) == {"job_id": "kept"}
+    finally:
+        client.close()
+        server.close()
+
+
+def test_worker_survives_broker_restart(factory) -> None:
+    server = BrokerServer(port=0).start()
+    port = int(server.url.rsplit(":", 1)[1])
+    stop, threads = _start_thread_workers(SocketBroker(server.url, connect_timeout=1), factory, 1)
+    engine = QueueTaskEngine(SocketBroker(server.url), timeout_s=10)
+    try:
+        assert engine.submit_task(_payload("urn:aos:req:restart.a"))["request_id"] == "urn:aos:req:restart.a"
+        engine.close()
+        server.close()
+        time.sleep(0.5)  # the worker polls a dead broker and backs off
+        assert threads[0].is_alive()
+        server = BrokerServer(port=port).start()
+        engine = QueueTaskEngine(SocketBroker(server.url), timeout_s=10)
+        assert engine.submit_task(_payload("urn:aos:req:restart.b"))["request_id"] == "urn:aos:req:restart.b"
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join(timeout=10)
+        engine.close()
+        server.close()
+    assert not threads[0].is_alive()
+
+
+def test_multiprocessing_workers(factory) -> None:
+    broker = MultiprocessingBroker()
+    workers, stop = start_worker_processes(broker, 2, factory)
+    engine = QueueTaskEngine(broker, timeout_s=30)
+    try:
+        results = [engine.submit_task(_payload(f"urn:aos:req:mp.{i}")) for i in range(4)]
+        assert {r["result"]["status"] for r in results} == {"completed"}
+    finally:
+        stop.set()
+        for worker in workers:
+            worker.join(timeout=10)
+        engine.close()
+    assert all(worker.exitcode == 0 for worker in workers)
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+import shutil
+import sys
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+
+if importlib.util.find_spec("httpx") is None:
+    pytest.skip("httpx is required for FastAPI TestClient", allow_module_level=True)
+
+from fastapi import HTTPException
+
+# Ensure `src` package imports resolve when running pytest from repo root.
+FOREMAN_ROOT = Path(__file__).resolve().parents[1]
+if str(FOREMAN_ROOT) not in sys.path:
+    sys.path.insert(0, str(FOREMAN_ROOT))
+
+import src.api.server as server
+from src.api.schema_bundle import BUNDLE_FORMAT, SchemaBundle, default_schema_root
+from src.api.validation_cache import ValidationCache
+from test_mvp_flow import _build_base_payload
+
+
+def _payload() -> Dict[str, Any]:
+    payload = _build_base_payload(task_type="planning")
+    payload["embedded_master_meta"]["agents"]["agents"][0]["allowed_task_types"] = ["planning"]
+    return payload
+
+
+@pytest.fixture
+def fresh_server(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(server, "SCHEMA_BUNDLE", None)
+    monkeypatch.setattr(server, "ENVELOPE_VALIDATORS", {})
+    monkeypatch.setattr(server, "VALIDATION_CACHE", ValidationCache(max_entries=0))
+    monkeypatch.delenv("AOS_ALLOW_LEGACY_SCHEMAS", raising=False)
+    monkeypatch.delenv("AOS_FOREMAN_SCHEMA_BUNDLE", raising=False)
+    return monkeypatch
+
+
+def test_only_requested_versions_are_built(fresh_server: pytest.MonkeyPatch) -> None:
+    server.validate_envelope_payload(_payload())
+
+    assert set(server.ENVELOPE_VALIDATORS) == {"aos.master.envelope.v5_1"}
+    assert sorted(server.SCHEMA_BUNDLE.sources) == [
+        "envelope/aos.master.envelope.v5_1.schema.json",
+        "master/aos.master.meta.v5_1.schema.json",
+    ]
+
+    legacy = _payload()
+    legacy["envelope_version"] = "aos.master.envelope.v4"
+    with pytest.raises(HTTPException):
+        server.validate_envelope_payload(legacy)
+    assert set(server.ENVELOPE_VALIDATORS) == {"aos.master.envelope.v5_1"}
+
+
+def test_bundle_round_trip(tmp_path: Path) -> None:
+    path = tmp_path / "bundle.json"
+    source = SchemaBundle(schema_root=default_schema_root()).prepare(["aos.master.envelope.v5_1", "aos.master.envelope.v5"])
+    source.save(path)
+
+    loaded = SchemaBundle.load(path)
+
+    assert loaded.to_dict() == source.to_dict()
+    assert loaded.to_dict()["format"] == BUNDLE_FORMAT
+    assert loaded.envelope("aos.master.envelope.v5").master_ids == source.envelope("aos.master.envelope.v5").master_ids
+    with pytest.raises(KeyError):
+        loaded.envelope("aos.master.envelope.v4")
+
+
+def test_server_validates_from_bundle_file(fresh_server: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    path = tmp_path / "bundle.json"
+    SchemaBundle(schema_root=default_schema_root()).prepare(["aos.master.envelope.v5_1"]).save(path)
+    fresh_server.setenv("AOS_FOREMAN_SCHEMA_BUNDLE", str(path))
+
+    server.validate_envelope_payload(_payload())
+    invalid = _payload()
+    invalid["embedded_master_meta"]["tasks"]["tasks"][0]["task_type"] = "unknown_magic_tool"
+    with pytest.raises(HTTPException) as excinfo:
+        server.validate_envelope_payload(invalid)
+
+    assert excinfo.value.detail["validator"] == "enum"
+    # Everything came from the bundle; no source schema was read.
+    assert server.SCHEMA_BUNDLE.sources == SchemaBundle.load(path).sources
+
+
+def test_stale_bundle_is_rebuilt_from_sources(tmp_path: Path) -> None:
+    schema_root = tmp_path / "schemas"
+    shutil.copytree(default_schema_root(), schema_root)
+    path = tmp_path / "bundle.json"
+    SchemaBundle(schema_root=schema_root).prepare(["aos.master.envelope.v5_1"]).save(path)
+
+    fresh = SchemaBundle.load(path, schema_root=schema_root)
+    assert fresh.stale_sources == []
+    assert "aos.master.envelope.v5_1" in fresh.envelopes
+
+    envelope_file = schema_root / "envelope" / "aos.master.envelope.v5_1.schema.json"
+    schema = json.loads(envelope_file.read_text(encoding="utf-8"))
+    schema["properties"]["request_id"]["description"] = "changed after the bundle was written"
+    envelope_file.write_text(json.dumps(schema), encoding="utf-8")
+
+    stale = SchemaBundle.load(path, schema_root=schema_root)
+    assert stale.stale_sources == ["envelope/aos.master.envelope.v5_1.schema.json"]
+    assert stale.envelopes == {}
+    prepared = stale.envelope("aos.master.envelope.v5_1")
+    assert prepared.outer_schema["properties"]["request_id"]["description"] == "changed after the bundle was written"
+
+
+def test_bundle_rejects_unknown_format(tmp_path: Path) -> None:
+    path = tmp_path / "bundle.json"
+    path.write_text('{"format": "something.else"}', encoding="utf-8")
+
+    with pytest.raises(ValueError, match="unsupported schema bundle format"):
+        SchemaBundle.load(path)
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import json
+import pickle
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Ensure `src` package imports resolve when running pytest from repo root.
+FOREMAN_ROOT = Path(__file__).resolve().parents[1]
+if str(FOREMAN_ROOT) not in sys.path:
+    sys.path.insert(0, str(FOREMAN_ROOT))
+
+from src.engines.local_inproc import LocalTaskEngine
+from src.registries.tool_columns import ToolColumns
+from src.registries.tool_lookup import ToolRegistry, shared_mapping
+from test_dag import _envelope, _task
+
+
+def _record(tool_id: str, capabilities: List[str], semver: str = "0.1.0", status: str = "active") -> Dict[str, Any]:
+    return {
+        "id": tool_id,
+        "type": "aos.tool_record",
+        "created_at": "2026-02-15T19:00:00Z",
+        "name": tool_id.rsplit(":", 1)[-1],
+        "kind": "python_module",
+        "entrypoint": "tools.run",
+        "capabilities": capabilities,
+        "interfaces": {"mcp": None, "vport": None, "http": None},
+        "versioning": {"semver": semver, "api_version": "v1"},
+        "status": status,
+    }
+
+
+def _append(path: Path, *rows: Dict[str, Any]) -> None:
+    with open(path, "a", encoding="utf-8") as handle:
+        for row in rows:
+            handle.write(json.dumps(row) + "\n")
+
+
+def test_inverted_index_ranks_and_filters(tmp_path: Path) -> None:
+    path = tmp_path / "tools_catalog.jsonl"
+    _append(
+        path,
+        {"id": "tools_catalog.meta.v1", "type": "aos.tool_catalog_meta"},
+        _record("urn:aos:tool:old", ["task_type:planning"], semver="0.9.0"),
+        _record("urn:aos:tool:retired", ["planning"], semver="9.0.0", status="deprecated"),
+        _record("urn:aos:tool:new", ["Planning", "retrieval"], semver="0.10.0"),
+    )
+    registry = ToolRegistry(registry_path=path)
+
+    assert [r.id for r in registry.find("planning")] == [
+        "urn:aos:tool:new",
+        "urn:aos:tool:old",
+        "urn:aos:tool:retired",
+    ]
+    assert registry.resolve_tool(" PLANNING ").id == "urn:aos:tool:new"
+    assert [r.id for r in registry.find("planning", status="deprecated")] == ["urn:aos:tool:retired"]
+    assert [r.id for r in registry.find("planning", min_version="1.0")] == ["urn:aos:tool:retired"]
+    assert registry.find("planning", api_version="v2") == []
+    assert [r.id for r in registry.records] == ["urn:aos:tool:old", "urn:aos:tool:retired", "urn:aos:tool:new"]
+
+
+def test_refresh_tails_appended_lines(tmp_path: Path) -> None:
+    path = tmp_path / "tools_catalog.jsonl"
+    _append(path, _record("urn:aos:tool:planner", ["planning"]))
+    registry = ToolRegistry(registry_path=path)
+    generation = registry.generation
+
+    assert registry.refresh() == 0
+    assert registry.generation == generation
+
+    _append(path, _record("urn:aos:tool:retriever", ["retrieval"]))
+    with open(path, "a", encoding="utf-8") as handle:
+        handle.write('{"id": "urn:aos:tool:partial"')  # writer mid-line
+    assert registry.refresh() == 1
+    assert registry.resolve_tool("retrieval").id == "urn:aos:tool:retriever"
+    assert registry.load_errors == []
+
+    with open(path, "a", encoding="utf-8") as handle:
+        handle.write(', "type": "aos.tool_catalog_meta"}\n')
+    # A later line for an existing id replaces the record.
+    _append(path, _record("urn:aos:tool:planner", ["presentation"], status="deprecated"))
+    assert registry.refresh() == 1
+    assert registry.resolve_tool("planning") is None
+    assert registry.get("urn:aos:tool:planner").status == "deprecated"
+    assert registry.generation > generation
+
+
+def test_replaced_file_is_reloaded_in_full(tmp_path: Path) -> None:
+    path = tmp_path / "tools_catalog.jsonl"
+    _append(path, _record("urn:aos:tool:planner", ["planning"]))
+    with open(path, "a", encoding="utf-8") as handle:
+        handle.write("not json\n")
+    registry = ToolRegistry(registry_path=path)
+    assert registry.load_errors and registry.load_errors[0].startswith("invalid_json line=2")
+
+    # Same inode and a longer file: only the changed head gives the rewrite away.
+    rewritten = [_record("urn:aos:tool:writer", ["presentation"]), _record("urn:aos:tool:viewer", ["presentation"])]
+    path.write_text("".join(json.dumps(row) + "\n" for row in rewritten), encoding="utf-8")
+    registry.refresh()
+    assert [r.id for r in registry.records] == ["urn:aos:tool:writer", "urn:aos:tool:viewer"]
+    assert registry.load_errors == []
+
+
+def test_lookups_proceed_while_reloading(tmp_path: Path) -> None:
+    path = tmp_path / "tools_catalog.jsonl"
+    _append(path, _record("urn:aos:tool:planner", ["planning"]))
+    registry = ToolRegistry(registry_path=path)
+    stop = threading.Event()
+    misses: List[str] = []
+
+    def reader() -> None:
+        while not stop.is_set():
+            if registry.resolve_tool("planning") is None:
+                misses.append("planning")
+
+    thread = threading.Thread(target=reader)
+    thread.start()
+    try:
+        for index in range(200):
+            _append(path, _record(f"urn:aos:tool:extra{index}", ["planning"], semver="0.0.1"))
+            registry.refresh()
+    finally:
+        stop.set()
+        thread.join()
+
+    assert misses == []
+    assert len(registry.find("planning")) == 201
+
+
+def test_engine_dispatch_follows_reloads(tmp_path: Path) -> None:
+    path = tmp_path / "tools_catalog.jsonl"
+    _append(path, _record("urn:aos:tool:other", ["retrieval"]))
+    engine = LocalTaskEngine(registry=ToolRegistry(registry_path=path), load_plugins=False)
+    assert engine.submit_task(_envelope([_task("a", [])]))["result"]["unsupported_tasks"][0]["reason"] == (
+        "tool_not_found"
+    )
+
+    _append(path, _record("urn:aos:tool:planner", ["planning"]))
+    engine.registry.refresh()
+    assert engine.submit_task(_envelope([_task("a", [])]))["result"]["status"] == "completed"
+
+
+def test_records_share_repeated_values(tmp_path: Path) -> None:
+    path = tmp_path / "tools_catalog.jsonl"
+    _append(path, _record("urn:aos:tool:a", ["planning"]), _record("urn:aos:tool:b", ["planning"]))
+    first, second = ToolRegistry(registry_path=path).records
+
+    assert not hasattr(first, "__dict__")
+    assert first.capabilities == ("planning",)
+    assert first.capabilities is second.capabilities
+    assert first.versioning is second.versioning
+    assert first.status is second.status
+    restored = pickle.loads(pickle.dumps(first))
+    assert restored == first and restored.versioning is first.versioning
+
+
+def test_shared_mappings_keep_value_types(tmp_path: Path) -> None:
+    path = tmp_path / "tools_catalog.jsonl"
+    flags = [True, 1, 1.0]
+    rows = []
+    for index, flag in enumerate(flags):
+        row = _record(f"urn:aos:tool:{index}", ["planning"])
+        row["interfaces"] = {"mcp": flag, "vport": None, "http": None}
+        rows.append(row)
+    _append(path, *rows)
+
+    records = ToolRegistry(registry_path=path).records
+
+    assert [type(record.interfaces["mcp"]) for record in records] == [bool, int, float]
+    assert shared_mapping({"a": 1}) is shared_mapping({"a": 1})
+    assert shared_mapping({"a": 1}) is not shared_mapping({"a": True})
+
+
+def test_columns_round_trip_records(tmp_path: Path) -> None:
+    path = tmp_path / "tools_catalog.jsonl"
+    _append(
+        path,
+        _record("urn:aos:tool:a", ["planning", "retrieval"]),
+        _record("urn:aos:tool:b", ["retrieval"], semver="1.0.0", status="deprecated"),
+        {**_record("urn:aos:tool:c", []), "interfaces": {"http": {"url": "http://tools.local"}}},
+    )
+    records = ToolRegistry(registry_path=path).records
+    columns = ToolColumns.from_records(records)
+
+    assert list(columns) == records
+    assert columns[-1].interfaces == {"http": {"url": "http://tools.local"}}
+    assert columns[1:] == records[1:]
+    assert columns.column("status") == ["active", "deprecated", "active"]
+    assert columns.column("capabilities") == [("planning", "retrieval"), ("retrieval",), ()]
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import importlib.util
+import sys
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+
+if importlib.util.find_spec("httpx") is None:
+    pytest.skip("httpx is required for FastAPI TestClient", allow_module_level=True)
+
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+# Ensure `src` package imports resolve when running pytest from repo root.
+FOREMAN_ROOT = Path(__file__).resolve().parents[1]
+if str(FOREMAN_ROOT) not in sys.path:
+    sys.path.insert(0, str(FOREMAN_ROOT))
+
+import src.api.server as server
+from src.api.validation_cache import ValidationCache, canonical_sha256
+from test_mvp_flow import _build_base_payload
+
+
+def _payload(request_id: str = "urn:aos:req:test.cache") -> Dict[str, Any]:
+    payload = _build_base_payload(task_type="planning")
+    payload["request_id"] = request_id
+    payload["embedded_master_meta"]["agents"]["agents"][0]["allowed_task_types"] = ["planning"]
+    return payload
+
+
+@pytest.fixture
+def cache(monkeypatch: pytest.MonkeyPatch) -> ValidationCache:
+    fresh = ValidationCache(max_entries=8)
+    monkeypatch.setattr(server, "VALIDATION_CACHE", fresh)
+    return fresh
+
+
+def _detail(payload: Dict[str, Any]) -> Dict[str, Any]:
+    with pytest.raises(HTTPException) as excinfo:
+        server.validate_envelope_payload(payload)
+    assert excinfo.value.status_code == 400
+    return excinfo.value.detail
+
+
+def test_same_meta_with_new_request_id_hits_cache(cache: ValidationCache) -> None:
+    server.validate_envelope_payload(_payload("urn:aos:req:test.one"))
+    server.validate_envelope_payload(_payload("urn:aos:req:test.two"))
+
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["hit_rate"] == 0.5
+
+
+def test_cache_key_ignores_key_order() -> None:
+    meta = _payload()["embedded_master_meta"]
+    reordered = dict(reversed(list(meta.items())))
+
+    assert canonical_sha256(meta) == canonical_sha256(reordered)
+    assert ValidationCache.key("v", meta) != ValidationCache.key("w", meta)
+
+
+def test_invalid_meta_reports_inner_error_and_is_cached(cache: ValidationCache) -> None:
+    payload = _payload()
+    payload["embedded_master_meta"]["tasks"]["tasks"][0]["task_type"] = "unknown_magic_tool"
+
+    first = _detail(payload)
+    second = _detail(payload)
+
+    assert first == second
+    assert first["validator"] == "enum"
+    assert first["path"] == ["embedded_master_meta", "tasks", "tasks", 0, "task_type"]
+    assert first["schema_path"][:4] == ["properties", "embedded_master_meta", "oneOf", "0"]
+    assert cache.stats()["hits"] == 1
+
+
+def test_outer_errors_skip_meta_validation(cache: ValidationCache) -> None:
+    payload = _payload()
+    payload["unexpected_key"] = True
+
+    detail = _detail(payload)
+
+    assert detail["validator"] == "additionalProperties"
+    assert cache.stats()["misses"] == 0
+
+
+def test_lru_evicts_oldest_entry() -> None:
+    cache = ValidationCache(max_entries=2)
+    for name in ("a", "b", "c"):
+        cache.put(("v", name), None)
+
+    assert cache.get(("v", "a")) == (False, None)
+    assert cache.get(("v", "c")) == (True, None)
+    assert cache.stats()["evictions"] == 1
+
+    disabled = ValidationCache(max_entries=0)
+    disabled.put(("v", "a"), None)
+    assert disabled.get(("v", "a")) == (False, None)
+
+
+def test_metrics_endpoint_reports_hit_rate(cache: ValidationCache) -> None:
+    with TestClient(server.app) as client:
+        server.validate_envelope_payload(_payload())
+        server.validate_envelope_payload(_payload())
+        body = client.get("/metrics").json()
+
+    assert body["validation_cache"]["hit_rate"] == 0.5
+    assert body["validation_cache"]["size"] == 1
+    assert body["executor"]["capacity"] == server.CHAT_EXECUTOR.capacity
@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+if importlib.util.find_spec("httpx") is None:
+    pytest.skip("httpx is required for FastAPI TestClient", allow_module_level=True)
+
+from fastapi.testclient import TestClient
+
+# Ensure `src` package imports resolve when running pytest from repo root.
+FOREMAN_ROOT = Path(__file__).resolve().parents[1]
+if str(FOREMAN_ROOT) not in sys.path:
+    sys.path.insert(0, str(FOREMAN_ROOT))
+
+import src.api.server as server
+from src.api.ws_stream import WsSession
+from src.engines.local_inproc import LocalTaskEngine
+from src.registries.tool_lookup import ToolRegistry
+from test_mvp_flow import _build_base_payload, _build_registry_file
+
+
+def _payload(request_id: str, task_ids: List[str]) -> Dict[str, Any]:
+    payload = _build_base_payload(task_type="planning")
+    payload["request_id"] = request_id
+    payload["embedded_master_meta"]["agents"]["agents"][0]["allowed_task_types"] = ["planning"]
+    tasks = []
+    for index, task_id in enumerate(task_ids):
+        tasks.append(
+            {
+                "task_id": task_id,
+                "task_type": "planning",
+                "description": f"task {task_id}",
+                "depends_on": task_ids[:index][-1:],
+            }
+        )
+    payload["embedded_master_meta"]["tasks"]["tasks"] = tasks
+    return payload
+
+
+def _collect(ws: Any, request_ids: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+    events: Dict[str, List[Dict[str, Any]]] = {request_id: [] for request_id in request_ids}
+    pending = set(request_ids)
+    while pending:
+        event = ws.receive_json()
+        events[event["request_id"]].append(event)
+        if event["type"] in ("result", "error"):
+            pending.discard(event["request_id"])
+    return events
+
+
+@pytest.fixture
+def client(tmp_path: Path):
+    with TestClient(server.app) as test_client:
+        server.ENGINE = LocalTaskEngine(registry=ToolRegistry(registry_path=_build_registry_file(tmp_path)))
+        yield test_client
+
+
+def test_streams_task_events_for_multiplexed_requests(client: TestClient) -> None:
+    first = _payload("urn:aos:req:ws.one", ["urn:aos:task:a", "urn:aos:task:b"])
+    second = _payload("urn:aos:req:ws.two", ["urn:aos:task:c"])
+
+    with client.websocket_connect("/ws") as ws:
+        assert ws.receive_json() == {"status": "connected"}
+        ws.send_json({"type": "submit", "envelope": first})
+        ws.send_json(second)
+        events = _collect(ws, ["urn:aos:req:ws.one", "urn:aos:req:ws.two"])
+
+    one = [event["type"] for event in events["urn:aos:req:ws.one"]]
+    assert one == ["accepted", "task_started", "task_completed", "task_started", "task_completed", "result"]
+    completed = [e for e in events["urn:aos:req:ws.one"] if e["type"] == "task_completed"]
+    assert [e["task_id"] for e in completed] == ["urn:aos:task:a", "urn:aos:task:b"]
+    assert completed[0]["artifact"]["produced_by_task_id"] == "urn:aos:task:a"
+
+    result = events["urn:aos:req:ws.one"][-1]["envelope"]
+    assert result["result"]["artifacts"] == [e["artifact"] for e in completed]
+    assert [event["type"] for event in events["urn:aos:req:ws.two"]][-1] == "result"
+
+
+def test_invalid_envelope_reports_error_and_keeps_connection(client: TestClient) -> None:
+    bad = _payload("urn:aos:req:ws.bad", ["urn:aos:task:a"])
+    bad["unexpected_key"] = True
+    good = _payload("urn:aos:req:ws.good", ["urn:aos:task:a"])
+
+    with client.websocket_connect("/ws") as ws:
+        ws.receive_json()
+        ws.send_text("{not json")
+        assert ws.receive_json()["detail"]["error"] == "invalid_json"
+        ws.send_json(bad)
+        ws.send_json(good)
+        events = _collect(ws, ["urn:aos:req:ws.bad", "urn:aos:req:ws.good"])
+
+    error = events["urn:aos:req:ws.bad"][-1]
+    assert error["type"] == "error"
+    assert error["status_code"] == 400
+    assert error["detail"]["validator"] == "additionalProperties"
+    assert events["urn:aos:req:ws.good"][-1]["type"] == "result"
+
+
+def test_in_flight_limit_per_connection(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("AOS_FOREMAN_WS_MAX_IN_FLIGHT", "1")
+    gate = threading.Event()
+    engine = server.ENGINE
+    build = engine.handlers["urn:aos:tool:planner"]
+
+    def gated(task: Dict[str, Any]) -> Dict[str, Any]:
+        gate.wait(timeout=5)
+        return build(task)
+
+    engine.handlers["urn:aos:tool:planner"] = gated
+
+    with client.websocket_connect("/ws") as ws:
+        ws.receive_json()
+        ws.send_json(_payload("urn:aos:req:ws.slow", ["urn:aos:task:a"]))
+        assert ws.receive_json()["type"] == "accepted"
+        ws.send_json(_payload("urn:aos:req:ws.extra", ["urn:aos:task:a"]))
+        refused = ws.receive_json()
+        while refused["request_id"] != "urn:aos:req:ws.extra":  # skip slow's task_started
+            refused = ws.receive_json()
+        gate.set()
+        events = _collect(ws, ["urn:aos:req:ws.slow"])
+
+    assert refused["detail"]["error"] == "too_many_in_flight"
+    assert events["urn:aos:req:ws.slow"][-1]["type"] == "result"
+
+
+class _StalledSocket:
+    """Fake WebSocket whose client reads nothing until `reading` is set."""
+
+    def __init__(self, messages: List[Dict[str, Any]]) -> None:
+        self.incoming: "asyncio.Queue[str]" = asyncio.Queue()
+        for message in messages:
+            self.incoming.put_nowait(json.dumps(message))
+        self.reading = asyncio.Event()
+        self.sent: List[Dict[str, Any]] = []
+
+    async def receive(self) -> Dict[str, Any]:
+        return {"type": "websocket.receive", "text": await self.incoming.get()}
+
+    async def send_json(self, event: Dict[str, Any]) -> None:
+        await self.reading.wait()
+        self.sent.append(event)
+
+
+def test_stalled_reader_never_blocks_engine_threads() -> None:
+    pool = ThreadPoolExecutor(max_workers=1)
+    emitted: Dict[str, float] = {}
+
+    async def validate(envelope: Dict[str, Any]) -> None:
+        return None
+
+    async def execute(envelope: Dict[str, Any], on_event: Any) -> Dict[str, Any]:
+        def run() -> Dict[str, Any]:
+            start = time.monotonic()
+            for index in range(envelope["events"]):
+                on_event({"type": "task_started", "task_id": str(index)})
+                on_event({"type": "task_completed", "task_id": str(index)})
+            emitted[envelope["request_id"]] = time.monotonic() - start
+            return {"ok": envelope["request_id"]}
+
+        return await asyncio.get_running_loop().run_in_executor(pool, run)
+
+    async def scenario() -> List[Dict[str, Any]]:
+        ws = _StalledSocket([
+            {"request_id": "slow", "events": 50},
+            {"request_id": "small", "events": 1},
+        ])
+        session = WsSession(ws, validate, execute, send_queue_size=8)  # type: ignore[arg-type]
+        serving = asyncio.create_task(session.serve())
+        # Both envelopes run on the one shared thread although nobody is reading.
+        for _ in range(200):
+            if len(emitted) == 2:
+                break
+            await asyncio.sleep(0.01)
+        ws.reading.set()
+        for _ in range(200):
+            if sum(1 for e in ws.sent if e["type"] in ("result", "error")) == 2:
+                break
+            await asyncio.sleep(0.01)
+        serving.cancel()
+        return ws.sent
+
+    sent = asyncio.run(scenario())
+    pool.shutdown()
+
+    assert set(emitted) == {"slow", "small"}
+    assert max(emitted.values()) < 1.0
+    final = {e["request_id"]: e for e in sent if e["type"] in ("result", "error")}
+    assert final["slow"]["detail"]["error"] == "slow_consumer"
+    assert final["small"]["type"] == "result"
+    assert len([e for e in sent if e["request_id"] == "slow"]) <= 8 + 2  # accepted + error
+
+
+def test_pongs_to_a_stalled_reader_stay_bounded() -> None:
+    async def scenario() -> Dict[str, Any]:
+        ws = _StalledSocket([{"type": "ping"}] * 100)
+        session = WsSession(ws, None, None, max_in_flight=1, send_queue_size=4)  # type: ignore[arg-type]
+        serving = asyncio.create_task(session.serve())
+        await asyncio.sleep(0.1)
+        stalled = {"queued": session._queue.qsize(), "unread": ws.incoming.qsize()}
+        ws.reading.set()
+        for _ in range(200):
+            if len(ws.sent) == 100:
+                break
+            await asyncio.sleep(0.01)
+        serving.cancel()
+        return {**stalled, "sent": len(ws.sent)}
+
+    outcome = asyncio.run(scenario())
+
+    assert outcome["queued"] <= 4
+    assert outcome["unread"] > 0  # reading paused while nobody read the pongs
+    assert outcome["sent"] == 100
+
+
+def test_binary_frame_is_refused_and_connection_stays_open(client: TestClient) -> None:
+    with client.websocket_connect("/ws") as ws:
+        ws.receive_json()
+        ws.send_bytes(b"\x00\x01")
+        error = ws.receive_json()
+        ws.send_json({"type": "ping"})
+        pong = ws.receive_json()
+
+    assert error["type"] == "error"
+    assert error["detail"]["error"] == "unsupported_frame"
+    assert pong == {"type": "pong", "request_id": None}